@@ -0,0 +1 @@
+"""Benchmarks for the MCP server-client example."""
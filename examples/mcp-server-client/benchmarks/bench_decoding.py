@@ -0,0 +1,87 @@
+"""Compare the cost of decoding Open-Meteo responses per JSON backend.
+
+Usage:
+    python -m benchmarks.bench_decoding --repeat 5
+
+Payloads come from the fake Open-Meteo API: current conditions for one and
+for 50 locations, as ``get_weather`` and ``get_weather_batch`` request them,
+and a 384 hour forecast as ``get_forecast`` requests it. Each is decoded in
+full and with the tool's field selection. "kept" is the size of what the
+tool would go on to cache, serialized back to JSON.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from typing import Any
+
+from benchmarks.fake_open_meteo import FakeOpenMeteo
+from src.mcp_server.decoding import BACKENDS, Fields, JsonDecoder, available_backend
+from src.mcp_server.tools.forecast import SERIES_FIELDS, SERIES_SELECTION
+from src.mcp_server.tools.weather import CURRENT_FIELDS, CURRENT_SELECTION
+
+
+def payloads() -> list[tuple[str, bytes, Fields]]:
+    """Build the response bodies to decode, with the selection for each."""
+    app = FakeOpenMeteo()
+    current = {"current": CURRENT_FIELDS, "timezone": "auto"}
+    hourly = {
+        "hourly": ",".join(SERIES_FIELDS["hourly"]),
+        "forecast_hours": "384",
+        "timeformat": "unixtime",
+        "timezone": "auto",
+    }
+    batch: list[Any] = [
+        app.location(40 + i * 0.1, -3 + i * 0.1, current) for i in range(50)
+    ]
+    return [
+        (
+            "current",
+            json.dumps(app.location(51.5, -0.1, current)).encode(),
+            CURRENT_SELECTION,
+        ),
+        ("current x50", json.dumps(batch).encode(), CURRENT_SELECTION),
+        (
+            "hourly 384h",
+            json.dumps(app.location(51.5, -0.1, hourly)).encode(),
+            SERIES_SELECTION["hourly"],
+        ),
+    ]
+
+
+def measure(
+    decoder: JsonDecoder, body: bytes, fields: Fields | None, repeat: int
+) -> float:
+    """Return the best of ``repeat`` runs, in seconds per decode."""
+    timer = timeit.Timer(lambda: decoder.decode(body, fields))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main() -> int:
+    """Run the decoding benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    backends = [name for name in BACKENDS if available_backend(name) == name]
+    print(
+        f"{'payload':<12} {'bytes':>7} {'backend':<7} "
+        f"{'full µs':>9} {'selected µs':>12} {'kept bytes':>11}"
+    )
+    for name, body, fields in payloads():
+        kept = len(json.dumps(JsonDecoder("json").decode(body, fields)))
+        for backend in backends:
+            decoder = JsonDecoder(backend)
+            full = measure(decoder, body, None, args.repeat)
+            selected = measure(decoder, body, fields, args.repeat)
+            print(
+                f"{name:<12} {len(body):>7} {backend:<7} "
+                f"{full * 1e6:>9.1f} {selected * 1e6:>12.1f} {kept:>11}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
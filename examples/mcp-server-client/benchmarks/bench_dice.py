@@ -0,0 +1,147 @@
+"""Compare dice rolled per second by the bulk engine and a randint loop.
+
+Usage:
+    python -m benchmarks.bench_dice --repeat 5
+
+"randint" is the per-die loop ``roll_dice`` used before the bulk engine;
+"numpy" and "python" are the ``DiceEngine`` backends. Rolls of at most 100
+dice keep their values, larger ones only their histogram.
+
+The second table times ``dice_distribution``'s exact distributions, cold
+(fresh memo caches) and warm (groups memoized by an earlier call).
+
+The third times ``roll_dice_batch``'s ``roll_batch`` against rolling each
+plan once per repeat, as many ``roll_dice`` calls would.
+
+The fourth compares the random stream modes drawing d20s: seeded "fast"
+streams (PCG64 with NumPy, ``random.Random`` without) and batched "secure"
+``secrets`` streams, against a per-die ``random.SystemRandom`` loop.
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from functools import partial
+
+from src.mcp_server.dice_distribution import DistributionCalculator
+from src.mcp_server.dice_engine import BACKENDS, DiceEngine, available_backend
+from src.mcp_server.dice_notation import compile_notation, roll_batch
+from src.mcp_server.dice_random import MODES, DiceStream
+
+SIZES = (10, 100, 10_000, 1_000_000)
+
+EXPRESSIONS = ("3d6", "4d6kh3", "20d20kh5", "100d100", "500d1000", "300d1000+200d20")
+
+# A table of attack rolls and damage, as bots roll them each turn
+BATCH = ("1d20+5", "1d20+3", "1d20-1", "2d6+3", "1d8+2", "4d6kh3", "2d20kh1+4")
+BATCH_REPEATS = (1, 100, 10_000)
+
+STREAM_SIZES = (100, 10_000, 1_000_000)
+
+# The per-die SystemRandom loop is too slow to time on larger draws
+SYSTEM_RANDOM_MAX = 10_000
+
+
+def randint_loop(count: int, sides: int) -> int:
+    """Roll the way roll_dice used to, one randint call per die."""
+    return sum(random.randint(1, sides) for _ in range(count))
+
+
+def system_random_loop(count: int, sides: int) -> list[int]:
+    """Draw secure dice without batching, one SystemRandom call per die."""
+    generator = random.SystemRandom()
+    return [generator.randint(1, sides) for _ in range(count)]
+
+
+def measure(roll: Callable[[], object], repeat: int) -> float:
+    """Return the best of ``repeat`` runs, in seconds per roll."""
+    timer = timeit.Timer(roll)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main() -> int:
+    """Run the dice benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--sides", type=int, default=6, help="Sides per die")
+    args = parser.parse_args()
+
+    rollers: dict[str, Callable[[int], object]] = {
+        "randint": lambda count: randint_loop(count, args.sides)
+    }
+    for backend in BACKENDS:
+        if available_backend(backend) == backend:
+            engine = DiceEngine(backend)
+            rollers[backend] = lambda count, engine=engine: engine.roll(
+                count, args.sides, max_values=100
+            )
+
+    print(f"{'dice':>9} {'backend':<8} {'ms/roll':>10} {'dice/s':>14}")
+    for count in SIZES:
+        for name, roller in rollers.items():
+            seconds = measure(lambda: roller(count), args.repeat)
+            print(
+                f"{count:>9} {name:<8} {seconds * 1e3:>10.3f} {count / seconds:>14,.0f}"
+            )
+
+    print(f"\n{'expression':<16} {'outcomes':>9} {'cold ms':>9} {'warm ms':>9}")
+    for notation in EXPRESSIONS:
+        plan = compile_notation(notation)
+        cold = min(
+            timeit.repeat(
+                lambda: DistributionCalculator().distribution(plan),
+                repeat=args.repeat,
+                number=1,
+            )
+        )
+        calculator = DistributionCalculator()
+        distribution = calculator.distribution(plan)
+        warm = measure(lambda: calculator.distribution(plan), args.repeat)
+        print(
+            f"{notation:<16} {len(distribution.pmf):>9} "
+            f"{cold * 1e3:>9.2f} {warm * 1e3:>9.3f}"
+        )
+
+    plans = [compile_notation(notation) for notation in BATCH]
+    print(f"\n{'repeat':>7} {'backend':<8} {'batch ms':>10} {'one by one ms':>14}")
+    for repeat in BATCH_REPEATS:
+        for backend in BACKENDS:
+            if available_backend(backend) != backend:
+                continue
+            engine = DiceEngine(backend)
+            batch = measure(lambda: roll_batch(engine, plans, repeat), args.repeat)
+            single = measure(
+                lambda: [
+                    plan.total(plan.roll(engine, 100))
+                    for plan in plans
+                    for _ in range(repeat)
+                ],
+                args.repeat,
+            )
+            print(
+                f"{repeat:>7} {backend:<8} {batch * 1e3:>10.3f} {single * 1e3:>14.3f}"
+            )
+
+    print(f"\n{'dice':>9} {'stream':<14} {'ms/draw':>10} {'dice/s':>14}")
+    for count in STREAM_SIZES:
+        draws: dict[str, Callable[[], object]] = {}
+        for backend in BACKENDS:
+            if available_backend(backend) != backend:
+                continue
+            for mode in MODES:
+                stream = DiceStream(backend, mode, seed=1 if mode == "fast" else None)
+                draws[f"{backend} {mode}"] = partial(stream.integers, 1, 20, count)
+        if count <= SYSTEM_RANDOM_MAX:
+            draws["sysrandom loop"] = lambda: system_random_loop(count, 20)
+        for name, draw in draws.items():
+            seconds = measure(draw, args.repeat)
+            rate = count / seconds
+            print(f"{count:>9} {name:<14} {seconds * 1e3:>10.3f} {rate:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Measure MCP server cold start: time from spawn to ``initialize`` response.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5 --threshold 2.0
+
+Exits with status 1 when the median cold start exceeds the threshold.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+async def measure_startup(env: dict[str, str] | None = None) -> float:
+    """Spawn a stdio server and return seconds until it answers initialize.
+
+    Args:
+        env: Environment of the server, e.g. to isolate its tool manifest;
+            None for the default environment
+    """
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "src.mcp_server.server"],
+        cwd=PROJECT_ROOT,
+        env=env,
+    )
+    with open(os.devnull, "w") as devnull:
+        started = time.perf_counter()
+        async with stdio_client(params, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                return time.perf_counter() - started
+
+
+async def run_benchmark(runs: int) -> list[float]:
+    """Measure several cold starts sequentially."""
+    return [await measure_startup() for _ in range(runs)]
+
+
+def main() -> int:
+    """Run the cold start benchmark and check it against the threshold."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=2.0,
+        help="Maximum median seconds to initialize (default: 2.0)",
+    )
+    args = parser.parse_args()
+
+    timings = asyncio.run(run_benchmark(args.runs))
+    median = statistics.median(timings)
+    print(f"runs:   {len(timings)}")
+    print(f"median: {median * 1000:.1f} ms")
+    print(f"min:    {min(timings) * 1000:.1f} ms")
+    print(f"max:    {max(timings) * 1000:.1f} ms")
+
+    if median > args.threshold:
+        print(f"❌ Median cold start exceeds {args.threshold * 1000:.0f} ms budget")
+        return 1
+    print(f"✅ Within {args.threshold * 1000:.0f} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Load test ``get_weather`` against the local fake Open-Meteo API.
+
+Usage:
+    python -m benchmarks.bench_weather --requests 2000 --concurrency 100 \\
+        --locations 200 --latency lognormal:80:0.5 --error-rate 0.02
+
+Requests pick coordinates from a fixed, seeded set of grid cells, so runs
+with the same arguments are comparable. The report shows call latency next
+to what reached upstream, which is where result caching, coalescing,
+retries and the connection pool show up. The disk cache is off unless
+``--disk-cache`` is given, so every run starts cold.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.fake_open_meteo import FakeConfig, FakeOpenMeteo, serve
+
+
+def locations(count: int, seed: int) -> list[str]:
+    """Return ``count`` coordinates in distinct weather grid cells."""
+    rng = random.Random(seed)
+    cells = rng.sample(range(100_000), count)
+    return [
+        f"{40 + cell // 1000 * 0.05:.3f},{cell % 1000 * 0.05 - 25:.3f}"
+        for cell in cells
+    ]
+
+
+async def run_benchmark(
+    app: FakeOpenMeteo, requests: int, concurrency: int, places: list[str], seed: int
+) -> tuple[list[float], int, dict]:
+    """Run the load and return call timings, failures and upstream stats."""
+    # Imported late so MCP_DISK_CACHE is read after it was set
+    from src.mcp_server.tools.weather import WeatherTool
+
+    rng = random.Random(seed)
+    plan = [rng.choice(places) for _ in range(requests)]
+    timings: list[float] = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with serve(app) as base_url:
+        tool = WeatherTool()
+        tool.api_base = base_url
+        await tool.warm()
+
+        async def call(location: str) -> None:
+            nonlocal failures
+            async with semaphore:
+                started = time.perf_counter()
+                result = await tool.safe_execute(location=location)
+                timings.append(time.perf_counter() - started)
+                failures += bool(result.get("isError"))
+
+        try:
+            await asyncio.gather(*(call(location) for location in plan))
+            upstream = tool.upstreams.stats()
+        finally:
+            await tool.cleanup()
+    return timings, failures, upstream
+
+
+def main() -> int:
+    """Run the weather load test and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="Tool calls")
+    parser.add_argument(
+        "--concurrency", type=int, default=50, help="Tool calls in flight at once"
+    )
+    parser.add_argument(
+        "--locations", type=int, default=100, help="Distinct grid cells requested"
+    )
+    parser.add_argument(
+        "--latency", default="lognormal:80:0.5", help="Fake API latency in ms"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction answered with 503"
+    )
+    parser.add_argument(
+        "--rate-limit", type=float, default=None, help="Fake API requests per second"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--disk-cache", action="store_true", help="Keep the persistent cache enabled"
+    )
+    args = parser.parse_args()
+
+    if not args.disk_cache:
+        os.environ["MCP_DISK_CACHE"] = "off"
+    app = FakeOpenMeteo(
+        FakeConfig(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            rate_limit=args.rate_limit,
+            seed=args.seed,
+        )
+    )
+    started = time.perf_counter()
+    timings, failures, upstream = asyncio.run(
+        run_benchmark(
+            app,
+            args.requests,
+            args.concurrency,
+            locations(args.locations, args.seed),
+            args.seed,
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(timings, n=100)
+    print(f"calls:       {len(timings)} ({failures} failed)")
+    print(f"throughput:  {len(timings) / elapsed:.0f} calls/s")
+    print(f"p50:         {quantiles[49] * 1000:.1f} ms")
+    print(f"p95:         {quantiles[94] * 1000:.1f} ms")
+    print(f"p99:         {quantiles[98] * 1000:.1f} ms")
+    print(f"upstream:    {app.stats.requests} requests")
+    print(f"  errors:    {app.stats.errors}")
+    print(f"  limited:   {app.stats.rate_limited}")
+    print(f"  in flight: {app.stats.max_in_flight} max")
+    for host, stats in upstream.items():
+        print(
+            f"client:      {host} {stats['retries']} retries, "
+            f"{stats['connections_opened']} connections, "
+            f"{stats['breaker_opens']} breaker opens"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""Local stand-in for the Open-Meteo forecast API.
+
+Serves ``/v1/forecast`` with the response shape of the real API, including
+comma-separated coordinate lists, ``current``, ``hourly`` and ``daily``
+variables and ``timeformat=unixtime``. Values are derived from the
+coordinates, so repeated requests get the same answer. Latency, error rate
+and rate limiting are configurable and seeded, which makes load tests
+against ``WeatherTool`` repeatable without network access.
+
+Usage:
+    python -m benchmarks.fake_open_meteo --port 8081 \\
+        --latency lognormal:80:0.5 --error-rate 0.02 --rate-limit 50
+
+Then point the server at it with ``MCP_OPEN_METEO_URL=http://127.0.0.1:8081/v1``.
+``/stats`` reports the requests served so far.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import math
+import random
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+UNITS = {
+    "temperature_2m": "°C",
+    "temperature_2m_min": "°C",
+    "temperature_2m_max": "°C",
+    "relative_humidity_2m": "%",
+    "precipitation_probability": "%",
+    "precipitation_sum": "mm",
+    "weather_code": "wmo code",
+    "wind_speed_10m": "km/h",
+    "wind_speed_10m_max": "km/h",
+}
+
+# Open-Meteo publishes current conditions every 15 minutes
+INTERVAL = 900
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Parse a latency distribution into a sampler returning seconds.
+
+    Specs are in milliseconds: ``fixed:MS``, ``uniform:LOW:HIGH`` or
+    ``lognormal:MEDIAN:SIGMA``.
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(":")] if args else []
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"Invalid latency distribution: {spec!r}")
+
+
+@dataclass
+class FakeConfig:
+    """Behaviour of the fake API.
+
+    Attributes:
+        latency: Latency distribution spec, see ``parse_latency``
+        error_rate: Fraction of requests answered with a 503
+        rate_limit: Requests per second before answering 429, or None
+        burst: Requests allowed at once above the rate limit
+        seed: Seed for latency and error sampling
+    """
+
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    rate_limit: float | None = None
+    burst: int = 10
+    seed: int = 0
+
+
+@dataclass
+class FakeStats:
+    """Requests served by the fake API."""
+
+    requests: int = 0
+    locations: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    coordinates: dict[str, int] = field(default_factory=dict)
+
+
+def _noise(lat: float, lon: float, salt: str) -> float:
+    """Deterministic value in [0, 1) for coordinates."""
+    digest = hashlib.blake2b(f"{lat:.4f},{lon:.4f},{salt}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "big") / 2**64
+
+
+def _value(variable: str, lat: float, lon: float, step: int) -> float | int:
+    """Plausible, deterministic value of a variable at a time step."""
+    base = 25 - abs(lat) * 0.4
+    wave = math.sin((step + lon / 15) * 2 * math.pi / 24)
+    noise = _noise(lat, lon, variable)
+    if variable.startswith("temperature_2m"):
+        offset = {"temperature_2m_min": -5, "temperature_2m_max": 5}.get(variable, 0)
+        return round(base + 4 * wave + offset + noise * 2, 1)
+    if variable == "relative_humidity_2m":
+        return int(50 + 30 * noise)
+    if variable == "precipitation_probability":
+        return int(100 * noise * (wave + 1) / 2)
+    if variable == "precipitation_sum":
+        return round(10 * noise * noise, 1)
+    if variable == "weather_code":
+        return (0, 1, 2, 3, 45, 61, 63, 80, 95)[int(noise * 9 + step) % 9]
+    return round(5 + 20 * noise + 3 * wave, 1)
+
+
+class FakeOpenMeteo:
+    """ASGI application imitating Open-Meteo's forecast endpoint."""
+
+    def __init__(self, config: FakeConfig | None = None):
+        self.config = config or FakeConfig()
+        self.stats = FakeStats()
+        self._rng = random.Random(self.config.seed)
+        self._latency = parse_latency(self.config.latency)
+        self._tokens = float(self.config.burst)
+        self._refilled = time.monotonic()
+        self.app = Starlette(
+            routes=[
+                Route("/v1/forecast", self.forecast),
+                Route("/stats", self.report),
+            ]
+        )
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.app(scope, receive, send)
+
+    def reset(self) -> None:
+        """Forget the requests served so far."""
+        self.stats = FakeStats()
+
+    def _take_token(self) -> bool:
+        rate = self.config.rate_limit
+        if rate is None:
+            return True
+        now = time.monotonic()
+        self._tokens = min(
+            self.config.burst, self._tokens + (now - self._refilled) * rate
+        )
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def report(self, request: Request) -> JSONResponse:
+        """Return the request statistics."""
+        return JSONResponse(self.stats.__dict__)
+
+    async def forecast(self, request: Request) -> JSONResponse:
+        """Answer a forecast request like Open-Meteo would."""
+        stats = self.stats
+        stats.requests += 1
+        if not self._take_token():
+            stats.rate_limited += 1
+            return JSONResponse(
+                {"error": True, "reason": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": "1"},
+            )
+
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            await asyncio.sleep(self._latency(self._rng))
+        finally:
+            stats.in_flight -= 1
+        if self._rng.random() < self.config.error_rate:
+            stats.errors += 1
+            return JSONResponse(
+                {"error": True, "reason": "Service unavailable"}, status_code=503
+            )
+
+        params = request.query_params
+        try:
+            latitudes = [float(v) for v in params["latitude"].split(",")]
+            longitudes = [float(v) for v in params["longitude"].split(",")]
+            if len(latitudes) != len(longitudes):
+                raise ValueError("latitude and longitude must have the same length")
+        except (KeyError, ValueError) as e:
+            return JSONResponse({"error": True, "reason": str(e)}, status_code=400)
+
+        results = []
+        for lat, lon in zip(latitudes, longitudes, strict=True):
+            key = f"{lat},{lon}"
+            stats.coordinates[key] = stats.coordinates.get(key, 0) + 1
+            results.append(self.location(lat, lon, params))
+        stats.locations += len(results)
+        # A single location is an object, several a list
+        return JSONResponse(results[0] if len(results) == 1 else results)
+
+    def location(self, lat: float, lon: float, params: Any) -> dict[str, Any]:
+        """Build the result for one location."""
+        unixtime = params.get("timeformat") == "unixtime"
+        offset = round(lon / 15) * 3600 if params.get("timezone") == "auto" else 0
+        now = datetime.now(UTC).replace(second=0, microsecond=0)
+        observed = now - timedelta(minutes=now.minute % 15)
+
+        def stamp(moment: datetime, fmt: str) -> str | int:
+            if unixtime:
+                return int(moment.timestamp())
+            return (moment + timedelta(seconds=offset)).strftime(fmt)
+
+        result: dict[str, Any] = {
+            "latitude": round(lat, 4),
+            "longitude": round(lon, 4),
+            "generationtime_ms": 0.1,
+            "utc_offset_seconds": offset,
+            "timezone": "GMT" if not offset else f"Etc/GMT{-offset // 3600:+d}",
+            "timezone_abbreviation": "GMT",
+            "elevation": round(500 * _noise(lat, lon, "elevation")),
+        }
+        if "current" in params:
+            variables = params["current"].split(",")
+            result["current_units"] = {
+                "time": "unixtime" if unixtime else "iso8601",
+                "interval": "seconds",
+                **{v: UNITS.get(v, "") for v in variables},
+            }
+            step = observed.hour
+            result["current"] = {
+                "time": stamp(observed, "%Y-%m-%dT%H:%M"),
+                "interval": INTERVAL,
+                **{v: _value(v, lat, lon, step) for v in variables},
+            }
+        if "hourly" in params:
+            hours = int(params.get("forecast_hours", 168))
+            start = now.replace(minute=0)
+            moments = [start + timedelta(hours=i) for i in range(hours)]
+            result.update(
+                self.series("hourly", params["hourly"], moments, stamp, lat, lon)
+            )
+        if "daily" in params:
+            days = int(params.get("forecast_days", 7))
+            start = now.replace(hour=0, minute=0)
+            moments = [start + timedelta(days=i) for i in range(days)]
+            result.update(
+                self.series("daily", params["daily"], moments, stamp, lat, lon)
+            )
+        return result
+
+    def series(
+        self,
+        resolution: str,
+        names: str,
+        moments: list[datetime],
+        stamp: Callable[[datetime, str], str | int],
+        lat: float,
+        lon: float,
+    ) -> dict[str, Any]:
+        """Build an hourly or daily block with its units."""
+        variables = names.split(",")
+        fmt = "%Y-%m-%dT%H:%M" if resolution == "hourly" else "%Y-%m-%d"
+        return {
+            f"{resolution}_units": {
+                "time": "iso8601",
+                **{v: UNITS.get(v, "") for v in variables},
+            },
+            resolution: {
+                "time": [stamp(moment, fmt) for moment in moments],
+                **{
+                    v: [_value(v, lat, lon, step) for step in range(len(moments))]
+                    for v in variables
+                },
+            },
+        }
+
+
+@contextlib.asynccontextmanager
+async def serve(app: FakeOpenMeteo, port: int = 0) -> AsyncIterator[str]:
+    """Serve the fake API on localhost for the block, yielding its base URL.
+
+    With the default port 0 a free port is chosen.
+    """
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if task.done():
+                task.result()
+                raise RuntimeError("Fake Open-Meteo server exited during startup")
+            await asyncio.sleep(0.01)
+        bound = server.servers[0].sockets[0].getsockname()[1]
+        yield f"http://127.0.0.1:{bound}/v1"
+    finally:
+        server.should_exit = True
+        await task
+
+
+def main() -> int:
+    """Run the fake API until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8081, help="Port to listen on")
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="fixed:MS, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA (default: fixed:0)",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction answered with 503"
+    )
+    parser.add_argument(
+        "--rate-limit", type=float, default=None, help="Requests per second"
+    )
+    parser.add_argument("--burst", type=int, default=10, help="Rate limit burst")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    app = FakeOpenMeteo(
+        FakeConfig(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            rate_limit=args.rate_limit,
+            burst=args.burst,
+            seed=args.seed,
+        )
+    )
+    print(f"Fake Open-Meteo at http://127.0.0.1:{args.port}/v1")
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,15 @@
 """Tool-specific form components for MCP tools."""
 
 import logging
-import re
 import time
+from typing import Any
 
 import streamlit as st
 
 from src.gui.models.gui_models import GUIInteraction
+from src.mcp_server.dice_notation import compile_notation
+from src.mcp_server.plugins import discover_tools, iter_fields
+from src.mcp_server.registry import ToolSpec
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +17,9 @@ logger = logging.getLogger(__name__)
 class ToolForms:
     """Manages tool-specific form interfaces."""
 
+    def __init__(self) -> None:
+        self.tool_specs = {spec.name: spec for spec in discover_tools()}
+
     def render(self) -> None:
         """Render tool selection and forms."""
         available_tools = st.session_state.gui_session.available_tools
@@ -27,89 +33,77 @@ class ToolForms:
             "Select Tool", options=available_tools, help="Choose a tool to invoke"
         )
 
-        # Tool-specific forms
-        if selected_tool == "roll_dice":
-            self._render_dice_form()
-        elif selected_tool == "get_weather":
-            self._render_weather_form()
-        elif selected_tool == "get_date":
-            self._render_date_form()
-
-    def _render_dice_form(self) -> None:
-        """Render dice rolling form."""
-        with st.form("dice_form"):
-            st.subheader("🎲 Roll Dice")
-
-            notation = st.text_input(
-                "Dice Notation",
-                value="2d6",
-                help="Enter dice notation (e.g., 2d6, 1d20, 3d10)",
-            )
-
-            # Help text with examples
-            st.caption("Examples: 1d20 (single 20-sided die), 3d6 (three 6-sided dice)")
-
-            submitted = st.form_submit_button("Roll Dice")
-
-            if submitted:
-                if self._validate_dice_notation(notation):
-                    self._execute_tool("roll_dice", {"notation": notation})
-                else:
-                    st.error("Invalid dice notation. Use format like '2d6' or '1d20'")
+        # Form generated from the tool's request schema
+        spec = self.tool_specs.get(selected_tool)
+        if spec is None:
+            st.warning(f"No form available for tool '{selected_tool}'")
+            return
+        self._render_tool_form(spec)
 
-    def _render_weather_form(self) -> None:
-        """Render weather lookup form."""
-        with st.form("weather_form"):
-            st.subheader("🌤️ Get Weather")
+    def _render_tool_form(self, spec: ToolSpec) -> None:
+        """Render a form with one input per field of the tool's schema."""
+        with st.form(f"{spec.name}_form"):
+            st.subheader(spec.name)
+            st.caption(spec.description)
 
-            location = st.text_input(
-                "Location",
-                value="San Francisco",
-                help="Enter city name or coordinates (lat,lon)",
-            )
+            arguments: dict[str, Any] = {}
+            for name, schema, required in iter_fields(spec):
+                value = self._render_field(name, schema, required)
+                if value is not None:
+                    arguments[name] = value
 
-            # Common location examples
-            st.caption("Examples: London, New York, 37.7749,-122.4194")
-
-            submitted = st.form_submit_button("Get Weather")
+            submitted = st.form_submit_button(f"Run {spec.name}")
 
             if submitted:
-                if location.strip():
-                    self._execute_tool("get_weather", {"location": location})
+                error = self._validate_arguments(spec, arguments)
+                if error:
+                    st.error(error)
                 else:
-                    st.error("Please enter a location")
-
-    def _render_date_form(self) -> None:
-        """Render date/time lookup form."""
-        with st.form("date_form"):
-            st.subheader("🕐 Get Date & Time")
-
-            timezone = st.selectbox(
-                "Timezone",
-                options=[
-                    "UTC",
-                    "America/New_York",
-                    "America/Los_Angeles",
-                    "Europe/London",
-                    "Asia/Tokyo",
-                    "Australia/Sydney",
-                ],
-                help="Select timezone or enter custom IANA timezone",
-            )
-
-            custom_timezone = st.text_input(
-                "Custom Timezone (optional)",
-                placeholder="e.g., America/Chicago",
-                help="Enter custom IANA timezone identifier",
+                    self._execute_tool(spec.name, arguments)
+
+    def _render_field(self, name: str, schema: dict[str, Any], required: bool) -> Any:
+        """Render the input widget for one schema field."""
+        label = schema.get("title", name) + ("" if required else " (optional)")
+        help_text = schema.get("description")
+        default = schema.get("default")
+        json_type = schema.get("type")
+
+        if "anyOf" in schema:
+            # Optional values like a dice seed are left out of the call if empty
+            text = st.text_input(label, help=help_text).strip()
+            if not text:
+                return None
+            integer = any(s.get("type") == "integer" for s in schema["anyOf"])
+            return int(text) if integer and text.isdigit() else text
+        if json_type == "boolean":
+            return st.checkbox(label, value=bool(default), help=help_text)
+        if json_type == "integer":
+            return int(
+                st.number_input(label, value=default or 0, step=1, help=help_text)
             )
-
-            submitted = st.form_submit_button("Get Date & Time")
-
-            if submitted:
-                tz = custom_timezone.strip() if custom_timezone.strip() else timezone
-                self._execute_tool("get_date", {"timezone": tz})
-
-    def _execute_tool(self, tool_name: str, arguments: dict[str, str]) -> None:
+        if json_type == "number":
+            return st.number_input(label, value=float(default or 0), help=help_text)
+        if json_type == "array":
+            text = st.text_area(label, help=f"{help_text} (one per line)")
+            return [line.strip() for line in text.splitlines() if line.strip()]
+        return st.text_input(label, value=default or "", help=help_text)
+
+    def _validate_arguments(
+        self, spec: ToolSpec, arguments: dict[str, Any]
+    ) -> str | None:
+        """Validate form input before sending it, returning an error message."""
+        for name, _, required in iter_fields(spec):
+            value = arguments.get(name)
+            if required and (value is None or value == "" or value == []):
+                return f"Please enter {name}"
+
+        if spec.name == "roll_dice" and not self._validate_dice_notation(
+            arguments["notation"]
+        ):
+            return "Invalid dice notation. Use format like '2d6', '4d6kh3' or '1d20+5'"
+        return None
+
+    def _execute_tool(self, tool_name: str, arguments: dict[str, Any]) -> None:
         """Execute tool and update GUI state."""
         if "mcp_connection_manager" not in st.session_state:
             st.error("Not connected to server")
@@ -158,6 +152,9 @@ class ToolForms:
             st.error(f"Execution error: {str(e)}")
 
     def _validate_dice_notation(self, notation: str) -> bool:
-        """Validate dice notation format."""
-        pattern = r"^(\d+)d(\d+)$"
-        return bool(re.match(pattern, notation.strip().lower()))
+        """Validate dice notation with the server's expression grammar."""
+        try:
+            compile_notation(notation)
+        except ValueError:
+            return False
+        return True
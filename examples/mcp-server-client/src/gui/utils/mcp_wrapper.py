@@ -11,6 +11,9 @@ from src.mcp_client.client import MCPClient
 
 logger = logging.getLogger(__name__)
 
+# Deadline sent with each tool call; the server cancels the work after it
+TOOL_CALL_TIMEOUT = 30.0
+
 
 class MCPConnectionManager:
     """Manages a persistent MCP connection in a background thread."""
@@ -78,7 +81,8 @@ class MCPConnectionManager:
 
         # Wait for response (with timeout)
         start_time = time.time()
-        while time.time() - start_time < 30:  # 30 second timeout
+        # Allow for the server's deadline error to arrive after the deadline
+        while time.time() - start_time < TOOL_CALL_TIMEOUT + 5:
             try:
                 response = self._response_queue.get(timeout=1)
                 if response.get("id") == request_id:
@@ -202,7 +206,7 @@ class MCPConnectionManager:
         """Handle tool invocation request."""
         try:
             result = await self._client.invoke_tool(
-                request["tool_name"], request["arguments"]
+                request["tool_name"], request["arguments"], timeout=TOOL_CALL_TIMEOUT
             )
 
             self._response_queue.put(
@@ -5,8 +5,10 @@ import logging
 import sys
 from asyncio import run
 
-from src.mcp_client.cli import MCPClientCLI
+from src.mcp_client.cli import MCPClientCLI, add_tool_subcommands
 from src.mcp_server import run_server
+from src.mcp_server.plugins import discover_tools
+from src.mcp_server.structured_logging import configure_logging
 
 
 def setup_logging(level: str = "INFO") -> None:
@@ -20,32 +22,7 @@ def setup_logging(level: str = "INFO") -> None:
 
 async def run_client_async(args) -> int:
     """Run the MCP client in async mode."""
-    # Create client CLI and run it
-    cli = MCPClientCLI()
-
-    # Build client arguments from parsed args
-    client_args = [
-        "--server",
-        args.server,
-        "--log-level",
-        args.log_level,
-        "--timeout",
-        str(args.timeout),
-    ]
-
-    if args.tool:
-        client_args.append(args.tool)
-
-        # Add tool-specific arguments
-        if args.tool == "roll_dice":
-            client_args.extend(["--notation", args.notation])
-        elif args.tool == "get_weather":
-            client_args.extend(["--location", args.location])
-        elif args.tool == "get_date":
-            client_args.extend(["--timezone", args.timezone])
-
-    # Run the client
-    return await cli.run(client_args)
+    return await MCPClientCLI().run_parsed(args)
 
 
 def main() -> None:
@@ -57,11 +34,14 @@ def main() -> None:
 Examples:
   # Run MCP server
   %(prog)s server
+  %(prog)s server --transport http --host 0.0.0.0 --port 8000
+  %(prog)s server --transport http --workers 4
   
   # Run MCP client
   %(prog)s client --server ./server.py roll_dice --notation 2d6
   %(prog)s client --server ./server.py get_weather --location "San Francisco"
   %(prog)s client --server ./server.py get_date --timezone UTC
+  %(prog)s client --server http://localhost:8000/mcp get_date
   
   # Launch Streamlit GUI
   %(prog)s gui
@@ -82,6 +62,41 @@ Examples:
         default="INFO",
         help="Set the logging level",
     )
+    server_parser.add_argument(
+        "--log-format",
+        choices=["json", "text"],
+        default=None,
+        help="Log record format (default: $MCP_LOG_FORMAT or json)",
+    )
+    server_parser.add_argument(
+        "--transport",
+        choices=["stdio", "http", "sse"],
+        default="stdio",
+        help="Transport to serve (default: stdio; http serves many sessions)",
+    )
+    server_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface to bind for http/sse transports (default: 127.0.0.1)",
+    )
+    server_parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port to bind for http/sse transports (default: 8000)",
+    )
+    server_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Pre-forked worker processes sharing the port (http only, default: 1)",
+    )
+    server_parser.add_argument(
+        "--grace-period",
+        type=float,
+        default=25.0,
+        help="Seconds in-flight calls get to finish on SIGTERM/SIGINT (default: 25)",
+    )
     server_parser.add_argument(
         "--version",
         action="version",
@@ -106,7 +121,9 @@ Examples:
         help="Port for Streamlit server (default: 8501)",
     )
     client_parser.add_argument(
-        "--server", required=True, help="Path to MCP server script"
+        "--server",
+        required=True,
+        help="Path to MCP server script or URL of an HTTP server",
     )
     client_parser.add_argument(
         "--log-level",
@@ -120,35 +137,21 @@ Examples:
         default=30,
         help="Connection timeout in seconds (default: 30)",
     )
+    client_parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Deadline for the tool call in seconds; the server cancels "
+        "the call once it passes (default: none)",
+    )
 
     # Tool subcommands for client
     tool_subparsers = client_parser.add_subparsers(
         dest="tool", help="Available tools", metavar="TOOL"
     )
 
-    # Roll dice tool
-    dice_parser = tool_subparsers.add_parser(
-        "roll_dice", help="Roll dice using standard notation"
-    )
-    dice_parser.add_argument(
-        "--notation", required=True, help="Dice notation (e.g., 2d6, 1d20, 3d10)"
-    )
-
-    # Weather tool
-    weather_parser = tool_subparsers.add_parser(
-        "get_weather", help="Get current weather conditions"
-    )
-    weather_parser.add_argument(
-        "--location", required=True, help="Location name or coordinates (lat,lon)"
-    )
-
-    # Date/time tool
-    date_parser = tool_subparsers.add_parser(
-        "get_date", help="Get current date and time"
-    )
-    date_parser.add_argument(
-        "--timezone", default="UTC", help="Timezone identifier (default: UTC)"
-    )
+    # One subcommand per discovered tool plugin
+    add_tool_subcommands(tool_subparsers, discover_tools())
 
     args = parser.parse_args()
 
@@ -159,7 +162,11 @@ Examples:
 
     # Setup logging
     log_level = getattr(args, "log_level", "INFO")
-    setup_logging(log_level)
+    if args.mode == "server":
+        # Queue-backed so tool calls never block on log writes
+        configure_logging(log_level, fmt=args.log_format)
+    else:
+        setup_logging(log_level)
 
     logger = logging.getLogger(__name__)
 
@@ -167,7 +174,13 @@ Examples:
         if args.mode == "server":
             logger.info("Starting MCP Server application")
             # Run the MCP server (this will block until server shuts down)
-            run_server()
+            run_server(
+                transport=args.transport,
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                grace_period=args.grace_period,
+            )
         elif args.mode == "client":
             logger.info("Starting MCP Client application")
             # Run client in async mode
@@ -204,7 +217,7 @@ Examples:
         logger.info("Application interrupted by user")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Application error: {e}")
+        logger.error("Application error: %s", e)
         sys.exit(1)
 
 
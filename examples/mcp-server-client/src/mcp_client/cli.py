@@ -5,20 +5,99 @@ import asyncio
 import json
 import logging
 import sys
+from collections.abc import Iterable
 from typing import Any
 
+from src.mcp_server.plugins import discover_tools, iter_fields
+from src.mcp_server.registry import ToolSpec
+
 from .client import MCPClient
 from .models.responses import ClientToolResult
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# JSON schema types mapped to argparse value converters
+_ARGUMENT_TYPES = {"integer": int, "number": float}
+
+
+def _argument_options(schema: dict[str, Any], required: bool) -> dict[str, Any]:
+    """Build add_argument() options for a tool field's JSON schema."""
+    if "anyOf" in schema:
+        schema = {
+            **next(s for s in schema["anyOf"] if s.get("type") != "null"),
+            **{k: v for k, v in schema.items() if k != "anyOf"},
+        }
+
+    # argparse formats help strings with %, so escape literal percent signs
+    help_text = schema.get("description", "").replace("%", "%%")
+    options: dict[str, Any] = {}
+    json_type = schema.get("type")
+    if json_type == "array":
+        options["nargs"] = "+"
+        json_type = schema.get("items", {}).get("type")
+    if json_type == "boolean":
+        options["action"] = argparse.BooleanOptionalAction
+    elif json_type in _ARGUMENT_TYPES:
+        options["type"] = _ARGUMENT_TYPES[json_type]
+
+    if required:
+        options["required"] = True
+    elif json_type == "boolean":
+        # Unset flags are left out of the call, so the tool's default applies
+        options["default"] = None
+    else:
+        options["default"] = schema.get("default")
+        if options["default"] is not None:
+            help_text += f" (default: {options['default']})"
+
+    options["help"] = help_text
+    return options
+
+
+def add_tool_subcommands(subparsers: Any, specs: Iterable[ToolSpec]) -> None:
+    """Add a subcommand per tool with options generated from its schema.
+
+    Args:
+        subparsers: Subparsers action to add the tool subcommands to
+        specs: Discovered tool specs
+    """
+    for spec in specs:
+        tool_parser = subparsers.add_parser(
+            spec.name, help=spec.description.replace("%", "%%")
+        )
+        for name, schema, required in iter_fields(spec):
+            tool_parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                dest=name,
+                **_argument_options(schema, required),
+            )
+
+
+def build_tool_arguments(args: argparse.Namespace, spec: ToolSpec) -> dict[str, Any]:
+    """Collect a tool's arguments from parsed CLI arguments.
+
+    Args:
+        args: Parsed command line arguments
+        spec: Spec of the selected tool
+
+    Returns:
+        Dictionary of tool arguments, omitting unset optional fields
+    """
+    arguments = {}
+    for name, _, _ in iter_fields(spec):
+        value = getattr(args, name, None)
+        if value is not None:
+            arguments[name] = value
+    return arguments
+
 
 class MCPClientCLI:
     """CLI interface for MCP client tool invocation."""
 
     def __init__(self) -> None:
         """Initialize CLI interface."""
+        self.tool_specs = {spec.name: spec for spec in discover_tools()}
         self.parser = self._create_parser()
         self.client: MCPClient | None = None
 
@@ -35,11 +114,16 @@ class MCPClientCLI:
   %(prog)s --server ./server.py roll_dice --notation 2d6
   %(prog)s --server ./server.py get_weather --location "San Francisco"
   %(prog)s --server ./server.py get_date --timezone UTC
+  %(prog)s --server http://localhost:8000/mcp get_date
 """,
         )
 
         # Global arguments
-        parser.add_argument("--server", required=True, help="Path to MCP server script")
+        parser.add_argument(
+            "--server",
+            required=True,
+            help="Path to MCP server script or URL of an HTTP server",
+        )
 
         parser.add_argument(
             "--log-level",
@@ -55,34 +139,21 @@ class MCPClientCLI:
             help="Connection timeout in seconds (default: 30)",
         )
 
+        parser.add_argument(
+            "--deadline",
+            type=float,
+            default=None,
+            help="Deadline for the tool call in seconds; the server cancels "
+            "the call once it passes (default: none)",
+        )
+
         # Subcommands for tools
         subparsers = parser.add_subparsers(
             dest="tool", help="Available tools", metavar="TOOL"
         )
 
-        # Roll dice tool
-        dice_parser = subparsers.add_parser(
-            "roll_dice", help="Roll dice using standard notation"
-        )
-        dice_parser.add_argument(
-            "--notation", required=True, help="Dice notation (e.g., 2d6, 1d20, 3d10)"
-        )
-
-        # Weather tool
-        weather_parser = subparsers.add_parser(
-            "get_weather", help="Get current weather conditions"
-        )
-        weather_parser.add_argument(
-            "--location", required=True, help="Location name or coordinates (lat,lon)"
-        )
-
-        # Date/time tool
-        date_parser = subparsers.add_parser(
-            "get_date", help="Get current date and time"
-        )
-        date_parser.add_argument(
-            "--timezone", default="UTC", help="Timezone identifier (default: UTC)"
-        )
+        # One subcommand per discovered tool
+        add_tool_subcommands(subparsers, self.tool_specs.values())
 
         return parser
 
@@ -107,14 +178,10 @@ class MCPClientCLI:
         Returns:
             Dictionary of tool arguments
         """
-        if args.tool == "roll_dice":
-            return {"notation": args.notation}
-        elif args.tool == "get_weather":
-            return {"location": args.location}
-        elif args.tool == "get_date":
-            return {"timezone": args.timezone}
-        else:
+        spec = self.tool_specs.get(args.tool)
+        if spec is None:
             return {}
+        return build_tool_arguments(args, spec)
 
     def _display_success(self, result: ClientToolResult) -> None:
         """Display successful tool result.
@@ -139,6 +206,19 @@ class MCPClientCLI:
         else:
             print(json.dumps(result.result, indent=2))
 
+    async def _display_progress(
+        self, progress: float, total: float | None, message: str | None
+    ) -> None:
+        """Display a progress notification's partial result.
+
+        Args:
+            progress: Work done so far
+            total: Total amount of work, if known
+            message: Partial result sent with the notification
+        """
+        if message:
+            print(message, flush=True)
+
     def _display_error(self, result: ClientToolResult) -> None:
         """Display tool execution error.
 
@@ -175,10 +255,19 @@ class MCPClientCLI:
         Returns:
             Exit code (0 for success, 1 for error)
         """
-        try:
-            # Parse arguments
-            parsed_args = self.parser.parse_args(args)
+        return await self.run_parsed(self.parser.parse_args(args))
 
+    async def run_parsed(self, parsed_args: argparse.Namespace) -> int:
+        """Run CLI with already parsed arguments.
+
+        Args:
+            parsed_args: Arguments parsed by this CLI's parser or an equivalent
+                parser built with add_tool_subcommands()
+
+        Returns:
+            Exit code (0 for success, 1 for error)
+        """
+        try:
             # Setup logging
             self._setup_logging(parsed_args.log_level)
 
@@ -187,8 +276,9 @@ class MCPClientCLI:
                 self.parser.print_help()
                 return 1
 
-            # Create client
+            # Create client, printing streamed partial results as they arrive
             self.client = MCPClient(parsed_args.server)
+            self.client.progress_handler = self._display_progress
 
             # Connect to server with timeout
             try:
@@ -205,8 +295,13 @@ class MCPClientCLI:
             # Build tool arguments
             tool_args = self._build_tool_arguments(parsed_args)
 
-            # Invoke tool
-            result = await self.client.invoke_tool(parsed_args.tool, tool_args)
+            # Invoke tool, propagating the deadline to the server if given
+            if parsed_args.deadline is None:
+                result = await self.client.invoke_tool(parsed_args.tool, tool_args)
+            else:
+                result = await self.client.invoke_tool(
+                    parsed_args.tool, tool_args, timeout=parsed_args.deadline
+                )
 
             # Display result
             if result.success:
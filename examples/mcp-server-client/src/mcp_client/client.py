@@ -3,6 +3,8 @@
 import logging
 from typing import Any
 
+from mcp.shared.session import ProgressFnT
+
 from .models.responses import ClientToolResult
 from .transport import MCPTransport
 
@@ -22,6 +24,8 @@ class MCPClient:
         self.server_path = server_path
         self.transport = MCPTransport(server_path)
         self._connected = False
+        # Receives progress notifications of every tool call, if set
+        self.progress_handler: ProgressFnT | None = None
 
     @property
     def connected(self) -> bool:
@@ -60,13 +64,17 @@ class MCPClient:
         self._connected = False
 
     async def invoke_tool(
-        self, tool_name: str, arguments: dict[str, Any]
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        timeout: float | None = None,
     ) -> ClientToolResult:
         """Invoke a tool on the connected server.
 
         Args:
             tool_name: Name of the tool to invoke
             arguments: Arguments to pass to the tool
+            timeout: Deadline for the call in seconds, propagated to the server
 
         Returns:
             ClientToolResult with success status and result or error
@@ -102,7 +110,12 @@ class MCPClient:
 
         try:
             # Call the tool through transport
-            result = await self.transport.call_tool(tool_name, arguments)
+            options: dict[str, Any] = {}
+            if timeout is not None:
+                options["timeout"] = timeout
+            if self.progress_handler is not None:
+                options["progress_callback"] = self.progress_handler
+            result = await self.transport.call_tool(tool_name, arguments, **options)
 
             # Process the result
             logger.info(f"Tool '{tool_name}' executed successfully")
@@ -2,20 +2,24 @@
 
 import os
 from contextlib import AsyncExitStack
+from datetime import timedelta
 from typing import Any
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.session import ProgressFnT
 
 
 class MCPTransport:
-    """Handles MCP server connections via stdio transport."""
+    """Handles MCP server connections via stdio or streamable HTTP transport."""
 
     def __init__(self, server_path: str):
         """Initialize transport with server path.
 
         Args:
-            server_path: Path to the MCP server script
+            server_path: Path to the MCP server script, or the URL of a server
+                running the streamable HTTP transport (e.g. http://host:8000/mcp)
         """
         self.server_path = server_path
         self.session: ClientSession | None = None
@@ -23,14 +27,23 @@ class MCPTransport:
         self.connected = False
         self.available_tools: list[str] = []
 
+    @property
+    def is_http(self) -> bool:
+        """Check if the server is addressed by an HTTP(S) URL."""
+        return self.server_path.startswith(("http://", "https://"))
+
     async def connect(self) -> None:
-        """Connect to MCP server via stdio transport.
+        """Connect to MCP server via stdio or streamable HTTP transport.
 
         Raises:
             FileNotFoundError: If server script doesn't exist
             ConnectionError: If connection fails
             ValueError: If server script type is not supported
         """
+        if self.is_http:
+            await self._connect_http()
+            return
+
         # Validate server script exists
         if not os.path.exists(self.server_path):
             raise FileNotFoundError(f"Server script not found: {self.server_path}")
@@ -58,27 +71,52 @@ class MCPTransport:
                 stdio_client(server_params)
             )
 
-            # Create session
-            self.session = await self.exit_stack.enter_async_context(
-                ClientSession(read, write)
-            )
+            await self._start_session(self.exit_stack, read, write)
 
-            # Initialize connection
-            await self.session.initialize()
+        except Exception as e:
+            # Clean up on connection failure
+            if self.exit_stack:
+                await self.exit_stack.aclose()
+                self.exit_stack = None
+            raise ConnectionError(f"Failed to connect to server: {e}")
 
-            # Discover available tools
-            tools_response = await self.session.list_tools()
-            self.available_tools = [tool.name for tool in tools_response.tools]
+    async def _connect_http(self) -> None:
+        """Connect to a running MCP server via streamable HTTP transport.
 
-            self.connected = True
+        Raises:
+            ConnectionError: If connection fails
+        """
+        try:
+            self.exit_stack = AsyncExitStack()
+
+            read, write, _ = await self.exit_stack.enter_async_context(
+                streamablehttp_client(self.server_path)
+            )
+
+            await self._start_session(self.exit_stack, read, write)
 
         except Exception as e:
-            # Clean up on connection failure
             if self.exit_stack:
                 await self.exit_stack.aclose()
                 self.exit_stack = None
             raise ConnectionError(f"Failed to connect to server: {e}")
 
+    async def _start_session(
+        self, exit_stack: AsyncExitStack, read: Any, write: Any
+    ) -> None:
+        """Create and initialize a client session over the given streams."""
+        # Create session
+        self.session = await exit_stack.enter_async_context(ClientSession(read, write))
+
+        # Initialize connection
+        await self.session.initialize()
+
+        # Discover available tools
+        tools_response = await self.session.list_tools()
+        self.available_tools = [tool.name for tool in tools_response.tools]
+
+        self.connected = True
+
     async def disconnect(self) -> None:
         """Disconnect from MCP server."""
         if self.exit_stack:
@@ -89,12 +127,22 @@ class MCPTransport:
         self.connected = False
         self.available_tools = []
 
-    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        timeout: float | None = None,
+        progress_callback: ProgressFnT | None = None,
+    ) -> Any:
         """Call a tool on the connected server.
 
         Args:
             tool_name: Name of the tool to call
             arguments: Arguments to pass to the tool
+            timeout: Seconds the call may take. The budget is sent to the
+                server, which cancels the tool's work once it is used up.
+            progress_callback: Receives the call's progress notifications,
+                e.g. chunks of a streamed forecast
 
         Returns:
             Tool response content
@@ -112,9 +160,36 @@ class MCPTransport:
                 f"Available tools: {self.available_tools}"
             )
 
-        # Call the tool
-        result = await self.session.call_tool(tool_name, arguments)
-        return result
+        if timeout is None and progress_callback is None:
+            # Call the tool
+            result = await self.session.call_tool(tool_name, arguments)
+            return result
+
+        # Call the tool with its time budget in the request metadata; the
+        # session adds a progress token when given a callback
+        meta = None
+        read_timeout = None
+        if timeout is not None:
+            # timeoutMs is an extra field, which Meta accepts but does not declare
+            meta = types.RequestParams.Meta.model_validate(
+                {"timeoutMs": int(timeout * 1000)}
+            )
+            read_timeout = timedelta(seconds=timeout)
+        return await self.session.send_request(
+            types.ClientRequest(
+                types.CallToolRequest(
+                    method="tools/call",
+                    params=types.CallToolRequestParams(
+                        name=tool_name,
+                        arguments=arguments,
+                        _meta=meta,
+                    ),
+                )
+            ),
+            types.CallToolResult,
+            request_read_timeout_seconds=read_timeout,
+            progress_callback=progress_callback,
+        )
 
     async def health_check(self) -> bool:
         """Check if connection is healthy.
@@ -1,5 +1,14 @@
 """MCP server package."""
 
-from .server import mcp, run_server
+from typing import Any
 
 __all__ = ["mcp", "run_server"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the server module only when its objects are requested."""
+    if name in __all__:
+        from . import server
+
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
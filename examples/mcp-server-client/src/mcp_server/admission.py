@@ -0,0 +1,165 @@
+"""Per-tool admission control for MCP server tools.
+
+Tools opt in by declaring an ``AdmissionPolicy``; ``BaseTool.safe_execute``
+then runs ``execute`` inside the tool's ``AdmissionController``. Calls beyond
+``max_concurrency`` wait in a bounded FIFO queue. When the queue is full, or a
+call waits longer than ``queue_timeout``, the call is rejected immediately so
+an overloaded server sheds load instead of slowing every caller down.
+
+Policies can be overridden per tool with ``MCP_TOOL_LIMITS``, e.g.
+``get_weather=16:64:2.5`` (max concurrency, max queue depth, queue timeout).
+Malformed entries are logged and ignored, leaving the tool's default policy.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    """Declarative concurrency limits for a tool.
+
+    Attributes:
+        max_concurrency: Calls allowed to execute at the same time
+        max_queue: Calls allowed to wait for a slot; 0 rejects immediately
+        queue_timeout: Seconds a call may wait for a slot before rejection
+    """
+
+    max_concurrency: int = 32
+    max_queue: int = 128
+    queue_timeout: float = 5.0
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call is shed instead of admitted."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def parse_limits(value: str) -> dict[str, AdmissionPolicy]:
+    """Parse "tool=concurrency:queue:timeout,..." into policies.
+
+    Malformed entries are logged and skipped, so their tools keep their
+    default policies.
+    """
+    policies = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        tool, _, limits = entry.partition("=")
+        try:
+            concurrency, queue, timeout = limits.split(":")
+            policy = AdmissionPolicy(
+                max_concurrency=int(concurrency),
+                max_queue=int(queue),
+                queue_timeout=float(timeout),
+            )
+        except ValueError:
+            policy = None
+        if not tool.strip() or policy is None or policy.max_concurrency < 1:
+            logger.warning(
+                "Ignoring MCP_TOOL_LIMITS entry %r; expected "
+                "tool=concurrency:queue:timeout with concurrency >= 1",
+                entry,
+            )
+            continue
+        policies[tool.strip()] = policy
+    return policies
+
+
+def policy_for(name: str, default: AdmissionPolicy | None) -> AdmissionPolicy | None:
+    """Return the MCP_TOOL_LIMITS override for a tool, or its default."""
+    return parse_limits(os.environ.get("MCP_TOOL_LIMITS", "")).get(name, default)
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded, timed FIFO wait queue.
+
+    Slots are handed directly to the oldest waiter on release, so waiters
+    are served in arrival order and a new caller cannot jump the queue.
+    """
+
+    def __init__(self, policy: AdmissionPolicy):
+        if policy.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.policy = policy
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls currently waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Wait for an execution slot.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait timed out
+        """
+        if self.active < self.policy.max_concurrency and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.policy.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(
+                f"queue full ({self.policy.max_queue} calls waiting)"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self.policy.queue_timeout):
+                await waiter
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the timeout fired
+                self.admitted += 1
+                return
+            self._discard(waiter)
+            self.timeouts += 1
+            raise AdmissionRejected(
+                f"waited more than {self.policy.queue_timeout}s for a slot"
+            ) from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Hand the slot to the oldest waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Slot ownership moves to the waiter; active stays unchanged
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict[str, int]:
+        """Return admission statistics."""
+        return {
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+    def _discard(self, waiter: asyncio.Future[None]) -> None:
+        with contextlib.suppress(ValueError):
+            self._waiters.remove(waiter)
@@ -0,0 +1,177 @@
+"""TTL/LRU result cache used by MCP server tools.
+
+Tools opt in by declaring a ``CachePolicy``; ``BaseTool.safe_execute`` then
+consults the tool's ``ResultCache`` before calling ``execute``. Tools may also
+own caches for upstream data, using ``lookup`` to keep serving expired
+entries while they refresh them in the background (stale-while-revalidate).
+"""
+
+import math
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Declarative cache policy for a tool.
+
+    Attributes:
+        ttl: Seconds an entry stays fresh, or None to never expire
+        max_entries: Maximum number of entries before LRU eviction
+        max_bytes: Approximate memory cap before LRU eviction, or None
+        max_stale: Seconds past expiry an entry may still be served by
+            ``ResultCache.lookup`` while it is refreshed
+    """
+
+    ttl: float | None = 300.0
+    max_entries: int = 1024
+    max_bytes: int | None = 1_000_000
+    max_stale: float = 0.0
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a (nested) value in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, list | tuple | set | frozenset):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class ResultCache:
+    """Bounded LRU cache with per-entry TTL and hit/miss/eviction stats.
+
+    ``None`` is used to signal a miss, so ``None`` values are never stored.
+    """
+
+    def __init__(self, policy: CachePolicy):
+        self.policy = policy
+        # key -> (value, expires_at, size)
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None, int]] = (
+            OrderedDict()
+        )
+        self.size_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for ``key`` or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def lookup(self, key: Hashable) -> tuple[Any, bool] | None:
+        """Return ``(value, fresh)`` for ``key``, or None on a miss.
+
+        Unlike ``get``, entries up to ``policy.max_stale`` seconds past their
+        expiry are returned with ``fresh`` set to False, so the caller can
+        serve them while refreshing.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        now = time.monotonic()
+        fresh = expires_at is None or expires_at > now
+        if expires_at is not None and not fresh:
+            if now - expires_at > self.policy.max_stale:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.stale_hits += 1
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value, fresh
+
+    def expires_in(self, key: Hashable) -> float | None:
+        """Return seconds until ``key`` expires, negative once stale.
+
+        Returns ``math.inf`` for entries without a TTL and None if ``key`` is
+        not cached. Unlike lookups, this does not count as a hit or miss and
+        leaves the LRU order alone.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at = entry[1]
+        return math.inf if expires_at is None else expires_at - time.monotonic()
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``, evicting LRU entries if needed.
+
+        Args:
+            key: Cache key
+            value: Value to cache; None is ignored
+            ttl: Seconds the entry stays fresh, overriding ``policy.ttl``
+        """
+        if value is None:
+            return
+
+        size = estimate_size(value)
+        if self.policy.max_bytes is not None and size > self.policy.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        if ttl is None:
+            ttl = self.policy.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at, size)
+        self.size_bytes += size
+
+        while len(self._entries) > self.policy.max_entries or (
+            self.policy.max_bytes is not None
+            and self.size_bytes > self.policy.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries, keeping the statistics."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
@@ -0,0 +1,91 @@
+"""Per-call deadlines propagated from the client into tool execution.
+
+Clients send their remaining time budget with each ``tools/call`` request as
+``_meta.timeoutMs``. A relative budget is used instead of a wall clock time
+so clock skew between client and server cannot shorten or extend it. The
+server converts it into a monotonic deadline stored in a context variable,
+which follows the call into ``BaseTool.execute`` and any task it awaits.
+``BaseTool.safe_execute`` cancels the call when the deadline passes, and
+outbound HTTP requests are given only the time that is left.
+"""
+
+import contextlib
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any
+
+# Request ``_meta`` key carrying the client's remaining budget in milliseconds
+META_KEY = "timeoutMs"
+
+_deadline: ContextVar[float | None] = ContextVar("mcp_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when no time is left for the current call."""
+
+
+def current() -> float | None:
+    """Return the current deadline as a ``time.monotonic()`` value, if any."""
+    return _deadline.get()
+
+
+def remaining() -> float | None:
+    """Return the seconds left before the deadline, or None without one."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def timeout_for(default: float) -> float:
+    """Return ``default`` capped to the time left before the deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded before the operation started")
+    return min(default, left)
+
+
+@contextlib.contextmanager
+def scope(timeout: float | None) -> Iterator[float | None]:
+    """Run the block with a deadline ``timeout`` seconds from now.
+
+    A deadline set by an enclosing scope is only ever shortened.
+    """
+    deadline = current()
+    if timeout is not None:
+        candidate = time.monotonic() + timeout
+        deadline = candidate if deadline is None else min(deadline, candidate)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+@contextlib.contextmanager
+def cleared() -> Iterator[None]:
+    """Run the block without a deadline, e.g. to start work shared by calls."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def timeout_from_meta(meta: Any) -> float | None:
+    """Read the client's time budget in seconds from request metadata."""
+    extra = getattr(meta, "model_extra", None) or {}
+    value = extra.get(META_KEY)
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0) / 1000
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,109 @@
+"""Decoding of upstream JSON responses.
+
+``make_request`` decodes response bodies with a ``JsonDecoder``. It uses
+orjson when it is installed (``pip install orjson``), which parses straight
+from bytes several times faster than the standard library, and ``json``
+otherwise. Set ``MCP_JSON_BACKEND`` to ``json`` or ``orjson`` to choose.
+
+Tools pass the fields they read as a ``Fields`` selection, built from dotted
+paths with ``compile_fields``. Everything else is dropped right after
+parsing, so unused parts of large payloads are not kept in result caches or
+written to the disk cache. ``python -m benchmarks.bench_decoding`` compares
+the cost per response of each backend with and without a selection.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable
+from importlib.util import find_spec
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("orjson", "json")
+
+# Keys to keep, mapped to the selection within them, or None for everything
+Fields = dict[str, "Fields | None"]
+
+
+def compile_fields(paths: Iterable[str]) -> Fields:
+    """Build a selection from dotted paths such as ``"current.time"``.
+
+    A path ending at an object keeps the whole object.
+    """
+    fields: Fields = {}
+    for path in paths:
+        *parents, leaf = path.split(".")
+        node = fields
+        for key in parents:
+            child = node.setdefault(key, {})
+            if child is None:
+                # An enclosing object is already kept whole
+                break
+            node = child
+        else:
+            node[leaf] = None
+    return fields
+
+
+def select(value: Any, fields: Fields) -> Any:
+    """Keep only the selected fields of a decoded value.
+
+    Lists are selected item by item, so a selection for one Open-Meteo
+    location also applies to multi-location responses. Missing fields are
+    left out rather than raising.
+    """
+    if isinstance(value, list):
+        return [select(item, fields) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {
+        key: value[key] if nested is None else select(value[key], nested)
+        for key, nested in fields.items()
+        if key in value
+    }
+
+
+def available_backend(name: str | None = None) -> str:
+    """Resolve a backend name, falling back to ``json`` if it is unavailable.
+
+    Args:
+        name: "orjson", "json", or None for ``MCP_JSON_BACKEND`` and otherwise
+            the fastest installed backend
+    """
+    name = name or os.environ.get("MCP_JSON_BACKEND") or "auto"
+    if name == "auto":
+        return "orjson" if find_spec("orjson") is not None else "json"
+    if name not in BACKENDS:
+        logger.warning("Unknown JSON backend %r; using json", name)
+        return "json"
+    if name == "orjson" and find_spec("orjson") is None:
+        logger.warning("orjson is not installed; using json")
+        return "json"
+    return name
+
+
+def _loads(backend: str) -> Callable[[bytes], Any]:
+    if backend == "orjson":
+        import orjson
+
+        return orjson.loads
+    return json.loads
+
+
+class JsonDecoder:
+    """Decodes JSON bodies with one backend, optionally selecting fields."""
+
+    def __init__(self, backend: str | None = None):
+        self.backend = available_backend(backend)
+        self._loads = _loads(self.backend)
+
+    def decode(self, content: bytes, fields: Fields | None = None) -> Any:
+        """Decode a body, keeping only ``fields`` if given.
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        data = self._loads(content)
+        return data if fields is None else select(data, fields)
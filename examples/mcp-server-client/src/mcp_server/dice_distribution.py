@@ -0,0 +1,363 @@
+"""Exact outcome distributions of compiled dice expressions.
+
+A distribution is a probability mass function over consecutive integers.
+Groups of identical dice are powers of one die's distribution: small ones
+are built by repeated direct convolution, and large ones by raising the
+die's Fourier transform to the number of dice, which costs two FFTs however
+many dice are rolled. Keeping the highest or lowest dice is solved by
+dynamic programming over the faces. Group distributions are then convolved
+into the expression's, switching from direct to FFT convolution once the
+operands are large.
+
+Die and group distributions are memoized in bounded LRU caches, so ``4d6``
+computed for ``4d6+2`` is reused by ``4d6-1d4``. NumPy (``pip install
+.[speedups]``) is used when installed; the pure Python fallback convolves
+directly and is only practical for small expressions. Exploding dice have
+no upper bound and are truncated once the remaining probability drops below
+``TAIL``.
+"""
+
+import bisect
+import math
+from collections.abc import Hashable
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any
+
+from .cache import CachePolicy, ResultCache
+from .dice_engine import MAX_EXPLOSIONS, DiceGroup, available_backend
+from .dice_notation import DicePlan
+
+# Probability below which exploding dice stop rolling again
+TAIL = 1e-12
+
+# Most outcomes a distribution may span
+MAX_OUTCOMES = 2_000_000
+
+# Face-by-count steps allowed when keeping dice: faces * count * (count + 1) / 2
+MAX_KEEP_STEPS = 250_000
+
+# Convolve with FFT once the product of the operand lengths exceeds this,
+# unless one operand is at most DIRECT_LENGTH long
+FFT_THRESHOLD = 1 << 16
+DIRECT_LENGTH = 16
+
+# Groups of at most this many dice are built by repeated direct convolution
+DIRECT_POWER = 8
+
+PERCENTILES = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """Probabilities of the consecutive outcomes from ``offset``.
+
+    Attributes:
+        offset: Smallest outcome
+        pmf: Probability of each outcome from ``offset``, a NumPy array or
+            a list depending on the backend
+    """
+
+    offset: int
+    pmf: Any
+
+    @property
+    def maximum(self) -> int:
+        """Largest outcome."""
+        return self.offset + len(self.pmf) - 1
+
+    @property
+    def mean(self) -> float:
+        """Expected outcome."""
+        return self.offset + sum_weighted(self.pmf, 1)
+
+    @property
+    def variance(self) -> float:
+        """Variance of the outcome."""
+        shift = self.mean - self.offset
+        return max(sum_weighted(self.pmf, 2) - shift * shift, 0.0)
+
+    def cdf(self) -> Any:
+        """Cumulative probabilities, capped at 1, of the same type as ``pmf``."""
+        if isinstance(self.pmf, list):
+            return [min(total, 1.0) for total in accumulate(self.pmf)]
+        import numpy
+
+        return numpy.minimum(numpy.cumsum(self.pmf), 1.0)
+
+    def percentiles(self, cdf: Any) -> dict[str, int]:
+        """Smallest outcome reaching each of ``PERCENTILES``."""
+        last = len(cdf) - 1
+        return {
+            f"p{q}": self.offset + min(bisect.bisect_left(cdf, q / 100 - 1e-12), last)
+            for q in PERCENTILES
+        }
+
+    def binned(
+        self, cdf: Any, max_points: int
+    ) -> tuple[int, int, int, list[float], list[float]]:
+        """Return ``(start, end, step, pmf, cdf)`` in at most ``max_points`` bins.
+
+        Outcomes in either tail with less than ``TAIL`` probability are left
+        out first, then consecutive outcomes are summed into bins of
+        ``step`` outcomes; ``cdf`` is taken at the end of each bin.
+        """
+        first, last = 0, len(cdf) - 1
+        if len(cdf) > max_points:
+            first = bisect.bisect_left(cdf, TAIL)
+            last = min(bisect.bisect_left(cdf, 1.0 - TAIL), last)
+        step = max(1, math.ceil((last - first + 1) / max_points))
+        ends = list(range(first + step - 1, last, step)) + [last]
+        starts = [first] + [end + 1 for end in ends[:-1]]
+        cdf_points = [float(cdf[end]) for end in ends]
+        before = float(cdf[first - 1]) if first else 0.0
+        pmf_points = [
+            max(total - previous, 0.0)
+            for previous, total in zip([before, *cdf_points], cdf_points, strict=False)
+        ]
+        return (
+            self.offset + starts[0],
+            self.offset + last,
+            step,
+            pmf_points,
+            cdf_points,
+        )
+
+
+def sum_weighted(pmf: Any, power: int) -> float:
+    """Sum of ``p * index ** power`` over a PMF."""
+    if isinstance(pmf, list):
+        return math.fsum(p * index**power for index, p in enumerate(pmf))
+    import numpy
+
+    return float(numpy.dot(pmf, numpy.arange(len(pmf), dtype=numpy.float64) ** power))
+
+
+def fft_length(size: int) -> int:
+    """Smallest length of at least ``size`` with only 2, 3 and 5 as factors.
+
+    NumPy's FFT is fastest for such lengths, and they waste less padding
+    than powers of two.
+    """
+    best = 1 << (size - 1).bit_length()
+    fives = 1
+    while fives < best:
+        threes = fives
+        while threes < best:
+            length = threes
+            while length < size:
+                length *= 2
+            best = min(best, length)
+            threes *= 3
+        fives *= 5
+    return best
+
+
+class DistributionCalculator:
+    """Computes distributions of dice plans, memoizing dice and groups.
+
+    Not thread safe; callers computing from several threads serialize calls.
+    """
+
+    # Bounded by memory rather than entries: a group of hundreds of d1000 has
+    # hundreds of thousands of outcomes
+    cache_policy = CachePolicy(ttl=None, max_entries=512, max_bytes=64_000_000)
+
+    def __init__(self, backend: str | None = None):
+        self.backend = available_backend(backend)
+        self.dice = ResultCache(self.cache_policy)
+        self.groups = ResultCache(self.cache_policy)
+
+    def distribution(self, plan: DicePlan) -> Distribution:
+        """Return the distribution of a whole expression.
+
+        Raises:
+            ValueError: If the expression spans more than ``MAX_OUTCOMES``
+                outcomes or keeps dice of too large a group
+        """
+        total: Distribution | None = None
+        for sign, group in plan.groups:
+            part = self.group(group)
+            if sign < 0:
+                part = Distribution(-part.maximum, part.pmf[::-1])
+            if total is None:
+                total = part
+                continue
+            self._check_size(len(total.pmf) + len(part.pmf) - 1)
+            total = Distribution(
+                total.offset + part.offset, self.convolve(total.pmf, part.pmf)
+            )
+        assert total is not None, "plans have at least one dice group"
+        return Distribution(total.offset + plan.constant, total.pmf)
+
+    def group(self, group: DiceGroup) -> Distribution:
+        """Return the distribution of a group's total, memoized."""
+        key = (group.count, self._die_key(group), group.keep, group.keep_highest)
+        cached = self.groups.get(key)
+        if cached is not None:
+            return Distribution(*cached)
+
+        die = self.die(group)
+        if group.keep is None:
+            self._check_size(group.count * (len(die.pmf) - 1) + 1)
+            result = Distribution(
+                die.offset * group.count, self.power(die.pmf, group.count)
+            )
+        else:
+            result = self.keep(die, group.count, group.keep, group.keep_highest)
+        # Stored as tuples so the cache can size the PMFs
+        self.groups.set(key, (result.offset, result.pmf))
+        return result
+
+    def die(self, group: DiceGroup) -> Distribution:
+        """Return the distribution of one die of a group, memoized."""
+        key = self._die_key(group)
+        cached = self.dice.get(key)
+        if cached is not None:
+            return Distribution(*cached)
+
+        result = self._die(group)
+        self.dice.set(key, (result.offset, result.pmf))
+        return result
+
+    def _die_key(self, group: DiceGroup) -> Hashable:
+        return (group.sides, group.low, group.reroll_once, group.explode)
+
+    def _die(self, group: DiceGroup) -> Distribution:
+        faces = group.sides - group.low + 1
+        # Rolled once, or rerolled once if at or below reroll_once
+        rerolled = max(group.reroll_once - group.low + 1, 0) / faces
+        first = [
+            (0.0 if face <= group.reroll_once else 1.0 / faces) + rerolled / faces
+            for face in range(group.low, group.sides + 1)
+        ]
+        if not group.explode:
+            return Distribution(group.low, self._array(first))
+
+        # Each explosion adds another uniform roll; stop once unlikely enough
+        chance = first[-1]
+        pmf = [0.0] * (group.low - 1) + first[:-1]
+        for explosions in range(1, MAX_EXPLOSIONS + 1):
+            if chance < TAIL:
+                break
+            start = explosions * group.sides
+            pmf.extend([0.0] * (start + group.low - 1 - len(pmf)))
+            pmf.extend(chance / faces for _ in range(faces - 1))
+            chance /= faces
+        pmf = pmf[group.low - 1 :]
+        scale = math.fsum(pmf)
+        return Distribution(group.low, self._array([p / scale for p in pmf]))
+
+    def power(self, pmf: Any, count: int) -> Any:
+        """Distribution of the sum of ``count`` independent draws of ``pmf``."""
+        if count == 1:
+            return pmf
+        if self.backend == "numpy" and count > DIRECT_POWER:
+            import numpy
+
+            size = count * (len(pmf) - 1) + 1
+            fft_size = fft_length(size)
+            spectrum = numpy.fft.rfft(pmf, fft_size) ** count
+            return self._clean(numpy.fft.irfft(spectrum, fft_size)[:size])
+
+        # Exponentiation by squaring with direct convolution
+        result = None
+        square = pmf
+        while count:
+            if count & 1:
+                result = square if result is None else self.convolve(result, square)
+            count >>= 1
+            if count:
+                square = self.convolve(square, square)
+        return result
+
+    def convolve(self, a: Any, b: Any) -> Any:
+        """Distribution of the sum of independent draws of ``a`` and ``b``."""
+        if self.backend == "python":
+            result = [0.0] * (len(a) + len(b) - 1)
+            for i, p in enumerate(a):
+                if p:
+                    for j, q in enumerate(b):
+                        result[i + j] += p * q
+            return result
+
+        import numpy
+
+        if len(a) * len(b) <= FFT_THRESHOLD or min(len(a), len(b)) <= DIRECT_LENGTH:
+            return numpy.convolve(a, b)
+        size = len(a) + len(b) - 1
+        fft_size = fft_length(size)
+        product = numpy.fft.rfft(a, fft_size) * numpy.fft.rfft(b, fft_size)
+        return self._clean(numpy.fft.irfft(product, fft_size)[:size])
+
+    def keep(
+        self, die: Distribution, count: int, keep: int, highest: bool
+    ) -> Distribution:
+        """Distribution of the sum of the ``keep`` highest or lowest dice.
+
+        Goes through the faces from the first kept, tracking how many dice
+        landed on faces so far and the sum of those kept.
+        """
+        faces = [
+            (die.offset + index, float(p)) for index, p in enumerate(die.pmf) if p > 0
+        ]
+        if len(faces) * count * (count + 1) // 2 > MAX_KEEP_STEPS:
+            raise ValueError(
+                f"Keeping dice from {count} dice with {len(faces)} faces is too "
+                "large to compute exactly"
+            )
+        if highest:
+            faces.reverse()
+
+        width = keep * (max(face for face, _ in faces) - die.offset) + 1
+        # states[seen] -> probability weight of each kept sum, or None
+        states: list[Any] = [None] * (count + 1)
+        states[0] = self._zeros(width)
+        states[0][0] = 1.0
+        for face, p in faces:
+            updated: list[Any] = [None] * (count + 1)
+            for seen, sums in enumerate(states):
+                if sums is None:
+                    continue
+                left = count - seen
+                for landed in range(left + 1):
+                    weight = math.comb(left, landed) * p**landed
+                    shift = min(landed, max(keep - seen, 0)) * (face - die.offset)
+                    target = updated[seen + landed]
+                    if target is None:
+                        target = updated[seen + landed] = self._zeros(width)
+                    self._add(target, shift, weight, sums)
+            states = updated
+
+        return Distribution(die.offset * keep, states[count])
+
+    def _check_size(self, outcomes: int) -> None:
+        if outcomes > MAX_OUTCOMES:
+            raise ValueError(
+                f"Distribution spans {outcomes} outcomes, more than {MAX_OUTCOMES}"
+            )
+
+    def _array(self, values: list[float]) -> Any:
+        if self.backend == "python":
+            return values
+        import numpy
+
+        return numpy.array(values, dtype=numpy.float64)
+
+    def _zeros(self, size: int) -> Any:
+        return self._array([0.0] * size)
+
+    def _add(self, target: Any, shift: int, weight: float, source: Any) -> None:
+        """Add ``weight * source`` to ``target`` from index ``shift``."""
+        size = len(target) - shift
+        if self.backend == "python":
+            for index, value in enumerate(source[:size]):
+                target[index + shift] += weight * value
+        else:
+            target[shift:] += weight * source[:size]
+
+    def _clean(self, pmf: Any) -> Any:
+        """Clip FFT round-off, which can leave tiny negative probabilities."""
+        import numpy
+
+        return numpy.clip(pmf, 0.0, None)
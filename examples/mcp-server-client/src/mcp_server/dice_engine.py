@@ -0,0 +1,419 @@
+"""Bulk dice rolling in vectorized batches.
+
+Rolls are drawn in batches of up to ``BATCH_SIZE`` dice rather than one
+``random.randint`` call per die. With NumPy installed (``pip install
+.[speedups]``) each batch is drawn as a NumPy array; otherwise as a list,
+still in a single call to the engine's stream. Batches are folded into
+running totals and a histogram as they are drawn, so memory stays bounded
+however many dice are rolled, and individual values are only kept for rolls
+of at most ``max_values`` dice. Set ``MCP_DICE_BACKEND`` to ``numpy`` or
+``python`` to choose a backend.
+
+Each engine draws from its own ``DiceStream`` (see ``dice_random``), which
+may be seeded to replay rolls or drawn from ``secrets`` for fair play.
+
+A ``DiceGroup`` adds rerolls, exploding dice and keeping the highest or
+lowest dice to a roll. These are applied to whole batches too, and keeping
+dice is resolved on the histogram of results, so memory stays bounded for
+modified rolls as well.
+
+Limits default to ``DiceLimits`` and can be overridden with
+``MCP_DICE_LIMITS="dice=1000000,sides=1000,values=100"``.
+"""
+
+import logging
+import os
+from collections import Counter
+from dataclasses import dataclass, fields
+from importlib.util import find_spec
+from typing import Any
+
+from .dice_random import DiceStream
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("numpy", "python")
+
+# Dice drawn per batch; bounds memory to a few MB per roll
+BATCH_SIZE = 1 << 20
+
+# Times a single exploding die may roll its top face again
+MAX_EXPLOSIONS = 100
+
+
+@dataclass(frozen=True)
+class DiceLimits:
+    """Limits on a single roll.
+
+    Attributes:
+        dice: Most dice rolled at once
+        sides: Most sides a die may have
+        values: Most dice whose individual values are returned; larger rolls
+            return summary statistics only
+    """
+
+    dice: int = 10_000_000
+    sides: int = 1000
+    values: int = 100
+
+
+def parse_dice_limits(value: str) -> DiceLimits:
+    """Parse "dice=N,sides=N,values=N" into limits, defaulting omitted ones.
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown limit
+    """
+    names = {field.name for field in fields(DiceLimits)}
+    overrides = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        name, _, limit = entry.partition("=")
+        if name.strip() not in names:
+            raise ValueError(f"Unknown dice limit: {name.strip()!r}")
+        overrides[name.strip()] = int(limit)
+    return DiceLimits(**overrides)
+
+
+def dice_limits() -> DiceLimits:
+    """Return the limits configured with MCP_DICE_LIMITS."""
+    return parse_dice_limits(os.environ.get("MCP_DICE_LIMITS", ""))
+
+
+def available_backend(name: str | None = None) -> str:
+    """Resolve a backend name, falling back to ``python`` if unavailable.
+
+    Args:
+        name: "numpy", "python", or None for ``MCP_DICE_BACKEND`` and
+            otherwise the fastest installed backend
+    """
+    name = name or os.environ.get("MCP_DICE_BACKEND") or "auto"
+    if name == "auto":
+        return "numpy" if find_spec("numpy") is not None else "python"
+    if name not in BACKENDS:
+        logger.warning("Unknown dice backend %r; using python", name)
+        return "python"
+    if name == "numpy" and find_spec("numpy") is None:
+        logger.warning("NumPy is not installed; using python")
+        return "python"
+    return name
+
+
+@dataclass(frozen=True)
+class DiceGroup:
+    """Identical dice rolled together, and how their results are adjusted.
+
+    Attributes:
+        count: Dice rolled
+        sides: Sides per die
+        low: Lowest face kept on a die; lower faces are rerolled until they
+            reach it
+        reroll_once: Dice showing this face or lower are rerolled once, and
+            the new result stands; 0 to never reroll
+        explode: Dice showing the top face are rolled again and added, up to
+            ``MAX_EXPLOSIONS`` times
+        keep: Dice counted towards the total, or None to count all
+        keep_highest: Whether ``keep`` counts the highest dice or the lowest
+    """
+
+    count: int
+    sides: int
+    low: int = 1
+    reroll_once: int = 0
+    explode: bool = False
+    keep: int | None = None
+    keep_highest: bool = True
+
+    @property
+    def plain(self) -> bool:
+        """Whether every die simply counts as rolled."""
+        return (
+            self.low == 1
+            and not self.reroll_once
+            and not self.explode
+            and self.keep is None
+        )
+
+
+@dataclass
+class BulkRoll:
+    """Outcome of rolling ``count`` dice with ``sides`` sides.
+
+    Attributes:
+        count: Dice counted towards the total
+        sides: Sides per die
+        total: Sum of the counted dice
+        minimum: Lowest counted die
+        maximum: Highest counted die
+        histogram: How often each result was counted, from 1 to ``sides``
+            or the highest exploded result
+        values: Counted dice in roll order, or None past ``max_values``
+        dropped: Dice rolled but not kept, in roll order, or None past
+            ``max_values``
+    """
+
+    count: int
+    sides: int
+    total: int
+    minimum: int
+    maximum: int
+    histogram: list[int]
+    values: list[int] | None = None
+    dropped: list[int] | None = None
+
+    @classmethod
+    def from_histogram(
+        cls,
+        sides: int,
+        histogram: list[int],
+        values: list[int] | None = None,
+        dropped: list[int] | None = None,
+    ) -> "BulkRoll":
+        """Summarize counted results given as a histogram."""
+        faces = [face for face, seen in enumerate(histogram, 1) if seen]
+        return cls(
+            count=sum(histogram),
+            sides=sides,
+            total=sum(face * seen for face, seen in enumerate(histogram, 1)),
+            minimum=faces[0],
+            maximum=faces[-1],
+            histogram=histogram,
+            values=values,
+            dropped=dropped,
+        )
+
+    @property
+    def mean(self) -> float:
+        """Average die."""
+        return self.total / self.count
+
+
+class DiceEngine:
+    """Rolls dice in batches with the NumPy or pure Python backend."""
+
+    def __init__(self, backend: str | None = None, stream: DiceStream | None = None):
+        """Create an engine.
+
+        Args:
+            backend: "numpy", "python", or None for ``available_backend()``;
+                ignored with a stream, which has its own
+            stream: Stream to draw from; None creates an unseeded one in the
+                ``MCP_DICE_RNG`` mode
+        """
+        if stream is None:
+            stream = DiceStream(available_backend(backend))
+        self.backend = stream.backend
+        self.stream = stream
+
+    def roll(self, count: int, sides: int, max_values: int = 0) -> BulkRoll:
+        """Roll ``count`` dice with ``sides`` sides.
+
+        Args:
+            count: Dice to roll, at least 1
+            sides: Sides per die, at least 1
+            max_values: Keep individual values for rolls up to this size
+        """
+        keep = count <= max_values
+        if self.backend == "numpy":
+            histogram, values = self._roll_numpy(count, sides, keep)
+        else:
+            histogram, values = self._roll_python(count, sides, keep)
+        return BulkRoll.from_histogram(sides, histogram, values)
+
+    def roll_group(self, group: DiceGroup, max_values: int = 0) -> BulkRoll:
+        """Roll a group of dice, applying its rerolls, explosions and keeps.
+
+        Args:
+            group: Dice to roll
+            max_values: Keep individual values for groups up to this size
+        """
+        if group.plain:
+            return self.roll(group.count, group.sides, max_values)
+
+        keep = group.count <= max_values
+        if self.backend == "numpy":
+            histogram, values = self._roll_group_numpy(group, keep)
+        else:
+            histogram, values = self._roll_group_python(group, keep)
+
+        dropped = None
+        if group.keep is not None:
+            histogram = keep_results(histogram, group.keep, group.keep_highest)
+            if values is not None:
+                values, dropped = keep_values(values, group.keep, group.keep_highest)
+        return BulkRoll.from_histogram(group.sides, histogram, values, dropped)
+
+    def roll_totals(self, group: DiceGroup, rolls: int) -> Any:
+        """Roll a group ``rolls`` times, returning the total of each roll.
+
+        Rolls are drawn as one matrix of dice per batch, so totals come out
+        of a few vectorized calls rather than one call per roll.
+
+        Returns:
+            A NumPy int64 array with the NumPy backend, otherwise a list
+        """
+        # Rolls too large for one batch are rolled, and bounded, one by one
+        large = group.count > BATCH_SIZE
+        per_batch = max(1, BATCH_SIZE // group.count)
+        if self.backend == "numpy":
+            import numpy
+
+            if large:
+                totals = [self.roll_group(group).total for _ in range(rolls)]
+                return numpy.array(totals, dtype=numpy.int64)
+            parts = []
+            for start in range(0, rolls, per_batch):
+                rows = min(per_batch, rolls - start)
+                results = self._draw_numpy(group, rows * group.count)
+                results = results.reshape(rows, group.count)
+                if group.keep is not None:
+                    results.sort(axis=1)
+                    results = (
+                        results[:, -group.keep :]
+                        if group.keep_highest
+                        else results[:, : group.keep]
+                    )
+                parts.append(results.sum(axis=1))
+            return numpy.concatenate(parts)
+
+        if large:
+            return [self.roll_group(group).total for _ in range(rolls)]
+        totals = []
+        for start in range(0, rolls, per_batch):
+            rows = min(per_batch, rolls - start)
+            results = self._draw_python(group, rows * group.count)
+            for row in range(rows):
+                dice = results[row * group.count : (row + 1) * group.count]
+                if group.keep is not None:
+                    dice = sorted(dice, reverse=group.keep_highest)[: group.keep]
+                totals.append(sum(dice))
+        return totals
+
+    def _roll_numpy(
+        self, count: int, sides: int, keep: bool
+    ) -> tuple[list[int], list[int] | None]:
+        import numpy
+
+        counts = numpy.zeros(sides + 1, dtype=numpy.int64)
+        values: list[int] | None = [] if keep else None
+        for start in range(0, count, BATCH_SIZE):
+            size = min(BATCH_SIZE, count - start)
+            batch = self.stream.integers(1, sides, size)
+            counts += numpy.bincount(batch, minlength=sides + 1)
+            if values is not None:
+                values.extend(batch.tolist())
+        return counts[1:].tolist(), values
+
+    def _roll_python(
+        self, count: int, sides: int, keep: bool
+    ) -> tuple[list[int], list[int] | None]:
+        counts: Counter[int] = Counter()
+        values: list[int] | None = [] if keep else None
+        faces = range(1, sides + 1)
+        for start in range(0, count, BATCH_SIZE):
+            batch = self.stream.integers(1, sides, min(BATCH_SIZE, count - start))
+            counts.update(batch)
+            if values is not None:
+                values.extend(batch)
+        return [counts[face] for face in faces], values
+
+    def _roll_group_numpy(
+        self, group: DiceGroup, keep: bool
+    ) -> tuple[list[int], list[int] | None]:
+        import numpy
+
+        counts = numpy.zeros(group.sides + 1, dtype=numpy.int64)
+        values: list[int] | None = [] if keep else None
+        for start in range(0, group.count, BATCH_SIZE):
+            results = self._draw_numpy(group, min(BATCH_SIZE, group.count - start))
+            batch_counts = numpy.bincount(results)
+            if len(batch_counts) > len(counts):
+                batch_counts[: len(counts)] += counts
+                counts = batch_counts
+            else:
+                counts[: len(batch_counts)] += batch_counts
+            if values is not None:
+                values.extend(results.tolist())
+        return counts[1:].tolist(), values
+
+    def _draw_numpy(self, group: DiceGroup, size: int) -> Any:
+        """Draw ``size`` dice of a group, rerolled and exploded."""
+        import numpy
+
+        def draw(size: int) -> Any:
+            return self.stream.integers(group.low, group.sides, size)
+
+        results = draw(size)
+        if group.reroll_once:
+            rerolled = numpy.flatnonzero(results <= group.reroll_once)
+            results[rerolled] = draw(len(rerolled))
+        if group.explode:
+            exploding = numpy.flatnonzero(results == group.sides)
+            for _ in range(MAX_EXPLOSIONS):
+                if not len(exploding):
+                    break
+                extra = draw(len(exploding))
+                results[exploding] += extra
+                exploding = exploding[extra == group.sides]
+        return results
+
+    def _roll_group_python(
+        self, group: DiceGroup, keep: bool
+    ) -> tuple[list[int], list[int] | None]:
+        counts: Counter[int] = Counter()
+        values: list[int] | None = [] if keep else None
+        for start in range(0, group.count, BATCH_SIZE):
+            results = self._draw_python(group, min(BATCH_SIZE, group.count - start))
+            counts.update(results)
+            if values is not None:
+                values.extend(results)
+        highest = max(group.sides, max(counts))
+        return [counts[result] for result in range(1, highest + 1)], values
+
+    def _draw_python(self, group: DiceGroup, size: int) -> list[int]:
+        """Draw ``size`` dice of a group, rerolled and exploded."""
+        results: list[int] = self.stream.integers(group.low, group.sides, size)
+        if group.reroll_once:
+            rerolled = [i for i, r in enumerate(results) if r <= group.reroll_once]
+            extra = self.stream.integers(group.low, group.sides, len(rerolled))
+            for index, result in zip(rerolled, extra, strict=True):
+                results[index] = result
+        if group.explode:
+            exploding = [i for i, r in enumerate(results) if r == group.sides]
+            for _ in range(MAX_EXPLOSIONS):
+                if not exploding:
+                    break
+                extra = self.stream.integers(group.low, group.sides, len(exploding))
+                for index, result in zip(exploding, extra, strict=True):
+                    results[index] += result
+                exploding = [
+                    index
+                    for index, result in zip(exploding, extra, strict=True)
+                    if result == group.sides
+                ]
+        return results
+
+
+def keep_results(histogram: list[int], keep: int, highest: bool) -> list[int]:
+    """Reduce a histogram of results to the ``keep`` highest or lowest."""
+    kept = [0] * len(histogram)
+    order = range(len(histogram) - 1, -1, -1) if highest else range(len(histogram))
+    for index in order:
+        if keep <= 0:
+            break
+        kept[index] = min(histogram[index], keep)
+        keep -= kept[index]
+    return kept
+
+
+def keep_values(
+    values: list[int], keep: int, highest: bool
+) -> tuple[list[int], list[int]]:
+    """Split values into the ``keep`` highest or lowest and the rest.
+
+    Both lists stay in roll order.
+    """
+    ranked = sorted(range(len(values)), key=values.__getitem__, reverse=highest)
+    kept = set(ranked[:keep])
+    return (
+        [value for index, value in enumerate(values) if index in kept],
+        [value for index, value in enumerate(values) if index not in kept],
+    )
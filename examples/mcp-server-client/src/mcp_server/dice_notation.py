@@ -0,0 +1,258 @@
+"""Dice expressions compiled into evaluation plans.
+
+Expressions add and subtract groups of dice and constants, ignoring case and
+spaces::
+
+    expression := term (("+" | "-") term)*
+    term       := COUNT "d" SIDES modifier* | CONSTANT
+    modifier   := "!"            explode: roll the top face again and add it
+                | "r" N          reroll N and below until higher
+                | "ro" N         reroll N and below once
+                | "kh" N | "k" N keep the N highest dice
+                | "kl" N         keep the N lowest dice
+                | "dh" N         drop the N highest dice
+                | "dl" N         drop the N lowest dice
+
+``SIDES`` may be ``%`` for 100, so ``4d6kh3``, ``2d20kl1+5``, ``1d6!+1d8r1``
+and ``1d%-10`` are all valid. ``compile_notation`` parses and validates an
+expression once, against the configured ``DiceLimits``, into a ``DicePlan``
+that rolls straight through the ``DiceEngine``. Rerolling until higher is
+compiled into a die without the rerolled faces, so it costs nothing at roll
+time. ``roll_batch`` rolls many plans many times, drawing each distinct dice
+group once for all of them.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from .dice_engine import BulkRoll, DiceEngine, DiceGroup, DiceLimits, dice_limits
+
+# Most dice groups and constants in one expression
+MAX_TERMS = 20
+
+# Longest expression accepted, which also bounds the size of its numbers
+MAX_LENGTH = 200
+
+# Largest constant term; with MAX_TERMS, keeps totals well inside int64
+MAX_CONSTANT = 1_000_000_000
+
+TERM = re.compile(
+    r"(?P<sign>[+-])?(?:"
+    r"(?P<count>\d+)d(?P<sides>\d+|%)(?P<modifiers>(?:!|(?:ro|r|kh|kl|k|dh|dl)\d+)*)"
+    r"|(?P<constant>\d+))"
+)
+MODIFIER = re.compile(r"!|(ro|r|kh|kl|k|dh|dl)(\d+)")
+KEEPS = frozenset({"kh", "kl", "dh", "dl"})
+
+EXPECTED = "Expected format like '2d6', '4d6kh3' or '1d20+5'"
+
+
+@dataclass(frozen=True)
+class DicePlan:
+    """Compiled dice expression.
+
+    Attributes:
+        notation: Canonical form of the expression
+        groups: Sign (1 or -1) and dice of each dice group
+        constant: Sum of the constants
+    """
+
+    notation: str
+    groups: tuple[tuple[int, DiceGroup], ...]
+    constant: int = 0
+
+    @property
+    def dice(self) -> int:
+        """Dice rolled, before explosions."""
+        return sum(group.count for _, group in self.groups)
+
+    @property
+    def plain(self) -> bool:
+        """Whether this is a single group of unmodified dice."""
+        return (
+            len(self.groups) == 1
+            and self.groups[0][0] == 1
+            and self.groups[0][1].plain
+            and not self.constant
+        )
+
+    def roll(self, engine: DiceEngine, max_values: int = 0) -> list[BulkRoll]:
+        """Roll every dice group, in expression order."""
+        return [engine.roll_group(group, max_values) for _, group in self.groups]
+
+    def total(self, rolls: list[BulkRoll]) -> int:
+        """Sum the rolls of ``roll`` with their signs and the constant."""
+        signed = (
+            sign * roll.total
+            for (sign, _), roll in zip(self.groups, rolls, strict=True)
+        )
+        return sum(signed, self.constant)
+
+
+def format_group(group: DiceGroup) -> str:
+    """Return the canonical notation of a dice group."""
+    notation = f"{group.count}d{group.sides}"
+    if group.low > 1:
+        notation += f"r{group.low - 1}"
+    if group.reroll_once:
+        notation += f"ro{group.reroll_once}"
+    if group.explode:
+        notation += "!"
+    if group.keep is not None:
+        notation += f"{'kh' if group.keep_highest else 'kl'}{group.keep}"
+    return notation
+
+
+def compile_group(
+    count: int, sides: int, modifiers: str, limits: DiceLimits
+) -> DiceGroup:
+    """Validate one dice group and compile its modifiers.
+
+    Raises:
+        ValueError: If the group is outside ``limits`` or its modifiers
+            conflict
+    """
+    if count <= 0:
+        raise ValueError("Dice count must be greater than 0")
+    if count > limits.dice:
+        raise ValueError(f"Dice count must not exceed {limits.dice}")
+    if sides <= 0:
+        raise ValueError("Number of sides must be greater than 0")
+    if sides > limits.sides:
+        raise ValueError(f"Number of sides must not exceed {limits.sides}")
+
+    options: dict[str, int] = {}
+    for match in MODIFIER.finditer(modifiers):
+        name, value = match.group(1) or "!", int(match.group(2) or 0)
+        name = {"k": "kh"}.get(name, name)
+        if name in options or (name in KEEPS and KEEPS & options.keys()):
+            raise ValueError(f"Conflicting dice modifiers: '{modifiers}'")
+        options[name] = value
+
+    for name in ("r", "ro"):
+        if options.get(name, 0) >= sides:
+            raise ValueError(f"Cannot reroll every face of a d{sides}")
+    if "!" in options and sides - options.get("r", 0) < 2:
+        raise ValueError(f"Cannot explode a d{sides} that always rolls its top face")
+
+    keep: int | None = None
+    keep_highest = True
+    if "kh" in options or "kl" in options:
+        keep_highest = "kh" in options
+        keep = options["kh" if keep_highest else "kl"]
+        if not 0 < keep <= count:
+            raise ValueError(f"Cannot keep {keep} of {count} dice")
+    elif "dh" in options or "dl" in options:
+        drop = options.get("dh", options.get("dl", 0))
+        keep_highest = "dl" in options
+        if not 0 <= drop < count:
+            raise ValueError(f"Cannot drop {drop} of {count} dice")
+        keep = count - drop
+
+    return DiceGroup(
+        count=count,
+        sides=sides,
+        low=options.get("r", 0) + 1,
+        reroll_once=options.get("ro", 0),
+        explode="!" in options,
+        keep=None if keep == count else keep,
+        keep_highest=keep_highest or keep == count,
+    )
+
+
+def compile_notation(notation: str) -> DicePlan:
+    """Parse and validate a dice expression into an evaluation plan.
+
+    Raises:
+        ValueError: If the expression is malformed or outside the configured
+            limits
+    """
+    text = "".join(notation.lower().split())
+    if len(text) > MAX_LENGTH:
+        raise ValueError(f"Dice notation must not exceed {MAX_LENGTH} characters")
+
+    limits = dice_limits()
+    groups: list[tuple[int, DiceGroup]] = []
+    constant = 0
+    terms = 0
+    position = 0
+    while position < len(text):
+        match = TERM.match(text, position)
+        if match is None or (position and not match.group("sign")):
+            raise ValueError(f"Invalid dice notation: '{notation}'. {EXPECTED}")
+        sign = -1 if match.group("sign") == "-" else 1
+        if match.group("constant") is not None:
+            value = int(match.group("constant"))
+            if value > MAX_CONSTANT:
+                raise ValueError(f"Dice constants must not exceed {MAX_CONSTANT}")
+            constant += sign * value
+        else:
+            sides = match.group("sides")
+            group = compile_group(
+                int(match.group("count")),
+                100 if sides == "%" else int(sides),
+                match.group("modifiers"),
+                limits,
+            )
+            groups.append((sign, group))
+        terms += 1
+        position = match.end()
+
+    if not groups:
+        raise ValueError(f"Invalid dice notation: '{notation}'. {EXPECTED}")
+    if terms > MAX_TERMS:
+        raise ValueError(f"Dice notation must not exceed {MAX_TERMS} terms")
+    if sum(group.count for _, group in groups) > limits.dice:
+        raise ValueError(f"Dice count must not exceed {limits.dice}")
+
+    canonical = "".join(
+        f"{'-' if sign < 0 else '+' if index else ''}{format_group(group)}"
+        for index, (sign, group) in enumerate(groups)
+    )
+    if constant:
+        canonical += f"{constant:+d}"
+    return DicePlan(notation=canonical, groups=tuple(groups), constant=constant)
+
+
+def roll_batch(
+    engine: DiceEngine, plans: list[DicePlan], repeat: int
+) -> list[list[int]]:
+    """Roll every plan ``repeat`` times, returning the totals of each plan.
+
+    All rolls of a dice group are drawn in one ``DiceEngine.roll_totals``
+    call, however many plans share it: ``1d20`` in ``1d20+5`` and
+    ``1d20-1`` is drawn once for both, and then split between them.
+    """
+    needed: dict[DiceGroup, int] = {}
+    for plan in plans:
+        for _, group in plan.groups:
+            needed[group] = needed.get(group, 0) + repeat
+    drawn = {group: engine.roll_totals(group, rolls) for group, rolls in needed.items()}
+    used = dict.fromkeys(needed, 0)
+
+    def take(group: DiceGroup) -> Any:
+        start = used[group]
+        used[group] += repeat
+        return drawn[group][start : start + repeat]
+
+    if engine.backend == "numpy":
+        import numpy
+
+        totals = numpy.empty((len(plans), repeat), dtype=numpy.int64)
+        for index, plan in enumerate(plans):
+            totals[index] = plan.constant
+            for sign, group in plan.groups:
+                totals[index] += sign * take(group)
+        return totals.tolist()
+
+    rows = []
+    for plan in plans:
+        row = [plan.constant] * repeat
+        for sign, group in plan.groups:
+            row = [
+                total + sign * rolled
+                for total, rolled in zip(row, take(group), strict=True)
+            ]
+        rows.append(row)
+    return rows
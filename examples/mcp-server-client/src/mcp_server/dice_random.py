@@ -0,0 +1,167 @@
+"""Random streams dice are drawn from.
+
+Every ``DiceEngine`` draws from its own ``DiceStream``, so concurrent
+sessions never share generator state. Streams come in two modes:
+
+``fast``
+    A PCG64 generator with NumPy, otherwise a ``random.Random`` (Mersenne
+    Twister) instance. Seeded streams replay the same dice; unseeded ones
+    are seeded from the operating system.
+``secure``
+    Dice drawn from ``secrets``, for fair-play contexts where rolls must be
+    unpredictable. Secure streams cannot be seeded.
+
+Either way a batch of dice is drawn in one call rather than one per die.
+Except for NumPy's fast streams, which use ``Generator.integers``, a batch
+reads one block of random bytes and maps its 32-bit words to faces, drawing
+again the few words that would bias them. Set
+``MCP_DICE_RNG`` to ``secure`` to draw every roll from ``secrets``.
+"""
+
+import logging
+import os
+import random
+import secrets
+import weakref
+from collections.abc import Callable
+from typing import Any
+
+from . import session
+
+logger = logging.getLogger(__name__)
+
+MODES = ("fast", "secure")
+
+# Secure dice are mapped from 32-bit random words
+WORD = 1 << 32
+
+
+def available_mode(name: str | None = None) -> str:
+    """Resolve a stream mode name.
+
+    Args:
+        name: "fast", "secure", or None for ``MCP_DICE_RNG`` and otherwise
+            "fast"
+    """
+    name = name or os.environ.get("MCP_DICE_RNG") or "fast"
+    if name not in MODES:
+        logger.warning("Unknown dice random mode %r; using fast", name)
+        return "fast"
+    return name
+
+
+class DiceStream:
+    """Independent stream of uniformly random dice results."""
+
+    def __init__(self, backend: str, mode: str | None = None, seed: int | None = None):
+        """Create a stream.
+
+        Args:
+            backend: "numpy" or "python", the type of batches returned
+            mode: "fast", "secure", or None for ``available_mode()``
+            seed: Seed of a fast stream; None seeds it from the system
+
+        Raises:
+            ValueError: If a secure stream is given a seed
+        """
+        self.backend = backend
+        self.mode = available_mode(mode)
+        self.seed = seed
+        self._generator: Any = None
+        if self.mode == "secure":
+            if seed is not None:
+                raise ValueError("Secure dice streams cannot be seeded")
+        elif backend == "numpy":
+            import numpy
+
+            self._generator = numpy.random.Generator(numpy.random.PCG64(seed))
+        else:
+            self._generator = random.Random(seed)
+
+    def integers(self, low: int, high: int, size: int) -> Any:
+        """Draw ``size`` results from ``low`` to ``high`` inclusive.
+
+        Returns:
+            A NumPy int64 array with the NumPy backend, otherwise a list
+        """
+        if self._generator is not None and self.backend == "numpy":
+            return self._generator.integers(low, high, size=size, endpoint=True)
+        read = (
+            secrets.token_bytes
+            if self._generator is None
+            else self._generator.randbytes
+        )
+        if self.backend == "numpy":
+            return faces_numpy(read, low, high, size)
+        return faces_python(read, low, high, size)
+
+
+def faces_numpy(read: Callable[[int], bytes], low: int, high: int, size: int) -> Any:
+    """Map random bytes from ``read`` to a NumPy array of unbiased faces."""
+    import numpy
+
+    faces = high - low + 1
+    limit = WORD - WORD % faces
+    results = numpy.empty(size, dtype=numpy.int64)
+    filled = 0
+    while filled < size:
+        words = numpy.frombuffer(read(4 * (size - filled)), dtype=numpy.uint32)
+        # Words at or above the last whole multiple of faces would bias
+        # the lowest faces, so they are drawn again
+        if limit < WORD:
+            words = words[words < limit]
+        results[filled : filled + len(words)] = words % faces
+        filled += len(words)
+    results += low
+    return results
+
+
+def faces_python(
+    read: Callable[[int], bytes], low: int, high: int, size: int
+) -> list[int]:
+    """Map random bytes from ``read`` to a list of unbiased faces."""
+    faces = high - low + 1
+    limit = WORD - WORD % faces
+    results: list[int] = []
+    while len(results) < size:
+        words = memoryview(read(4 * (size - len(results)))).cast("I")
+        results.extend(low + word % faces for word in words if word < limit)
+    return results
+
+
+class SessionStreams:
+    """The fast stream of each MCP session.
+
+    Streams are kept per ``session.current()`` and dropped with their
+    session. Calls outside any session share one stream.
+    """
+
+    def __init__(self) -> None:
+        self._streams: weakref.WeakKeyDictionary[Any, DiceStream] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._default: DiceStream | None = None
+
+    def get(self, backend: str, seed: int | None = None) -> DiceStream:
+        """Return the current session's stream.
+
+        Args:
+            backend: Backend of a new stream
+            seed: Replace the session's stream with one seeded by this, so
+                its rolls from here on can be replayed
+
+        Raises:
+            ValueError: If seeded while ``MCP_DICE_RNG`` is "secure"
+        """
+        owner = session.current()
+        stream = self._default if owner is None else self._streams.get(owner)
+        if stream is None or seed is not None or stream.backend != backend:
+            stream = DiceStream(backend, seed=seed)
+            if owner is None:
+                self._default = stream
+            else:
+                self._streams[owner] = stream
+        return stream
+
+    def __len__(self) -> int:
+        return len(self._streams)
@@ -0,0 +1,251 @@
+"""Persistent upstream response cache shared by server processes.
+
+HTTP tools opt in by declaring a ``DiskCachePolicy``. Entries live in one
+SQLite database in WAL mode, so any number of server processes, including
+short-lived stdio servers, can read while another writes and a new process
+starts with the results its predecessors fetched. Writes take the database
+lock up front (``BEGIN IMMEDIATE``) and wait up to ``LOCK_TIMEOUT`` for other
+processes. Expiry uses wall clock time, which unlike ``time.monotonic()`` is
+comparable between processes. Once a namespace's entries exceed
+``max_bytes``, the least recently used ones are evicted.
+
+Lookups only read. An entry's access time is updated at most once per
+``access_interval``, so LRU order is that coarse, and entries too stale to
+serve are deleted by the next write.
+
+The database defaults to ``~/.cache/mcp-server-client/upstream.sqlite3``;
+set ``MCP_DISK_CACHE`` to another path, or to ``off`` to disable it. Cache
+failures are logged and treated as misses, so they never fail a tool call.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Seconds a process waits for another one holding the write lock
+LOCK_TIMEOUT = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries (namespace, accessed_at);
+"""
+
+
+@dataclass(frozen=True)
+class DiskCachePolicy:
+    """Declarative persistent cache policy for a tool.
+
+    Attributes:
+        ttl: Seconds an entry stays fresh unless given per entry, or None to
+            never expire
+        max_bytes: Size of the tool's stored values before LRU eviction
+        max_stale: Seconds past expiry an entry is still returned as stale
+        access_interval: Seconds before a read entry's access time is
+            updated again; reads in between do not take the write lock
+    """
+
+    ttl: float | None = 300.0
+    max_bytes: int = 50_000_000
+    max_stale: float = 0.0
+    access_interval: float = 60.0
+
+
+def disk_cache_path() -> Path | None:
+    """Return the configured database path, or None if disabled."""
+    configured = os.environ.get("MCP_DISK_CACHE")
+    if configured:
+        return None if configured.lower() == "off" else Path(configured)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "mcp-server-client" / "upstream.sqlite3"
+
+
+class DiskCache:
+    """SQLite-backed TTL/LRU cache for one namespace (tool) of JSON values.
+
+    Methods block on SQLite; call them from a worker thread in async code.
+    """
+
+    def __init__(self, path: Path, policy: DiskCachePolicy, namespace: str):
+        self.path = path
+        self.policy = policy
+        self.namespace = namespace
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            path, timeout=LOCK_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        try:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # WAL commits survive process crashes; only power loss may drop the last
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+        except sqlite3.Error:
+            self._db.close()
+            raise
+
+    def lookup(self, key: Hashable) -> tuple[Any, float] | None:
+        """Return ``(value, expires_in)`` for ``key``, or None on a miss.
+
+        ``expires_in`` is the number of seconds the value stays fresh; it is
+        negative for entries up to ``policy.max_stale`` seconds past expiry.
+        """
+        encoded = json.dumps(key)
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT value, expires_at, accessed_at FROM entries "
+                    "WHERE namespace = ? AND key = ?",
+                    (self.namespace, encoded),
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                value, expires_at, accessed_at = row
+                if expires_at is not None and now - expires_at > self.policy.max_stale:
+                    # Left for the next write's eviction to delete
+                    self.misses += 1
+                    return None
+
+                if now - accessed_at >= self.policy.access_interval:
+                    self._db.execute(
+                        "UPDATE entries SET accessed_at = ? "
+                        "WHERE namespace = ? AND key = ?",
+                        (now, self.namespace, encoded),
+                    )
+        except sqlite3.Error as e:
+            logger.warning("Disk cache lookup failed: %s", e)
+            self.misses += 1
+            return None
+
+        expires_in = float("inf") if expires_at is None else expires_at - now
+        if expires_in <= 0:
+            self.stale_hits += 1
+        self.hits += 1
+        return json.loads(value), expires_in
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``, evicting LRU entries if needed.
+
+        Args:
+            key: JSON-serializable cache key
+            value: JSON-serializable value
+            ttl: Seconds the entry stays fresh, overriding ``policy.ttl``
+        """
+        if ttl is None:
+            ttl = self.policy.ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        try:
+            encoded = json.dumps(value)
+            size = len(encoded.encode())
+            if size > self.policy.max_bytes:
+                return
+            with self._lock:
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            self.namespace,
+                            json.dumps(key),
+                            encoded,
+                            size,
+                            expires_at,
+                            now,
+                        ),
+                    )
+                    self._evict()
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("Disk cache write failed: %s", e)
+
+    def checkpoint(self) -> None:
+        """Copy the write-ahead log into the database file."""
+        try:
+            with self._lock:
+                self._db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error as e:
+            logger.warning("Disk cache checkpoint failed: %s", e)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def stats(self) -> dict[str, int]:
+        """Return cache statistics; entries and size cover every process."""
+        try:
+            with self._lock:
+                entries, size_bytes = self._db.execute(
+                    "SELECT count(*), total(size) FROM entries WHERE namespace = ?",
+                    (self.namespace,),
+                ).fetchone()
+        except sqlite3.Error:
+            entries = size_bytes = 0
+        return {
+            "entries": entries,
+            "size_bytes": int(size_bytes),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _evict(self) -> None:
+        # Drop entries too stale to serve, then least recently used ones
+        cursor = self._db.execute(
+            "DELETE FROM entries WHERE namespace = ? AND expires_at < ?",
+            (self.namespace, time.time() - self.policy.max_stale),
+        )
+        self.expirations += cursor.rowcount
+
+        (total,) = self._db.execute(
+            "SELECT total(size) FROM entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        excess = total - self.policy.max_bytes
+        if excess <= 0:
+            return
+        rows = self._db.execute(
+            "SELECT key, size FROM entries WHERE namespace = ? ORDER BY accessed_at",
+            (self.namespace,),
+        )
+        victims = []
+        for key, size in rows:
+            victims.append((self.namespace, key))
+            excess -= size
+            if excess <= 0:
+                break
+        rows.close()
+        self._db.executemany(
+            "DELETE FROM entries WHERE namespace = ? AND key = ?", victims
+        )
+        self.evictions += len(victims)
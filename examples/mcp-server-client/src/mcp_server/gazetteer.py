@@ -0,0 +1,401 @@
+"""Offline gazetteer for resolving place names and coordinates.
+
+The index is built once from a GeoNames style dump (tab-separated, plain or
+gzip), either the bundled ``data/cities.tsv.gz`` or the file named by
+``MCP_GAZETTEER``, e.g. GeoNames' ``cities500.txt`` with about 200,000
+places. It is written as one flat binary file to the cache directory and
+memory-mapped, so start-up does not parse anything and lookups only page in
+the parts of the index they touch.
+
+Names are normalised and stored sorted, so exact and prefix lookups are
+binary searches. Typo-tolerant lookups search for every single edit of the
+name. Coordinates are stored as an implicit k-d tree over points on the unit
+sphere for nearest-place queries.
+
+Build an index ahead of time with::
+
+    python -m src.mcp_server.gazetteer cities500.txt
+"""
+
+import argparse
+import functools
+import gzip
+import hashlib
+import heapq
+import logging
+import math
+import mmap
+import os
+import struct
+import unicodedata
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_DATASET = Path(__file__).parent / "data" / "cities.tsv.gz"
+
+MAGIC = b"MCPGAZ01"
+
+# Array typecodes used by the index
+Typecode = Literal["B", "I", "Q", "d", "f"]
+
+# Index sections and their array typecodes, in file order
+SECTIONS: tuple[tuple[str, Typecode], ...] = (
+    ("key_offsets", "I"),
+    ("key_places", "I"),
+    ("keys", "B"),
+    ("label_offsets", "I"),
+    ("labels", "B"),
+    ("latitudes", "d"),
+    ("longitudes", "d"),
+    ("populations", "Q"),
+    ("tree_places", "I"),
+    ("tree_points", "f"),
+)
+
+# Magic, place count, key count, then (offset, length) per section
+_HEADER = struct.Struct(f"<8sII{2 * len(SECTIONS)}Q")
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Characters tried when substituting or inserting for typo tolerance
+_EDIT_ALPHABET = "abcdefghijklmnopqrstuvwxyz -'"
+
+# (name, alternate names, latitude, longitude, country code, population)
+PlaceRow = tuple[str, list[str], float, float, str, int]
+
+
+@dataclass(frozen=True)
+class Place:
+    """A named place from the gazetteer.
+
+    Attributes:
+        name: Display name, e.g. "London, GB"
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+        population: Population, used to rank places sharing a name
+    """
+
+    name: str
+    latitude: float
+    longitude: float
+    population: int
+
+
+def normalize_name(name: str) -> str:
+    """Fold case, accents and whitespace so spellings compare equal."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def read_geonames(path: Path) -> Iterator[PlaceRow]:
+    """Read places from a GeoNames dump, skipping malformed lines."""
+    opener: Any = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            columns = line.rstrip("\n").split("\t")
+            try:
+                yield (
+                    columns[1],
+                    [columns[2], *columns[3].split(",")],
+                    float(columns[4]),
+                    float(columns[5]),
+                    columns[8],
+                    int(columns[14] or 0),
+                )
+            except (IndexError, ValueError):
+                continue
+
+
+def unit_vector(latitude: float, longitude: float) -> tuple[float, float, float]:
+    """Map coordinates to a point on the unit sphere."""
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)
+
+
+def build_index(rows: Iterable[PlaceRow]) -> bytes:
+    """Build a gazetteer index from place rows."""
+    latitudes, longitudes = array("d"), array("d")
+    populations = array("Q")
+    label_offsets, labels = array("I", [0]), bytearray()
+    entries: list[tuple[bytes, int, int]] = []
+    points: list[tuple[float, float, float, int]] = []
+
+    for place, (name, alternates, lat, lon, country, population) in enumerate(rows):
+        latitudes.append(lat)
+        longitudes.append(lon)
+        populations.append(population)
+        labels += (f"{name}, {country}" if country else name).encode()
+        label_offsets.append(len(labels))
+        for normalized in {normalize_name(n) for n in (name, *alternates)} - {""}:
+            # Most populous place first among those sharing a name
+            entries.append((normalized.encode(), -population, place))
+        points.append((*unit_vector(lat, lon), place))
+
+    entries.sort()
+    key_offsets, key_places, keys = array("I", [0]), array("I"), bytearray()
+    for key, _, place in entries:
+        keys += key
+        key_offsets.append(len(keys))
+        key_places.append(place)
+
+    _build_tree(points, 0, len(points), 0)
+    tree_places = array("I", (point[3] for point in points))
+    tree_points = array("f", (c for point in points for c in point[:3]))
+
+    sections = {
+        "key_offsets": key_offsets.tobytes(),
+        "key_places": key_places.tobytes(),
+        "keys": bytes(keys),
+        "label_offsets": label_offsets.tobytes(),
+        "labels": bytes(labels),
+        "latitudes": latitudes.tobytes(),
+        "longitudes": longitudes.tobytes(),
+        "populations": populations.tobytes(),
+        "tree_places": tree_places.tobytes(),
+        "tree_points": tree_points.tobytes(),
+    }
+    layout: list[int] = []
+    body = bytearray()
+    for name, _ in SECTIONS:
+        # Align every array to 8 bytes
+        body += bytes(-(_HEADER.size + len(body)) % 8)
+        layout += [_HEADER.size + len(body), len(sections[name])]
+        body += sections[name]
+    return _HEADER.pack(MAGIC, len(latitudes), len(entries), *layout) + bytes(body)
+
+
+def _build_tree(
+    points: list[tuple[float, float, float, int]], lo: int, hi: int, depth: int
+) -> None:
+    """Order points[lo:hi] as an implicit k-d tree (median at the middle)."""
+    if hi - lo <= 1:
+        return
+    points[lo:hi] = sorted(points[lo:hi], key=itemgetter(depth % 3))
+    mid = (lo + hi) // 2
+    _build_tree(points, lo, mid, depth + 1)
+    _build_tree(points, mid + 1, hi, depth + 1)
+
+
+def _edits(word: str) -> set[str]:
+    """Return every string one deletion, transposition, substitution or
+    insertion away from ``word``."""
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    edits = {a + b[1:] for a, b in splits if b}
+    edits |= {a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1}
+    edits |= {a + c + b[1:] for a, b in splits if b for c in _EDIT_ALPHABET}
+    edits |= {a + c + b for a, b in splits for c in _EDIT_ALPHABET}
+    edits.discard(word)
+    return edits
+
+
+class Gazetteer:
+    """Read-only view of a gazetteer index held in memory or memory-mapped."""
+
+    place_count: int
+    key_count: int
+
+    def __init__(self, buffer: bytes | mmap.mmap):
+        """Open an index.
+
+        Raises:
+            ValueError: If the buffer does not hold a gazetteer index
+        """
+        view = memoryview(buffer)
+        try:
+            magic, self.place_count, self.key_count, *layout = _HEADER.unpack_from(view)
+        except struct.error as e:
+            raise ValueError(f"Truncated gazetteer index: {e}") from None
+        if magic != MAGIC:
+            raise ValueError("Not a gazetteer index")
+
+        arrays: dict[str, memoryview[Any]] = {
+            name: view[offset : offset + length].cast(code)
+            for (name, code), offset, length in zip(
+                SECTIONS, layout[::2], layout[1::2], strict=True
+            )
+        }
+        self._buffer = buffer
+        self._key_offsets = arrays["key_offsets"]
+        self._key_places = arrays["key_places"]
+        self._keys = arrays["keys"]
+        self._label_offsets = arrays["label_offsets"]
+        self._labels = arrays["labels"]
+        self._latitudes = arrays["latitudes"]
+        self._longitudes = arrays["longitudes"]
+        self._populations = arrays["populations"]
+        self._tree_places = arrays["tree_places"]
+        self._tree_points = arrays["tree_points"]
+
+    @classmethod
+    def open(cls, path: Path) -> "Gazetteer":
+        """Memory-map an index file.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a gazetteer index
+        """
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self.place_count
+
+    def lookup(self, name: str) -> Place | None:
+        """Return the most populous place named ``name``, or None."""
+        return self._exact(normalize_name(name).encode())
+
+    def prefix(self, text: str, limit: int = 5, scan: int = 1000) -> list[Place]:
+        """Return the most populous places with a name starting with ``text``.
+
+        Args:
+            text: Start of a place name
+            limit: Maximum number of places returned
+            scan: Maximum number of names considered
+        """
+        key = normalize_name(text).encode()
+        if not key:
+            return []
+        found: dict[int, int] = {}
+        start = self._lower_bound(key)
+        for index in range(start, min(start + scan, self.key_count)):
+            if not self._key(index).startswith(key):
+                break
+            place = self._key_places[index]
+            found.setdefault(place, self._populations[place])
+        return self._ranked(found, limit)
+
+    def fuzzy(self, name: str, limit: int = 5) -> list[Place]:
+        """Return the most populous places named one typo away from ``name``."""
+        found: dict[int, int] = {}
+        for candidate in _edits(normalize_name(name)):
+            key = candidate.encode()
+            index = self._lower_bound(key)
+            if index < self.key_count and self._key(index) == key:
+                place = self._key_places[index]
+                found.setdefault(place, self._populations[place])
+        return self._ranked(found, limit)
+
+    def suggest(self, name: str, limit: int = 5) -> list[Place]:
+        """Return likely intended places for an unknown name."""
+        suggestions = self.fuzzy(name, limit) + self.prefix(name, limit)
+        return list(dict.fromkeys(suggestions))[:limit]
+
+    def nearest(self, latitude: float, longitude: float) -> tuple[Place, float] | None:
+        """Return the place closest to coordinates and its distance in km."""
+        if not self.place_count:
+            return None
+
+        query = unit_vector(latitude, longitude)
+        points = self._tree_points
+        best = [math.inf, 0]
+
+        def search(lo: int, hi: int, depth: int) -> None:
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            x, y, z = points[3 * mid], points[3 * mid + 1], points[3 * mid + 2]
+            distance = (x - query[0]) ** 2 + (y - query[1]) ** 2 + (z - query[2]) ** 2
+            if distance < best[0]:
+                best[0], best[1] = distance, mid
+            axis = depth % 3
+            diff = query[axis] - points[3 * mid + axis]
+            near, far = (
+                ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+            )
+            search(*near, depth + 1)
+            # Only cross the splitting plane if it is closer than the best
+            if diff * diff < best[0]:
+                search(*far, depth + 1)
+
+        search(0, self.place_count, 0)
+        chord = math.sqrt(best[0])
+        km = 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+        return self._place(self._tree_places[int(best[1])]), km
+
+    def _key(self, index: int) -> bytes:
+        return self._keys[
+            self._key_offsets[index] : self._key_offsets[index + 1]
+        ].tobytes()
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self.key_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _exact(self, key: bytes) -> Place | None:
+        index = self._lower_bound(key)
+        if index < self.key_count and self._key(index) == key:
+            return self._place(self._key_places[index])
+        return None
+
+    def _place(self, place: int) -> Place:
+        start, end = self._label_offsets[place], self._label_offsets[place + 1]
+        return Place(
+            name=self._labels[start:end].tobytes().decode(),
+            latitude=self._latitudes[place],
+            longitude=self._longitudes[place],
+            population=self._populations[place],
+        )
+
+    def _ranked(self, found: dict[int, int], limit: int) -> list[Place]:
+        return [
+            self._place(p) for p in heapq.nlargest(limit, found, key=found.__getitem__)
+        ]
+
+
+def index_path(source: Path) -> Path:
+    """Return the cache location of the index built from ``source``."""
+    stat = source.stat()
+    digest = hashlib.sha256(
+        f"{source.resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{MAGIC!r}".encode()
+    ).hexdigest()[:16]
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "mcp-server-client" / f"gazetteer-{digest}.idx"
+
+
+@functools.cache
+def load_gazetteer(source: Path | None = None) -> Gazetteer:
+    """Open the index for a dataset, building it on first use.
+
+    Args:
+        source: GeoNames style dump (defaults to MCP_GAZETTEER, then the
+            bundled dataset)
+    """
+    source = source or Path(os.environ.get("MCP_GAZETTEER") or BUNDLED_DATASET)
+    path = index_path(source)
+    try:
+        return Gazetteer.open(path)
+    except (OSError, ValueError):
+        pass
+
+    logger.info("Building gazetteer index from %s", source)
+    data = build_index(read_geonames(source))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        return Gazetteer.open(path)
+    except OSError as e:
+        logger.warning("Could not write gazetteer index %s: %s", path, e)
+        return Gazetteer(data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a gazetteer index")
+    parser.add_argument("source", type=Path, help="GeoNames dump, plain or gzip")
+    args = parser.parse_args()
+    gazetteer = load_gazetteer(args.source)
+    print(f"{len(gazetteer)} places indexed at {index_path(args.source)}")
@@ -0,0 +1,86 @@
+"""Uvicorn runner that drains in-flight tool calls before shutting down.
+
+Imported only for the network transports, so stdio servers do not pay for
+importing uvicorn.
+"""
+
+import socket
+from types import FrameType
+
+import uvicorn
+from sse_starlette.sse import AppStatus
+from starlette.applications import Starlette
+
+from .lifecycle import ServerLifecycle
+
+# Seconds left for responses to flush once in-flight calls have drained.
+# Idle streamable HTTP GET streams never finish on their own.
+RESPONSE_FLUSH_SECONDS = 1
+
+
+class DrainingServer(uvicorn.Server):
+    """Uvicorn server that stops new tool calls as soon as a signal arrives.
+
+    Listening sockets are closed first, then in-flight calls get the rest of
+    the grace period. Uvicorn's own shutdown then closes the connections and
+    runs the app's lifespan shutdown.
+    """
+
+    def __init__(
+        self, config: uvicorn.Config, lifecycle: ServerLifecycle, grace_period: float
+    ):
+        super().__init__(config)
+        self.lifecycle = lifecycle
+        self.grace_period = grace_period
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        self.lifecycle.stop_accepting(self.grace_period)
+        # sse-starlette patches uvicorn.Server.handle_exit to end every SSE
+        # stream at once, which would cut off responses to in-flight calls.
+        # Use the original handler and end the streams after draining.
+        original = AppStatus.original_handler or uvicorn.Server.handle_exit
+        original(self, sig, frame)
+
+    async def shutdown(self, sockets: list[socket.socket] | None = None) -> None:
+        for server in self.servers:
+            server.close()
+        for sock in sockets or []:
+            sock.close()
+
+        if not self.force_exit:
+            await self.lifecycle.drain(self.grace_period)
+        end_sse_streams()
+        self.config.timeout_graceful_shutdown = RESPONSE_FLUSH_SECONDS
+        await super().shutdown(sockets)
+
+
+def end_sse_streams() -> None:
+    """Close open SSE streams, e.g. idle streamable HTTP GET streams."""
+    AppStatus.should_exit = True
+    if AppStatus.should_exit_event is not None:
+        AppStatus.should_exit_event.set()
+
+
+async def serve_http(
+    app: Starlette,
+    lifecycle: ServerLifecycle,
+    grace_period: float,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    sockets: list[socket.socket] | None = None,
+    log_level: str = "info",
+) -> None:
+    """Serve an ASGI app until a shutdown signal has been drained.
+
+    Args:
+        app: Starlette app built by the MCP server
+        lifecycle: Lifecycle tracking the app's tool calls
+        grace_period: Seconds in-flight calls get after a shutdown signal
+        host: Interface to bind when no sockets are given
+        port: Port to bind when no sockets are given
+        sockets: Already bound listening sockets, e.g. from a supervisor
+        log_level: Uvicorn log level
+    """
+    config = uvicorn.Config(app, host=host, port=port, log_level=log_level)
+    server = DrainingServer(config, lifecycle, grace_period)
+    await server.serve(sockets=sockets)
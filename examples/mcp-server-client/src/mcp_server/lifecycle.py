@@ -0,0 +1,76 @@
+"""Server lifecycle: in-flight call tracking and graceful draining.
+
+Every tool call runs inside ``ServerLifecycle.track``. On SIGTERM/SIGINT the
+server stops accepting calls (new ones fail fast with a retryable
+"overloaded" error), waits up to the grace period for in-flight calls to
+finish, and only then flushes state and closes resources. Rolling restarts
+therefore do not fail requests that were already being served.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Default seconds in-flight calls get to finish after a shutdown signal
+DEFAULT_GRACE_PERIOD = 25.0
+
+
+class ServerLifecycle:
+    """Tracks in-flight tool calls and coordinates draining on shutdown."""
+
+    def __init__(self, poll_interval: float = 0.05):
+        self.poll_interval = poll_interval
+        self.accepting = True
+        self.in_flight = 0
+        self._drain_deadline: float | None = None
+
+    @contextlib.contextmanager
+    def track(self) -> Iterator[None]:
+        """Count a tool call as in flight for the duration of the block."""
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def stop_accepting(self, grace_period: float = DEFAULT_GRACE_PERIOD) -> None:
+        """Refuse new calls and start the grace period for in-flight ones."""
+        if not self.accepting:
+            return
+        self.accepting = False
+        self._drain_deadline = time.monotonic() + grace_period
+        logger.info(
+            "Draining %d in-flight calls (grace period %.1fs)",
+            self.in_flight,
+            grace_period,
+        )
+
+    def drain_remaining(self) -> float:
+        """Seconds left in the grace period (0 when not draining)."""
+        if self._drain_deadline is None:
+            return 0.0
+        return max(self._drain_deadline - time.monotonic(), 0.0)
+
+    async def drain(self, grace_period: float = DEFAULT_GRACE_PERIOD) -> bool:
+        """Stop accepting calls and wait for in-flight ones to finish.
+
+        The grace period counts from the first call to ``stop_accepting``,
+        so draining again later does not extend it.
+
+        Returns:
+            True if all calls finished, False if the grace period ran out
+        """
+        self.stop_accepting(grace_period)
+        while self.in_flight and self.drain_remaining() > 0:
+            await asyncio.sleep(self.poll_interval)
+
+        if self.in_flight:
+            logger.warning(
+                "Grace period exceeded, abandoning %d in-flight calls", self.in_flight
+            )
+            return False
+        return True
@@ -0,0 +1,466 @@
+"""In-process instrumentation for MCP server tools.
+
+Every tool owns a ``ToolMetrics`` instance holding a fixed-bucket latency
+histogram, success/error counters and an in-flight gauge. Updates happen on the
+event loop thread with plain integer arithmetic, so no locks are needed.
+
+When several worker processes serve the same socket, each worker exports its
+snapshot to a shared directory and renders the merged view of all workers.
+"""
+
+import copy
+import json
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .admission import AdmissionController
+    from .cache import ResultCache
+    from .disk_cache import DiskCache
+    from .outbound import UpstreamPool
+    from .prewarm import Prewarmer
+    from .singleflight import SingleFlight
+
+# Upper bounds in seconds, Prometheus style. The implicit last bucket is +Inf.
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# (series suffix, Prometheus type, help) for cache statistics
+CACHE_SERIES: tuple[tuple[str, str, str], ...] = (
+    ("hits_total", "counter", "Cache lookups served from the cache."),
+    ("stale_hits_total", "counter", "Expired entries served while refreshing."),
+    ("misses_total", "counter", "Cache lookups that missed or had expired."),
+    ("evictions_total", "counter", "Entries evicted by the LRU size bounds."),
+    ("entries", "gauge", "Entries currently cached."),
+    ("size_bytes", "gauge", "Approximate memory held by cached entries."),
+)
+
+# (series suffix, stat, Prometheus type, help) for admission statistics
+ADMISSION_SERIES: tuple[tuple[str, str, str, str], ...] = (
+    ("queue_depth", "queue_depth", "gauge", "Tool calls waiting for a slot."),
+    ("active", "active", "gauge", "Tool calls holding an execution slot."),
+    ("rejected_total", "rejected", "counter", "Calls shed because the queue was full."),
+    ("timeouts_total", "timeouts", "counter", "Calls shed after waiting too long."),
+)
+
+# (series suffix, stat, Prometheus type, help) for single-flight statistics
+COALESCING_SERIES: tuple[tuple[str, str, str, str], ...] = (
+    ("upstream_in_flight", "in_flight", "gauge", "Shared upstream calls running."),
+    ("upstream_calls_total", "flights", "counter", "Upstream calls started."),
+    (
+        "coalesced_total",
+        "coalesced",
+        "counter",
+        "Calls that joined an upstream call already in flight.",
+    ),
+)
+
+# (series suffix, stat, Prometheus type, help) for prewarming statistics
+PREWARM_SERIES: tuple[tuple[str, str, str, str], ...] = (
+    ("tracked_keys", "tracked", "gauge", "Keys whose request rate is tracked."),
+    ("refreshes_total", "refreshes", "counter", "Entries refreshed before expiry."),
+    ("failures_total", "failures", "counter", "Prewarm refreshes that failed."),
+    (
+        "deferred_total",
+        "deferred",
+        "counter",
+        "Due refreshes skipped to stay within the upstream budget.",
+    ),
+    (
+        "hits_total",
+        "hits",
+        "counter",
+        "Fresh cache hits that would have been stale or missed without prewarming.",
+    ),
+)
+
+# (series suffix, stat, Prometheus type, help) for outbound HTTP statistics
+HTTP_SERIES: tuple[tuple[str, str, str, str], ...] = (
+    ("requests_total", "requests", "counter", "Outbound HTTP attempts sent."),
+    ("retries_total", "retries", "counter", "Outbound HTTP attempts retried."),
+    ("failures_total", "failures", "counter", "Attempts failing with 5xx or errors."),
+    ("in_flight", "in_flight", "gauge", "Outbound HTTP requests awaiting an answer."),
+    (
+        "connections_opened_total",
+        "connections_opened",
+        "counter",
+        "Connections opened to the host; flat while keep-alive reuses them.",
+    ),
+    ("breaker_open", "breaker_open", "gauge", "1 while the circuit breaker is open."),
+    ("breaker_opens_total", "breaker_opens", "counter", "Times the breaker opened."),
+    (
+        "breaker_rejected_total",
+        "breaker_rejected",
+        "counter",
+        "Requests failed fast by an open circuit breaker.",
+    ),
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Record a single observation."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        return estimate_quantile(self.buckets, self.counts, q)
+
+
+def estimate_quantile(
+    buckets: tuple[float, ...] | list[float], counts: list[int], q: float
+) -> float | None:
+    """Estimate quantile ``q`` from per-bucket (non-cumulative) counts."""
+    total = sum(counts)
+    if total == 0:
+        return None
+
+    rank = q * total
+    seen = 0
+    for index, bucket_count in enumerate(counts):
+        if bucket_count and seen + bucket_count >= rank:
+            lower = buckets[index - 1] if index > 0 else 0.0
+            if index >= len(buckets):
+                # Observations beyond the last bound: report the bound itself
+                return float(buckets[-1])
+            upper = buckets[index]
+            fraction = (rank - seen) / bucket_count
+            return lower + (upper - lower) * fraction
+        seen += bucket_count
+    return float(buckets[-1])
+
+
+class ToolMetrics:
+    """Latency, throughput and error metrics for a single tool."""
+
+    def __init__(self, name: str, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.latency = LatencyHistogram(buckets)
+        self.success = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    def start(self) -> float:
+        """Mark the start of a call and return its start timestamp."""
+        self.in_flight += 1
+        return time.perf_counter()
+
+    def finish(self, started: float, success: bool) -> None:
+        """Mark the end of a call started with ``start``."""
+        self.in_flight -= 1
+        self.latency.observe(time.perf_counter() - started)
+        if success:
+            self.success += 1
+        else:
+            self.errors += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a mergeable, JSON-serializable view of the metrics."""
+        return {
+            "success": self.success,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "latency": {
+                "buckets": list(self.latency.buckets),
+                "counts": list(self.latency.counts),
+                "sum": self.latency.sum,
+                "count": self.latency.count,
+            },
+        }
+
+
+class MetricsRegistry:
+    """Registry of per-tool metrics with Prometheus and JSON renderers."""
+
+    def __init__(self) -> None:
+        self._tools: dict[str, ToolMetrics] = {}
+        self._caches: dict[str, ResultCache | DiskCache] = {}
+        self._admission: dict[str, AdmissionController] = {}
+        self._coalescing: dict[str, SingleFlight] = {}
+        self._http: dict[str, UpstreamPool] = {}
+        self._prewarm: dict[str, Prewarmer] = {}
+        self.started_at = time.time()
+        # Directory shared with sibling worker processes, if any
+        self.shared_dir: Path | None = None
+
+    def tool(self, name: str) -> ToolMetrics:
+        """Get or create the metrics for a tool."""
+        metrics = self._tools.get(name)
+        if metrics is None:
+            metrics = self._tools[name] = ToolMetrics(name)
+        return metrics
+
+    def register_cache(self, name: str, cache: "ResultCache | DiskCache") -> None:
+        """Publish a cache's hit/miss/eviction statistics under ``name``."""
+        self._caches[name] = cache
+
+    def register_admission(self, name: str, controller: "AdmissionController") -> None:
+        """Publish a tool's queue depth and load shedding statistics."""
+        self._admission[name] = controller
+
+    def register_coalescing(self, name: str, group: "SingleFlight") -> None:
+        """Publish a tool's upstream call coalescing statistics."""
+        self._coalescing[name] = group
+
+    def register_http(self, name: str, upstreams: "UpstreamPool") -> None:
+        """Publish a tool's per-host outbound HTTP pool and breaker statistics."""
+        self._http[name] = upstreams
+
+    def register_prewarm(self, name: str, prewarmer: "Prewarmer") -> None:
+        """Publish a tool's background refresh statistics."""
+        self._prewarm[name] = prewarmer
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return raw metrics for every registered tool and cache."""
+        return {
+            "started_at": self.started_at,
+            "tools": {name: m.snapshot() for name, m in self._tools.items()},
+            "caches": {name: c.stats() for name, c in self._caches.items()},
+            "admission": {name: a.stats() for name, a in self._admission.items()},
+            "coalescing": {name: g.stats() for name, g in self._coalescing.items()},
+            "http": {name: u.stats() for name, u in self._http.items()},
+            "prewarm": {name: p.stats() for name, p in self._prewarm.items()},
+        }
+
+    def export(self) -> None:
+        """Write this process's snapshot into the shared directory."""
+        if self.shared_dir is None:
+            return
+        path = self.shared_dir / f"worker-{os.getpid()}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.snapshot()))
+        tmp_path.replace(path)
+
+    def aggregate(self) -> dict[str, Any]:
+        """Return metrics merged across all workers sharing ``shared_dir``."""
+        if self.shared_dir is None:
+            return self.snapshot()
+        self.export()
+        return merge_snapshots(load_snapshots(self.shared_dir))
+
+    def render_json(self) -> str:
+        """Render metrics as JSON including derived percentiles and rates."""
+        return render_json(self.aggregate())
+
+    def render_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        return render_prometheus(self.aggregate())
+
+
+def load_snapshots(directory: Path) -> list[dict[str, Any]]:
+    """Load every worker snapshot from a shared metrics directory."""
+    snapshots = []
+    for path in sorted(directory.glob("worker-*.json")):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            # Worker exited or is mid-write; skip it for this scrape
+            continue
+    return snapshots
+
+
+def merge_snapshots(snapshots: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge registry snapshots from several processes into one."""
+    merged: dict[str, Any] = {
+        "started_at": min((s["started_at"] for s in snapshots), default=time.time()),
+        "tools": {},
+        "caches": {},
+        "admission": {},
+        "coalescing": {},
+        "http": {},
+        "prewarm": {},
+    }
+    for snapshot in snapshots:
+        for section in ("caches", "admission", "coalescing", "prewarm"):
+            for name, stats in snapshot.get(section, {}).items():
+                totals = merged[section].setdefault(name, dict.fromkeys(stats, 0))
+                for key, value in stats.items():
+                    totals[key] = totals.get(key, 0) + value
+        for name, hosts in snapshot.get("http", {}).items():
+            merged_hosts = merged["http"].setdefault(name, {})
+            for host, stats in hosts.items():
+                totals = merged_hosts.setdefault(host, dict.fromkeys(stats, 0))
+                for key, value in stats.items():
+                    totals[key] = totals.get(key, 0) + value
+        for name, data in snapshot["tools"].items():
+            target = merged["tools"].get(name)
+            if target is None:
+                merged["tools"][name] = copy.deepcopy(data)
+                continue
+            for key in ("success", "errors", "in_flight"):
+                target[key] += data[key]
+            latency, source = target["latency"], data["latency"]
+            latency["counts"] = [
+                a + b for a, b in zip(latency["counts"], source["counts"], strict=True)
+            ]
+            latency["sum"] += source["sum"]
+            latency["count"] += source["count"]
+    return merged
+
+
+def render_json(snapshot: dict[str, Any]) -> str:
+    """Render a registry snapshot as JSON with derived statistics."""
+    uptime = max(time.time() - snapshot["started_at"], 1e-9)
+    tools: dict[str, Any] = {}
+    for name, data in snapshot["tools"].items():
+        latency = data["latency"]
+        calls = data["success"] + data["errors"]
+        tools[name] = {
+            "calls": calls,
+            "success": data["success"],
+            "errors": data["errors"],
+            "in_flight": data["in_flight"],
+            "error_rate": data["errors"] / calls if calls else 0.0,
+            "throughput_per_second": calls / uptime,
+            "latency_seconds": {
+                "mean": latency["sum"] / latency["count"] if latency["count"] else None,
+                "p50": estimate_quantile(latency["buckets"], latency["counts"], 0.5),
+                "p90": estimate_quantile(latency["buckets"], latency["counts"], 0.9),
+                "p99": estimate_quantile(latency["buckets"], latency["counts"], 0.99),
+            },
+        }
+    caches: dict[str, Any] = {}
+    for name, stats in snapshot.get("caches", {}).items():
+        lookups = stats["hits"] + stats["misses"]
+        caches[name] = {
+            **stats,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+        }
+    return json.dumps(
+        {
+            "uptime_seconds": uptime,
+            "tools": tools,
+            "caches": caches,
+            "admission": snapshot.get("admission", {}),
+            "coalescing": snapshot.get("coalescing", {}),
+            "http": snapshot.get("http", {}),
+            "prewarm": snapshot.get("prewarm", {}),
+        },
+        indent=2,
+    )
+
+
+def render_prometheus(snapshot: dict[str, Any]) -> str:
+    """Render a registry snapshot in the Prometheus text format."""
+    lines = [
+        "# HELP mcp_tool_calls_total Completed tool calls by outcome.",
+        "# TYPE mcp_tool_calls_total counter",
+    ]
+    tools = snapshot["tools"]
+    for name, data in tools.items():
+        lines.append(
+            f'mcp_tool_calls_total{{tool="{name}",outcome="success"}} {data["success"]}'
+        )
+        lines.append(
+            f'mcp_tool_calls_total{{tool="{name}",outcome="error"}} {data["errors"]}'
+        )
+
+    lines += [
+        "# HELP mcp_tool_in_flight Tool calls currently executing.",
+        "# TYPE mcp_tool_in_flight gauge",
+    ]
+    for name, data in tools.items():
+        lines.append(f'mcp_tool_in_flight{{tool="{name}"}} {data["in_flight"]}')
+
+    lines += [
+        "# HELP mcp_tool_latency_seconds Tool call latency.",
+        "# TYPE mcp_tool_latency_seconds histogram",
+    ]
+    for name, data in tools.items():
+        latency = data["latency"]
+        cumulative = 0
+        for bound, count in zip(latency["buckets"], latency["counts"], strict=False):
+            cumulative += count
+            lines.append(
+                f'mcp_tool_latency_seconds_bucket{{tool="{name}",le="{bound}"}} '
+                f"{cumulative}"
+            )
+        lines.append(
+            f'mcp_tool_latency_seconds_bucket{{tool="{name}",le="+Inf"}} '
+            f"{latency['count']}"
+        )
+        lines.append(f'mcp_tool_latency_seconds_sum{{tool="{name}"}} {latency["sum"]}')
+        lines.append(
+            f'mcp_tool_latency_seconds_count{{tool="{name}"}} {latency["count"]}'
+        )
+
+    caches = snapshot.get("caches", {})
+    for stat, kind, help_text in CACHE_SERIES:
+        lines += [
+            f"# HELP mcp_cache_{stat} {help_text}",
+            f"# TYPE mcp_cache_{stat} {kind}",
+        ]
+        for name, stats in caches.items():
+            key = stat.removesuffix("_total")
+            lines.append(f'mcp_cache_{stat}{{cache="{name}"}} {stats[key]}')
+
+    admission = snapshot.get("admission", {})
+    for suffix, key, kind, help_text in ADMISSION_SERIES:
+        lines += [
+            f"# HELP mcp_tool_{suffix} {help_text}",
+            f"# TYPE mcp_tool_{suffix} {kind}",
+        ]
+        for name, stats in admission.items():
+            lines.append(f'mcp_tool_{suffix}{{tool="{name}"}} {stats[key]}')
+
+    coalescing = snapshot.get("coalescing", {})
+    for suffix, key, kind, help_text in COALESCING_SERIES:
+        lines += [
+            f"# HELP mcp_tool_{suffix} {help_text}",
+            f"# TYPE mcp_tool_{suffix} {kind}",
+        ]
+        for name, stats in coalescing.items():
+            lines.append(f'mcp_tool_{suffix}{{tool="{name}"}} {stats[key]}')
+
+    prewarm = snapshot.get("prewarm", {})
+    for suffix, key, kind, help_text in PREWARM_SERIES:
+        lines += [
+            f"# HELP mcp_prewarm_{suffix} {help_text}",
+            f"# TYPE mcp_prewarm_{suffix} {kind}",
+        ]
+        for name, stats in prewarm.items():
+            lines.append(f'mcp_prewarm_{suffix}{{tool="{name}"}} {stats[key]}')
+
+    http = snapshot.get("http", {})
+    for suffix, key, kind, help_text in HTTP_SERIES:
+        lines += [
+            f"# HELP mcp_http_{suffix} {help_text}",
+            f"# TYPE mcp_http_{suffix} {kind}",
+        ]
+        for name, hosts in http.items():
+            for host, stats in hosts.items():
+                lines.append(
+                    f'mcp_http_{suffix}{{tool="{name}",host="{host}"}} {stats[key]}'
+                )
+
+    return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by all tools
+registry = MetricsRegistry()
@@ -3,13 +3,25 @@
 from .requests import (
     DateTimeRequest,
     DateTimeResponse,
+    DiceBatchRequest,
+    DiceBatchResponse,
+    DiceDistributionRequest,
+    DiceDistributionResponse,
+    DiceGroupRoll,
+    DiceNotationRequest,
     DiceRollRequest,
     DiceRollResponse,
+    DiceRollSummary,
+    DiceStreamOptions,
+    ForecastRequest,
     MCPError,
     MCPRequest,
     MCPResponse,
     ToolCallRequest,
     ToolCallResponse,
+    WeatherBatchItem,
+    WeatherBatchRequest,
+    WeatherBatchResponse,
     WeatherRequest,
     WeatherResponse,
 )
@@ -17,13 +29,25 @@ from .requests import (
 __all__ = [
     "DateTimeRequest",
     "DateTimeResponse",
+    "DiceBatchRequest",
+    "DiceBatchResponse",
+    "DiceDistributionRequest",
+    "DiceDistributionResponse",
+    "DiceGroupRoll",
+    "DiceNotationRequest",
     "DiceRollRequest",
     "DiceRollResponse",
+    "DiceRollSummary",
+    "DiceStreamOptions",
+    "ForecastRequest",
     "MCPError",
     "MCPRequest",
     "MCPResponse",
     "ToolCallRequest",
     "ToolCallResponse",
+    "WeatherBatchItem",
+    "WeatherBatchRequest",
+    "WeatherBatchResponse",
     "WeatherRequest",
     "WeatherResponse",
 ]
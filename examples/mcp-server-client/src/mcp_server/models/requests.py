@@ -1,9 +1,10 @@
 """Pydantic models for MCP server request/response validation."""
 
-import re
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from ..dice_notation import compile_notation
 
 
 class MCPRequest(BaseModel):
@@ -32,54 +33,169 @@ class MCPError(BaseModel):
     data: dict | None = None
 
 
-class DiceRollRequest(BaseModel):
-    """Dice roll tool request with notation validation."""
+class DiceNotationRequest(BaseModel):
+    """Dice expression request with notation validation."""
 
-    notation: str = Field(..., description="Dice notation like '2d6' or '1d20'")
+    notation: str = Field(
+        ..., description="Dice notation like '2d6', '4d6kh3' or '1d20+5'"
+    )
 
     @field_validator("notation")
     @classmethod
     def validate_notation(cls, v: str) -> str:
-        """Validate dice notation format."""
+        """Validate dice notation against the expression grammar and limits."""
         if not isinstance(v, str):
             raise ValueError("Notation must be a string")
 
-        # Remove spaces and convert to lowercase
-        notation = v.strip().lower()
+        # Raises ValueError for malformed expressions and exceeded limits
+        compile_notation(v)
+
+        return v.strip().lower()
+
+
+class DiceStreamOptions(BaseModel):
+    """Choice of the random stream a call's dice are drawn from."""
+
+    seed: int | None = Field(
+        None,
+        ge=0,
+        le=2**64 - 1,
+        description="Restart this session's dice stream from a seed, so the "
+        "rolls that follow can be replayed",
+    )
+    secure: bool = Field(
+        False,
+        description="Draw the dice from the system's cryptographic random "
+        "source, for fair play",
+    )
+
+    @model_validator(mode="after")
+    def validate_stream(self) -> "DiceStreamOptions":
+        """Reject seeded secure rolls, which would be predictable."""
+        if self.secure and self.seed is not None:
+            raise ValueError("Secure rolls cannot be seeded")
+        return self
 
-        # Validate format using regex
-        pattern = re.compile(r"^(\d+)d(\d+)$")
-        match = pattern.match(notation)
 
-        if not match:
-            raise ValueError(
-                f"Invalid dice notation: '{v}'. "
-                f"Expected format: 'XdY' (e.g., '2d6', '1d20')"
-            )
+class DiceRollRequest(DiceStreamOptions, DiceNotationRequest):
+    """Dice roll tool request."""
 
-        dice_count = int(match.group(1))
-        sides = int(match.group(2))
 
-        # Validate reasonable limits
-        if dice_count <= 0:
-            raise ValueError("Dice count must be greater than 0")
-        if dice_count > 100:
-            raise ValueError("Dice count must not exceed 100")
+class DiceRollSummary(BaseModel):
+    """Summary statistics of a roll too large to list every die."""
+
+    count: int = Field(..., description="Number of dice counted")
+    minimum: int = Field(..., description="Lowest counted die")
+    maximum: int = Field(..., description="Highest counted die")
+    mean: float = Field(..., description="Average counted die")
+    histogram: list[int] = Field(
+        ...,
+        description="How often each result was counted, from 1 to the number "
+        "of sides or the highest exploded result",
+    )
 
-        if sides <= 0:
-            raise ValueError("Number of sides must be greater than 0")
-        if sides > 1000:
-            raise ValueError("Number of sides must not exceed 1000")
 
-        return notation
+class DiceGroupRoll(BaseModel):
+    """Result of one group of dice in an expression."""
+
+    notation: str = Field(..., description="Canonical notation of the group")
+    sign: int = Field(..., description="1 if the group is added, -1 if subtracted")
+    values: list[int] = Field(
+        default_factory=list,
+        description="Counted dice, empty for summarized groups",
+    )
+    dropped: list[int] = Field(
+        default_factory=list, description="Dice rolled but not kept"
+    )
+    total: int = Field(..., description="Sum of the counted dice")
+    summary: DiceRollSummary | None = Field(
+        None, description="Statistics instead of values for very large groups"
+    )
 
 
 class DiceRollResponse(BaseModel):
     """Dice roll tool response."""
 
-    values: list[int] = Field(..., description="Individual dice roll results")
-    total: int = Field(..., description="Sum of all dice rolls")
+    values: list[int] = Field(
+        default_factory=list,
+        description="Counted dice of every group, empty for summarized rolls",
+    )
+    total: int = Field(..., description="Result of the whole expression")
     notation: str = Field(..., description="Original dice notation")
+    summary: DiceRollSummary | None = Field(
+        None, description="Statistics instead of values for very large rolls"
+    )
+    dropped: list[int] = Field(
+        default_factory=list, description="Dice rolled but not kept"
+    )
+    modifier: int = Field(0, description="Sum of the constants in the expression")
+    groups: list[DiceGroupRoll] = Field(
+        default_factory=list,
+        description="Per group results for expressions with several dice groups",
+    )
+
+
+class DiceNotationsRequest(BaseModel):
+    """Batch of dice expressions, each rolled several times."""
+
+    notations: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Dice notations like '1d20+5', up to 1000",
+    )
+    repeat: int = Field(1, ge=1, le=10_000, description="Times each notation is rolled")
+
+    @model_validator(mode="after")
+    def validate_rolls(self) -> "DiceNotationsRequest":
+        """Bound the number of totals returned."""
+        rolls = len(self.notations) * self.repeat
+        if rolls > 100_000:
+            raise ValueError(f"Batch must not exceed 100000 rolls, got {rolls}")
+        return self
+
+
+class DiceBatchRequest(DiceStreamOptions, DiceNotationsRequest):
+    """Batch dice roll tool request."""
+
+
+class DiceBatchResponse(BaseModel):
+    """Batch dice roll tool response, as one row of totals per notation."""
+
+    notations: list[str] = Field(..., description="Notations in request order")
+    repeat: int = Field(..., description="Times each notation was rolled")
+    totals: list[list[int]] = Field(
+        ..., description="Totals of each notation's rolls, in request order"
+    )
+
+
+class DiceDistributionRequest(DiceNotationRequest):
+    """Dice distribution tool request, validated like a roll."""
+
+
+class DiceDistributionResponse(BaseModel):
+    """Exact outcome distribution of a dice expression."""
+
+    notation: str = Field(..., description="Original dice notation")
+    minimum: int = Field(..., description="Lowest possible total")
+    maximum: int = Field(..., description="Highest possible total")
+    mean: float = Field(..., description="Expected total")
+    variance: float = Field(..., description="Variance of the total")
+    std_dev: float = Field(..., description="Standard deviation of the total")
+    percentiles: dict[str, int] = Field(
+        ..., description="Smallest total reaching each percentile, e.g. 'p50'"
+    )
+    start: int = Field(..., description="First total of the first pmf and cdf point")
+    end: int = Field(..., description="Last total of the last pmf and cdf point")
+    step: int = Field(
+        1,
+        description="Totals per point; above 1, each point sums a bin of totals "
+        "and negligible tails are left out",
+    )
+    pmf: list[float] = Field(..., description="Probability of each total or bin")
+    cdf: list[float] = Field(
+        ..., description="Probability of at most the last total of each point"
+    )
 
 
 class WeatherRequest(BaseModel):
@@ -110,6 +226,78 @@ class WeatherResponse(BaseModel):
     wind_speed: float = Field(..., description="Wind speed in km/h")
     humidity: float | None = Field(None, description="Humidity percentage")
     timestamp: str | None = Field(None, description="Data timestamp")
+    place: str | None = Field(None, description="Nearest named place to coordinates")
+
+
+class WeatherBatchRequest(BaseModel):
+    """Batch weather tool request for several locations."""
+
+    locations: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="City names or coordinates (lat,lon), up to 100",
+    )
+
+    @field_validator("locations")
+    @classmethod
+    def validate_locations(cls, v: list[str]) -> list[str]:
+        """Validate that every location is non-empty."""
+        locations = [location.strip() for location in v]
+        if not all(locations):
+            raise ValueError("Locations cannot be empty")
+
+        return locations
+
+
+class WeatherBatchItem(BaseModel):
+    """Weather or error for one location of a batch."""
+
+    location: str = Field(..., description="Requested location")
+    weather: WeatherResponse | None = Field(None, description="Weather data")
+    error: str | None = Field(None, description="Why the lookup failed")
+
+
+class WeatherBatchResponse(BaseModel):
+    """Batch weather tool response, in request order."""
+
+    results: list[WeatherBatchItem] = Field(..., description="Per-location results")
+
+    @property
+    def failed(self) -> int:
+        """Number of locations without weather data."""
+        return sum(1 for item in self.results if item.error is not None)
+
+
+class ForecastRequest(BaseModel):
+    """Forecast tool request for an hourly or daily horizon."""
+
+    location: str = Field(..., description="City name or coordinates (lat,lon)")
+    hours: int | None = Field(
+        None, ge=1, le=384, description="Hourly forecast for this many hours"
+    )
+    days: int | None = Field(
+        None, ge=1, le=16, description="Daily forecast for this many days"
+    )
+
+    @field_validator("location")
+    @classmethod
+    def validate_location(cls, v: str) -> str:
+        """Validate location format."""
+        location = v.strip()
+        if not location:
+            raise ValueError("Location cannot be empty")
+
+        return location
+
+    @model_validator(mode="after")
+    def validate_horizon(self) -> "ForecastRequest":
+        """Allow hours or days, defaulting to 24 hours."""
+        if self.hours is not None and self.days is not None:
+            raise ValueError("Give either hours or days, not both")
+        if self.hours is None and self.days is None:
+            self.hours = 24
+        return self
 
 
 class DateTimeRequest(BaseModel):
@@ -0,0 +1,223 @@
+"""Outbound HTTP policies: connection pooling, retries and circuit breaking.
+
+``AsyncHttpMixin`` builds its pooled client from an ``HttpPolicy`` and sends
+every request through ``make_request``, which retries transient failures and
+consults a per-host ``CircuitBreaker``:
+
+- Connection failures are retried for any method, since the request never
+  reached the server. Timeouts and 429/5xx responses are only retried for
+  idempotent methods, or requests the caller marks as idempotent.
+- Retries back off exponentially with full jitter, honour ``Retry-After``
+  and never sleep past the call's deadline.
+- After ``failure_threshold`` consecutive failures a host's breaker opens and
+  requests fail fast for ``reset_timeout`` seconds. A single probe request
+  then decides whether it closes again.
+
+HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``);
+without it clients fall back to HTTP/1.1.
+"""
+
+import importlib.util
+import random
+import time
+from dataclasses import dataclass
+from typing import Any
+
+# Methods that may be repeated without changing the outcome (RFC 9110)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+# Responses worth retrying: rate limited or a temporarily failing upstream
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Port of each scheme when a URL does not give one
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass(frozen=True)
+class HttpPolicy:
+    """Declarative connection pool settings for a tool's HTTP client.
+
+    Attributes:
+        max_connections: Connections open at once, across all hosts
+        max_keepalive_connections: Idle connections kept for reuse
+        keepalive_expiry: Seconds an idle connection is kept
+        connect_timeout: Seconds allowed to establish a connection
+        http2: Multiplex requests over HTTP/2 when ``h2`` is installed
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    http2: bool = True
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Declarative retry limits for outbound requests.
+
+    Attributes:
+        attempts: Tries per request, including the first; 1 disables retries
+        base_delay: Upper bound in seconds of the first backoff
+        max_delay: Longest backoff; a longer ``Retry-After`` is not waited for
+    """
+
+    attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+
+    def backoff(self, attempt: int) -> float:
+        """Return a full-jitter delay before retrying after ``attempt`` tries."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+@dataclass(frozen=True)
+class BreakerPolicy:
+    """Declarative circuit breaker thresholds for each upstream host.
+
+    Attributes:
+        failure_threshold: Consecutive failures that open the breaker
+        reset_timeout: Seconds to fail fast before probing the host again
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+
+def http2_available() -> bool:
+    """Whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header given in seconds, if present."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        # HTTP dates are rare for 429/503 and not worth a parser here
+        return None
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker counting consecutive failures."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, policy: BreakerPolicy):
+        self.policy = policy
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self.rejected = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now.
+
+        While open, requests are rejected until ``reset_timeout`` has passed;
+        then exactly one probe is let through at a time.
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.policy.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+        if self._probing:
+            self.rejected += 1
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after the host answered."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold."""
+        self.failures += 1
+        self._probing = False
+        if self.state == self.OPEN:
+            return
+        if (
+            self.state == self.HALF_OPEN
+            or self.failures >= self.policy.failure_threshold
+        ):
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.opens += 1
+
+    def abandon(self) -> None:
+        """Forget a request that ended without an outcome, e.g. cancelled."""
+        self._probing = False
+
+
+class UpstreamHost:
+    """Circuit breaker and request statistics for one upstream host."""
+
+    def __init__(self, origin: tuple[str, str, int], policy: BreakerPolicy):
+        self.origin = origin
+        self.breaker = CircuitBreaker(policy)
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.connections_opened = 0
+
+    async def trace(self, event: str, info: dict[str, Any]) -> None:
+        """Count new connections; an httpx ``trace`` request extension."""
+        if event == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+
+    @property
+    def name(self) -> str:
+        """The origin as a URL, with the port only if not the default."""
+        scheme, host, port = self.origin
+        if port == DEFAULT_PORTS.get(scheme):
+            return f"{scheme}://{host}"
+        return f"{scheme}://{host}:{port}"
+
+    def stats(self) -> dict[str, int]:
+        """Return request and breaker statistics."""
+        return {
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "connections_opened": self.connections_opened,
+            "breaker_open": int(self.breaker.state != CircuitBreaker.CLOSED),
+            "breaker_opens": self.breaker.opens,
+            "breaker_rejected": self.breaker.rejected,
+        }
+
+
+class UpstreamPool:
+    """Per-host state of one HTTP client."""
+
+    def __init__(self, policy: BreakerPolicy):
+        self.policy = policy
+        # Keyed by (scheme, host, port), so ports and schemes of one host
+        # get breakers of their own
+        self.hosts: dict[tuple[str, str, int], UpstreamHost] = {}
+
+    def host(self, scheme: str, host: str, port: int | None) -> UpstreamHost:
+        """Get or create the state for a request's host."""
+        if port is None:
+            port = DEFAULT_PORTS.get(scheme, 80)
+        origin = (scheme, host, port)
+        upstream = self.hosts.get(origin)
+        if upstream is None:
+            upstream = self.hosts[origin] = UpstreamHost(origin, self.policy)
+        return upstream
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return statistics per host."""
+        return {upstream.name: upstream.stats() for upstream in self.hosts.values()}
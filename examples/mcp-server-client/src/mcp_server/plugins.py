@@ -0,0 +1,237 @@
+"""Tool plugin discovery via Python entry points.
+
+Tools are ``BaseTool`` subclasses that declare a pydantic ``request_model``.
+They are registered under the ``mcp_server.tools`` entry point group, e.g. in
+a plugin's ``pyproject.toml``::
+
+    [project.entry-points."mcp_server.tools"]
+    get_tides = "tides_plugin.tool:TidesTool"
+
+Discovery imports each tool once to read its name, description and request
+schema, then caches the result in a manifest file. Later starts read the
+manifest instead of re-scanning packages, until installed packages or the
+built-in tool sources change. MCP tool signatures, CLI subcommands and GUI
+forms are all generated from the cached schemas.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Annotated, Any
+
+from pydantic import Field
+
+from .registry import ToolSpec, load_target
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "mcp_server.tools"
+
+# Built-in tools, also declared as entry points in pyproject.toml. Listed here
+# so a source checkout works without the package being installed.
+BUILTIN_TOOLS = {
+    "roll_dice": "src.mcp_server.tools.dice:DiceRollTool",
+    "roll_dice_batch": "src.mcp_server.tools.dice_batch:DiceBatchTool",
+    "dice_distribution": (
+        "src.mcp_server.tools.dice_distribution:DiceDistributionTool"
+    ),
+    "get_weather": "src.mcp_server.tools.weather:WeatherTool",
+    "get_weather_batch": "src.mcp_server.tools.weather_batch:WeatherBatchTool",
+    "get_forecast": "src.mcp_server.tools.forecast:ForecastTool",
+    "get_date": "src.mcp_server.tools.date_time:DateTimeTool",
+}
+
+MANIFEST_VERSION = 1
+
+PACKAGE_DIR = Path(__file__).parent
+
+_JSON_TYPES: dict[str, Any] = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "object": dict[str, Any],
+}
+
+
+def default_manifest_path() -> Path:
+    """Return the manifest location, overridable via MCP_TOOL_MANIFEST."""
+    if path := os.environ.get("MCP_TOOL_MANIFEST"):
+        return Path(path)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "mcp-server-client" / "tools-manifest.json"
+
+
+def fingerprint() -> str:
+    """Fingerprint the installed packages and built-in tool sources.
+
+    Installing or removing a distribution changes the modification time of
+    its ``sys.path`` directory, so stat calls are enough to detect it.
+    """
+    parts = []
+    for entry in sys.path:
+        try:
+            parts.append(f"{entry}:{os.stat(entry or '.').st_mtime_ns}")
+        except OSError:
+            continue
+    for directory in ("tools", "models"):
+        for path in sorted((PACKAGE_DIR / directory).glob("*.py")):
+            parts.append(f"{path}:{path.stat().st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def build_spec(target: str) -> ToolSpec:
+    """Import a tool class and describe it as a ToolSpec.
+
+    The class is only imported: tools declare ``name``, ``description`` and
+    ``request_model`` as class attributes, so constructors (which register
+    metrics and open caches) run only when the tool is first called.
+
+    Raises:
+        ValueError: If the tool does not declare a request model or name
+    """
+    tool_class = load_target(target)
+    request_model = getattr(tool_class, "request_model", None)
+    if request_model is None:
+        raise ValueError(f"Tool {target} does not declare a request_model")
+    if not getattr(tool_class, "name", None):
+        raise ValueError(f"Tool {target} does not declare a name")
+
+    return ToolSpec(
+        name=tool_class.name,
+        target=target,
+        description=tool_class.description,
+        input_schema=request_model.model_json_schema(),
+    )
+
+
+def scan_tools() -> list[ToolSpec]:
+    """Discover built-in and entry point tools by importing them."""
+    targets = dict(BUILTIN_TOOLS)
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        targets[entry_point.name] = entry_point.value
+
+    specs = []
+    for name, target in targets.items():
+        try:
+            specs.append(build_spec(target))
+        except Exception as e:
+            logger.error("Skipping tool plugin %s (%s): %s", name, target, e)
+    return specs
+
+
+def load_manifest(path: Path, expected_fingerprint: str) -> list[ToolSpec] | None:
+    """Load tool specs from a manifest if it is still valid."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+    if (
+        data.get("version") != MANIFEST_VERSION
+        or data.get("fingerprint") != expected_fingerprint
+    ):
+        return None
+    return [ToolSpec(**tool) for tool in data["tools"]]
+
+
+def save_manifest(path: Path, specs: list[ToolSpec], manifest_fingerprint: str) -> None:
+    """Write discovered tool specs to the manifest, ignoring write failures."""
+    data = {
+        "version": MANIFEST_VERSION,
+        "fingerprint": manifest_fingerprint,
+        "tools": [
+            {
+                "name": spec.name,
+                "target": spec.target,
+                "description": spec.description,
+                "input_schema": spec.input_schema,
+            }
+            for spec in specs
+        ],
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2))
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.warning("Could not write tool manifest %s: %s", path, e)
+
+
+def discover_tools(
+    manifest_path: Path | None = None, refresh: bool = False
+) -> list[ToolSpec]:
+    """Return tool specs from the manifest, re-scanning only when stale.
+
+    Args:
+        manifest_path: Manifest location (defaults to default_manifest_path())
+        refresh: Ignore any cached manifest and re-scan
+    """
+    path = manifest_path or default_manifest_path()
+    current = fingerprint()
+    if not refresh:
+        specs = load_manifest(path, current)
+        if specs is not None:
+            return specs
+
+    specs = scan_tools()
+    save_manifest(path, specs, current)
+    return specs
+
+
+def python_type(schema: dict[str, Any]) -> Any:
+    """Map a JSON schema fragment to a Python type annotation."""
+    if "anyOf" in schema:
+        options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+        annotation = python_type(options[0]) if len(options) == 1 else Any
+        if len(options) < len(schema["anyOf"]):
+            return annotation | None
+        return annotation
+    if schema.get("type") == "array":
+        return list[python_type(schema.get("items", {}))]  # type: ignore[misc]
+    return _JSON_TYPES.get(schema.get("type", ""), Any)
+
+
+def iter_fields(spec: ToolSpec) -> list[tuple[str, dict[str, Any], bool]]:
+    """Return (name, schema, required) for each input field of a tool."""
+    required = set(spec.input_schema.get("required", []))
+    return [
+        (name, schema, name in required)
+        for name, schema in spec.input_schema.get("properties", {}).items()
+    ]
+
+
+def build_signature(spec: ToolSpec) -> inspect.Signature:
+    """Build a function signature matching a tool's request schema."""
+    parameters = []
+    for name, schema, required in iter_fields(spec):
+        parameters.append(
+            inspect.Parameter(
+                name,
+                inspect.Parameter.KEYWORD_ONLY,
+                annotation=Annotated[
+                    python_type(schema), Field(description=schema.get("description"))
+                ],
+                default=inspect.Parameter.empty if required else schema.get("default"),
+            )
+        )
+    return inspect.Signature(parameters, return_annotation=dict[str, Any])
+
+
+def build_docstring(spec: ToolSpec) -> str:
+    """Build a Google style docstring from a tool's description and schema."""
+    lines = [spec.description]
+    fields = iter_fields(spec)
+    if fields:
+        lines += ["", "Args:"]
+        lines += [
+            f"    {name}: {schema.get('description', name)}"
+            for name, schema, _ in fields
+        ]
+    return "\n".join(lines)
@@ -0,0 +1,216 @@
+"""Background refresh of popular upstream data before it expires.
+
+Tools opt in by declaring a ``PrewarmPolicy`` and owning a ``Prewarmer``,
+which counts requests per cache key with exponential decay so popularity
+follows the traffic. The ``PrewarmScheduler`` runs in the server lifespan:
+every ``interval`` it asks each tool for its hottest keys whose entries
+expire within ``lead_time`` (or have already dropped out of the cache) and
+refreshes them, at most ``max_qps`` per second, so popular lookups keep
+hitting fresh entries instead of paying upstream latency.
+
+Due keys beyond the budget are counted as deferred. Lookups that were
+served fresh only because an entry was refreshed ahead of its old expiry
+are counted as prewarm hits, which is the hit rate gained.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for newly loaded tools to prewarm
+SCHEDULER_TICK = 1.0
+
+
+@dataclass(frozen=True)
+class PrewarmPolicy:
+    """Declarative prewarming policy for a tool.
+
+    Attributes:
+        top_k: Most requested keys kept warm
+        lead_time: Refresh entries expiring within this many seconds
+        max_qps: Upstream refreshes per second the scheduler may spend, > 0
+        interval: Seconds between checks for entries due for refresh
+        half_life: Seconds after which a request counts half as much
+        min_requests: Decayed request count a key needs to be kept warm; the
+            default of 1.5 skips one-off lookups but keeps keys requested
+            twice within about a half-life
+        max_tracked: Keys whose popularity is tracked before the least
+            popular are forgotten
+    """
+
+    top_k: int = 16
+    lead_time: float = 60.0
+    max_qps: float = 1.0
+    interval: float = 15.0
+    half_life: float = 1800.0
+    min_requests: float = 1.5
+    max_tracked: int = 1024
+
+    @property
+    def budget(self) -> int:
+        """Refreshes allowed per check."""
+        return max(1, int(self.max_qps * self.interval))
+
+
+class Prewarmer:
+    """Request popularity and prewarming statistics of one tool."""
+
+    def __init__(self, policy: PrewarmPolicy):
+        self.policy = policy
+        # key -> (decayed request count, monotonic time it was decayed to)
+        self._scores: dict[Hashable, tuple[float, float]] = {}
+        # key -> monotonic time its entry would have expired without prewarming
+        self._extended: dict[Hashable, float] = {}
+        self.refreshes = 0
+        self.failures = 0
+        self.deferred = 0
+        self.hits = 0
+
+    def _decayed(self, key: Hashable, now: float) -> float:
+        score, updated = self._scores[key]
+        decay: float = 0.5 ** ((now - updated) / self.policy.half_life)
+        return score * decay
+
+    def record(self, key: Hashable) -> None:
+        """Count a request for ``key``."""
+        now = time.monotonic()
+        score = self._decayed(key, now) if key in self._scores else 0.0
+        self._scores[key] = (score + 1.0, now)
+        if len(self._scores) > self.policy.max_tracked:
+            self._forget(now)
+
+    def record_hit(self, key: Hashable) -> None:
+        """Count a fresh cache hit, and whether prewarming made it fresh."""
+        extended = self._extended.get(key)
+        if extended is not None and time.monotonic() >= extended:
+            self.hits += 1
+
+    def hottest(self) -> list[Hashable]:
+        """Return up to ``top_k`` keys requested often enough, hottest first."""
+        now = time.monotonic()
+        scores = ((self._decayed(key, now), key) for key in self._scores)
+        top = heapq.nlargest(self.policy.top_k, scores, key=lambda item: item[0])
+        return [key for score, key in top if score >= self.policy.min_requests]
+
+    def due(
+        self, expires_in: Callable[[Hashable], float | None]
+    ) -> list[tuple[Hashable, float | None]]:
+        """Return hot keys expiring within ``lead_time``, hottest first.
+
+        Args:
+            expires_in: Seconds until a key's cache entry expires, negative
+                once stale, or None if it is not cached
+        """
+        due = []
+        for key in self.hottest():
+            remaining = expires_in(key)
+            if remaining is None or remaining <= self.policy.lead_time:
+                due.append((key, remaining))
+        return due
+
+    def refreshed(self, key: Hashable, previous_expires_in: float | None) -> None:
+        """Note that ``key`` was refreshed ahead of its previous expiry."""
+        self.refreshes += 1
+        self._extended[key] = time.monotonic() + max(previous_expires_in or 0.0, 0.0)
+
+    def _forget(self, now: float) -> None:
+        # Drop the least popular quarter at once so this stays amortized O(1)
+        keep = self.policy.max_tracked * 3 // 4
+        scores = {key: self._decayed(key, now) for key in self._scores}
+        for key in heapq.nsmallest(len(scores) - keep, scores, key=scores.__getitem__):
+            del self._scores[key]
+            self._extended.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        """Return prewarming statistics."""
+        return {
+            "tracked": len(self._scores),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "deferred": self.deferred,
+            "hits": self.hits,
+        }
+
+
+class Prewarmable(Protocol):
+    """Tool whose cached upstream data can be refreshed ahead of expiry."""
+
+    name: str
+    prewarmer: Prewarmer | None
+
+    def expires_in(self, key: Hashable) -> float | None:
+        """Seconds until ``key``'s entry expires, or None if not cached."""
+        ...
+
+    async def prewarm(self, key: Hashable) -> None:
+        """Refresh ``key``'s entry from upstream."""
+        ...
+
+
+class PrewarmScheduler:
+    """Runs one prewarming loop per loaded tool that has a ``Prewarmer``."""
+
+    def __init__(self, tools: Callable[[], Iterable[Any]]):
+        """Create a scheduler for the tools returned by ``tools``.
+
+        Args:
+            tools: Returns the currently loaded tools; tools loaded later are
+                picked up within ``SCHEDULER_TICK`` seconds
+        """
+        self.tools = tools
+        self._task: asyncio.Task[None] | None = None
+        self._loops: dict[str, asyncio.Task[None]] = {}
+
+    def start(self) -> None:
+        """Start scheduling in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop scheduling and wait for in-progress refreshes to be cancelled."""
+        tasks = [*self._loops.values(), *([self._task] if self._task else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._loops.clear()
+
+    async def run(self) -> None:
+        """Start a loop for every prewarmable tool as it is loaded."""
+        while True:
+            for tool in self.tools():
+                prewarmer = getattr(tool, "prewarmer", None)
+                if prewarmer is not None and tool.name not in self._loops:
+                    self._loops[tool.name] = asyncio.create_task(self.loop(tool))
+            await asyncio.sleep(SCHEDULER_TICK)
+
+    async def loop(self, tool: Prewarmable) -> None:
+        """Refresh a tool's due entries every ``interval`` seconds."""
+        assert tool.prewarmer is not None
+        while True:
+            await asyncio.sleep(tool.prewarmer.policy.interval)
+            await self.cycle(tool)
+
+    async def cycle(self, tool: Prewarmable) -> None:
+        """Refresh a tool's hottest due entries within the QPS budget."""
+        prewarmer = tool.prewarmer
+        assert prewarmer is not None
+        policy = prewarmer.policy
+        due = prewarmer.due(tool.expires_in)
+        prewarmer.deferred += max(len(due) - policy.budget, 0)
+        for index, (key, remaining) in enumerate(due[: policy.budget]):
+            if index:
+                await asyncio.sleep(1.0 / policy.max_qps)
+            try:
+                await tool.prewarm(key)
+            except Exception as e:
+                prewarmer.failures += 1
+                logger.warning("Prewarming %s for %s failed: %s", key, tool.name, e)
+            else:
+                prewarmer.refreshed(key, remaining)
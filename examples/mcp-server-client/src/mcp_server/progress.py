@@ -0,0 +1,48 @@
+"""Progress notifications from tool execution back to the calling client.
+
+Clients that want progress send a ``progressToken`` in the ``tools/call``
+request's ``_meta``. The server then stores a reporter for the request in a
+context variable, like the deadline, so tools can stream partial results
+with ``report`` without knowing about MCP sessions. Without a token no
+reporter is set; tools can check ``active`` to skip preparing updates that
+nobody would receive.
+"""
+
+import contextlib
+from collections.abc import Awaitable, Callable, Iterator
+from contextvars import ContextVar
+
+# Sends (progress, total, message) to the client, e.g. Context.report_progress
+Reporter = Callable[[float, float | None, str | None], Awaitable[None]]
+
+_reporter: ContextVar[Reporter | None] = ContextVar("mcp_progress", default=None)
+
+
+def active() -> bool:
+    """Whether the current call's client receives progress notifications."""
+    return _reporter.get() is not None
+
+
+async def report(
+    progress: float, total: float | None = None, message: str | None = None
+) -> None:
+    """Send a progress notification for the current call, if requested.
+
+    Args:
+        progress: Work done so far, increasing with every notification
+        total: Total amount of work, if known
+        message: Human readable update, e.g. a chunk of partial results
+    """
+    reporter = _reporter.get()
+    if reporter is not None:
+        await reporter(progress, total, message)
+
+
+@contextlib.contextmanager
+def scope(reporter: Reporter | None) -> Iterator[None]:
+    """Send the block's progress notifications through ``reporter``."""
+    token = _reporter.set(reporter)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
@@ -0,0 +1,85 @@
+"""Lazy tool registry for the MCP server.
+
+Tool schemas are registered with FastMCP up front, but each tool's
+implementation module is imported and its class instantiated only on the
+first call, so spawning a server does not pay for tools it never uses.
+"""
+
+import importlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .tools.base import BaseTool
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Where to find a tool implementation.
+
+    Attributes:
+        name: MCP tool name
+        target: Import path of the tool class as "module:ClassName"
+        description: Human readable description of the tool
+        input_schema: JSON schema of the tool's request model
+    """
+
+    name: str
+    target: str
+    description: str = ""
+    input_schema: dict[str, Any] = field(default_factory=dict)
+
+
+def load_target(target: str) -> Any:
+    """Import the object referenced by a "module:attribute" path."""
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class ToolRegistry:
+    """Registry that imports and constructs tools on first use."""
+
+    def __init__(self) -> None:
+        self._specs: dict[str, ToolSpec] = {}
+        self._instances: dict[str, BaseTool] = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    @property
+    def names(self) -> list[str]:
+        """Names of all registered tools."""
+        return list(self._specs)
+
+    def register(self, spec: ToolSpec) -> None:
+        """Register a tool by the import path of its class."""
+        self._specs[spec.name] = spec
+
+    def spec(self, name: str) -> ToolSpec:
+        """Return the spec of a registered tool."""
+        return self._specs[name]
+
+    def get(self, name: str) -> "BaseTool":
+        """Return the tool instance, importing and constructing it if needed.
+
+        Raises:
+            KeyError: If no tool with that name is registered
+        """
+        tool = self._instances.get(name)
+        if tool is None:
+            tool_class = load_target(self._specs[name].target)
+            tool = self._instances[name] = tool_class()
+        return tool
+
+    def is_loaded(self, name: str) -> bool:
+        """Check if a tool has already been constructed."""
+        return name in self._instances
+
+    def loaded(self) -> list["BaseTool"]:
+        """Return the tools constructed so far."""
+        return list(self._instances.values())
+
+    def load_all(self) -> None:
+        """Construct every registered tool, e.g. to warm a long-lived server."""
+        for name in self._specs:
+            self.get(name)
@@ -1,138 +1,393 @@
 """MCP server implementation with dice, weather, and date/time tools."""
 
+import functools
+import inspect
 import logging
+import signal
 import sys
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
-from mcp.server.fastmcp import FastMCP
-
-from src.mcp_server.tools.date_time import DateTimeTool
-from src.mcp_server.tools.dice import DiceRollTool
-from src.mcp_server.tools.weather import WeatherTool
+import anyio
+from mcp.server.fastmcp import Context, FastMCP
+from starlette.applications import Starlette
+
+from src.mcp_server import deadline, progress, session
+from src.mcp_server.lifecycle import DEFAULT_GRACE_PERIOD, ServerLifecycle
+from src.mcp_server.metrics import registry as metrics_registry
+from src.mcp_server.plugins import (
+    build_docstring,
+    build_signature,
+    discover_tools,
+    iter_fields,
+)
+from src.mcp_server.prewarm import PrewarmScheduler
+from src.mcp_server.registry import ToolRegistry, ToolSpec
+from src.mcp_server.structured_logging import configure_logging, stop_logging
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create MCP server instance
 mcp = FastMCP("dice-weather-datetime-server")
 
-# Initialize tool instances
-dice_tool = DiceRollTool()
-weather_tool = WeatherTool()
-datetime_tool = DateTimeTool()
-
-
-@mcp.tool()
-async def roll_dice(notation: str) -> dict[str, Any]:
-    """Roll dice using standard notation like '2d6' or '1d20'.
-
-    Args:
-        notation: Dice notation (e.g., "2d6", "1d20", "3d10")
-
-    Returns:
-        Dict containing dice roll results, total, and formatted display
-    """
-    logger.info(f"Tool call: roll_dice(notation='{notation}')")
-    return await dice_tool.safe_execute(notation=notation)
-
-
-@mcp.tool()
-async def get_weather(location: str) -> dict[str, Any]:
-    """Get current weather conditions for a location.
-
-    Args:
-        location: City name or coordinates (lat,lon)
-
-    Returns:
-        Dict containing weather data including temperature, condition, and wind speed
-    """
-    logger.info(f"Tool call: get_weather(location='{location}')")
-    return await weather_tool.safe_execute(location=location)
-
-
-@mcp.tool()
-async def get_date(timezone: str = "UTC") -> dict[str, Any]:
-    """Get current date and time for a specific timezone.
+# CLI transport names mapped to FastMCP transport identifiers
+TRANSPORTS = {
+    "stdio": "stdio",
+    "http": "streamable-http",
+    "sse": "sse",
+}
+
+# Tool implementations are discovered from entry points (cached in a
+# manifest), registered with FastMCP from their schemas and constructed on
+# first call
+tool_registry = ToolRegistry()
+tool_functions: dict[str, Callable[..., Awaitable[dict[str, Any]]]] = {}
+
+# Tracks in-flight calls so shutdown can drain them
+lifecycle = ServerLifecycle()
+
+# Refreshes popular cached upstream data of loaded tools before it expires
+prewarm_scheduler = PrewarmScheduler(tool_registry.loaded)
+
+# Module attributes kept for callers that use the tool instances directly
+_TOOL_ATTRIBUTES = {
+    "dice_tool": "roll_dice",
+    "weather_tool": "get_weather",
+    "datetime_tool": "get_date",
+}
+
+
+def request_timeout(ctx: Context | None) -> float | None:
+    """Return the time budget the client sent with the current request."""
+    if ctx is None:
+        return None
+    try:
+        meta = ctx.request_context.meta
+    except ValueError:
+        # Called outside of an MCP request
+        return None
+    return deadline.timeout_from_meta(meta)
 
-    Args:
-        timezone: Timezone identifier (e.g., "UTC", "America/New_York") or alias
 
-    Returns:
-        Dict containing current date/time in ISO 8601 format with timezone info
-    """
-    logger.info(f"Tool call: get_date(timezone='{timezone}')")
-    return await datetime_tool.safe_execute(timezone=timezone)
+def progress_reporter(ctx: Context | None) -> progress.Reporter | None:
+    """Return the progress sender for the current request, if it wants one."""
+    if ctx is None:
+        return None
+    try:
+        meta = ctx.request_context.meta
+    except ValueError:
+        # Called outside of an MCP request
+        return None
+    if meta is None or meta.progressToken is None:
+        return None
+    return ctx.report_progress
+
+
+def client_session(ctx: Context | None) -> Any:
+    """Return the MCP session the current request arrived on, if any."""
+    if ctx is None:
+        return None
+    try:
+        return ctx.request_context.session
+    except ValueError:
+        # Called outside of an MCP request
+        return None
+
+
+def make_tool_function(spec: ToolSpec) -> Callable[..., Awaitable[dict[str, Any]]]:
+    """Create the MCP tool function for a spec, typed from its request schema."""
+
+    async def call_tool(ctx: Context | None = None, **kwargs: Any) -> dict[str, Any]:
+        logger.info(
+            "Tool call: %s", spec.name, extra={"tool": spec.name, "arguments": kwargs}
+        )
+        tool = tool_registry.get(spec.name)
+        if not lifecycle.accepting:
+            from src.mcp_server.tools.base import ServerOverloadedError
+
+            return tool.create_error_response(
+                ServerOverloadedError(
+                    f"Server shutting down: {spec.name} is not accepting new "
+                    "calls. Please retry.",
+                    tool_name=spec.name,
+                    reason="shutting down",
+                )
+            )
+        with (
+            lifecycle.track(),
+            deadline.scope(request_timeout(ctx)),
+            progress.scope(progress_reporter(ctx)),
+            session.scope(client_session(ctx)),
+        ):
+            return await tool.safe_execute(**kwargs)
+
+    signature = build_signature(spec)
+    # FastMCP injects the request context into the parameter typed Context
+    context = inspect.Parameter(
+        "ctx", inspect.Parameter.KEYWORD_ONLY, annotation=Context, default=None
+    )
+    call_tool.__name__ = call_tool.__qualname__ = spec.name
+    call_tool.__doc__ = build_docstring(spec)
+    call_tool.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=[*signature.parameters.values(), context]
+    )
+    return call_tool
+
+
+def register_tool(spec: ToolSpec) -> None:
+    """Register a discovered tool with the registry and the MCP server."""
+    tool_registry.register(spec)
+    function = tool_functions[spec.name] = make_tool_function(spec)
+    mcp.add_tool(function, name=spec.name, description=function.__doc__)
+
+
+for _spec in discover_tools():
+    register_tool(_spec)
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve tool functions and instances lazily through the registry."""
+    if name in tool_functions:
+        return tool_functions[name]
+    if name in _TOOL_ATTRIBUTES:
+        return tool_registry.get(_TOOL_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @mcp.resource("mcp://tools/help")
 async def get_help() -> str:
     """Get help information about available tools."""
-    help_text = """
-🎲 **MCP Server - Available Tools**
-
-**roll_dice** - Roll dice using standard notation
-- Usage: roll_dice(notation="2d6")
-- Examples: "1d20", "3d6", "2d10"
-- Returns individual values and total
-
-**get_weather** - Get current weather conditions  
-- Usage: get_weather(location="San Francisco")
-- Supports city names or coordinates (lat,lon)
-- Returns temperature, condition, wind speed
-
-**get_date** - Get current date and time
-- Usage: get_date(timezone="UTC")
-- Supports IANA timezones and common aliases
-- Returns ISO 8601 formatted datetime
+    sections = []
+    for name in tool_registry.names:
+        spec = tool_registry.spec(name)
+        usage = ", ".join(
+            f"{field}=..." if required else f"{field}={schema.get('default')!r}"
+            for field, schema, required in iter_fields(spec)
+        )
+        lines = [f"**{name}** - {spec.description}", f"- Usage: {name}({usage})"]
+        lines += [
+            f"- {field}: {schema.get('description', field)}"
+            for field, schema, _ in iter_fields(spec)
+        ]
+        sections.append("\n".join(lines))
+
+    return (
+        "\n🎲 **MCP Server - Available Tools**\n\n"
+        + "\n\n".join(sections)
+        + """
 
 **Examples:**
 - roll_dice("2d6") → Roll two six-sided dice
+- roll_dice("1d20", seed=42) → Replayable rolls from a seeded session stream
+- roll_dice_batch(["1d20+5", "2d6"], repeat=10) → Totals of many rolls as JSON
+- dice_distribution("4d6kh3") → Exact odds of every total
 - get_weather("London") → Weather for London
+- get_weather_batch(["London", "Paris"]) → Weather for several cities
+- get_forecast("London", hours=48) → Hourly forecast, streamed in chunks
 - get_date("America/New_York") → NYC current time
+
+**Resources:**
+- mcp://metrics → Per-tool latency, error and in-flight metrics (Prometheus)
+- mcp://metrics/json → Same metrics as JSON with p50/p90/p99 latency
 """
-    return help_text
+    )
+
+
+@mcp.resource("mcp://metrics", mime_type="text/plain")
+async def get_metrics() -> str:
+    """Get per-tool latency histograms and counters in Prometheus text format."""
+    return metrics_registry.render_prometheus()
+
+
+@mcp.resource("mcp://metrics/json", mime_type="application/json")
+async def get_metrics_json() -> str:
+    """Get per-tool latency percentiles, error rates and throughput as JSON."""
+    return metrics_registry.render_json()
 
 
 async def cleanup_server():
     """Cleanup server resources."""
     logger.info("Cleaning up server resources...")
-    try:
-        await weather_tool.cleanup()
-        logger.info("Server cleanup completed")
-    except Exception as e:
-        logger.error(f"Error during cleanup: {e}")
+    for tool in tool_registry.loaded():
+        cleanup = getattr(tool, "cleanup", None)
+        if cleanup is None:
+            continue
+        try:
+            await cleanup()
+        except Exception as e:
+            logger.error("Error during cleanup of %s: %s", tool.name, e)
+    logger.info("Server cleanup completed")
 
 
 # Server lifecycle management
-async def startup():
-    """Server startup handler."""
+async def startup(warm: bool = False):
+    """Server startup handler.
+
+    Args:
+        warm: Construct every tool and warm its pools and caches up front,
+            for long-lived servers. Short-lived stdio servers stay lazy.
+    """
     logger.info("MCP Server starting up...")
-    logger.info("Tools available: roll_dice, get_weather, get_date")
+    logger.info("Tools available: %s", ", ".join(tool_registry.names))
+    if warm:
+        tool_registry.load_all()
+        for tool in tool_registry.loaded():
+            try:
+                await tool.warm()
+            except Exception as e:
+                logger.warning("Error warming %s: %s", tool.name, e)
+
 
+async def shutdown(grace_period: float = DEFAULT_GRACE_PERIOD):
+    """Server shutdown handler.
 
-async def shutdown():
-    """Server shutdown handler."""
+    Drains in-flight calls, flushes metrics and tool state, then closes
+    tool resources.
+    """
     logger.info("MCP Server shutting down...")
+    await lifecycle.drain(grace_period)
+    metrics_registry.export()
+    for tool in tool_registry.loaded():
+        try:
+            await tool.flush()
+        except Exception as e:
+            logger.error("Error flushing %s: %s", tool.name, e)
     await cleanup_server()
 
 
-def run_server():
-    """Run the MCP server."""
+@asynccontextmanager
+async def server_lifespan(
+    grace_period: float = DEFAULT_GRACE_PERIOD, warm: bool = False
+) -> AsyncIterator[None]:
+    """Run startup before serving and a draining shutdown afterwards.
+
+    Prewarming runs in the background while serving and stops before the
+    shutdown drains in-flight calls.
+    """
+    await startup(warm=warm)
+    prewarm_scheduler.start()
+    try:
+        yield
+    finally:
+        await prewarm_scheduler.stop()
+        await shutdown(grace_period)
+
+
+def build_app(
+    transport: str, grace_period: float = DEFAULT_GRACE_PERIOD, warm: bool = True
+) -> Starlette:
+    """Build the ASGI app for a network transport with the server lifespan."""
+    app = mcp.streamable_http_app() if transport == "http" else mcp.sse_app()
+    transport_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        # Drain before the transport tears down its sessions
+        async with transport_lifespan(app), server_lifespan(grace_period, warm):
+            yield
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+async def serve_stdio(grace_period: float = DEFAULT_GRACE_PERIOD) -> None:
+    """Serve stdio until stdin closes or a signal has been drained."""
+    async with server_lifespan(grace_period), anyio.create_task_group() as tg:
+
+        async def stop_on_signal() -> None:
+            with anyio.open_signal_receiver(signal.SIGTERM, signal.SIGINT) as signals:
+                async for signum in signals:
+                    logger.info("Received signal %s, shutting down...", signum)
+                    await shutdown(grace_period)
+                    # stdin is read in a worker thread that cannot be
+                    # cancelled, so rather than wait for the client to close
+                    # the pipe, exit through the default handler like uvicorn
+                    stop_logging()
+                    signal.signal(signum, signal.SIG_DFL)
+                    signal.raise_signal(signum)
+
+        tg.start_soon(stop_on_signal)
+        await mcp.run_stdio_async()
+        tg.cancel_scope.cancel()
+
+
+async def serve_network(
+    transport: str, host: str, port: int, grace_period: float = DEFAULT_GRACE_PERIOD
+) -> None:
+    """Serve a network transport until a signal has been drained."""
+    from src.mcp_server.http_server import serve_http
+
+    await serve_http(
+        build_app(transport, grace_period),
+        lifecycle,
+        grace_period,
+        host=host,
+        port=port,
+        log_level=mcp.settings.log_level.lower(),
+    )
+
+
+def run_server(
+    transport: str = "stdio",
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 1,
+    grace_period: float = DEFAULT_GRACE_PERIOD,
+) -> None:
+    """Run the MCP server.
+
+    Args:
+        transport: "stdio" for a single client on stdin/stdout, "http" for
+            streamable HTTP (with SSE streaming) or "sse" for the legacy SSE
+            transport. Network transports serve many concurrent sessions from
+            one process, sharing tool instances and their HTTP pools.
+        host: Interface to bind for network transports
+        port: Port to bind for network transports
+        workers: Number of pre-forked worker processes sharing the listening
+            socket (http transport only)
+        grace_period: Seconds in-flight calls get to finish after SIGTERM or
+            SIGINT before resources are closed
+    """
+    if transport not in TRANSPORTS:
+        raise ValueError(
+            f"Unknown transport: {transport}. Choose one of: {', '.join(TRANSPORTS)}"
+        )
+    if workers > 1 and transport != "http":
+        raise ValueError("Multiple workers require the http transport")
+
     try:
-        logger.info("Starting MCP server...")
-        mcp.run()
+        if workers > 1:
+            from src.mcp_server.supervisor import WorkerSupervisor, serve_worker
+
+            WorkerSupervisor(
+                workers,
+                host=host,
+                port=port,
+                target=functools.partial(serve_worker, grace_period=grace_period),
+            ).run()
+            return
+
+        if transport == "stdio":
+            logger.info("Starting MCP server (stdio)...")
+            anyio.run(serve_stdio, grace_period)
+        else:
+            mcp.settings.host = host
+            mcp.settings.port = port
+            logger.info("Starting MCP server (%s) on %s:%s...", transport, host, port)
+            anyio.run(serve_network, transport, host, port, grace_period)
     except KeyboardInterrupt:
         logger.info("Server interrupted by user")
     except Exception as e:
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
         raise
 
 
 if __name__ == "__main__":
+    configure_logging()
     run_server()
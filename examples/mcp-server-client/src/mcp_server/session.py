@@ -0,0 +1,29 @@
+"""The MCP session of the current tool call.
+
+The server stores the calling client's session in a context variable, like
+the deadline, so tools can keep per-session state such as dice streams
+without knowing about MCP sessions. Calls made outside a session, e.g. by
+tests or the CLI calling tools directly, have no session.
+"""
+
+import contextlib
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any
+
+_session: ContextVar[Any] = ContextVar("mcp_session", default=None)
+
+
+def current() -> Any:
+    """Return the current call's session, or None outside a session."""
+    return _session.get()
+
+
+@contextlib.contextmanager
+def scope(owner: Any) -> Iterator[None]:
+    """Run the block as part of ``owner``'s session."""
+    token = _session.set(owner)
+    try:
+        yield
+    finally:
+        _session.reset(token)
@@ -0,0 +1,86 @@
+"""Single-flight coalescing of concurrent identical upstream calls.
+
+When many calls need the same upstream result at once, only the first one
+starts the work; the others await the same task and count as coalesced. The
+shared task runs without the starting call's deadline, so a caller that gives
+up early cannot fail callers that have more time left. Each caller's own
+deadline still bounds its wait, and the task is cancelled once nobody is
+waiting for it any more.
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from . import deadline
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task[Any]
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight] = {}
+        self.flights = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Shared calls currently running."""
+        return len(self._flights)
+
+    def running(self, key: Hashable) -> bool:
+        """Whether a shared call for ``key`` is in flight."""
+        return key in self._flights
+
+    async def do(
+        self, key: Hashable, func: Callable[[], Coroutine[Any, Any, Any]]
+    ) -> Any:
+        """Return ``func()``'s result, sharing one run among concurrent callers.
+
+        Args:
+            key: Identifies calls that would produce the same result
+            func: Starts the call; only invoked when no call for ``key`` runs
+
+        Raises:
+            Exception: Whatever the shared call raised, in every caller
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            with deadline.cleared():
+                flight = _Flight(asyncio.create_task(func()))
+            flight.task.add_done_callback(lambda task: self._finished(key, flight))
+            self._flights[key] = flight
+            self.flights += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Every caller gave up, e.g. on its deadline
+                flight.task.cancel()
+
+    def stats(self) -> dict[str, int]:
+        """Return coalescing statistics."""
+        return {
+            "in_flight": self.in_flight,
+            "flights": self.flights,
+            "coalesced": self.coalesced,
+        }
+
+    def _finished(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Mark the error retrieved even if every caller was cancelled
+            flight.task.exception()
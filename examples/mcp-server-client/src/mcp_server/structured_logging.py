@@ -0,0 +1,215 @@
+"""Non-blocking, sampled structured logging for the MCP server.
+
+Log calls on the event loop only run the filters and put the record on an
+in-process queue. A background ``QueueListener`` thread does the message
+formatting, JSON encoding and stream writes. Tool records carry a ``tool``
+field, which lets per-tool sampling rates thin out chatty INFO/DEBUG lines
+at high QPS. Repeated error stacks are rate-limited: within the interval the
+record is still emitted, but without its traceback.
+
+Configure from the environment with ``MCP_LOG_FORMAT`` (``json`` or
+``text``) and ``MCP_LOG_SAMPLE_RATES`` (e.g. ``roll_dice=0.01,*=0.5``).
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+from datetime import UTC, datetime
+from typing import Any, TextIO
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "taskName", "suppressed_stacks"}
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value
+        suppressed = getattr(record, "suppressed_stacks", 0)
+        if suppressed:
+            data["suppressed_stacks"] = suppressed
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of low-severity records per tool.
+
+    Records at WARNING and above are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float] | None = None):
+        """Initialize the filter.
+
+        Args:
+            rates: Keep probability per tool name; "*" sets the default rate
+        """
+        super().__init__()
+        self.rates = dict(rates or {})
+        self.default_rate = self.rates.pop("*", 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, "tool", ""), self.default_rate)
+        return rate >= 1.0 or random.random() < rate
+
+
+class StackRateLimitFilter(logging.Filter):
+    """Emit at most one traceback per error signature and interval.
+
+    The signature is the logger, call site and exception type. Records
+    inside the interval are kept but lose their traceback; the next stack
+    that is emitted reports how many were suppressed.
+    """
+
+    def __init__(self, interval: float = 60.0):
+        super().__init__()
+        self.interval = interval
+        # signature -> (last emitted at, suppressed since)
+        self._seen: dict[tuple[Any, ...], tuple[float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not record.exc_info or record.exc_info[0] is None:
+            return True
+
+        signature = (record.name, record.pathname, record.lineno, record.exc_info[0])
+        now = time.monotonic()
+        last, suppressed = self._seen.get(signature, (None, 0))
+        if last is not None and now - last < self.interval:
+            self._seen[signature] = (last, suppressed + 1)
+            record.exc_info = None
+            record.exc_text = None
+        else:
+            self._seen[signature] = (now, 0)
+            record.suppressed_stacks = suppressed
+        return True
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener thread.
+
+    The stock ``prepare`` formats the message on the calling thread so that
+    records survive pickling. The queue here never leaves the process, so
+    records are passed through untouched.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_handler: LazyQueueHandler | None = None
+_listener: logging.handlers.QueueListener | None = None
+
+
+def parse_sample_rates(value: str) -> dict[str, float]:
+    """Parse "tool=rate,..." into a rate mapping.
+
+    Raises:
+        ValueError: If an entry is malformed or a rate is outside [0, 1]
+    """
+    rates = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        tool, _, rate = entry.partition("=")
+        rates[tool.strip()] = float(rate)
+        if not 0.0 <= rates[tool.strip()] <= 1.0:
+            raise ValueError(f"Sample rate for {tool.strip()} must be between 0 and 1")
+    return rates
+
+
+def configure_logging(
+    level: str = "INFO",
+    fmt: str | None = None,
+    sample_rates: dict[str, float] | None = None,
+    stack_interval: float = 60.0,
+    stream: TextIO | None = None,
+) -> logging.handlers.QueueListener:
+    """Route root logging through a background writer thread.
+
+    Replaces any handlers already installed on the root logger.
+
+    Args:
+        level: Root log level name
+        fmt: "json" or "text" (defaults to MCP_LOG_FORMAT, then "json")
+        sample_rates: Keep probability per tool (defaults to
+            MCP_LOG_SAMPLE_RATES)
+        stack_interval: Seconds between tracebacks of the same error
+        stream: Output stream (defaults to stderr, leaving stdout to stdio)
+
+    Returns:
+        The started queue listener
+    """
+    global _handler, _listener
+
+    fmt = fmt or os.environ.get("MCP_LOG_FORMAT", "json")
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.environ.get("MCP_LOG_SAMPLE_RATES", ""))
+
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(
+        JsonFormatter()
+        if fmt == "json"
+        else logging.Formatter(TEXT_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+    )
+
+    _handler = LazyQueueHandler(queue.SimpleQueue())
+    _handler.addFilter(SamplingFilter(sample_rates))
+    _handler.addFilter(StackRateLimitFilter(stack_interval))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+        existing.close()
+    root.addHandler(_handler)
+    root.setLevel(getattr(logging, level.upper()))
+
+    _listener = logging.handlers.QueueListener(_handler.queue, output)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        listener, _listener = _listener, None
+        listener.stop()
+
+
+def _restart_after_fork() -> None:
+    """Give a forked worker its own queue and writer thread.
+
+    Only the forking thread survives ``fork``, so the child would otherwise
+    enqueue records that nobody writes.
+    """
+    if _handler is None or _listener is None:
+        return
+    _handler.queue = _listener.queue = queue.SimpleQueue()
+    _listener._thread = None
+    _listener.start()
+
+
+atexit.register(stop_logging)
+os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,201 @@
+"""Pre-forking supervisor running several HTTP server workers on one socket.
+
+The supervisor binds the listening socket once, forks ``workers`` copies of the
+MCP server app that all accept from it, and restarts any worker that exits
+unexpectedly. Workers export their metrics to a shared directory so every
+worker's ``mcp://metrics`` resource reports the merged view of the pool.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from .lifecycle import DEFAULT_GRACE_PERIOD
+from .metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
+
+WorkerTarget = Callable[[socket.socket, Path], None]
+
+
+def serve_worker(
+    sock: socket.socket,
+    metrics_dir: Path,
+    export_interval: float = 1.0,
+    grace_period: float = DEFAULT_GRACE_PERIOD,
+) -> None:
+    """Run one streamable HTTP server worker on an inherited socket.
+
+    Args:
+        sock: Listening socket shared by all workers
+        metrics_dir: Directory where workers exchange metrics snapshots
+        export_interval: Seconds between metrics exports
+        grace_period: Seconds in-flight calls get to finish after SIGTERM
+    """
+    from .http_server import serve_http
+    from .server import build_app, lifecycle, mcp
+
+    metrics_registry.shared_dir = metrics_dir
+    # Any worker may receive any request, so sessions cannot live in one worker
+    mcp.settings.stateless_http = True
+    app = build_app("http", grace_period)
+
+    async def export_metrics() -> None:
+        while True:
+            metrics_registry.export()
+            await asyncio.sleep(export_interval)
+
+    async def serve() -> None:
+        exporter = asyncio.create_task(export_metrics())
+        try:
+            await serve_http(
+                app,
+                lifecycle,
+                grace_period,
+                sockets=[sock],
+                log_level=mcp.settings.log_level.lower(),
+            )
+        finally:
+            exporter.cancel()
+
+    asyncio.run(serve())
+
+
+class WorkerSupervisor:
+    """Pre-fork N server workers behind a shared socket and keep them alive."""
+
+    def __init__(
+        self,
+        workers: int,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        target: WorkerTarget = serve_worker,
+        restart_delay: float = 1.0,
+    ):
+        """Initialize the supervisor.
+
+        Args:
+            workers: Number of worker processes to keep running
+            host: Interface to bind
+            port: Port to bind
+            target: Function run in each forked worker
+            restart_delay: Seconds to wait before restarting a crashed worker
+        """
+        if workers < 1:
+            raise ValueError("Number of workers must be at least 1")
+
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.target = target
+        self.restart_delay = restart_delay
+        self.restarts = 0
+        self.pids: dict[int, int] = {}  # pid -> worker slot
+        self.sock: socket.socket | None = None
+        self.metrics_dir: Path | None = None
+        self._stopping = False
+
+    def bind(self) -> socket.socket:
+        """Create the listening socket inherited by all workers."""
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def run(self) -> None:
+        """Start the workers and supervise them until stopped."""
+        self.sock = self.bind()
+        self.metrics_dir = Path(tempfile.mkdtemp(prefix="mcp-metrics-"))
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_signal)
+            signal.signal(signal.SIGINT, self._handle_signal)
+
+        logger.info(
+            "Starting %d workers on %s:%s (supervisor pid %d)",
+            self.workers,
+            self.host,
+            self.port,
+            os.getpid(),
+        )
+        try:
+            for slot in range(self.workers):
+                self._spawn(slot)
+            self._supervise()
+        finally:
+            self.sock.close()
+            shutil.rmtree(self.metrics_dir, ignore_errors=True)
+            logger.info("All workers stopped")
+
+    def stop(self) -> None:
+        """Stop restarting workers and ask the running ones to shut down."""
+        self._stopping = True
+        for pid in list(self.pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _handle_signal(self, signum: int, frame: object) -> None:
+        """Forward termination signals to the workers."""
+        logger.info("Received signal %s, stopping workers...", signum)
+        self.stop()
+
+    def _spawn(self, slot: int) -> None:
+        """Fork a worker process for the given slot."""
+        assert self.sock is not None and self.metrics_dir is not None
+        pid = os.fork()
+        if pid == 0:
+            # Worker: let the server install its own signal handling
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                self.target(self.sock, self.metrics_dir)
+            except BaseException as e:
+                logger.error("Worker %d failed: %s", slot, e)
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self.pids[pid] = slot
+        logger.info("Worker %d started (pid %d)", slot, pid)
+
+    def _supervise(self) -> None:
+        """Reap exited workers and restart them until stopped."""
+        while self.pids:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            slot = self.pids.pop(pid, None)
+            if slot is None:
+                continue
+            if self.metrics_dir is not None:
+                (self.metrics_dir / f"worker-{pid}.json").unlink(missing_ok=True)
+            if self._stopping:
+                continue
+
+            exit_code = os.waitstatus_to_exitcode(status)
+            logger.warning(
+                "Worker %d (pid %d) exited with code %d, restarting",
+                slot,
+                pid,
+                exit_code,
+            )
+            self.restarts += 1
+            time.sleep(self.restart_delay)
+            if not self._stopping:
+                self._spawn(slot)
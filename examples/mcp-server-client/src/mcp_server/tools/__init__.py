@@ -3,7 +3,9 @@
 from .base import (
     AsyncHttpMixin,
     BaseTool,
+    DeadlineExceededError,
     ExternalServiceError,
+    ServerOverloadedError,
     ToolError,
     ValidationToolError,
 )
@@ -11,7 +13,9 @@ from .base import (
 __all__ = [
     "AsyncHttpMixin",
     "BaseTool",
+    "DeadlineExceededError",
     "ExternalServiceError",
+    "ServerOverloadedError",
     "ToolError",
     "ValidationToolError",
 ]
@@ -1,12 +1,37 @@
 """Base tool interface and common patterns for MCP server tools."""
 
+import asyncio
+import contextlib
 import logging
+import sqlite3
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Hashable
 from typing import Any
 
-import httpx
 from pydantic import BaseModel, ValidationError
 
+from .. import deadline
+from ..admission import (
+    AdmissionController,
+    AdmissionPolicy,
+    AdmissionRejected,
+    policy_for,
+)
+from ..cache import CachePolicy, ResultCache
+from ..decoding import Fields, JsonDecoder
+from ..disk_cache import DiskCache, DiskCachePolicy, disk_cache_path
+from ..metrics import registry as metrics_registry
+from ..outbound import (
+    IDEMPOTENT_METHODS,
+    RETRY_STATUSES,
+    BreakerPolicy,
+    HttpPolicy,
+    RetryPolicy,
+    UpstreamPool,
+    http2_available,
+    retry_after,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,19 +64,69 @@ class ExternalServiceError(ToolError):
         self.status_code = status_code
 
 
+class ServerOverloadedError(ToolError):
+    """Exception for calls shed by a tool's admission controller."""
+
+    def __init__(self, message: str, tool_name: str, reason: str):
+        super().__init__(message, code=-32000, data={"reason": reason})  # Overloaded
+        self.tool_name = tool_name
+
+
+class DeadlineExceededError(ToolError):
+    """Exception for calls cancelled because the caller's deadline passed."""
+
+    def __init__(self, message: str):
+        super().__init__(message, code=-32001)  # Request timeout
+
+
 class BaseTool(ABC):
     """Abstract base class for all MCP server tools."""
 
-    def __init__(self, name: str, description: str):
-        self.name = name
-        self.description = description
-        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+    # Name and description the tool is registered under; read from the class
+    # during discovery, so tools are described without being constructed
+    name: str = ""
+    description: str = ""
+
+    # Pydantic model describing the tool's arguments; used to generate the
+    # MCP schema, CLI subcommand and GUI form for plugin tools
+    request_model: type[BaseModel] | None = None
+
+    # Opt-in result caching; None disables caching for the tool
+    cache_policy: CachePolicy | None = None
+
+    # Opt-in concurrency limits; None leaves executions unbounded
+    admission_policy: AdmissionPolicy | None = None
+
+    def __init__(self, name: str | None = None, description: str | None = None):
+        name = self.name = name or self.name
+        self.description = description or self.description
+        # Records carry the tool name for per-tool sampling and filtering
+        self.logger = logging.LoggerAdapter(
+            logging.getLogger(f"{__name__}.{self.__class__.__name__}"),
+            {"tool": name},
+        )
+        self.metrics = metrics_registry.tool(name)
+        self.cache: ResultCache | None = None
+        if self.cache_policy is not None:
+            self.cache = ResultCache(self.cache_policy)
+            metrics_registry.register_cache(name, self.cache)
+        self.admission: AdmissionController | None = None
+        admission_policy = policy_for(name, self.admission_policy)
+        if admission_policy is not None:
+            self.admission = AdmissionController(admission_policy)
+            metrics_registry.register_admission(name, self.admission)
 
     @abstractmethod
     async def execute(self, **kwargs: Any) -> Any:
         """Execute the tool with the given arguments."""
         pass
 
+    async def warm(self) -> None:
+        """Prepare pools and caches before the first call (server startup)."""
+
+    async def flush(self) -> None:
+        """Persist buffered state before resources are closed (shutdown)."""
+
     def validate_input(
         self, input_data: dict[str, Any], model_class: type[BaseModel]
     ) -> BaseModel:
@@ -70,6 +145,22 @@ class BaseTool(ABC):
                 validation_errors=e.errors(),
             )
 
+    def cache_key(self, **kwargs: Any) -> Hashable | None:
+        """Build the cache key for a call, or None to bypass the cache.
+
+        Tools override this to normalise equivalent arguments to one key.
+        """
+        key = tuple(sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def format_result(self, result: Any) -> Any:
+        """Format an execution result for display."""
+        return result
+
     def create_success_response(self, data: Any) -> dict[str, Any]:
         """Create a successful tool response."""
         return {
@@ -89,10 +180,14 @@ class BaseTool(ABC):
         else:
             error_message = f"An unexpected error occurred: {str(error)}"
 
-        # Log the full error for debugging
-        self.logger.error(f"Tool {self.name} error: {error}", exc_info=True)
+        if isinstance(error, ServerOverloadedError | DeadlineExceededError):
+            # Shedding and expired deadlines are expected; skip the traceback
+            self.logger.warning("Tool %s: %s", self.name, error_message)
+        else:
+            # Log the full error for debugging
+            self.logger.error("Tool %s error: %s", self.name, error, exc_info=True)
 
-        return {
+        response: dict[str, Any] = {
             "content": [
                 {
                     "type": "text",
@@ -101,22 +196,116 @@ class BaseTool(ABC):
             ],
             "isError": True,
         }
+        if isinstance(error, ToolError):
+            # JSON-RPC style error details so clients can tell errors apart
+            response["error"] = {
+                "code": error.code,
+                "message": error_message,
+                "data": error.data,
+            }
+        return response
 
     async def safe_execute(self, **kwargs) -> dict[str, Any]:
-        """Execute the tool with error handling."""
+        """Execute with caching, admission control, error handling and metrics."""
+        started = self.metrics.start()
+        success = False
         try:
-            result = await self.execute(**kwargs)
-            return self.create_success_response(result)
+            key = self.cache_key(**kwargs) if self.cache is not None else None
+            if key is not None and self.cache is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    success = True
+                    return cached
+
+            result = await self.execute_within_deadline(**kwargs)
+            response = self.create_success_response(self.format_result(result))
+            if key is not None and self.cache is not None:
+                self.cache.set(key, response)
+            success = True
+            return response
         except Exception as e:
             return self.create_error_response(e)
+        finally:
+            self.metrics.finish(started, success)
+
+    async def execute_within_deadline(self, **kwargs) -> Any:
+        """Run the call, cancelling it when the current deadline passes.
+
+        Raises:
+            DeadlineExceededError: If the deadline passed before completion
+        """
+        timeout = asyncio.timeout(deadline.remaining())
+        try:
+            async with timeout:
+                return await self.admit_and_execute(**kwargs)
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            raise DeadlineExceededError(
+                f"Deadline exceeded: {self.name} was cancelled"
+            ) from None
+
+    async def admit_and_execute(self, **kwargs) -> Any:
+        """Run execute within the tool's admission limits.
+
+        Raises:
+            ServerOverloadedError: If the call was shed
+        """
+        async with self.admission_slot():
+            return await self.execute(**kwargs)
+
+    @contextlib.asynccontextmanager
+    async def admission_slot(self) -> AsyncIterator[None]:
+        """Hold one of the tool's execution slots for the block.
+
+        Raises:
+            ServerOverloadedError: If no slot could be acquired
+        """
+        if self.admission is None:
+            yield
+            return
+
+        try:
+            await self.admission.acquire()
+        except AdmissionRejected as e:
+            raise ServerOverloadedError(
+                f"Server overloaded: {self.name} is at capacity ({e.reason}). "
+                "Please retry later.",
+                tool_name=self.name,
+                reason=e.reason,
+            ) from None
+        try:
+            yield
+        finally:
+            self.admission.release()
 
 
 class AsyncHttpMixin:
-    """Mixin for tools that need HTTP client capabilities."""
+    """Mixin for tools that need HTTP client capabilities.
+
+    Pooling, retries and circuit breaking are configured per tool through the
+    ``http_policy``, ``retry_policy`` and ``breaker_policy`` class attributes.
+    """
+
+    http_policy = HttpPolicy()
+    retry_policy = RetryPolicy()
+    breaker_policy = BreakerPolicy()
 
-    def __init__(self, *args, **kwargs):
+    # Opt-in upstream cache shared with other server processes; None disables it
+    disk_cache_policy: DiskCachePolicy | None = None
+
+    # JSON backend for response bodies; None for MCP_JSON_BACKEND or the
+    # fastest one installed
+    json_backend: str | None = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        self._http_client = None
+        self._http_client: Any = None
+        self._json_decoder: JsonDecoder | None = None
+        self._disk_cache: DiskCache | None = None
+        self._disk_cache_opened = False
+        self.upstreams = UpstreamPool(self.breaker_policy)
+        metrics_registry.register_http(self.name, self.upstreams)  # type: ignore[attr-defined]
 
     @property
     def http_client(self):
@@ -124,41 +313,228 @@ class AsyncHttpMixin:
         if self._http_client is None:
             import httpx
 
+            policy = self.http_policy
+            http2 = policy.http2 and http2_available()
+            if policy.http2 and not http2:
+                logger.info("h2 is not installed; using HTTP/1.1 for outbound calls")
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=policy.max_connections,
+                    max_keepalive_connections=policy.max_keepalive_connections,
+                    keepalive_expiry=policy.keepalive_expiry,
+                ),
+                http2=http2,
+            )
             self._http_client = httpx.AsyncClient(
-                timeout=30.0,
+                transport=transport,
+                timeout=httpx.Timeout(30.0, connect=policy.connect_timeout),
                 headers={"User-Agent": "MCP-Server/1.0"},
             )
         return self._http_client
 
+    @property
+    def json_decoder(self) -> JsonDecoder:
+        """Decoder for response bodies, created on first use."""
+        if self._json_decoder is None:
+            self._json_decoder = JsonDecoder(self.json_backend)
+        return self._json_decoder
+
+    def decode_response(self, response: Any, fields: Fields | None = None) -> Any:
+        """Decode a response body, keeping only ``fields`` if given.
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        return self.json_decoder.decode(response.content, fields)
+
+    @property
+    def disk_cache(self) -> DiskCache | None:
+        """Persistent upstream cache, opened on first use if the tool has one."""
+        if not self._disk_cache_opened:
+            self._disk_cache_opened = True
+            path = disk_cache_path()
+            if self.disk_cache_policy is not None and path is not None:
+                name = self.name  # type: ignore[attr-defined]
+                try:
+                    self._disk_cache = DiskCache(path, self.disk_cache_policy, name)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning("Disk cache %s unavailable: %s", path, e)
+                else:
+                    metrics_registry.register_cache(f"{name}_disk", self._disk_cache)
+        return self._disk_cache
+
+    async def read_disk_cache(self, key: Hashable) -> tuple[Any, float] | None:
+        """Return ``(value, expires_in)`` from the disk cache, or None."""
+        if self.disk_cache is None:
+            return None
+        return await asyncio.to_thread(self.disk_cache.lookup, key)
+
+    async def write_disk_cache(
+        self, key: Hashable, value: Any, ttl: float | None = None
+    ) -> None:
+        """Store a JSON-serializable value in the disk cache, if enabled."""
+        if self.disk_cache is not None:
+            await asyncio.to_thread(self.disk_cache.set, key, value, ttl)
+
+    async def warm(self) -> None:
+        """Create the HTTP client and its connection pool."""
+        await super().warm()  # type: ignore[misc]
+        _ = self.http_client
+        _ = self.json_decoder
+        _ = self.disk_cache
+
+    async def flush(self) -> None:
+        """Checkpoint the disk cache's write-ahead log."""
+        await super().flush()  # type: ignore[misc]
+        if self._disk_cache is not None:
+            await asyncio.to_thread(self._disk_cache.checkpoint)
+
     async def cleanup(self):
-        """Cleanup HTTP client resources."""
+        """Cleanup HTTP client and disk cache resources."""
         if self._http_client:
             await self._http_client.aclose()
             self._http_client = None
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+            self._disk_cache_opened = False
 
     async def make_request(
-        self, method: str, url: str, timeout: float = 10.0, **kwargs
-    ) -> dict[str, Any]:
-        """Make an HTTP request with error handling."""
-        try:
-            response = await self.http_client.request(
-                method=method, url=url, timeout=timeout, **kwargs
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.TimeoutException:
-            raise ExternalServiceError(
-                f"Request to {url} timed out after {timeout} seconds",
-                service_name="HTTP",
-            )
-        except httpx.HTTPStatusError as e:
-            raise ExternalServiceError(
-                f"HTTP error {e.response.status_code}: {e.response.text}",
-                service_name="HTTP",
-                status_code=e.response.status_code,
-            )
-        except Exception as e:
-            raise ExternalServiceError(
-                f"Failed to make request to {url}: {str(e)}",
-                service_name="HTTP",
+        self,
+        method: str,
+        url: str,
+        timeout: float = 10.0,
+        idempotent: bool | None = None,
+        fields: Fields | None = None,
+        **kwargs,
+    ) -> Any:
+        """Make an HTTP request with retries, circuit breaking and error handling.
+
+        Each attempt's timeout is capped to the time left before the call's
+        deadline.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            timeout: Seconds allowed per attempt
+            idempotent: Whether the request may be repeated after it reached
+                the server; defaults to True for GET, PUT, DELETE and the
+                other idempotent methods
+            fields: Parts of the JSON response to keep, see ``compile_fields``;
+                None keeps all of it
+
+        Raises:
+            DeadlineExceededError: If the deadline passed before an answer
+            ExternalServiceError: If the request failed, or the host's circuit
+                breaker is open
+        """
+        import httpx
+
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        target = httpx.URL(url)
+        upstream = self.upstreams.host(target.scheme, target.host, target.port)
+        breaker = upstream.breaker
+        # The trace hook counts connections the pool opens to the host
+        extensions = {"trace": upstream.trace, **kwargs.pop("extensions", {})}
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                request_timeout = deadline.timeout_for(timeout)
+            except deadline.DeadlineExceeded as e:
+                raise DeadlineExceededError(str(e)) from None
+            if not breaker.allow():
+                raise ExternalServiceError(
+                    f"Circuit open for {target.host} after repeated failures; "
+                    "failing fast",
+                    service_name="HTTP",
+                    status_code=503,
+                )
+
+            delay = 0.0
+            upstream.in_flight += 1
+            upstream.requests += 1
+            try:
+                response = await self.http_client.request(
+                    method=method,
+                    url=url,
+                    timeout=request_timeout,
+                    extensions=extensions,
+                    **kwargs,
+                )
+                response.raise_for_status()
+                data = self.decode_response(response, fields)
+            except httpx.TimeoutException as e:
+                if request_timeout < timeout:
+                    # Our deadline ran out, which says nothing about the host
+                    breaker.abandon()
+                    raise DeadlineExceededError(
+                        f"Deadline exceeded after {request_timeout:.2f}s "
+                        f"waiting for {url}"
+                    )
+                breaker.record_failure()
+                error = ExternalServiceError(
+                    f"Request to {url} timed out after {timeout} seconds",
+                    service_name="HTTP",
+                )
+                retry = idempotent or isinstance(e, httpx.ConnectTimeout)
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                error = ExternalServiceError(
+                    f"HTTP error {status}: {e.response.text}",
+                    service_name="HTTP",
+                    status_code=status,
+                )
+                retry = idempotent and status in RETRY_STATUSES
+                delay = retry_after(e.response.headers.get("Retry-After")) or 0.0
+            except httpx.TransportError as e:
+                # Connection refused or reset, protocol errors and the like
+                breaker.record_failure()
+                error = ExternalServiceError(
+                    f"Failed to make request to {url}: {str(e)}",
+                    service_name="HTTP",
+                )
+                retry = idempotent or isinstance(e, httpx.ConnectError)
+            except Exception as e:
+                # Invalid URLs, undecodable bodies: retrying will not help
+                breaker.abandon()
+                raise ExternalServiceError(
+                    f"Failed to make request to {url}: {str(e)}",
+                    service_name="HTTP",
+                )
+            except BaseException:
+                breaker.abandon()
+                raise
+            else:
+                breaker.record_success()
+                return data
+            finally:
+                upstream.in_flight -= 1
+
+            if error.status_code is None or error.status_code >= 500:
+                upstream.failures += 1
+            delay = max(delay, self.retry_policy.backoff(attempt))
+            left = deadline.remaining()
+            if (
+                not retry
+                or attempt >= self.retry_policy.attempts
+                or delay > self.retry_policy.max_delay
+                or (left is not None and delay >= left)
+            ):
+                raise error
+            upstream.retries += 1
+            self.logger.warning(  # type: ignore[attr-defined]
+                "Retrying %s %s in %.2fs after attempt %d: %s",
+                method,
+                url,
+                delay,
+                attempt,
+                error.message,
             )
+            await asyncio.sleep(delay)
@@ -4,6 +4,8 @@ import zoneinfo
 from datetime import UTC, datetime
 from typing import Any
 
+from ..cache import CachePolicy, ResultCache
+from ..metrics import registry as metrics_registry
 from ..models import DateTimeRequest, DateTimeResponse
 from .base import BaseTool, ToolError
 
@@ -11,11 +13,16 @@ from .base import BaseTool, ToolError
 class DateTimeTool(BaseTool):
     """Tool for getting current date and time in various timezones."""
 
+    name = "get_date"
+    description = "Get current date and time in ISO 8601 format for any timezone"
+    request_model = DateTimeRequest
+
+    # Results carry the current time, so only timezone resolution is cached;
+    # zone definitions don't change, so resolutions never expire
+    timezone_cache_policy = CachePolicy(ttl=None, max_entries=512, max_bytes=None)
+
     def __init__(self):
-        super().__init__(
-            name="get_date",
-            description="Get current date and time in ISO 8601 format for any timezone",
-        )
+        super().__init__()
 
         # Common timezone aliases for user convenience
         self.timezone_aliases = {
@@ -35,8 +42,25 @@ class DateTimeTool(BaseTool):
             "aest": "Australia/Sydney",
         }
 
+        self.timezone_cache = ResultCache(self.timezone_cache_policy)
+        metrics_registry.register_cache(f"{self.name}_timezones", self.timezone_cache)
+
+    async def warm(self) -> None:
+        """Pre-resolve the timezone aliases into the timezone cache."""
+        for alias in self.timezone_aliases:
+            self.parse_timezone(alias)
+
     def parse_timezone(self, timezone_str: str) -> zoneinfo.ZoneInfo | type[UTC]:
-        """Parse timezone string to ZoneInfo object."""
+        """Parse timezone string to ZoneInfo object, memoizing resolutions."""
+        key = timezone_str.strip()
+        tz = self.timezone_cache.get(key)
+        if tz is None:
+            tz = self._resolve_timezone(timezone_str)
+            self.timezone_cache.set(key, tz)
+        return tz
+
+    def _resolve_timezone(self, timezone_str: str) -> zoneinfo.ZoneInfo | type[UTC]:
+        """Resolve a timezone string or alias to a ZoneInfo object."""
         # Normalize timezone string
         tz_lower = timezone_str.lower().strip()
 
@@ -86,7 +110,7 @@ class DateTimeTool(BaseTool):
         # Parse timezone
         tz = self.parse_timezone(request.timezone)
 
-        self.logger.info(f"Getting current time for timezone: {timezone}")
+        self.logger.info("Getting current time for timezone: %s", timezone)
 
         # Get current time in the specified timezone
         if isinstance(tz, zoneinfo.ZoneInfo):
@@ -102,7 +126,7 @@ class DateTimeTool(BaseTool):
         # Get Unix timestamp
         timestamp = current_time.timestamp()
 
-        self.logger.info(f"Current time in {tz_name}: {iso_datetime}")
+        self.logger.info("Current time in %s: %s", tz_name, iso_datetime)
 
         return DateTimeResponse(
             datetime=iso_datetime,
@@ -137,24 +161,6 @@ class DateTimeTool(BaseTool):
                 f"🔢 Unix Timestamp: `{int(response.timestamp)}`"
             )
 
-    async def safe_execute(self, **kwargs) -> dict[str, Any]:
-        """Execute date/time lookup with formatted output."""
-        try:
-            result = await self.execute(**kwargs)
-            formatted_result = self.format_result(result)
-
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": formatted_result,
-                    }
-                ],
-                "isError": False,
-            }
-        except Exception as e:
-            return self.create_error_response(e)
-
     def get_available_timezones(self) -> list[str]:
         """Get a list of common available timezones."""
         common_zones = [
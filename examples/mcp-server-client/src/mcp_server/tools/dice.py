@@ -1,22 +1,121 @@
 """Dice rolling tool for MCP server."""
 
-import random
-import re
+import asyncio
 from typing import Any
 
-from ..models import DiceRollRequest, DiceRollResponse
-from .base import BaseTool, ToolError
+from ..cache import CachePolicy, ResultCache
+from ..dice_engine import BulkRoll, DiceEngine, available_backend, dice_limits
+from ..dice_notation import DicePlan, compile_notation, format_group
+from ..dice_random import DiceStream, SessionStreams
+from ..metrics import registry as metrics_registry
+from ..models import (
+    DiceGroupRoll,
+    DiceRollRequest,
+    DiceRollResponse,
+    DiceRollSummary,
+    DiceStreamOptions,
+)
+from .base import BaseTool, ToolError, ValidationToolError
 
+# Rolls of more dice are drawn in a worker thread to keep the loop responsive
+THREAD_THRESHOLD = 100_000
 
-class DiceRollTool(BaseTool):
-    """Tool for rolling dice using standard notation."""
+# Summaries list how often each face came up for dice with at most this many sides
+HISTOGRAM_FACES = 20
+
+# Notations compiled at startup, so the usual rolls never parse
+COMMON_NOTATIONS = ("1d4", "1d6", "2d6", "1d8", "1d10", "1d12", "1d20", "1d100")
+
+# Fast stream of each MCP session, shared by the dice tools so that a seed
+# replays a session's single and batch rolls alike
+session_streams = SessionStreams()
+
+
+def summarize(roll: BulkRoll) -> DiceRollSummary:
+    """Summary statistics of a roll whose values were not kept."""
+    return DiceRollSummary(
+        count=roll.count,
+        minimum=roll.minimum,
+        maximum=roll.maximum,
+        mean=roll.mean,
+        histogram=roll.histogram,
+    )
+
+
+class DiceTool(BaseTool):
+    """Base class of tools rolling compiled dice notations.
+
+    Keeps a cache of compiled plans per tool and picks the random stream of
+    each call.
+    """
+
+    # Every roll must be fresh, so results are never cached
+    cache_policy = None
+
+    # Compiled notations; plans never go stale, so only LRU evicts them
+    plan_cache_policy = CachePolicy(ttl=None, max_entries=1024, max_bytes=None)
 
     def __init__(self):
-        super().__init__(
-            name="roll_dice",
-            description="Roll dice using standard notation like '2d6' or '1d20'",
-        )
-        self.notation_pattern = re.compile(r"^(\d+)d(\d+)$")
+        super().__init__()
+        self.backend = available_backend()
+        self.secure_stream = DiceStream(self.backend, mode="secure")
+        self.plans = ResultCache(self.plan_cache_policy)
+        metrics_registry.register_cache(f"{self.name}_plans", self.plans)
+
+    async def warm(self) -> None:
+        """Compile the most common notations into the plan cache."""
+        for notation in COMMON_NOTATIONS:
+            self.plan(notation)
+
+    def plan(self, notation: str) -> DicePlan:
+        """Return the compiled plan for a notation, compiling it on a miss.
+
+        Cached notations skip parsing and validation. Limits are checked when
+        a notation is compiled.
+        """
+        plan = self.plans.get(notation)
+        if plan is None:
+            plan = self.compile(notation)
+            self.plans.set(notation, plan)
+        return plan
+
+    def compile(self, notation: str) -> DicePlan:
+        """Compile a notation, rejecting invalid ones as invalid input.
+
+        Compiling is the notation's validation, so this parses it once rather
+        than once in the request model and again here.
+        """
+        try:
+            return compile_notation(notation)
+        except ValueError as e:
+            raise ValidationToolError(
+                f"Invalid input for {self.name}: notation: {e}"
+            ) from e
+
+    def engine_for(self, seed: int | None = None, secure: bool = False) -> DiceEngine:
+        """Return the engine drawing a call's dice.
+
+        Secure calls draw from ``secrets``. Others draw from the session's
+        fast stream, restarted from ``seed`` if one is given.
+        """
+        if secure:
+            return DiceEngine(stream=self.secure_stream)
+        try:
+            return DiceEngine(stream=session_streams.get(self.backend, seed))
+        except ValueError as e:
+            raise ValidationToolError(str(e)) from e
+
+
+class DiceRollTool(DiceTool):
+    """Tool for rolling dice expressions like '4d6kh3' or '2d6+1d8+3'."""
+
+    name = "roll_dice"
+    description = (
+        "Roll dice using notation like '2d6', '1d20+5', '4d6kh3' (keep "
+        "highest), '2d20kl1' (keep lowest), '1d6!' (exploding) or '1d8r1' "
+        "(reroll)"
+    )
+    request_model = DiceRollRequest
 
     async def execute(self, **kwargs: Any) -> DiceRollResponse:
         """Execute dice roll with the given notation."""
@@ -24,60 +123,107 @@ class DiceRollTool(BaseTool):
         if not notation:
             raise ToolError("Missing required parameter: notation")
 
-        # Validate input using Pydantic model
-        request = self.validate_input({"notation": notation}, DiceRollRequest)
-
-        # Parse the notation
-        match = self.notation_pattern.match(request.notation)
-        if not match:
-            raise ToolError(f"Invalid dice notation: {notation}")
-
-        dice_count = int(match.group(1))
-        sides = int(match.group(2))
-
-        self.logger.info(f"Rolling {dice_count}d{sides}")
-
-        # Generate random values for each die
-        values = []
-        for _ in range(dice_count):
-            roll = random.randint(1, sides)
-            values.append(roll)
-
-        total = sum(values)
+        plan = self.plan(str(notation))
+        # Plain rolls keep skipping validation; stream options are checked
+        # only when given
+        seed, secure = kwargs.get("seed"), kwargs.get("secure") or False
+        if seed is not None or secure:
+            options = self.validate_input(
+                {"seed": seed, "secure": secure}, DiceStreamOptions
+            )
+            seed, secure = options.seed, options.secure
+        engine = self.engine_for(seed, secure)
+        self.logger.info("Rolling %s (%s stream)", plan.notation, engine.stream.mode)
 
-        self.logger.info(f"Dice roll result: {values} (total: {total})")
+        limits = dice_limits()
+        if plan.dice > THREAD_THRESHOLD:
+            rolls = await asyncio.to_thread(plan.roll, engine, limits.values)
+        else:
+            rolls = plan.roll(engine, limits.values)
+        total = plan.total(rolls)
 
-        # Return structured response
-        return DiceRollResponse(
-            values=values,
-            total=total,
-            notation=str(notation),  # Return original notation as provided
+        # Return original notation as provided
+        response = DiceRollResponse(
+            total=total, notation=str(notation), modifier=plan.constant
         )
+        if len(rolls) == 1:
+            roll = rolls[0]
+            if roll.values is None:
+                response.summary = summarize(roll)
+            else:
+                response.values = roll.values
+                response.dropped = roll.dropped or []
+        else:
+            response.groups = [
+                DiceGroupRoll(
+                    notation=format_group(group),
+                    sign=sign,
+                    values=roll.values or [],
+                    dropped=roll.dropped or [],
+                    total=roll.total,
+                    summary=summarize(roll) if roll.values is None else None,
+                )
+                for (sign, group), roll in zip(plan.groups, rolls, strict=True)
+            ]
+            if all(roll.values is not None for roll in rolls):
+                response.values = [
+                    value for roll in rolls for value in roll.values or []
+                ]
+                response.dropped = [
+                    value for roll in rolls for value in roll.dropped or []
+                ]
+
+        if response.summary is None and not response.groups:
+            self.logger.info("Dice roll result: %s (total: %d)", response.values, total)
+        else:
+            self.logger.info("Dice roll result: total %d", total)
+        return response
 
     def format_result(self, response: DiceRollResponse) -> str:
         """Format dice roll result for display."""
-        if len(response.values) == 1:
-            return f"🎲 Rolled {response.notation}: **{response.values[0]}**"
-        else:
-            values_str = ", ".join(map(str, response.values))
-            return (
-                f"🎲 Rolled {response.notation}: [{values_str}] = **{response.total}**"
+        summary = response.summary
+        if summary is not None:
+            result = (
+                f"🎲 Rolled {response.notation}: **{response.total}** "
+                f"(mean {summary.mean:.3f}, min {summary.minimum}, "
+                f"max {summary.maximum})"
             )
-
-    async def safe_execute(self, **kwargs) -> dict[str, Any]:
-        """Execute dice roll with formatted output."""
-        try:
-            result = await self.execute(**kwargs)
-            formatted_result = self.format_result(result)
-
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": formatted_result,
-                    }
-                ],
-                "isError": False,
-            }
-        except Exception as e:
-            return self.create_error_response(e)
+            if len(summary.histogram) <= HISTOGRAM_FACES:
+                result += "\n" + "\n".join(
+                    f"{face}: {seen}" for face, seen in enumerate(summary.histogram, 1)
+                )
+            return result
+
+        if response.groups:
+            parts = []
+            for index, group in enumerate(response.groups):
+                sign = "-" if group.sign < 0 else "+"
+                dice = (
+                    f"({group.total})"
+                    if group.summary is not None
+                    else self._format_dice(group.values, group.dropped)
+                )
+                parts.append(
+                    f"{sign + ' ' if index or group.sign < 0 else ''}"
+                    f"{group.notation} {dice}"
+                )
+            dice_str = " ".join(parts)
+        elif (
+            len(response.values) == 1 and not response.dropped and not response.modifier
+        ):
+            # The total carries the sign of a subtracted die, e.g. "-1d6"
+            return f"🎲 Rolled {response.notation}: **{response.total}**"
+        else:
+            dice_str = self._format_dice(response.values, response.dropped)
+
+        if response.modifier:
+            sign = "-" if response.modifier < 0 else "+"
+            dice_str += f" {sign} {abs(response.modifier)}"
+        return f"🎲 Rolled {response.notation}: {dice_str} = **{response.total}**"
+
+    def _format_dice(self, values: list[int], dropped: list[int]) -> str:
+        """Format counted dice, and dropped ones if any."""
+        dice_str = f"[{', '.join(map(str, values))}]"
+        if dropped:
+            dice_str += f" (dropped {', '.join(map(str, dropped))})"
+        return dice_str
@@ -0,0 +1,60 @@
+"""Batch dice tool rolling many notations in one call."""
+
+import asyncio
+from typing import Any
+
+from ..dice_engine import dice_limits
+from ..dice_notation import roll_batch
+from ..models import DiceBatchRequest, DiceBatchResponse
+from .base import ValidationToolError
+from .dice import THREAD_THRESHOLD, DiceTool
+
+
+class DiceBatchTool(DiceTool):
+    """Tool rolling many dice notations, each several times, in one call."""
+
+    name = "roll_dice_batch"
+    description = (
+        "Roll many dice notations like '1d20+5' or '4d6kh3' in one call, "
+        "each `repeat` times, returning compact JSON arrays of totals"
+    )
+    request_model = DiceBatchRequest
+
+    async def execute(self, **kwargs: Any) -> DiceBatchResponse:
+        """Roll every notation ``repeat`` times."""
+        request = self.validate_input(kwargs, DiceBatchRequest)
+
+        # Each distinct notation is compiled, or found in the plan cache, once
+        plans = {
+            notation: self.plan(notation)
+            for notation in dict.fromkeys(request.notations)
+        }
+        batch = [plans[notation] for notation in request.notations]
+
+        dice = sum(plan.dice for plan in batch) * request.repeat
+        limits = dice_limits()
+        if dice > limits.dice:
+            raise ValidationToolError(
+                f"Batch rolls {dice} dice, more than the limit of {limits.dice}"
+            )
+
+        engine = self.engine_for(request.seed, request.secure)
+        self.logger.info(
+            "Rolling %d notations (%d distinct) x%d (%s stream)",
+            len(batch),
+            len(plans),
+            request.repeat,
+            engine.stream.mode,
+        )
+        if dice > THREAD_THRESHOLD:
+            totals = await asyncio.to_thread(roll_batch, engine, batch, request.repeat)
+        else:
+            totals = roll_batch(engine, batch, request.repeat)
+
+        return DiceBatchResponse(
+            notations=request.notations, repeat=request.repeat, totals=totals
+        )
+
+    def format_result(self, response: DiceBatchResponse) -> str:
+        """Return the arrays as compact JSON for programmatic clients."""
+        return response.model_dump_json()
@@ -0,0 +1,115 @@
+"""Exact dice distribution tool for MCP server."""
+
+import asyncio
+import math
+import threading
+from typing import Any
+
+from ..admission import AdmissionPolicy
+from ..cache import CachePolicy
+from ..dice_distribution import DistributionCalculator
+from ..dice_notation import DicePlan, compile_notation
+from ..metrics import registry as metrics_registry
+from ..models import DiceDistributionRequest, DiceDistributionResponse
+from .base import BaseTool, ToolError, ValidationToolError
+
+# Most PMF and CDF points returned; wider distributions are binned
+MAX_POINTS = 250
+
+
+class DiceDistributionTool(BaseTool):
+    """Tool computing the exact outcome distribution of a dice expression."""
+
+    name = "dice_distribution"
+    description = (
+        "Exact probability distribution of a dice expression like '3d6', "
+        "'4d6kh3' or '2d20kl1+5': PMF, CDF, mean, variance and percentiles"
+    )
+    request_model = DiceDistributionRequest
+
+    # Distributions never change, so results only leave the cache by LRU
+    cache_policy = CachePolicy(ttl=None, max_entries=256, max_bytes=10_000_000)
+
+    # Each computation holds a worker thread for up to ~100ms; queue the rest
+    admission_policy = AdmissionPolicy(
+        max_concurrency=2, max_queue=64, queue_timeout=10.0
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.calculator = DistributionCalculator()
+        # The calculator's memo caches are shared by all worker threads
+        self._lock = threading.Lock()
+        metrics_registry.register_cache("dice_distribution_dice", self.calculator.dice)
+        metrics_registry.register_cache(
+            "dice_distribution_groups", self.calculator.groups
+        )
+
+    async def execute(self, **kwargs: Any) -> DiceDistributionResponse:
+        """Compute the distribution of the given notation."""
+        notation = kwargs.get("notation")
+        if not notation:
+            raise ToolError("Missing required parameter: notation")
+
+        # Compiling validates the notation, so it is parsed only once
+        try:
+            plan = compile_notation(str(notation))
+        except ValueError as e:
+            raise ValidationToolError(
+                f"Invalid input for {self.name}: notation: {e}"
+            ) from e
+        self.logger.info("Computing distribution of %s", plan.notation)
+
+        try:
+            return await asyncio.to_thread(self.compute, plan, str(notation))
+        except ValueError as e:
+            raise ValidationToolError(str(e)) from e
+
+    def compute(self, plan: DicePlan, notation: str) -> DiceDistributionResponse:
+        """Compute the distribution and its statistics (blocking).
+
+        Raises:
+            ValueError: If the distribution is too large to compute exactly
+        """
+        with self._lock:
+            distribution = self.calculator.distribution(plan)
+        cdf = distribution.cdf()
+        start, end, step, pmf, cdf_points = distribution.binned(cdf, MAX_POINTS)
+        variance = distribution.variance
+        return DiceDistributionResponse(
+            notation=notation,
+            minimum=distribution.offset,
+            maximum=distribution.maximum,
+            mean=distribution.mean,
+            variance=variance,
+            std_dev=math.sqrt(variance),
+            percentiles=distribution.percentiles(cdf),
+            start=start,
+            end=end,
+            step=step,
+            pmf=pmf,
+            cdf=cdf_points,
+        )
+
+    def format_result(self, response: DiceDistributionResponse) -> str:
+        """Format the statistics and a table of the distribution."""
+        percentiles = ", ".join(
+            f"{name} {value}" for name, value in response.percentiles.items()
+        )
+        lines = [
+            f"📊 **Distribution of {response.notation}**",
+            f"Range {response.minimum}–{response.maximum}, mean "
+            f"**{response.mean:.4f}**, variance {response.variance:.4f}, "
+            f"std dev {response.std_dev:.4f}",
+            f"Percentiles: {percentiles}",
+            "",
+            "total: P(total) P(≤ total)",
+        ]
+        for index, (p, cumulative) in enumerate(
+            zip(response.pmf, response.cdf, strict=True)
+        ):
+            first = response.start + index * response.step
+            last = min(first + response.step - 1, response.end)
+            label = str(first) if first == last else f"{first}–{last}"
+            lines.append(f"{label}: {p:.6g} {cumulative:.6g}")
+        return "\n".join(lines)
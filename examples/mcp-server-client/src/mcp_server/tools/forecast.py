@@ -0,0 +1,289 @@
+"""Forecast tool streaming Open-Meteo hourly or daily series in chunks."""
+
+import math
+from array import array
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from .. import progress
+from ..decoding import compile_fields
+from ..metrics import registry as metrics_registry
+from ..models import ForecastRequest
+from ..singleflight import SingleFlight
+from .base import BaseTool, ExternalServiceError, ToolError
+from .open_meteo import OpenMeteoMixin
+
+# Open-Meteo variables requested per resolution, in display order
+SERIES_FIELDS = {
+    "hourly": (
+        "temperature_2m",
+        "precipitation_probability",
+        "weather_code",
+        "wind_speed_10m",
+    ),
+    "daily": (
+        "temperature_2m_min",
+        "temperature_2m_max",
+        "precipitation_sum",
+        "weather_code",
+        "wind_speed_10m_max",
+    ),
+}
+
+# Parts of a response that are decoded into a series
+SERIES_SELECTION = {
+    resolution: compile_fields(
+        [
+            "utc_offset_seconds",
+            f"{resolution}.time",
+            *(f"{resolution}.{field}" for field in fields),
+        ]
+    )
+    for resolution, fields in SERIES_FIELDS.items()
+}
+
+# Variables holding small integers; all others are stored as doubles
+INTEGER_FIELDS = frozenset({"weather_code", "precipitation_probability"})
+
+# Stand-in for missing integers; missing doubles are NaN
+MISSING = -1
+
+# Rows per progress notification: a day of hours, a week of days
+CHUNK_ROWS = {"hourly": 24, "daily": 7}
+
+
+@dataclass
+class ForecastSeries:
+    """Forecast values as typed columns instead of one dict per time step.
+
+    Attributes:
+        resolution: "hourly" or "daily"
+        utc_offset: Seconds the location's local time is ahead of UTC
+        times: Start of each step in Unix seconds
+        columns: One array per variable, aligned with ``times``
+    """
+
+    resolution: str
+    utc_offset: int
+    times: "array[int]"
+    columns: "dict[str, array[int] | array[float]]"
+
+    @classmethod
+    def decode(cls, data: dict[str, Any], resolution: str) -> "ForecastSeries":
+        """Decode an Open-Meteo response requested with ``timeformat=unixtime``.
+
+        Raises:
+            ExternalServiceError: If the series is missing or malformed
+        """
+        block = data.get(resolution) or {}
+        times = block.get("time")
+        if not times:
+            raise ExternalServiceError(
+                f"No {resolution} forecast data available", service_name="Open-Meteo"
+            )
+
+        columns: dict[str, array[int] | array[float]] = {}
+        for field in SERIES_FIELDS[resolution]:
+            values = block.get(field) or [None] * len(times)
+            if len(values) != len(times):
+                raise ExternalServiceError(
+                    f"Malformed {resolution} forecast: {field} has "
+                    f"{len(values)} values for {len(times)} times",
+                    service_name="Open-Meteo",
+                )
+            if field in INTEGER_FIELDS:
+                columns[field] = array(
+                    "h", (MISSING if v is None else int(v) for v in values)
+                )
+            else:
+                columns[field] = array(
+                    "d", (math.nan if v is None else float(v) for v in values)
+                )
+        return cls(
+            resolution=resolution,
+            utc_offset=int(data.get("utc_offset_seconds", 0)),
+            times=array("q", times),
+            columns=columns,
+        )
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def local_time(self, index: int) -> datetime:
+        """Return the start of step ``index`` in the location's local time."""
+        return datetime.fromtimestamp(self.times[index], UTC) + timedelta(
+            seconds=self.utc_offset
+        )
+
+    def value(self, field: str, index: int) -> float | int | None:
+        """Return one value, or None if Open-Meteo had no data for it."""
+        value = self.columns[field][index]
+        if value == MISSING and field in INTEGER_FIELDS:
+            return None
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        return value
+
+    def range(self, field: str) -> tuple[float, float] | None:
+        """Return the (min, max) of a variable over the series, if any."""
+        values = [v for v in self.columns[field] if not math.isnan(v)]
+        return (min(values), max(values)) if values else None
+
+
+@dataclass
+class Forecast:
+    """Forecast for a location, and how many chunks were streamed."""
+
+    location: str
+    series: ForecastSeries
+    place: str | None = None
+    streamed_chunks: int = 0
+
+
+def _number(value: float | int | None, unit: str, digits: int = 1) -> str:
+    return "–" if value is None else f"{value:.{digits}f}{unit}"
+
+
+class ForecastTool(OpenMeteoMixin, BaseTool):
+    """Tool for hourly or daily forecasts, streamed as progress notifications."""
+
+    name = "get_forecast"
+    description = "Get an hourly or daily weather forecast for a location"
+    request_model = ForecastRequest
+
+    def __init__(self):
+        super().__init__()
+        self.coalescer = SingleFlight()
+        metrics_registry.register_coalescing(self.name, self.coalescer)
+
+    async def fetch_forecast(
+        self, cell: tuple[float, float], resolution: str, steps: int
+    ) -> ForecastSeries:
+        """Request and decode a forecast series for a grid cell."""
+        horizon = "forecast_hours" if resolution == "hourly" else "forecast_days"
+        async with self.admission_slot():
+            data = await self.make_request(
+                method="GET",
+                url=f"{self.api_base}/forecast",
+                params={
+                    "latitude": cell[0],
+                    "longitude": cell[1],
+                    resolution: ",".join(SERIES_FIELDS[resolution]),
+                    horizon: steps,
+                    "timezone": "auto",
+                    "timeformat": "unixtime",
+                },
+                timeout=15.0,
+                fields=SERIES_SELECTION[resolution],
+            )
+        return ForecastSeries.decode(data, resolution)
+
+    async def execute(self, **kwargs: Any) -> Forecast:
+        """Get the forecast, streaming chunks of rows to clients that listen.
+
+        Raises:
+            ToolError: If the location is unknown or the forecast unavailable
+        """
+        location = kwargs.get("location")
+        if not location:
+            raise ToolError("Missing required parameter: location")
+
+        request = self.validate_input(
+            {
+                "location": location,
+                "hours": kwargs.get("hours"),
+                "days": kwargs.get("days"),
+            },
+            ForecastRequest,
+        )
+        lat, lon = self.parse_location(request.location)
+        if request.days is not None:
+            resolution, steps = "daily", request.days
+        else:
+            resolution, steps = "hourly", request.hours
+
+        self.logger.info(
+            "Getting %d step %s forecast for %s", steps, resolution, location
+        )
+        # Concurrent requests for the same forecast share one upstream call
+        cell = self.snap(lat, lon)
+        try:
+            series = await self.coalescer.do(
+                (cell, resolution, steps),
+                lambda: self.fetch_forecast(cell, resolution, steps),
+            )
+        except ToolError:
+            raise
+        except Exception as e:
+            raise ExternalServiceError(
+                f"Failed to retrieve forecast data: {str(e)}",
+                service_name="Open-Meteo",
+            )
+
+        forecast = Forecast(location=str(location), series=series)
+        if self.parse_coordinates(request.location) is not None:
+            forecast.place = self.nearest_place(lat, lon)
+
+        if progress.active():
+            # Send each chunk as soon as it is formatted instead of one
+            # large result at the end
+            size = CHUNK_ROWS[resolution]
+            for start in range(0, len(series), size):
+                stop = min(start + size, len(series))
+                await progress.report(
+                    stop, len(series), self.format_rows(series, start, stop)
+                )
+                forecast.streamed_chunks += 1
+        return forecast
+
+    def format_rows(self, series: ForecastSeries, start: int, stop: int) -> str:
+        """Format rows ``start`` to ``stop`` of a series, one line per step."""
+        lines = []
+        for i in range(start, stop):
+            code = series.value("weather_code", i)
+            condition = "–" if code is None else self.weather_code_to_text(int(code))
+            if series.resolution == "hourly":
+                lines.append(
+                    f"{series.local_time(i):%a %d %b %H:%M}  "
+                    f"{_number(series.value('temperature_2m', i), '°C')}  "
+                    f"{_number(series.value('precipitation_probability', i), '%', 0)}"
+                    f"  {condition}  "
+                    f"{_number(series.value('wind_speed_10m', i), ' km/h')}"
+                )
+            else:
+                lines.append(
+                    f"{series.local_time(i):%a %d %b}  "
+                    f"{_number(series.value('temperature_2m_min', i), '')}–"
+                    f"{_number(series.value('temperature_2m_max', i), '°C')}  "
+                    f"{_number(series.value('precipitation_sum', i), ' mm')}  "
+                    f"{condition}  "
+                    f"{_number(series.value('wind_speed_10m_max', i), ' km/h')}"
+                )
+        return "\n".join(lines)
+
+    def format_result(self, forecast: Forecast) -> str:
+        """Format the forecast, or only a summary if it was streamed."""
+        series = forecast.series
+        unit = "hours" if series.resolution == "hourly" else "days"
+        result = (
+            f"📅 **{series.resolution.capitalize()} forecast for "
+            f"{forecast.location}** ({len(series)} {unit})\n"
+        )
+        if forecast.place:
+            result += f"📍 Near: **{forecast.place}**\n"
+
+        if series.resolution == "hourly":
+            temperatures = series.range("temperature_2m")
+        else:
+            lows = series.range("temperature_2m_min")
+            highs = series.range("temperature_2m_max")
+            temperatures = (lows[0], highs[1]) if lows and highs else None
+        if temperatures is not None:
+            result += (
+                f"🌡️ Temperature: **{temperatures[0]:.1f}–{temperatures[1]:.1f}°C**\n"
+            )
+
+        if forecast.streamed_chunks:
+            return result + f"Streamed in {forecast.streamed_chunks} chunks."
+        return result + self.format_rows(series, 0, len(series))
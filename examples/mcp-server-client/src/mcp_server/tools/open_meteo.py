@@ -0,0 +1,194 @@
+"""Shared plumbing for tools calling the Open-Meteo API."""
+
+import math
+import os
+from typing import Any
+
+from ..admission import AdmissionPolicy
+from ..decoding import compile_fields
+from ..gazetteer import Gazetteer, load_gazetteer
+from ..models import WeatherResponse
+from .base import AsyncHttpMixin, ExternalServiceError, ToolError
+
+# Open-Meteo API, overridden with MCP_OPEN_METEO_URL, e.g. to load test
+# against benchmarks.fake_open_meteo
+DEFAULT_API_BASE = "https://api.open-meteo.com/v1"
+
+# Open-Meteo current conditions requested for every location
+CURRENT_FIELDS = "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m"
+
+# Parts of a response that are read; the rest is dropped when decoding
+CURRENT_SELECTION = compile_fields(
+    [
+        "utc_offset_seconds",
+        "current.time",
+        "current.interval",
+        *(f"current.{field}" for field in CURRENT_FIELDS.split(",")),
+    ]
+)
+
+# Grid in degrees that coordinates are snapped to, about 1 km. Open-Meteo's
+# models are no finer, so lookups within a cell return the same data.
+DEFAULT_GRID = 0.01
+
+# Coordinates further from any known place are shown without a place name
+NEAREST_PLACE_KM = 50.0
+
+# Weather code to description mapping (subset of WMO codes)
+WEATHER_CODES = {
+    0: "Clear sky",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Fog",
+    48: "Depositing rime fog",
+    51: "Light drizzle",
+    53: "Moderate drizzle",
+    55: "Dense drizzle",
+    61: "Slight rain",
+    63: "Moderate rain",
+    65: "Heavy rain",
+    71: "Slight snow",
+    73: "Moderate snow",
+    75: "Heavy snow",
+    77: "Snow grains",
+    80: "Slight rain showers",
+    81: "Moderate rain showers",
+    82: "Violent rain showers",
+    85: "Slight snow showers",
+    86: "Heavy snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with slight hail",
+    99: "Thunderstorm with heavy hail",
+}
+
+
+class OpenMeteoMixin(AsyncHttpMixin):
+    """Mixin for tools that resolve locations and query Open-Meteo.
+
+    Provides the API base URL, offline location parsing against the
+    gazetteer, grid snapping and decoding of current conditions.
+    """
+
+    # Bound outbound requests so a burst cannot exhaust sockets and memory.
+    # Tools take a slot per upstream call through ``admission_slot``, so
+    # calls answered from a cache or coalesced onto another never wait.
+    admission_policy: AdmissionPolicy | None = AdmissionPolicy(
+        max_concurrency=32, max_queue=128, queue_timeout=5.0
+    )
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        api_base = os.environ.get("MCP_OPEN_METEO_URL", DEFAULT_API_BASE)
+        self.api_base = api_base.rstrip("/")
+        self.grid = float(os.environ.get("MCP_WEATHER_GRID", DEFAULT_GRID))
+
+    @property
+    def gazetteer(self) -> Gazetteer:
+        """Offline place index, opened on first use."""
+        return load_gazetteer()
+
+    def parse_coordinates(self, location: str) -> tuple[float, float] | None:
+        """Parse a "lat,lon" string, or return None if it is not one."""
+        parts = location.split(",")
+        if len(parts) != 2:
+            return None
+        try:
+            lat = float(parts[0].strip())
+            lon = float(parts[1].strip())
+        except ValueError:
+            return None
+
+        # Basic validation for reasonable coordinate ranges
+        if -90 <= lat <= 90 and -180 <= lon <= 180:
+            return lat, lon
+        return None
+
+    def parse_location(self, location: str) -> tuple[float, float]:
+        """Parse location string to get coordinates."""
+        place = self.gazetteer.lookup(location)
+        if place is not None:
+            return place.latitude, place.longitude
+
+        coordinates = self.parse_coordinates(location)
+        if coordinates is not None:
+            return coordinates
+
+        # Only search for similar names once the location is known to be bad
+        suggestions = [place.name for place in self.gazetteer.suggest(location)]
+        hint = f" Did you mean: {'; '.join(suggestions)}?" if suggestions else ""
+        raise ToolError(
+            f"Unknown location: '{location}'.{hint} "
+            "Please use a city name or coordinates (lat,lon)."
+        )
+
+    def nearest_place(self, lat: float, lon: float) -> str | None:
+        """Name the closest known place, if one is near the coordinates."""
+        nearest = self.gazetteer.nearest(lat, lon)
+        if nearest is None or nearest[1] > NEAREST_PLACE_KM:
+            return None
+        return nearest[0].name
+
+    def build_response(self, location: str, data: dict[str, Any]) -> WeatherResponse:
+        """Build the response for a location from an Open-Meteo result.
+
+        Raises:
+            ExternalServiceError: If current conditions are missing
+        """
+        # Extract current weather data
+        current = data.get("current", {})
+        if not current:
+            raise ExternalServiceError(
+                "No current weather data available",
+                service_name="Open-Meteo",
+            )
+
+        temperature = current.get("temperature_2m")
+        humidity = current.get("relative_humidity_2m")
+        weather_code = current.get("weather_code")
+        wind_speed = current.get("wind_speed_10m")
+        timestamp = current.get("time")
+
+        if temperature is None or weather_code is None or wind_speed is None:
+            raise ExternalServiceError(
+                "Incomplete weather data received",
+                service_name="Open-Meteo",
+            )
+
+        condition = self.weather_code_to_text(weather_code)
+
+        self.logger.info(  # type: ignore[attr-defined]
+            "Weather data retrieved: %s°C, %s, %s km/h wind",
+            temperature,
+            condition,
+            wind_speed,
+        )
+
+        return WeatherResponse(
+            location=location,
+            temperature=temperature,
+            condition=condition,
+            wind_speed=wind_speed,
+            humidity=humidity,
+            timestamp=timestamp,
+        )
+
+    def weather_code_to_text(self, code: int) -> str:
+        """Convert weather code to readable description."""
+        return WEATHER_CODES.get(code, f"Unknown weather condition (code: {code})")
+
+    def snap(self, lat: float, lon: float) -> tuple[float, float]:
+        """Snap coordinates to the centre of their grid cell."""
+        return (
+            round((math.floor(lat / self.grid) + 0.5) * self.grid, 6),
+            round((math.floor(lon / self.grid) + 0.5) * self.grid, 6),
+        )
+
+    async def warm(self) -> None:
+        """Create the HTTP client and open the place index."""
+        await super().warm()
+        _ = self.gazetteer
+
+    async def admit_and_execute(self, **kwargs: Any) -> Any:
+        """Execute without a slot; upstream calls take one each."""
+        return await self.execute(**kwargs)  # type: ignore[attr-defined]
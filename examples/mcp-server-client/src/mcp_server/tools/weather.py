@@ -1,106 +1,183 @@
 """Weather tool for MCP server using Open-Meteo API."""
 
-from datetime import datetime
+import asyncio
+from collections.abc import Hashable
+from datetime import UTC, datetime, timedelta, timezone
 from typing import Any
 
+from ..cache import CachePolicy, ResultCache
+from ..disk_cache import DiskCachePolicy
+from ..metrics import registry as metrics_registry
 from ..models import WeatherRequest, WeatherResponse
-from .base import AsyncHttpMixin, BaseTool, ExternalServiceError, ToolError
+from ..prewarm import Prewarmer, PrewarmPolicy
+from ..singleflight import SingleFlight
+from .base import BaseTool, ExternalServiceError, ToolError
+from .open_meteo import CURRENT_FIELDS, CURRENT_SELECTION, OpenMeteoMixin
 
+# Open-Meteo updates current conditions every 15 minutes
+DEFAULT_UPDATE_INTERVAL = 900
 
-class WeatherTool(BaseTool, AsyncHttpMixin):
+# Minimum freshness, for when the next update is overdue upstream
+MIN_FRESH_SECONDS = 60.0
+
+
+class WeatherTool(OpenMeteoMixin, BaseTool):
     """Tool for getting current weather data."""
 
+    name = "get_weather"
+    description = "Get current weather conditions for a location"
+    request_model = WeatherRequest
+
+    # No cache of formatted responses: every call reaches the per-cell cache
+    # below, so entries expire with Open-Meteo's updates, stale ones are
+    # refreshed and popularity is counted for prewarming
+    cache_policy = None
+
+    # Upstream data per grid cell. Entries expire when Open-Meteo publishes
+    # new conditions and are served for up to an hour longer while a
+    # background request refreshes them.
+    coordinate_cache_policy = CachePolicy(
+        ttl=DEFAULT_UPDATE_INTERVAL, max_entries=4096, max_stale=3600.0
+    )
+
+    # The same per-cell data on disk, so restarted and short-lived stdio
+    # servers start with the cells other processes fetched
+    disk_cache_policy = DiskCachePolicy(
+        ttl=DEFAULT_UPDATE_INTERVAL, max_bytes=20_000_000, max_stale=3600.0
+    )
+
+    # Keep the most requested cells fresh: refresh them shortly before
+    # Open-Meteo's next update, spending at most one upstream call a second
+    prewarm_policy: PrewarmPolicy | None = PrewarmPolicy(
+        top_k=32, lead_time=60.0, max_qps=1.0, interval=15.0
+    )
+
     def __init__(self):
-        super().__init__(
-            name="get_weather",
-            description="Get current weather conditions for a location",
+        super().__init__()
+
+        # Concurrent lookups of the same coordinates share one upstream request
+        self.coalescer = SingleFlight()
+        metrics_registry.register_coalescing(self.name, self.coalescer)
+
+        self.coordinate_cache = ResultCache(self.coordinate_cache_policy)
+        metrics_registry.register_cache(
+            f"{self.name}_coordinates", self.coordinate_cache
         )
-        self.api_base = "https://api.open-meteo.com/v1"
-
-        # Basic city to coordinates mapping
-        # In production, this would use a proper geocoding service
-        self.city_coords = {
-            "san francisco": (37.7749, -122.4194),
-            "new york": (40.7128, -74.0060),
-            "london": (51.5074, -0.1278),
-            "paris": (48.8566, 2.3522),
-            "tokyo": (35.6762, 139.6503),
-            "sydney": (-33.8688, 151.2093),
-            "los angeles": (34.0522, -118.2437),
-            "chicago": (41.8781, -87.6298),
-            "miami": (25.7617, -80.1918),
-            "seattle": (47.6062, -122.3321),
-            "vancouver": (49.2827, -123.1207),
-            "toronto": (43.6532, -79.3832),
-            "berlin": (52.5200, 13.4050),
-            "rome": (41.9028, 12.4964),
-            "madrid": (40.4168, -3.7038),
-            "moscow": (55.7558, 37.6176),
-            "beijing": (39.9042, 116.4074),
-            "mumbai": (19.0760, 72.8777),
-            "cairo": (30.0444, 31.2357),
-            "lagos": (6.5244, 3.3792),
-        }
-
-        # Weather code to description mapping (subset of WMO codes)
-        self.weather_codes = {
-            0: "Clear sky",
-            1: "Mainly clear",
-            2: "Partly cloudy",
-            3: "Overcast",
-            45: "Fog",
-            48: "Depositing rime fog",
-            51: "Light drizzle",
-            53: "Moderate drizzle",
-            55: "Dense drizzle",
-            61: "Slight rain",
-            63: "Moderate rain",
-            65: "Heavy rain",
-            71: "Slight snow",
-            73: "Moderate snow",
-            75: "Heavy snow",
-            77: "Snow grains",
-            80: "Slight rain showers",
-            81: "Moderate rain showers",
-            82: "Violent rain showers",
-            85: "Slight snow showers",
-            86: "Heavy snow showers",
-            95: "Thunderstorm",
-            96: "Thunderstorm with slight hail",
-            99: "Thunderstorm with heavy hail",
-        }
-
-    def parse_location(self, location: str) -> tuple[float, float]:
-        """Parse location string to get coordinates."""
-        location_lower = location.lower().strip()
-
-        # Check if it's in our city mapping
-        if location_lower in self.city_coords:
-            return self.city_coords[location_lower]
-
-        # Try to parse as "lat,lon" coordinates
+        self._refreshes: set[asyncio.Task[Any]] = set()
+
+        # Request counts per cell, for the server's prewarm scheduler
+        self.prewarmer: Prewarmer | None = None
+        if self.prewarm_policy is not None:
+            self.prewarmer = Prewarmer(self.prewarm_policy)
+            metrics_registry.register_prewarm(self.name, self.prewarmer)
+
+    def seconds_until_update(self, data: dict[str, Any]) -> float:
+        """Seconds until Open-Meteo publishes conditions newer than ``data``."""
+        current = data.get("current", {})
+        interval = current.get("interval") or DEFAULT_UPDATE_INTERVAL
         try:
-            parts = location.split(",")
-            if len(parts) == 2:
-                lat = float(parts[0].strip())
-                lon = float(parts[1].strip())
-
-                # Basic validation for reasonable coordinate ranges
-                if -90 <= lat <= 90 and -180 <= lon <= 180:
-                    return lat, lon
-        except ValueError:
-            pass
-
-        # If we can't parse the location, raise an error
-        available_cities = ", ".join(sorted(self.city_coords.keys()))
-        raise ToolError(
-            f"Unknown location: '{location}'. "
-            f"Please use coordinates (lat,lon) or one of: {available_cities}"
-        )
+            observed = datetime.fromisoformat(current["time"])
+        except (KeyError, TypeError, ValueError):
+            return float(interval)
+
+        if observed.tzinfo is None:
+            # With timezone=auto, times are local to the location
+            offset = timedelta(seconds=data.get("utc_offset_seconds", 0))
+            observed = observed.replace(tzinfo=timezone(offset))
+        next_update = observed + timedelta(seconds=interval)
+        return max((next_update - datetime.now(UTC)).total_seconds(), MIN_FRESH_SECONDS)
+
+    async def current_conditions(self, lat: float, lon: float) -> dict[str, Any]:
+        """Return Open-Meteo data for the grid cell containing coordinates.
+
+        Cached data is returned immediately, even when it is stale; stale
+        data is refreshed in the background. Memory misses fall back to the
+        disk cache shared with other processes; only misses there wait for
+        upstream.
+        """
+        cell = self.snap(lat, lon)
+        if self.prewarmer is not None:
+            self.prewarmer.record(cell)
+        cached = self.coordinate_cache.lookup(cell)
+        if cached is not None and cached[1] and self.prewarmer is not None:
+            self.prewarmer.record_hit(cell)
+        if cached is None:
+            # Join a load already in flight for the cell, if any
+            cached = await self.coalescer.do(cell, lambda: self.load(cell))
+
+        data, fresh = cached
+        if not fresh:
+            self.refresh_in_background(cell)
+        return data
+
+    async def load(self, cell: tuple[float, float]) -> tuple[dict[str, Any], bool]:
+        """Load a grid cell from the disk cache, or fetch it on a miss.
+
+        Returns:
+            The cell's data and whether it is still fresh
+        """
+        persisted = await self.read_disk_cache(cell)
+        if persisted is None:
+            return await self.refresh(cell), True
+
+        data, expires_in = persisted
+        self.coordinate_cache.set(cell, data, ttl=max(expires_in, 0.0))
+        return data, expires_in > 0
+
+    async def refresh(self, cell: tuple[float, float]) -> dict[str, Any]:
+        """Fetch a grid cell's conditions and cache them until the next update."""
+        data = await self.fetch_current(*cell)
+        if data.get("current"):
+            ttl = self.seconds_until_update(data)
+            self.coordinate_cache.set(cell, data, ttl=ttl)
+            await self.write_disk_cache(cell, data, ttl=ttl)
+        return data
+
+    def expires_in(self, key: Hashable) -> float | None:
+        """Seconds until a grid cell's cached conditions expire."""
+        return self.coordinate_cache.expires_in(key)
+
+    async def prewarm(self, key: Hashable) -> None:
+        """Refresh a popular grid cell ahead of its expiry."""
+        cell: tuple[float, float] = key  # type: ignore[assignment]
+        await self.coalescer.do(cell, lambda: self.refresh(cell))
+
+    def refresh_in_background(self, cell: tuple[float, float]) -> None:
+        """Start refreshing a stale grid cell unless a request is in flight."""
+        if self.coalescer.running(cell):
+            return
+        task = asyncio.create_task(self.coalescer.do(cell, lambda: self.refresh(cell)))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task[Any]) -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.warning(
+                "Background refresh failed, serving stale data: %s", task.exception()
+            )
 
-    def weather_code_to_text(self, code: int) -> str:
-        """Convert weather code to readable description."""
-        return self.weather_codes.get(code, f"Unknown weather condition (code: {code})")
+    async def cleanup(self):
+        """Cancel background refreshes and close the HTTP client."""
+        for task in list(self._refreshes):
+            task.cancel()
+        await super().cleanup()
+
+    async def fetch_current(self, lat: float, lon: float) -> dict[str, Any]:
+        """Request current conditions for coordinates from Open-Meteo."""
+        async with self.admission_slot():
+            return await self.make_request(
+                method="GET",
+                url=f"{self.api_base}/forecast",
+                params={
+                    "latitude": lat,
+                    "longitude": lon,
+                    "current": CURRENT_FIELDS,
+                    "timezone": "auto",
+                },
+                timeout=15.0,
+                fields=CURRENT_SELECTION,
+            )
 
     async def execute(self, **kwargs: Any) -> WeatherResponse:
         """Get weather data for the specified location."""
@@ -114,61 +191,12 @@ class WeatherTool(BaseTool, AsyncHttpMixin):
         # Parse location to coordinates
         lat, lon = self.parse_location(request.location)
 
-        self.logger.info(f"Getting weather for {location} ({lat}, {lon})")
+        self.logger.info("Getting weather for %s (%s, %s)", location, lat, lon)
 
-        # Make API request to Open-Meteo
         try:
-            data = await self.make_request(
-                method="GET",
-                url=f"{self.api_base}/forecast",
-                params={
-                    "latitude": lat,
-                    "longitude": lon,
-                    "current": (
-                        "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m"
-                    ),
-                    "timezone": "auto",
-                },
-                timeout=15.0,
-            )
-
-            # Extract current weather data
-            current = data.get("current", {})
-            if not current:
-                raise ExternalServiceError(
-                    "No current weather data available",
-                    service_name="Open-Meteo",
-                )
-
-            temperature = current.get("temperature_2m")
-            humidity = current.get("relative_humidity_2m")
-            weather_code = current.get("weather_code")
-            wind_speed = current.get("wind_speed_10m")
-            timestamp = current.get("time")
-
-            if temperature is None or weather_code is None or wind_speed is None:
-                raise ExternalServiceError(
-                    "Incomplete weather data received",
-                    service_name="Open-Meteo",
-                )
-
-            condition = self.weather_code_to_text(weather_code)
-
-            self.logger.info(
-                f"Weather data retrieved: {temperature}°C, {condition}, "
-                f"{wind_speed} km/h wind"
-            )
-
-            return WeatherResponse(
-                location=str(location),
-                temperature=temperature,
-                condition=condition,
-                wind_speed=wind_speed,
-                humidity=humidity,
-                timestamp=timestamp,
-            )
-
-        except ExternalServiceError:
+            data = await self.current_conditions(lat, lon)
+            response = self.build_response(str(location), data)
+        except ToolError:
             raise
         except Exception as e:
             raise ExternalServiceError(
@@ -176,9 +204,15 @@ class WeatherTool(BaseTool, AsyncHttpMixin):
                 service_name="Open-Meteo",
             )
 
+        if self.parse_coordinates(request.location) is not None:
+            response.place = self.nearest_place(lat, lon)
+        return response
+
     def format_result(self, response: WeatherResponse) -> str:
         """Format weather data for display."""
         result = f"🌤️ **Weather for {response.location}**\n"
+        if response.place:
+            result += f"📍 Near: **{response.place}**\n"
         result += f"🌡️ Temperature: **{response.temperature}°C**\n"
         result += f"☁️ Condition: **{response.condition}**\n"
         result += f"💨 Wind Speed: **{response.wind_speed} km/h**"
@@ -195,21 +229,3 @@ class WeatherTool(BaseTool, AsyncHttpMixin):
                 pass
 
         return result
-
-    async def safe_execute(self, **kwargs) -> dict[str, Any]:
-        """Execute weather lookup with formatted output."""
-        try:
-            result = await self.execute(**kwargs)
-            formatted_result = self.format_result(result)
-
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": formatted_result,
-                    }
-                ],
-                "isError": False,
-            }
-        except Exception as e:
-            return self.create_error_response(e)
@@ -0,0 +1,190 @@
+"""Batch weather tool fetching many locations per Open-Meteo request."""
+
+import asyncio
+from typing import Any
+from urllib.parse import quote_plus, urlencode
+
+from ..models import WeatherBatchItem, WeatherBatchRequest, WeatherBatchResponse
+from .base import BaseTool, ExternalServiceError, ToolError
+from .open_meteo import CURRENT_FIELDS, CURRENT_SELECTION, OpenMeteoMixin
+
+# Keep request URLs well below the limits of Open-Meteo and common proxies
+MAX_URL_LENGTH = 2000
+
+# Encoded comma between coordinates in the latitude/longitude lists
+_ENCODED_SEPARATOR = quote_plus(",")
+
+Coordinates = tuple[float, float]
+
+
+def chunk_coordinates(
+    coordinates: list[Coordinates],
+    url: str,
+    params: dict[str, Any],
+    max_length: int = MAX_URL_LENGTH,
+) -> list[list[Coordinates]]:
+    """Split coordinates into chunks whose request URLs fit ``max_length``.
+
+    Args:
+        coordinates: (lat, lon) pairs in request order
+        url: Request URL without query string
+        params: Query parameters other than latitude and longitude
+        max_length: Maximum length of a request URL
+
+    Returns:
+        Chunks of at least one pair, requested as comma-separated lists
+    """
+    base = len(url) + 1 + len(urlencode({"latitude": "", "longitude": "", **params}))
+    chunks: list[list[Coordinates]] = []
+    chunk: list[Coordinates] = []
+    length = base
+    for lat, lon in coordinates:
+        added = len(str(lat)) + len(str(lon))
+        if chunk:
+            added += 2 * len(_ENCODED_SEPARATOR)
+            if length + added > max_length:
+                chunks.append(chunk)
+                chunk, length = [], base
+                added -= 2 * len(_ENCODED_SEPARATOR)
+        chunk.append((lat, lon))
+        length += added
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class WeatherBatchTool(OpenMeteoMixin, BaseTool):
+    """Tool for getting current weather for many locations in one call."""
+
+    name = "get_weather_batch"
+    description = "Get current weather conditions for several locations"
+    request_model = WeatherBatchRequest
+
+    def __init__(self):
+        super().__init__()
+        self.max_url_length = MAX_URL_LENGTH
+
+    async def fetch_current_batch(
+        self, coordinates: list[Coordinates]
+    ) -> list[dict[str, Any]]:
+        """Request current conditions for several coordinates at once.
+
+        Raises:
+            ExternalServiceError: If Open-Meteo returned the wrong number of
+                results
+        """
+        async with self.admission_slot():
+            data = await self.make_request(
+                method="GET",
+                url=f"{self.api_base}/forecast",
+                params={
+                    "latitude": ",".join(str(lat) for lat, _ in coordinates),
+                    "longitude": ",".join(str(lon) for _, lon in coordinates),
+                    "current": CURRENT_FIELDS,
+                    "timezone": "auto",
+                },
+                timeout=15.0,
+                fields=CURRENT_SELECTION,
+            )
+
+        # Open-Meteo answers one location with an object, several with a list
+        results = data if isinstance(data, list) else [data]
+        if len(results) != len(coordinates):
+            raise ExternalServiceError(
+                f"Expected {len(coordinates)} results, got {len(results)}",
+                service_name="Open-Meteo",
+            )
+        return results
+
+    async def execute(self, **kwargs: Any) -> WeatherBatchResponse:
+        """Get weather data for every requested location.
+
+        Locations that cannot be resolved or fetched are reported per item
+        instead of failing the whole batch.
+
+        Raises:
+            ToolError: If no location could be served
+        """
+        locations = kwargs.get("locations")
+        if not locations:
+            raise ToolError("Missing required parameter: locations")
+
+        # Validate input
+        request = self.validate_input({"locations": locations}, WeatherBatchRequest)
+
+        resolved: dict[int, Coordinates] = {}
+        errors: dict[int, str] = {}
+        for index, location in enumerate(request.locations):
+            try:
+                resolved[index] = self.parse_location(location)
+            except ToolError as e:
+                errors[index] = e.message
+
+        # Locations resolving to the same coordinates are requested once
+        unique = list(dict.fromkeys(resolved.values()))
+        chunks = chunk_coordinates(
+            unique,
+            f"{self.api_base}/forecast",
+            {"current": CURRENT_FIELDS, "timezone": "auto"},
+            self.max_url_length,
+        )
+        self.logger.info(
+            "Getting weather for %d locations in %d requests",
+            len(request.locations),
+            len(chunks),
+        )
+
+        outcomes = await asyncio.gather(
+            *(self.fetch_current_batch(chunk) for chunk in chunks),
+            return_exceptions=True,
+        )
+        fetched: dict[Coordinates, dict[str, Any] | str] = {}
+        for chunk, outcome in zip(chunks, outcomes, strict=True):
+            if isinstance(outcome, ToolError):
+                fetched.update(dict.fromkeys(chunk, outcome.message))
+            elif isinstance(outcome, Exception):
+                message = f"Failed to retrieve weather data: {outcome}"
+                fetched.update(dict.fromkeys(chunk, message))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                fetched.update(zip(chunk, outcome, strict=True))
+
+        results = []
+        for index, location in enumerate(request.locations):
+            data = fetched[resolved[index]] if index in resolved else errors[index]
+            if isinstance(data, str):
+                results.append(WeatherBatchItem(location=location, error=data))
+                continue
+            try:
+                weather = self.build_response(location, data)
+            except ToolError as e:
+                results.append(WeatherBatchItem(location=location, error=e.message))
+            else:
+                results.append(WeatherBatchItem(location=location, weather=weather))
+
+        response = WeatherBatchResponse(results=results)
+        if response.failed == len(results):
+            raise ToolError(
+                "No weather data for any location: "
+                + "; ".join(f"{item.location}: {item.error}" for item in results)
+            )
+        return response
+
+    def format_result(self, response: WeatherBatchResponse) -> str:
+        """Format batch weather data for display, one line per location."""
+        succeeded = len(response.results) - response.failed
+        lines = [f"🌤️ **Weather for {succeeded} of {len(response.results)} locations**"]
+        for item in response.results:
+            if item.weather is None:
+                lines.append(f"- {item.location}: ⚠️ {item.error}")
+                continue
+            weather = item.weather
+            line = (
+                f"- {item.location}: **{weather.temperature}°C**, "
+                f"{weather.condition}, {weather.wind_speed} km/h wind"
+            )
+            if weather.humidity is not None:
+                line += f", {weather.humidity}% humidity"
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,11 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_disk_cache(tmp_path, monkeypatch):
+    """Give every test its own disk cache and index cache instead of the user's."""
+    monkeypatch.setenv("MCP_DISK_CACHE", str(tmp_path / "upstream.sqlite3"))
+    # Gazetteer indexes are written under XDG_CACHE_HOME
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
@@ -0,0 +1,172 @@
+"""Tests for per-tool admission control and load shedding."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from src.mcp_server.admission import (
+    AdmissionController,
+    AdmissionPolicy,
+    AdmissionRejected,
+    parse_limits,
+    policy_for,
+)
+from src.mcp_server.metrics import MetricsRegistry
+from src.mcp_server.tools.base import BaseTool
+
+
+class SlowTool(BaseTool):
+    """Tool that blocks until released, for saturating admission."""
+
+    admission_policy = AdmissionPolicy(max_concurrency=1, max_queue=1, queue_timeout=1)
+
+    def __init__(self):
+        super().__init__(name="slow_tool", description="Blocks until released")
+        self.release = asyncio.Event()
+
+    async def execute(self, **kwargs: Any) -> str:
+        await self.release.wait()
+        return "done"
+
+
+class TestAdmissionController:
+    """Test suite for AdmissionController."""
+
+    @pytest.mark.asyncio
+    async def test_admits_up_to_concurrency(self):
+        """Test calls within the concurrency limit are admitted immediately."""
+        controller = AdmissionController(AdmissionPolicy(max_concurrency=2))
+
+        await controller.acquire()
+        await controller.acquire()
+
+        assert controller.stats()["active"] == 2
+        assert controller.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Test calls beyond concurrency and queue depth are rejected."""
+        controller = AdmissionController(
+            AdmissionPolicy(max_concurrency=1, max_queue=0)
+        )
+        await controller.acquire()
+
+        with pytest.raises(AdmissionRejected, match="queue full"):
+            await controller.acquire()
+        assert controller.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        """Test queued calls are rejected after the wait timeout."""
+        controller = AdmissionController(
+            AdmissionPolicy(max_concurrency=1, max_queue=1, queue_timeout=0.01)
+        )
+        await controller.acquire()
+
+        with pytest.raises(AdmissionRejected, match="waited"):
+            await controller.acquire()
+        assert controller.timeouts == 1
+        assert controller.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_release_hands_slot_to_waiter_in_order(self):
+        """Test released slots go to waiters in FIFO order."""
+        controller = AdmissionController(
+            AdmissionPolicy(max_concurrency=1, max_queue=2)
+        )
+        await controller.acquire()
+        order = []
+
+        async def wait(name: str) -> None:
+            await controller.acquire()
+            order.append(name)
+
+        tasks = [
+            asyncio.create_task(wait("first")),
+            asyncio.create_task(wait("second")),
+        ]
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 2
+
+        controller.release()
+        await asyncio.sleep(0)
+        controller.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["first", "second"]
+        assert controller.active == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test cancelling a queued call removes it from the queue."""
+        controller = AdmissionController(AdmissionPolicy(max_concurrency=1))
+        await controller.acquire()
+        task = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert controller.queue_depth == 0
+        controller.release()
+        assert controller.active == 0
+
+    def test_parse_limits(self, monkeypatch):
+        """Test MCP_TOOL_LIMITS overrides a tool's default policy."""
+        assert parse_limits("get_weather=4:8:1.5") == {
+            "get_weather": AdmissionPolicy(4, 8, 1.5)
+        }
+        monkeypatch.setenv("MCP_TOOL_LIMITS", "get_weather=4:8:1.5")
+
+        assert policy_for("get_weather", None) == AdmissionPolicy(4, 8, 1.5)
+        assert policy_for("roll_dice", None) is None
+
+    def test_malformed_limits_fall_back(self, monkeypatch, caplog):
+        """Test malformed MCP_TOOL_LIMITS entries keep the default policy."""
+        default = AdmissionPolicy(32, 128, 5.0)
+        monkeypatch.setenv(
+            "MCP_TOOL_LIMITS", "roll_dice=4:8,get_time=0:1:1,get_weather=4:8:1.5"
+        )
+
+        assert policy_for("roll_dice", default) == default
+        assert policy_for("get_time", default) == default
+        assert policy_for("get_weather", default) == AdmissionPolicy(4, 8, 1.5)
+        assert "roll_dice=4:8" in caplog.text
+
+
+class TestLoadShedding:
+    """Test suite for admission control in BaseTool.safe_execute."""
+
+    @pytest.mark.asyncio
+    async def test_overloaded_tool_returns_error(self):
+        """Test a saturated tool sheds calls with a server overloaded error."""
+        tool = SlowTool()
+        running = asyncio.create_task(tool.safe_execute())
+        queued = asyncio.create_task(tool.safe_execute())
+        await asyncio.sleep(0)
+
+        result = await tool.safe_execute()
+
+        assert result["isError"] is True
+        assert result["error"]["code"] == -32000
+        assert "overloaded" in result["content"][0]["text"]
+
+        tool.release.set()
+        assert (await running)["isError"] is False
+        assert (await queued)["isError"] is False
+        assert tool.admission is not None
+        assert tool.admission.stats()["active"] == 0
+
+    def test_queue_depth_metric(self):
+        """Test queue depth and shedding counters are rendered."""
+        registry = MetricsRegistry()
+        registry.register_admission(
+            "get_weather", AdmissionController(AdmissionPolicy())
+        )
+
+        text = registry.render_prometheus()
+
+        assert 'mcp_tool_queue_depth{tool="get_weather"} 0' in text
+        assert 'mcp_tool_rejected_total{tool="get_weather"} 0' in text
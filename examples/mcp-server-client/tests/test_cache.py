@@ -0,0 +1,275 @@
+"""Tests for the tool result cache."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.mcp_server.cache import CachePolicy, ResultCache
+from src.mcp_server.tools.date_time import DateTimeTool
+from src.mcp_server.tools.dice import DiceRollTool
+from src.mcp_server.tools.weather import WeatherTool
+from tests.fixtures.mcp_messages import WeatherAPIFixtures
+
+
+class TestResultCache:
+    """Test suite for ResultCache."""
+
+    def test_hit_and_miss(self):
+        """Test lookups count hits and misses."""
+        cache = ResultCache(CachePolicy())
+
+        assert cache.get("a") is None
+        cache.set("a", {"value": 1})
+
+        assert cache.get("a") == {"value": 1}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        cache = ResultCache(CachePolicy(ttl=10.0))
+
+        with patch("src.mcp_server.cache.time.monotonic", return_value=100.0):
+            cache.set("a", "value")
+        with patch("src.mcp_server.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_no_ttl_never_expires(self):
+        """Test entries without TTL never expire."""
+        cache = ResultCache(CachePolicy(ttl=None))
+
+        with patch("src.mcp_server.cache.time.monotonic", return_value=0.0):
+            cache.set("a", "value")
+        with patch("src.mcp_server.cache.time.monotonic", return_value=1e9):
+            assert cache.get("a") == "value"
+
+    def test_lru_eviction_by_entries(self):
+        """Test least recently used entries are evicted first."""
+        cache = ResultCache(CachePolicy(max_entries=2))
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_memory_cap(self):
+        """Test the memory cap bounds the cache size."""
+        cache = ResultCache(CachePolicy(max_entries=100, max_bytes=500))
+        for i in range(20):
+            cache.set(i, "x" * 100)
+
+        assert cache.size_bytes <= 500
+        assert cache.stats()["evictions"] > 0
+
+    def test_oversized_value_not_cached(self):
+        """Test values larger than the memory cap are not stored."""
+        cache = ResultCache(CachePolicy(max_bytes=100))
+        cache.set("big", "x" * 1000)
+
+        assert len(cache) == 0
+
+    def test_set_overrides_ttl(self):
+        """Test an entry can carry its own freshness."""
+        cache = ResultCache(CachePolicy(ttl=10.0))
+
+        with patch("src.mcp_server.cache.time.monotonic", return_value=100.0):
+            cache.set("a", "value", ttl=60.0)
+        with patch("src.mcp_server.cache.time.monotonic", return_value=150.0):
+            assert cache.get("a") == "value"
+
+    def test_lookup_serves_stale_entries(self):
+        """Test expired entries are served as stale within max_stale."""
+        cache = ResultCache(CachePolicy(ttl=10.0, max_stale=30.0))
+
+        with patch("src.mcp_server.cache.time.monotonic", return_value=100.0):
+            cache.set("a", "value")
+            assert cache.lookup("a") == ("value", True)
+        with patch("src.mcp_server.cache.time.monotonic", return_value=120.0):
+            assert cache.lookup("a") == ("value", False)
+        with patch("src.mcp_server.cache.time.monotonic", return_value=141.0):
+            assert cache.lookup("a") is None
+
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["stale_hits"] == 1
+        assert cache.stats()["expirations"] == 1
+
+
+class TestCoordinateCache:
+    """Test suite for the weather tool's grid-bucketed upstream cache."""
+
+    @staticmethod
+    def upstream(minutes_ago: float = 0.0, temperature: float = 20.0):
+        """Build an Open-Meteo result observed ``minutes_ago``."""
+        data = WeatherAPIFixtures.current_weather_response(temperature=temperature)
+        observed = datetime.now(UTC) - timedelta(minutes=minutes_ago)
+        data["current"]["time"] = observed.strftime("%Y-%m-%dT%H:%M")
+        data["current"]["interval"] = 900
+        data["utc_offset_seconds"] = 0
+        return data
+
+    def test_nearby_coordinates_share_a_cell(self):
+        """Test coordinates within one grid cell snap to the same key."""
+        tool = WeatherTool()
+
+        assert tool.snap(37.7749, -122.4194) == tool.snap(37.7750, -122.4193)
+        assert tool.snap(37.7749, -122.4194) != tool.snap(37.80, -122.4194)
+
+    def test_grid_configurable(self, monkeypatch):
+        """Test MCP_WEATHER_GRID sets the cell size."""
+        monkeypatch.setenv("MCP_WEATHER_GRID", "0.1")
+
+        assert WeatherTool().snap(37.7749, -122.4194) == (37.75, -122.45)
+
+    def test_expiry_follows_update_cadence(self):
+        """Test entries stay fresh until the next upstream update."""
+        tool = WeatherTool()
+
+        remaining = tool.seconds_until_update(self.upstream(minutes_ago=5))
+
+        assert 540 <= remaining <= 600
+
+    def test_overdue_update_keeps_minimum_freshness(self):
+        """Test data past its update time is not refetched on every call."""
+        tool = WeatherTool()
+
+        assert tool.seconds_until_update(self.upstream(minutes_ago=60)) == 60.0
+
+    def test_local_time_uses_utc_offset(self):
+        """Test local observation times are converted with the UTC offset."""
+        tool = WeatherTool()
+        data = self.upstream(minutes_ago=5)
+        local = datetime.now(UTC) + timedelta(hours=9) - timedelta(minutes=5)
+        data["current"]["time"] = local.strftime("%Y-%m-%dT%H:%M")
+        data["utc_offset_seconds"] = 9 * 3600
+
+        assert 540 <= tool.seconds_until_update(data) <= 600
+
+    @pytest.mark.asyncio
+    async def test_nearby_lookups_use_one_request(self):
+        """Test distinct coordinate strings in one cell hit upstream once."""
+        tool = WeatherTool()
+
+        with patch.object(
+            tool, "make_request", return_value=self.upstream()
+        ) as mock_request:
+            await tool.execute(location="37.7749,-122.4194")
+            response = await tool.execute(location="37.7750,-122.4193")
+
+        assert mock_request.call_count == 1
+        assert response.location == "37.7750,-122.4193"
+
+    @pytest.mark.asyncio
+    async def test_stale_served_while_refreshing(self):
+        """Test stale data is returned at once and refreshed in background."""
+        tool = WeatherTool()
+        cell = tool.snap(51.5074, -0.1278)
+        tool.coordinate_cache.set(cell, self.upstream(temperature=10.0), ttl=-1.0)
+        release = asyncio.Event()
+
+        async def make_request(**kwargs):
+            await release.wait()
+            return self.upstream(temperature=12.0)
+
+        with patch.object(tool, "make_request", side_effect=make_request) as request:
+            stale = await tool.execute(location="London")
+            await tool.execute(location="London")
+            release.set()
+            await asyncio.gather(*tool._refreshes)
+            refreshed = await tool.execute(location="London")
+
+        assert stale.temperature == 10.0
+        assert request.call_count == 1
+        assert refreshed.temperature == 12.0
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_data(self):
+        """Test an upstream failure during refresh still serves stale data."""
+        tool = WeatherTool()
+        cell = tool.snap(51.5074, -0.1278)
+        tool.coordinate_cache.set(cell, self.upstream(temperature=10.0), ttl=-1.0)
+
+        with patch.object(tool, "make_request", side_effect=RuntimeError("down")):
+            await tool.execute(location="London")
+            await asyncio.gather(*tool._refreshes, return_exceptions=True)
+            response = await tool.execute(location="London")
+
+        assert response.temperature == 10.0
+
+    @pytest.mark.asyncio
+    async def test_cleanup_cancels_refreshes(self):
+        """Test pending background refreshes are cancelled on cleanup."""
+        tool = WeatherTool()
+        cell = tool.snap(51.5074, -0.1278)
+        tool.coordinate_cache.set(cell, self.upstream(), ttl=-1.0)
+
+        async def make_request(**kwargs):
+            await asyncio.sleep(10)
+
+        with patch.object(tool, "make_request", side_effect=make_request):
+            await tool.execute(location="London")
+            refreshes = list(tool._refreshes)
+            await tool.cleanup()
+            await asyncio.gather(*refreshes, return_exceptions=True)
+
+        assert all(task.cancelled() for task in refreshes)
+
+
+class TestToolCaching:
+    """Test suite for cache integration in BaseTool.safe_execute."""
+
+    @pytest.mark.asyncio
+    async def test_weather_cached_by_normalised_location(self):
+        """Test equivalent weather locations share one upstream request."""
+        tool = WeatherTool()
+        mock_response = WeatherAPIFixtures.current_weather_response()
+
+        with patch.object(
+            tool, "make_request", return_value=mock_response
+        ) as mock_request:
+            await tool.safe_execute(location="London")
+            await tool.safe_execute(location="  london ")
+
+        assert mock_request.call_count == 1
+        assert tool.coordinate_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_weather_responses_follow_cell_expiry(self):
+        """Test repeat calls are answered from the cell, not a response cache."""
+        tool = WeatherTool()
+        cell = tool.snap(51.5074, -0.1278)
+        mock_response = WeatherAPIFixtures.current_weather_response()
+
+        with patch.object(
+            tool, "make_request", return_value=mock_response
+        ) as mock_request:
+            await tool.safe_execute(location="London")
+            tool.coordinate_cache.set(cell, mock_response, ttl=-1.0)
+            await tool.safe_execute(location="London")
+            await asyncio.gather(*tool._refreshes)
+
+        assert tool.cache is None
+        assert mock_request.call_count == 2
+
+    def test_dice_never_cached(self):
+        """Test dice rolls opt out of caching."""
+        assert DiceRollTool().cache is None
+
+    def test_timezone_resolution_cached(self):
+        """Test timezone resolution is memoized without expiry."""
+        tool = DateTimeTool()
+
+        first = tool.parse_timezone("America/New_York")
+        second = tool.parse_timezone("America/New_York")
+
+        assert first is second
+        assert tool.timezone_cache.policy.ttl is None
+        assert tool.timezone_cache.stats()["hits"] == 1
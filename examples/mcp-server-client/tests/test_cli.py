@@ -38,6 +38,8 @@ class TestMCPClientCLI:
         args = MagicMock()
         args.tool = "roll_dice"
         args.notation = "2d6"
+        args.seed = None
+        args.secure = None
 
         result = cli._build_tool_arguments(args)
         assert result == {"notation": "2d6"}
@@ -0,0 +1,121 @@
+"""Tests for deadline propagation into tool execution."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from src.mcp_server import deadline
+from src.mcp_server.server import request_timeout
+from src.mcp_server.tools.base import BaseTool, DeadlineExceededError
+from src.mcp_server.tools.weather import WeatherTool
+
+
+class SleepyTool(BaseTool):
+    """Tool that sleeps, recording whether it was cancelled."""
+
+    def __init__(self):
+        super().__init__(name="sleepy_tool", description="Sleeps")
+        self.cancelled = False
+
+    async def execute(self, **kwargs: Any) -> str:
+        try:
+            await asyncio.sleep(kwargs.get("seconds", 1.0))
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "awake"
+
+
+class TestDeadlineScope:
+    """Test suite for the deadline context variable."""
+
+    def test_no_deadline(self):
+        """Test defaults apply when no deadline is set."""
+        assert deadline.remaining() is None
+        assert deadline.timeout_for(10.0) == 10.0
+
+    def test_scope_caps_timeouts(self):
+        """Test timeouts are capped to the time left."""
+        with deadline.scope(0.5):
+            assert 0 < deadline.timeout_for(10.0) <= 0.5
+            assert deadline.timeout_for(0.1) == 0.1
+        assert deadline.remaining() is None
+
+    def test_nested_scope_only_shortens(self):
+        """Test an inner scope cannot extend the outer deadline."""
+        with deadline.scope(0.5):
+            with deadline.scope(60.0):
+                assert deadline.remaining() <= 0.5
+
+    def test_expired_deadline(self):
+        """Test an expired deadline refuses to start new work."""
+        with deadline.scope(0.0), pytest.raises(deadline.DeadlineExceeded):
+            deadline.timeout_for(10.0)
+
+    def test_timeout_from_meta(self):
+        """Test the client's budget is read from request metadata."""
+        meta = SimpleNamespace(model_extra={"timeoutMs": 1500})
+
+        assert deadline.timeout_from_meta(meta) == 1.5
+        assert deadline.timeout_from_meta(None) is None
+        assert deadline.timeout_from_meta(SimpleNamespace(model_extra={})) is None
+
+    def test_request_timeout_from_context(self):
+        """Test the server reads the budget from the request context."""
+        meta = SimpleNamespace(model_extra={"timeoutMs": 250})
+        ctx = SimpleNamespace(request_context=SimpleNamespace(meta=meta))
+
+        assert request_timeout(ctx) == 0.25
+        assert request_timeout(None) is None
+
+
+class TestDeadlineEnforcement:
+    """Test suite for deadline enforcement in tools."""
+
+    @pytest.mark.asyncio
+    async def test_expired_call_is_cancelled(self):
+        """Test execution is cancelled and reported once the deadline passes."""
+        tool = SleepyTool()
+
+        with deadline.scope(0.01):
+            result = await tool.safe_execute(seconds=5.0)
+
+        assert result["isError"] is True
+        assert result["error"]["code"] == -32001
+        assert tool.cancelled is True
+
+    @pytest.mark.asyncio
+    async def test_call_within_deadline(self):
+        """Test calls that finish in time succeed."""
+        with deadline.scope(5.0):
+            result = await SleepyTool().safe_execute(seconds=0.0)
+
+        assert result["isError"] is False
+
+    @pytest.mark.asyncio
+    async def test_http_request_gets_remaining_time(self):
+        """Test outbound requests are given only the time left."""
+        tool = WeatherTool()
+        response = MagicMock()
+        response.content = b"{}"
+        tool._http_client = AsyncMock()
+        tool._http_client.request.return_value = response
+
+        with deadline.scope(0.5):
+            await tool.make_request("GET", "https://example.com", timeout=10.0)
+
+        assert tool._http_client.request.call_args.kwargs["timeout"] <= 0.5
+
+    @pytest.mark.asyncio
+    async def test_http_timeout_caused_by_deadline(self):
+        """Test a request cut short by the deadline reports the deadline."""
+        tool = WeatherTool()
+        tool._http_client = AsyncMock()
+        tool._http_client.request.side_effect = httpx.ReadTimeout("timed out")
+
+        with deadline.scope(0.5), pytest.raises(DeadlineExceededError):
+            await tool.make_request("GET", "https://example.com", timeout=10.0)
@@ -0,0 +1,125 @@
+"""Tests for decoding upstream JSON responses."""
+
+from importlib.util import find_spec
+
+import httpx
+import pytest
+
+from src.mcp_server.decoding import (
+    JsonDecoder,
+    available_backend,
+    compile_fields,
+    select,
+)
+from src.mcp_server.tools.weather import CURRENT_SELECTION
+from tests.test_outbound import URL, UpstreamTool
+
+BODY = b"""{
+    "latitude": 51.5,
+    "utc_offset_seconds": 3600,
+    "current_units": {"temperature_2m": "\xc2\xb0C"},
+    "current": {"time": "2025-07-07T12:00", "temperature_2m": 12.5, "snow": 0}
+}"""
+
+
+class TestFieldSelection:
+    """Test suite for compile_fields and select."""
+
+    def test_compile_dotted_paths(self):
+        """Test paths sharing a parent are merged."""
+        fields = compile_fields(["a", "b.c", "b.d.e"])
+
+        assert fields == {"a": None, "b": {"c": None, "d": {"e": None}}}
+
+    def test_whole_object_wins(self):
+        """Test a path to an object keeps it whole, in either order."""
+        assert compile_fields(["b.c", "b"]) == {"b": None}
+        assert compile_fields(["b", "b.c"]) == {"b": None}
+
+    def test_select_nested(self):
+        """Test only selected fields survive, and missing ones are skipped."""
+        data = {"a": 1, "b": {"c": 2, "d": 3}, "e": 4}
+
+        selected = select(data, compile_fields(["a", "b.c", "missing.x"]))
+
+        assert selected == {"a": 1, "b": {"c": 2}}
+
+    def test_select_each_list_item(self):
+        """Test multi-location lists are selected per location."""
+        data = [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+
+        assert select(data, {"a": None}) == [{"a": 1}, {"a": 3}]
+
+
+class TestJsonDecoder:
+    """Test suite for JsonDecoder backends."""
+
+    @pytest.mark.parametrize("backend", ["json", "orjson"])
+    def test_backends_agree(self, backend):
+        """Test every backend decodes the same value."""
+        if find_spec(backend) is None:
+            pytest.skip(f"{backend} is not installed")
+
+        decoded = JsonDecoder(backend).decode(BODY)
+
+        assert decoded == JsonDecoder("json").decode(BODY)
+        assert decoded["current_units"]["temperature_2m"] == "°C"
+
+    def test_selection(self):
+        """Test a selection keeps only what the weather tool reads."""
+        decoded = JsonDecoder().decode(BODY, CURRENT_SELECTION)
+
+        assert decoded == {
+            "utc_offset_seconds": 3600,
+            "current": {"time": "2025-07-07T12:00", "temperature_2m": 12.5},
+        }
+
+    def test_invalid_json(self):
+        """Test malformed bodies raise ValueError on every backend."""
+        with pytest.raises(ValueError):
+            JsonDecoder().decode(b"{not json")
+
+    def test_backend_from_environment(self, monkeypatch):
+        """Test MCP_JSON_BACKEND chooses the backend."""
+        monkeypatch.setenv("MCP_JSON_BACKEND", "json")
+
+        assert JsonDecoder().backend == "json"
+
+    def test_unknown_backend_falls_back(self):
+        """Test an unknown or missing backend falls back to json."""
+        assert available_backend("simdjson") == "json"
+
+
+class TestSelectiveRequests:
+    """Test suite for field selection in make_request."""
+
+    @pytest.mark.asyncio
+    async def test_make_request_selects_fields(self):
+        """Test responses are reduced to the requested fields."""
+        tool = UpstreamTool(lambda request: httpx.Response(200, content=BODY))
+
+        data = await tool.make_request("GET", URL, fields=compile_fields(["latitude"]))
+
+        assert data == {"latitude": 51.5}
+
+    @pytest.mark.asyncio
+    async def test_make_request_keeps_everything_by_default(self):
+        """Test requests without fields get the whole response."""
+        tool = UpstreamTool(lambda request: httpx.Response(200, content=BODY))
+
+        data = await tool.make_request("GET", URL)
+
+        assert set(data) == {
+            "latitude",
+            "utc_offset_seconds",
+            "current_units",
+            "current",
+        }
+
+    @pytest.mark.asyncio
+    async def test_tool_backend_is_configurable(self):
+        """Test tools can pin a backend with the json_backend attribute."""
+        tool = UpstreamTool(lambda request: httpx.Response(200, content=BODY))
+        tool.json_backend = "json"
+
+        assert tool.json_decoder.backend == "json"
@@ -0,0 +1,195 @@
+"""Tests for exact dice distributions."""
+
+import itertools
+from collections import Counter
+from importlib.util import find_spec
+
+import pytest
+
+from src.mcp_server import dice_distribution
+from src.mcp_server.dice_distribution import DistributionCalculator, fft_length
+from src.mcp_server.dice_notation import compile_notation
+
+BACKENDS = [
+    pytest.param(
+        "numpy",
+        marks=pytest.mark.skipif(
+            find_spec("numpy") is None, reason="NumPy is not installed"
+        ),
+    ),
+    "python",
+]
+
+
+def enumerate_pmf(
+    sides: int, count: int, keep: int | None = None, highest: bool = True
+) -> dict[int, float]:
+    """Brute force the distribution of ``count`` dice, keeping some."""
+    totals: Counter[int] = Counter()
+    for faces in itertools.product(range(1, sides + 1), repeat=count):
+        kept = sorted(faces, reverse=highest)[: keep or count]
+        totals[sum(kept)] += 1
+    return {total: ways / sides**count for total, ways in totals.items()}
+
+
+def as_dict(distribution) -> dict[int, float]:
+    """Map each outcome to its probability."""
+    return {
+        distribution.offset + index: float(p)
+        for index, p in enumerate(distribution.pmf)
+        if p > 1e-15
+    }
+
+
+def assert_close(actual: dict[int, float], expected: dict[int, float]) -> None:
+    """Assert two distributions agree to rounding error."""
+    assert actual.keys() == expected.keys()
+    for total, p in expected.items():
+        assert actual[total] == pytest.approx(p, abs=1e-12)
+
+
+class TestDistributionCalculator:
+    """Test suite for DistributionCalculator."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_plain_dice(self, backend):
+        """Test sums of dice match enumeration."""
+        distribution = DistributionCalculator(backend).distribution(
+            compile_notation("3d6")
+        )
+
+        assert_close(as_dict(distribution), enumerate_pmf(6, 3))
+        assert distribution.mean == pytest.approx(10.5)
+        assert distribution.variance == pytest.approx(8.75)
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    @pytest.mark.parametrize("highest", [True, False])
+    def test_keep(self, backend, highest):
+        """Test keeping dice matches enumeration."""
+        notation = "4d6kh3" if highest else "4d6kl3"
+
+        distribution = DistributionCalculator(backend).distribution(
+            compile_notation(notation)
+        )
+
+        assert_close(as_dict(distribution), enumerate_pmf(6, 4, 3, highest))
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_signs_and_constants(self, backend):
+        """Test subtracted groups and constants shift the outcomes."""
+        distribution = DistributionCalculator(backend).distribution(
+            compile_notation("1d6-1d4+2")
+        )
+
+        assert distribution.offset == -1
+        assert distribution.maximum == 7
+        assert distribution.mean == pytest.approx(3.5 - 2.5 + 2)
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_rerolls(self, backend):
+        """Test rerolling until higher and rerolling once."""
+        calculator = DistributionCalculator(backend)
+
+        until = as_dict(calculator.distribution(compile_notation("1d6r2")))
+        once = as_dict(calculator.distribution(compile_notation("1d6ro1")))
+
+        assert_close(until, {face: 0.25 for face in range(3, 7)})
+        assert once[1] == pytest.approx(1 / 36)
+        assert once[6] == pytest.approx(7 / 36)
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_exploding(self, backend):
+        """Test exploding dice skip the top face and keep their mean."""
+        distribution = DistributionCalculator(backend).distribution(
+            compile_notation("1d6!")
+        )
+        pmf = as_dict(distribution)
+
+        assert 6 not in pmf
+        assert pmf[7] == pytest.approx(1 / 36)
+        assert distribution.mean == pytest.approx(4.2)
+
+    def test_fft_matches_direct(self):
+        """Test FFT powers and convolutions agree with direct convolution."""
+        plan = compile_notation("40d20+30d12")
+
+        fast = DistributionCalculator("numpy").distribution(plan)
+        direct = DistributionCalculator("python").distribution(plan)
+
+        assert fast.offset == direct.offset
+        assert fast.pmf.tolist() == pytest.approx(direct.pmf, abs=1e-12)
+
+    def test_hundreds_of_large_dice(self):
+        """Test large groups have the mean and variance of their dice."""
+        distribution = DistributionCalculator().distribution(
+            compile_notation("300d1000")
+        )
+
+        assert distribution.maximum == 300_000
+        assert distribution.mean == pytest.approx(300 * 500.5)
+        assert distribution.variance == pytest.approx(300 * (1000**2 - 1) / 12)
+
+    def test_groups_memoized(self):
+        """Test groups are computed once across expressions."""
+        calculator = DistributionCalculator()
+
+        calculator.distribution(compile_notation("4d6+2"))
+        calculator.distribution(compile_notation("4d6-1d4"))
+
+        assert calculator.groups.hits == 1
+        assert len(calculator.dice) == 2
+
+    def test_too_many_outcomes(self, monkeypatch):
+        """Test distributions beyond MAX_OUTCOMES are refused."""
+        monkeypatch.setattr(dice_distribution, "MAX_OUTCOMES", 1000)
+
+        with pytest.raises(ValueError, match="more than 1000"):
+            DistributionCalculator().distribution(compile_notation("200d6"))
+
+    def test_keep_too_large(self):
+        """Test keeping dice of very large groups is refused."""
+        with pytest.raises(ValueError, match="too large to compute exactly"):
+            DistributionCalculator().distribution(compile_notation("200d100kh10"))
+
+    def test_fft_length(self):
+        """Test FFT lengths only have small prime factors."""
+        assert fft_length(1000) == 1000
+        assert fft_length(1001) == 1024
+        assert fft_length(499_501) == 500_000
+
+
+class TestDistribution:
+    """Test suite for statistics of a distribution."""
+
+    def test_percentiles(self):
+        """Test percentiles are the smallest totals reaching them."""
+        distribution = DistributionCalculator().distribution(compile_notation("1d4"))
+
+        percentiles = distribution.percentiles(distribution.cdf())
+
+        assert percentiles["p25"] == 1
+        assert percentiles["p50"] == 2
+        assert percentiles["p99"] == 4
+
+    def test_exact_points(self):
+        """Test small distributions keep one point per total."""
+        distribution = DistributionCalculator().distribution(compile_notation("2d6"))
+
+        start, end, step, pmf, cdf = distribution.binned(distribution.cdf(), 100)
+
+        assert (start, end, step) == (2, 12, 1)
+        assert pmf[5] == pytest.approx(1 / 6)
+        assert cdf[-1] == pytest.approx(1.0)
+
+    def test_binned(self):
+        """Test wide distributions are binned without their negligible tails."""
+        distribution = DistributionCalculator().distribution(
+            compile_notation("100d100")
+        )
+
+        start, end, step, pmf, cdf = distribution.binned(distribution.cdf(), 100)
+
+        assert len(pmf) <= 100
+        assert step > 1
+        assert 100 < start < end < 10_000
+        assert sum(pmf) == pytest.approx(1.0)
@@ -0,0 +1,185 @@
+"""Tests for the bulk dice engine."""
+
+from importlib.util import find_spec
+
+import pytest
+
+from src.mcp_server import dice_engine
+from src.mcp_server.dice_engine import (
+    DiceEngine,
+    DiceGroup,
+    DiceLimits,
+    available_backend,
+    keep_results,
+    keep_values,
+    parse_dice_limits,
+)
+
+BACKENDS = [
+    pytest.param(
+        "numpy",
+        marks=pytest.mark.skipif(
+            find_spec("numpy") is None, reason="NumPy is not installed"
+        ),
+    ),
+    "python",
+]
+
+
+class TestDiceEngine:
+    """Test suite for DiceEngine backends."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_values_kept_for_small_rolls(self, backend):
+        """Test small rolls return every die."""
+        roll = DiceEngine(backend).roll(10, 6, max_values=10)
+
+        assert len(roll.values) == 10
+        assert all(1 <= v <= 6 for v in roll.values)
+        assert roll.total == sum(roll.values)
+        assert roll.minimum == min(roll.values)
+        assert roll.maximum == max(roll.values)
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_summary_for_large_rolls(self, backend):
+        """Test large rolls keep only statistics."""
+        roll = DiceEngine(backend).roll(100_000, 20, max_values=100)
+
+        assert roll.values is None
+        assert sum(roll.histogram) == 100_000
+        assert len(roll.histogram) == 20
+        assert abs(roll.mean - 10.5) < 0.1
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_several_batches(self, backend, monkeypatch):
+        """Test rolls larger than a batch are drawn in several."""
+        monkeypatch.setattr(dice_engine, "BATCH_SIZE", 7)
+
+        roll = DiceEngine(backend).roll(50, 4, max_values=50)
+
+        assert len(roll.values) == 50
+        assert roll.histogram == [roll.values.count(face) for face in range(1, 5)]
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_single_sided_die(self, backend):
+        """Test a one sided die always rolls 1."""
+        roll = DiceEngine(backend).roll(1000, 1)
+
+        assert roll.total == 1000
+        assert roll.histogram == [1000]
+
+    def test_backend_from_environment(self, monkeypatch):
+        """Test MCP_DICE_BACKEND chooses the backend."""
+        monkeypatch.setenv("MCP_DICE_BACKEND", "python")
+
+        assert DiceEngine().backend == "python"
+        assert available_backend("fortran") == "python"
+
+
+class TestDiceLimits:
+    """Test suite for configurable dice limits."""
+
+    def test_defaults(self):
+        """Test empty configuration keeps the defaults."""
+        assert parse_dice_limits("") == DiceLimits()
+
+    def test_overrides(self):
+        """Test limits can be overridden individually."""
+        limits = parse_dice_limits("dice=500, values=10")
+
+        assert limits == DiceLimits(dice=500, sides=DiceLimits.sides, values=10)
+
+    def test_unknown_limit(self):
+        """Test unknown limit names are rejected."""
+        with pytest.raises(ValueError):
+            parse_dice_limits("faces=6")
+
+
+class TestDiceGroups:
+    """Test suite for rolling modified dice groups."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_keep_highest(self, backend):
+        """Test only the highest dice are counted."""
+        group = DiceGroup(count=4, sides=6, keep=3)
+
+        roll = DiceEngine(backend).roll_group(group, max_values=10)
+
+        assert len(roll.values) == 3
+        assert len(roll.dropped) == 1
+        assert min(roll.values) >= roll.dropped[0]
+        assert roll.total == sum(roll.values)
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_keep_lowest_summarized(self, backend):
+        """Test keeping dice works on the histogram of large rolls."""
+        group = DiceGroup(count=100_000, sides=20, keep=10, keep_highest=False)
+
+        roll = DiceEngine(backend).roll_group(group)
+
+        assert roll.values is None
+        assert roll.count == 10
+        assert roll.total == 10
+        assert roll.histogram[0] == 10
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_reroll_until_higher(self, backend):
+        """Test faces at or below the reroll threshold never come up."""
+        roll = DiceEngine(backend).roll_group(DiceGroup(count=10_000, sides=6, low=3))
+
+        assert roll.minimum == 3
+        assert roll.histogram[:2] == [0, 0]
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_reroll_once(self, backend):
+        """Test rerolled faces may still come up, but less often."""
+        group = DiceGroup(count=60_000, sides=6, reroll_once=1)
+
+        roll = DiceEngine(backend).roll_group(group)
+
+        # P(1) = 1/6 * 1/6
+        assert 0 < roll.histogram[0] < 3_000
+        assert roll.count == 60_000
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_exploding(self, backend):
+        """Test top faces roll again and are added."""
+        roll = DiceEngine(backend).roll_group(
+            DiceGroup(count=60_000, sides=6, explode=True)
+        )
+
+        assert roll.histogram[5] == 0
+        assert roll.maximum > 6
+        assert abs(roll.mean - 4.2) < 0.1
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_roll_totals(self, backend):
+        """Test per-roll totals stay in range and keep the best dice."""
+        totals = DiceEngine(backend).roll_totals(
+            DiceGroup(count=4, sides=6, keep=3), 20_000
+        )
+
+        assert len(totals) == 20_000
+        assert min(totals) >= 3
+        assert max(totals) <= 18
+        # 4d6kh3 averages about 12.24, against 10.5 for 3d6
+        assert abs(sum(totals) / 20_000 - 12.24) < 0.1
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_roll_totals_exploding(self, backend):
+        """Test per-roll totals include explosions."""
+        totals = DiceEngine(backend).roll_totals(
+            DiceGroup(count=1, sides=6, explode=True), 60_000
+        )
+
+        assert 6 not in set(totals)
+        assert abs(sum(totals) / 60_000 - 4.2) < 0.1
+
+    def test_keep_results(self):
+        """Test keeping from a histogram takes whole faces first."""
+        assert keep_results([2, 0, 3, 1], 3, highest=True) == [0, 0, 2, 1]
+        assert keep_results([2, 0, 3, 1], 3, highest=False) == [2, 0, 1, 0]
+
+    def test_keep_values(self):
+        """Test kept and dropped values stay in roll order."""
+        assert keep_values([3, 6, 1, 5], 2, highest=True) == ([6, 5], [3, 1])
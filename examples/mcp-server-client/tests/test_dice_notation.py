@@ -0,0 +1,141 @@
+"""Tests for compiling dice expressions."""
+
+from importlib.util import find_spec
+
+import pytest
+
+from src.mcp_server.dice_engine import DiceEngine, DiceGroup
+from src.mcp_server.dice_notation import compile_notation, roll_batch
+
+
+class TestCompileNotation:
+    """Test suite for the dice expression compiler."""
+
+    def test_plain_dice(self):
+        """Test plain notation compiles to one unmodified group."""
+        plan = compile_notation("2d6")
+
+        assert plan.groups == ((1, DiceGroup(count=2, sides=6)),)
+        assert plan.plain
+        assert plan.dice == 2
+
+    def test_groups_and_constants(self):
+        """Test groups and constants are summed with their signs."""
+        plan = compile_notation(" 2D20kl1 - 1d4 + 3 - 1 ")
+
+        assert plan.notation == "2d20kl1-1d4+2"
+        assert [sign for sign, _ in plan.groups] == [1, -1]
+        assert plan.constant == 2
+        assert not plan.plain
+
+    @pytest.mark.parametrize(
+        ("notation", "group"),
+        [
+            ("4d6kh3", DiceGroup(count=4, sides=6, keep=3)),
+            ("4d6k3", DiceGroup(count=4, sides=6, keep=3)),
+            ("2d20kl1", DiceGroup(count=2, sides=20, keep=1, keep_highest=False)),
+            ("4d6dl1", DiceGroup(count=4, sides=6, keep=3)),
+            ("4d6dh1", DiceGroup(count=4, sides=6, keep=3, keep_highest=False)),
+            ("4d6kh4", DiceGroup(count=4, sides=6)),
+            ("1d6!", DiceGroup(count=1, sides=6, explode=True)),
+            ("2d6r2", DiceGroup(count=2, sides=6, low=3)),
+            ("2d6ro1", DiceGroup(count=2, sides=6, reroll_once=1)),
+            ("1d%", DiceGroup(count=1, sides=100)),
+        ],
+    )
+    def test_modifiers(self, notation, group):
+        """Test each modifier compiles into the dice group."""
+        assert compile_notation(notation).groups == ((1, group),)
+
+    @pytest.mark.parametrize(
+        ("notation", "message"),
+        [
+            ("d6", "Invalid dice notation"),
+            ("2d6+", "Invalid dice notation"),
+            ("2d6 2d6", "Invalid dice notation"),
+            ("5", "Invalid dice notation"),
+            ("4d6kh", "Invalid dice notation"),
+            ("4d6kh5", "Cannot keep 5 of 4 dice"),
+            ("4d6dl4", "Cannot drop 4 of 4 dice"),
+            ("4d6kh3dl1", "Conflicting dice modifiers"),
+            ("1d6!!", "Conflicting dice modifiers"),
+            ("1d6r6", "Cannot reroll every face of a d6"),
+            ("1d1!", "Cannot explode a d1"),
+            ("1d6r5!", "Cannot explode a d6"),
+            ("+".join(["1d6"] * 21), "must not exceed 20 terms"),
+            ("1d6+99999999999999999999", "constants must not exceed"),
+        ],
+    )
+    def test_invalid(self, notation, message):
+        """Test malformed and conflicting expressions are rejected."""
+        with pytest.raises(ValueError, match=message):
+            compile_notation(notation)
+
+    def test_limits_apply_to_whole_expression(self, monkeypatch):
+        """Test the dice limit counts every group."""
+        monkeypatch.setenv("MCP_DICE_LIMITS", "dice=10")
+
+        compile_notation("5d6+5d8")
+        with pytest.raises(ValueError, match="Dice count must not exceed 10"):
+            compile_notation("5d6+6d8")
+
+
+class TestDicePlan:
+    """Test suite for rolling compiled plans."""
+
+    def test_total(self):
+        """Test the total applies signs and the constant."""
+        plan = compile_notation("3d1-2d1+10")
+
+        rolls = plan.roll(DiceEngine("python"))
+
+        assert plan.total(rolls) == 11
+
+
+BACKENDS = [
+    pytest.param(
+        "numpy",
+        marks=pytest.mark.skipif(
+            find_spec("numpy") is None, reason="NumPy is not installed"
+        ),
+    ),
+    "python",
+]
+
+
+class TestRollBatch:
+    """Test suite for rolling many plans at once."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_totals_per_plan(self, backend):
+        """Test each plan gets its own row of totals in range."""
+        plans = [compile_notation(n) for n in ("1d20+5", "2d6-1d4", "1d1+2")]
+
+        totals = roll_batch(DiceEngine(backend), plans, 500)
+
+        assert [len(row) for row in totals] == [500, 500, 500]
+        assert all(6 <= total <= 25 for total in totals[0])
+        assert all(-2 <= total <= 11 for total in totals[1])
+        assert totals[2] == [3] * 500
+        assert all(type(total) is int for total in totals[0])
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_shared_groups_drawn_once(self, backend):
+        """Test plans sharing a group split one draw between them."""
+        engine = DiceEngine(backend)
+        calls = []
+        roll_totals = engine.roll_totals
+
+        def counted(group, rolls):
+            calls.append((group, rolls))
+            return roll_totals(group, rolls)
+
+        engine.roll_totals = counted
+        plans = [compile_notation(n) for n in ("1d20+5", "1d20-1", "1d20+5")]
+
+        totals = roll_batch(engine, plans, 100)
+
+        assert calls == [(DiceGroup(count=1, sides=20), 300)]
+        # Each plan gets its own dice, not a copy of another plan's
+        assert [t - 5 for t in totals[0]] != [t - 5 for t in totals[2]]
+        assert all(0 <= total <= 19 for total in totals[1])
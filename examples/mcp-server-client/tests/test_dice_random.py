@@ -0,0 +1,145 @@
+"""Tests for the random streams dice are drawn from."""
+
+import gc
+from importlib.util import find_spec
+from types import SimpleNamespace
+
+import pytest
+
+from src.mcp_server import session
+from src.mcp_server.dice_engine import DiceEngine, DiceGroup
+from src.mcp_server.dice_random import DiceStream, SessionStreams, available_mode
+from src.mcp_server.server import client_session
+
+BACKENDS = [
+    pytest.param(
+        "numpy",
+        marks=pytest.mark.skipif(
+            find_spec("numpy") is None, reason="NumPy is not installed"
+        ),
+    ),
+    "python",
+]
+
+
+class Session:
+    """Stand-in for an MCP session, which streams are keyed by."""
+
+
+class TestDiceStream:
+    """Test suite for fast and secure dice streams."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_seeded_streams_replay(self, backend):
+        """Test streams with the same seed draw the same dice."""
+        first = DiceStream(backend, seed=42)
+        second = DiceStream(backend, seed=42)
+
+        assert list(first.integers(1, 20, 100)) == list(second.integers(1, 20, 100))
+        assert list(first.integers(1, 6, 10)) == list(second.integers(1, 6, 10))
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_unseeded_streams_independent(self, backend):
+        """Test unseeded streams draw different dice."""
+        first = DiceStream(backend).integers(1, 1000, 100)
+        second = DiceStream(backend).integers(1, 1000, 100)
+
+        assert list(first) != list(second)
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    @pytest.mark.parametrize("sides", [6, 8, 1000])
+    def test_secure_results_uniform(self, backend, sides):
+        """Test secure dice cover every face evenly, with or without bias."""
+        stream = DiceStream(backend, mode="secure")
+
+        results = list(stream.integers(1, sides, 100 * sides))
+
+        assert len(results) == 100 * sides
+        assert min(results) == 1
+        assert max(results) == sides
+        assert abs(sum(results) / len(results) - (sides + 1) / 2) < sides * 0.05
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_secure_engine_rolls(self, backend):
+        """Test engines roll modified groups from a secure stream."""
+        engine = DiceEngine(stream=DiceStream(backend, mode="secure"))
+
+        roll = engine.roll_group(DiceGroup(count=10_000, sides=6, explode=True))
+
+        assert engine.backend == backend
+        assert roll.histogram[5] == 0
+        assert abs(roll.mean - 4.2) < 0.2
+
+    def test_secure_cannot_be_seeded(self):
+        """Test seeding a secure stream is rejected."""
+        with pytest.raises(ValueError, match="cannot be seeded"):
+            DiceStream("python", mode="secure", seed=1)
+
+    def test_mode_from_environment(self, monkeypatch):
+        """Test MCP_DICE_RNG sets the default mode."""
+        monkeypatch.setenv("MCP_DICE_RNG", "secure")
+        assert available_mode() == "secure"
+        assert DiceEngine("python").stream.mode == "secure"
+
+        monkeypatch.setenv("MCP_DICE_RNG", "quantum")
+        assert available_mode() == "fast"
+        assert available_mode("secure") == "secure"
+
+
+class TestSessionStreams:
+    """Test suite for per-session streams."""
+
+    def test_sessions_have_own_streams(self):
+        """Test each session keeps one stream of its own."""
+        streams = SessionStreams()
+        first, second = Session(), Session()
+
+        with session.scope(first):
+            stream = streams.get("python")
+            assert streams.get("python") is stream
+        with session.scope(second):
+            assert streams.get("python") is not stream
+        assert streams.get("python") is not stream
+        assert len(streams) == 2
+
+    def test_seed_restarts_session_stream(self):
+        """Test a seed replaces only the current session's stream."""
+        streams = SessionStreams()
+        first, second = Session(), Session()
+        with session.scope(second):
+            other = streams.get("python")
+
+        with session.scope(first):
+            seeded = streams.get("python", seed=7)
+            rolls = seeded.integers(1, 20, 5)
+            assert streams.get("python") is seeded
+            assert streams.get("python", seed=7).integers(1, 20, 5) == rolls
+        with session.scope(second):
+            assert streams.get("python") is other
+
+    def test_streams_dropped_with_session(self):
+        """Test a session's stream is released when the session ends."""
+        streams = SessionStreams()
+        owner = Session()
+        with session.scope(owner):
+            streams.get("python")
+
+        del owner
+        gc.collect()
+
+        assert len(streams) == 0
+
+    def test_session_from_request_context(self):
+        """Test the server keys calls by the session they arrived on."""
+        owner = Session()
+        ctx = SimpleNamespace(request_context=SimpleNamespace(session=owner))
+
+        assert client_session(ctx) is owner
+        assert client_session(None) is None
+
+    def test_seed_rejected_in_secure_mode(self, monkeypatch):
+        """Test seeds are refused while every stream must be secure."""
+        monkeypatch.setenv("MCP_DICE_RNG", "secure")
+
+        with pytest.raises(ValueError, match="cannot be seeded"):
+            SessionStreams().get("python", seed=1)
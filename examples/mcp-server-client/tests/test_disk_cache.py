@@ -0,0 +1,201 @@
+"""Tests for the persistent upstream cache."""
+
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.mcp_server.disk_cache import DiskCache, DiskCachePolicy, disk_cache_path
+from src.mcp_server.tools.weather import WeatherTool
+from tests.fixtures.mcp_messages import WeatherAPIFixtures
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+WRITER = """
+import sys
+from pathlib import Path
+from src.mcp_server.disk_cache import DiskCache, DiskCachePolicy
+
+cache = DiskCache(Path(sys.argv[1]), DiskCachePolicy(), "shared")
+for i in range(50):
+    cache.set([sys.argv[2], i], {"value": i})
+"""
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a disk cache in a temporary directory."""
+    return DiskCache(tmp_path / "cache.sqlite3", DiskCachePolicy(ttl=60.0), "tool")
+
+
+class TestDiskCache:
+    """Test suite for DiskCache."""
+
+    def test_round_trip(self, cache):
+        """Test values are stored with their remaining freshness."""
+        cache.set((51.5, -0.1), {"current": {"temperature_2m": 12.5}})
+
+        value, expires_in = cache.lookup((51.5, -0.1))
+
+        assert value == {"current": {"temperature_2m": 12.5}}
+        assert 59 < expires_in <= 60
+        assert cache.lookup((0.0, 0.0)) is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_expired_entries_dropped(self, cache):
+        """Test entries past expiry are misses, deleted by the next write."""
+        cache.set("key", {"value": 1}, ttl=-1.0)
+
+        assert cache.lookup("key") is None
+        assert cache.stats()["misses"] == 1
+
+        cache.set("other", {"value": 2})
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["expirations"] == 1
+
+    def test_reads_update_access_time_once_per_interval(self, cache):
+        """Test repeated reads within access_interval do not write."""
+        cache.set("key", {"value": 1}, ttl=3600.0)
+        statements = []
+        cache._db.set_trace_callback(statements.append)
+
+        cache.lookup("key")
+        cache.lookup("key")
+        assert not any(sql.startswith("UPDATE") for sql in statements)
+
+        with patch("time.time", return_value=time.time() + 61.0):
+            cache.lookup("key")
+        assert sum(sql.startswith("UPDATE") for sql in statements) == 1
+
+    def test_database_errors_count_as_misses(self, cache):
+        """Test a failing lookup is a miss rather than an error."""
+        cache.close()
+
+        assert cache.lookup("key") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_stale_entries_served_within_max_stale(self, tmp_path):
+        """Test entries within max_stale come back with a negative freshness."""
+        policy = DiskCachePolicy(ttl=60.0, max_stale=30.0)
+        cache = DiskCache(tmp_path / "cache.sqlite3", policy, "tool")
+        cache.set("key", {"value": 1}, ttl=-10.0)
+
+        value, expires_in = cache.lookup("key")
+
+        assert value == {"value": 1}
+        assert expires_in < 0
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_least_recently_used_evicted_over_size(self, tmp_path):
+        """Test the size cap evicts the entries read longest ago."""
+        policy = DiskCachePolicy(max_bytes=300, access_interval=0.0)
+        cache = DiskCache(tmp_path / "cache.sqlite3", policy, "tool")
+        cache.set("a", {"data": "x" * 80})
+        cache.set("b", {"data": "x" * 80})
+        cache.lookup("a")
+        cache.set("c", {"data": "x" * 80})
+        cache.set("d", {"data": "x" * 80})
+
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") is not None
+        assert cache.stats()["size_bytes"] <= 300
+        assert cache.stats()["evictions"] == 1
+
+    def test_namespaces_are_separate(self, tmp_path):
+        """Test tools sharing a database do not see each other's entries."""
+        path = tmp_path / "cache.sqlite3"
+        DiskCache(path, DiskCachePolicy(), "one").set("key", {"value": 1})
+
+        assert DiskCache(path, DiskCachePolicy(), "two").lookup("key") is None
+        assert DiskCache(path, DiskCachePolicy(), "one").lookup("key") is not None
+
+    def test_unserializable_values_skipped(self, cache):
+        """Test values that are not JSON are not cached, without raising."""
+        cache.set("key", {"value": object()})
+
+        assert cache.lookup("key") is None
+
+    def test_concurrent_processes(self, tmp_path):
+        """Test several processes can write the same database at once."""
+        path = tmp_path / "cache.sqlite3"
+        writers = [
+            subprocess.Popen(
+                [sys.executable, "-c", WRITER, str(path), f"w{n}"], cwd=PROJECT_ROOT
+            )
+            for n in range(4)
+        ]
+
+        assert [writer.wait(timeout=30) for writer in writers] == [0] * 4
+        assert DiskCache(path, DiskCachePolicy(), "shared").stats()["entries"] == 200
+
+    def test_path_configuration(self, tmp_path, monkeypatch):
+        """Test MCP_DISK_CACHE selects or disables the database."""
+        monkeypatch.setenv("MCP_DISK_CACHE", "off")
+        assert disk_cache_path() is None
+
+        monkeypatch.delenv("MCP_DISK_CACHE")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert disk_cache_path() == tmp_path / "mcp-server-client" / "upstream.sqlite3"
+
+
+class TestWeatherDiskCache:
+    """Test suite for the weather tool's persistent cell cache."""
+
+    @pytest.mark.asyncio
+    async def test_new_process_starts_warm(self):
+        """Test a fresh tool serves cells fetched by an earlier one."""
+        data = WeatherAPIFixtures.current_weather_response(temperature=15.0)
+        first = WeatherTool()
+        with patch.object(first, "make_request", return_value=data):
+            await first.execute(location="London")
+        await first.cleanup()
+
+        second = WeatherTool()
+        with patch.object(second, "make_request") as mock_request:
+            response = await second.execute(location="London")
+
+        assert mock_request.call_count == 0
+        assert response.temperature == 15.0
+
+    @pytest.mark.asyncio
+    async def test_stale_disk_entry_served_and_refreshed(self):
+        """Test stale persisted data is served while it is refreshed."""
+        tool = WeatherTool()
+        cell = tool.snap(51.5074, -0.1278)
+        stale = WeatherAPIFixtures.current_weather_response(temperature=10.0)
+        await tool.write_disk_cache(cell, stale, ttl=-1.0)
+        fresh = WeatherAPIFixtures.current_weather_response(temperature=12.0)
+
+        with patch.object(tool, "make_request", return_value=fresh) as mock_request:
+            response = await tool.execute(location="London")
+            await asyncio.gather(*tool._refreshes)
+
+        assert response.temperature == 10.0
+        assert mock_request.call_count == 1
+        persisted, _ = await tool.read_disk_cache(cell)
+        assert persisted["current"]["temperature_2m"] == 12.0
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, monkeypatch):
+        """Test MCP_DISK_CACHE=off keeps the tool memory-only."""
+        monkeypatch.setenv("MCP_DISK_CACHE", "off")
+        tool = WeatherTool()
+
+        assert tool.disk_cache is None
+        assert await tool.read_disk_cache((0.0, 0.0)) is None
+
+    @pytest.mark.asyncio
+    async def test_flush_checkpoints(self):
+        """Test flushing at shutdown leaves the cache readable."""
+        tool = WeatherTool()
+        await tool.write_disk_cache((1.0, 2.0), {"current": {}})
+
+        await tool.flush()
+        await tool.cleanup()
+
+        assert tool.disk_cache.lookup((1.0, 2.0)) is not None
@@ -0,0 +1,197 @@
+"""Tests for the fake Open-Meteo API and the weather tool running against it."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.fake_open_meteo import FakeConfig, FakeOpenMeteo, parse_latency, serve
+from src.mcp_server.tools.forecast import ForecastTool
+from src.mcp_server.tools.weather import CURRENT_FIELDS, WeatherTool
+
+
+async def get(app: FakeOpenMeteo, **params) -> httpx.Response:
+    """Send a forecast request to the app in process."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://fake") as c:
+        return await c.get("/v1/forecast", params=params)
+
+
+class TestFakeOpenMeteo:
+    """Test suite for the fake API's responses and failure modes."""
+
+    @pytest.mark.asyncio
+    async def test_current_response_shape(self):
+        """Test current conditions look like Open-Meteo's."""
+        response = await get(
+            FakeOpenMeteo(),
+            latitude=51.5,
+            longitude=-0.1,
+            current=CURRENT_FIELDS,
+            timezone="auto",
+        )
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data["current"]["interval"] == 900
+        assert set(CURRENT_FIELDS.split(",")) <= set(data["current"])
+        assert data["current_units"]["temperature_2m"] == "°C"
+
+    @pytest.mark.asyncio
+    async def test_deterministic_values(self):
+        """Test the same coordinates always get the same conditions."""
+        app = FakeOpenMeteo()
+        params = {"latitude": 48.85, "longitude": 2.35, "current": CURRENT_FIELDS}
+
+        first = (await get(app, **params)).json()["current"]
+        second = (await get(app, **params)).json()["current"]
+
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_multiple_coordinates_return_a_list(self):
+        """Test comma separated coordinates get one result each."""
+        app = FakeOpenMeteo()
+
+        response = await get(
+            app, latitude="51.5,48.85", longitude="-0.1,2.35", current=CURRENT_FIELDS
+        )
+
+        assert [r["latitude"] for r in response.json()] == [51.5, 48.85]
+        assert app.stats.requests == 1
+        assert app.stats.locations == 2
+
+    @pytest.mark.asyncio
+    async def test_hourly_unixtime(self):
+        """Test hourly series honour forecast_hours and timeformat."""
+        response = await get(
+            FakeOpenMeteo(),
+            latitude=51.5,
+            longitude=-0.1,
+            hourly="temperature_2m,weather_code",
+            forecast_hours=48,
+            timeformat="unixtime",
+        )
+
+        hourly = response.json()["hourly"]
+        assert len(hourly["time"]) == len(hourly["weather_code"]) == 48
+        assert hourly["time"][1] - hourly["time"][0] == 3600
+
+    @pytest.mark.asyncio
+    async def test_errors_at_configured_rate(self):
+        """Test error_rate answers that fraction of requests with 503."""
+        app = FakeOpenMeteo(FakeConfig(error_rate=1.0))
+
+        response = await get(app, latitude=0, longitude=0, current=CURRENT_FIELDS)
+
+        assert response.status_code == 503
+        assert app.stats.errors == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_with_retry_after(self):
+        """Test requests beyond the burst get 429 with Retry-After."""
+        app = FakeOpenMeteo(FakeConfig(rate_limit=0.001, burst=2))
+
+        statuses = [
+            (await get(app, latitude=0, longitude=0)).status_code for _ in range(3)
+        ]
+        response = await get(app, latitude=0, longitude=0)
+
+        assert statuses == [200, 200, 429]
+        assert response.headers["Retry-After"] == "1"
+        assert app.stats.rate_limited == 2
+
+    @pytest.mark.asyncio
+    async def test_bad_coordinates(self):
+        """Test malformed coordinates are a 400 like upstream."""
+        response = await get(FakeOpenMeteo(), latitude="1,2", longitude="3")
+
+        assert response.status_code == 400
+
+    def test_latency_distributions(self):
+        """Test latency specs parse into samplers in seconds."""
+        import random
+
+        rng = random.Random(0)
+
+        assert parse_latency("fixed:50")(rng) == 0.05
+        assert 0.01 <= parse_latency("uniform:10:20")(rng) <= 0.02
+        assert parse_latency("lognormal:80:0.5")(rng) > 0
+        with pytest.raises(ValueError):
+            parse_latency("normal:1")
+
+
+class TestWeatherToolAgainstFake:
+    """Test suite running the weather tools over real HTTP to the fake API."""
+
+    @pytest.mark.asyncio
+    async def test_api_base_from_environment(self, monkeypatch):
+        """Test MCP_OPEN_METEO_URL points the tool at another API."""
+        monkeypatch.setenv("MCP_OPEN_METEO_URL", "http://127.0.0.1:8081/v1/")
+
+        assert WeatherTool().api_base == "http://127.0.0.1:8081/v1"
+
+    @pytest.mark.asyncio
+    async def test_get_weather(self, monkeypatch):
+        """Test a weather lookup end to end."""
+        app = FakeOpenMeteo()
+        async with serve(app) as base_url:
+            monkeypatch.setenv("MCP_OPEN_METEO_URL", base_url)
+            tool = WeatherTool()
+            try:
+                result = await tool.safe_execute(location="51.5,-0.1")
+            finally:
+                await tool.cleanup()
+
+        assert result["isError"] is False
+        assert "°C" in result["content"][0]["text"]
+        assert app.stats.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_coalesced(self):
+        """Test concurrent calls for one cell make one slow upstream request."""
+        app = FakeOpenMeteo(FakeConfig(latency="fixed:100"))
+        async with serve(app) as base_url:
+            tool = WeatherTool()
+            tool.api_base = base_url
+            try:
+                await asyncio.gather(
+                    *(tool.execute(location="51.5,-0.1") for _ in range(20))
+                )
+            finally:
+                await tool.cleanup()
+
+        assert app.stats.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_retried(self):
+        """Test 503s are retried until the attempts run out."""
+        app = FakeOpenMeteo(FakeConfig(error_rate=1.0))
+        async with serve(app) as base_url:
+            tool = WeatherTool()
+            tool.api_base = base_url
+            try:
+                result = await tool.safe_execute(location="51.5,-0.1")
+                host = tool.upstreams.stats()[base_url.removesuffix("/v1")]
+            finally:
+                await tool.cleanup()
+
+        assert result["isError"] is True
+        assert app.stats.requests == tool.retry_policy.attempts
+        assert host["retries"] == tool.retry_policy.attempts - 1
+        assert host["connections_opened"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_forecast(self):
+        """Test the forecast tool decodes the fake's unix time series."""
+        app = FakeOpenMeteo()
+        async with serve(app) as base_url:
+            tool = ForecastTool()
+            tool.api_base = base_url
+            try:
+                forecast = await tool.execute(location="London", hours=36)
+            finally:
+                await tool.cleanup()
+
+        assert len(forecast.series) == 36
+        assert forecast.series.value("weather_code", 0) is not None
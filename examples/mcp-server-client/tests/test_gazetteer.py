@@ -0,0 +1,175 @@
+"""Tests for the offline gazetteer."""
+
+import gzip
+import random
+
+import pytest
+
+from src.mcp_server.gazetteer import (
+    BUNDLED_DATASET,
+    Gazetteer,
+    build_index,
+    index_path,
+    load_gazetteer,
+    normalize_name,
+    read_geonames,
+    unit_vector,
+)
+
+ROWS = [
+    ("Paris", ["Paris", "Parigi"], 48.8566, 2.3522, "FR", 2_100_000),
+    ("Paris", ["Paris"], 33.6609, -95.5555, "US", 25_000),
+    ("Zürich", ["Zurich"], 47.3769, 8.5417, "CH", 420_000),
+    ("San Francisco", ["SF"], 37.7749, -122.4194, "US", 870_000),
+    ("San Diego", [], 32.7157, -117.1611, "US", 1_400_000),
+    ("Santiago", [], -33.4489, -70.6693, "CL", 5_600_000),
+]
+
+
+@pytest.fixture
+def gazetteer():
+    """Build an in-memory gazetteer from a few places."""
+    return Gazetteer(build_index(ROWS))
+
+
+class TestGazetteer:
+    """Test suite for Gazetteer lookups."""
+
+    def test_normalize_name(self):
+        """Test case, accents and whitespace are folded."""
+        assert normalize_name("  Zürich ") == "zurich"
+        assert normalize_name("SÃO  Paulo") == "sao paulo"
+
+    def test_exact_lookup(self, gazetteer):
+        """Test names resolve regardless of case and accents."""
+        place = gazetteer.lookup("zurich")
+
+        assert place.name == "Zürich, CH"
+        assert (place.latitude, place.longitude) == (47.3769, 8.5417)
+
+    def test_alternate_names(self, gazetteer):
+        """Test alternate names resolve to their place."""
+        assert gazetteer.lookup("SF").name == "San Francisco, US"
+        assert gazetteer.lookup("parigi").name == "Paris, FR"
+
+    def test_most_populous_place_wins(self, gazetteer):
+        """Test a shared name resolves to the most populous place."""
+        assert gazetteer.lookup("Paris").name == "Paris, FR"
+
+    def test_unknown_name(self, gazetteer):
+        """Test unknown names return None."""
+        assert gazetteer.lookup("Atlantis") is None
+
+    def test_prefix_ranked_by_population(self, gazetteer):
+        """Test prefix matches are ordered by population."""
+        names = [place.name for place in gazetteer.prefix("san")]
+
+        assert names == ["Santiago, CL", "San Diego, US", "San Francisco, US"]
+
+    def test_prefix_limit(self, gazetteer):
+        """Test prefix lookups return at most ``limit`` places."""
+        assert len(gazetteer.prefix("san", limit=2)) == 2
+        assert gazetteer.prefix("") == []
+
+    @pytest.mark.parametrize("typo", ["Zruich", "Zurch", "Zurichh", "Xurich"])
+    def test_fuzzy_tolerates_one_typo(self, gazetteer, typo):
+        """Test transpositions, deletions, insertions and substitutions."""
+        assert [place.name for place in gazetteer.fuzzy(typo)] == ["Zürich, CH"]
+
+    def test_suggest_combines_typos_and_prefixes(self, gazetteer):
+        """Test suggestions cover both misspelled and partial names."""
+        assert gazetteer.suggest("Pari")[0].name == "Paris, FR"
+        assert "San Diego, US" in [place.name for place in gazetteer.suggest("San")]
+
+    def test_nearest_place(self, gazetteer):
+        """Test coordinates resolve to the closest place with its distance."""
+        place, km = gazetteer.nearest(37.7750, -122.4193)
+
+        assert place.name == "San Francisco, US"
+        assert km < 0.1
+
+    def test_nearest_matches_brute_force(self):
+        """Test the k-d tree finds the same place as a linear scan."""
+        rng = random.Random(7)
+        rows = [
+            (f"P{i}", [], rng.uniform(-90, 90), rng.uniform(-180, 180), "", 0)
+            for i in range(2000)
+        ]
+        gazetteer = Gazetteer(build_index(rows))
+
+        for _ in range(100):
+            lat, lon = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            query = unit_vector(lat, lon)
+            expected = min(
+                rows,
+                key=lambda row: sum(
+                    (a - b) ** 2
+                    for a, b in zip(unit_vector(row[2], row[3]), query, strict=True)
+                ),
+            )
+            assert gazetteer.nearest(lat, lon)[0].name == expected[0]
+
+    def test_empty_index(self):
+        """Test an empty index answers every lookup with nothing."""
+        gazetteer = Gazetteer(build_index([]))
+
+        assert gazetteer.lookup("Paris") is None
+        assert gazetteer.nearest(0.0, 0.0) is None
+
+    def test_rejects_other_files(self):
+        """Test buffers without the index header are rejected."""
+        with pytest.raises(ValueError):
+            Gazetteer(b"not an index")
+
+
+class TestGazetteerLoading:
+    """Test suite for building, caching and memory-mapping indexes."""
+
+    def test_read_geonames_skips_malformed_lines(self, tmp_path):
+        """Test GeoNames rows are parsed and broken lines skipped."""
+        columns = ["1", "Oslo", "Oslo", "Christiania", "59.9139", "10.7522"]
+        columns += ["P", "PPLC", "NO", "", "", "", "", "", "700000"]
+        dump = tmp_path / "cities.txt.gz"
+        with gzip.open(dump, "wt", encoding="utf-8") as f:
+            f.write("\t".join(columns) + "\n")
+            f.write("broken line\n")
+
+        assert list(read_geonames(dump)) == [
+            ("Oslo", ["Oslo", "Christiania"], 59.9139, 10.7522, "NO", 700000)
+        ]
+
+    def test_bundled_dataset(self):
+        """Test the bundled dataset covers the well-known cities."""
+        places = {row[0] for row in read_geonames(BUNDLED_DATASET)}
+
+        assert {"London", "Tokyo", "San Francisco", "New York City"} <= places
+
+    def test_index_cached_and_memory_mapped(self, tmp_path, monkeypatch):
+        """Test the index is written once and then memory-mapped."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        load_gazetteer.cache_clear()
+
+        gazetteer = load_gazetteer(BUNDLED_DATASET)
+        path = index_path(BUNDLED_DATASET)
+        load_gazetteer.cache_clear()
+        reopened = load_gazetteer(BUNDLED_DATASET)
+        load_gazetteer.cache_clear()
+
+        assert path.parent == tmp_path / "mcp-server-client"
+        assert path.exists()
+        assert reopened is not gazetteer
+        assert reopened.lookup("London").name == "London, GB"
+
+    def test_corrupt_index_rebuilt(self, tmp_path, monkeypatch):
+        """Test an unreadable cached index is replaced."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        path = index_path(BUNDLED_DATASET)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"garbage")
+        load_gazetteer.cache_clear()
+
+        gazetteer = load_gazetteer(BUNDLED_DATASET)
+        load_gazetteer.cache_clear()
+
+        assert gazetteer.lookup("Tokyo") is not None
+        assert Gazetteer.open(path).lookup("Tokyo") is not None
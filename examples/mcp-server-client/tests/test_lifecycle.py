@@ -0,0 +1,171 @@
+"""Tests for graceful shutdown and in-flight call draining."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.mcp_server import server
+from src.mcp_server.lifecycle import ServerLifecycle
+
+
+@pytest.fixture
+def fresh_lifecycle(monkeypatch):
+    """Replace the server's lifecycle so tests do not leak draining state."""
+    lifecycle = ServerLifecycle(poll_interval=0.01)
+    monkeypatch.setattr(server, "lifecycle", lifecycle)
+    return lifecycle
+
+
+class TestServerLifecycle:
+    """Test suite for ServerLifecycle."""
+
+    def test_track_counts_in_flight_calls(self):
+        """Test calls are counted while inside the tracked block."""
+        lifecycle = ServerLifecycle()
+        with lifecycle.track():
+            with lifecycle.track():
+                assert lifecycle.in_flight == 2
+            assert lifecycle.in_flight == 1
+        assert lifecycle.in_flight == 0
+
+    def test_track_releases_on_error(self):
+        """Test a failing call is no longer counted as in flight."""
+        lifecycle = ServerLifecycle()
+        with pytest.raises(RuntimeError), lifecycle.track():
+            raise RuntimeError("boom")
+        assert lifecycle.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_in_flight_calls(self):
+        """Test drain returns once in-flight calls have finished."""
+        lifecycle = ServerLifecycle(poll_interval=0.01)
+
+        async def call():
+            with lifecycle.track():
+                await asyncio.sleep(0.05)
+
+        task = asyncio.create_task(call())
+        await asyncio.sleep(0)
+
+        assert await lifecycle.drain(grace_period=1.0) is True
+        assert task.done()
+        assert lifecycle.accepting is False
+
+    @pytest.mark.asyncio
+    async def test_drain_gives_up_after_grace_period(self):
+        """Test drain reports calls still running when the grace period ends."""
+        lifecycle = ServerLifecycle(poll_interval=0.01)
+
+        with lifecycle.track():
+            assert await lifecycle.drain(grace_period=0.05) is False
+            assert lifecycle.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_grace_period_starts_at_first_signal(self):
+        """Test draining again does not extend the grace period."""
+        lifecycle = ServerLifecycle(poll_interval=0.01)
+        lifecycle.stop_accepting(grace_period=0.05)
+        await asyncio.sleep(0.05)
+
+        with lifecycle.track():
+            assert await lifecycle.drain(grace_period=10.0) is False
+
+
+class TestServerShutdown:
+    """Test suite for the server's draining shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_new_calls_refused_while_draining(self, fresh_lifecycle):
+        """Test calls after the signal fail fast with a retryable error."""
+        fresh_lifecycle.stop_accepting()
+
+        result = await server.roll_dice(notation="1d6")
+
+        assert result["isError"] is True
+        assert result["error"]["code"] == -32000
+        assert result["error"]["data"]["reason"] == "shutting down"
+        assert "retry" in result["content"][0]["text"].lower()
+
+    @pytest.mark.asyncio
+    async def test_in_flight_call_finishes_during_drain(self, fresh_lifecycle):
+        """Test a call started before the signal completes successfully."""
+        dice_tool = server.tool_registry.get("roll_dice")
+        started = asyncio.Event()
+        original = dice_tool.execute
+
+        async def slow_execute(**kwargs):
+            started.set()
+            await asyncio.sleep(0.05)
+            return await original(**kwargs)
+
+        with patch.object(dice_tool, "execute", side_effect=slow_execute):
+            call = asyncio.create_task(server.roll_dice(notation="1d6"))
+            await started.wait()
+            assert fresh_lifecycle.in_flight == 1
+
+            assert await fresh_lifecycle.drain(grace_period=1.0) is True
+            result = await call
+
+        assert result["isError"] is False
+
+    @pytest.mark.asyncio
+    async def test_shutdown_drains_before_flushing(self, fresh_lifecycle):
+        """Test shutdown waits for calls before flushing and closing tools."""
+        order = []
+
+        async def drain(grace_period):
+            order.append("drain")
+            return True
+
+        with (
+            patch.object(fresh_lifecycle, "drain", side_effect=drain),
+            patch.object(
+                server.metrics_registry,
+                "export",
+                side_effect=lambda: order.append("export"),
+            ),
+            patch.object(
+                server,
+                "cleanup_server",
+                AsyncMock(side_effect=lambda: order.append("cleanup")),
+            ),
+        ):
+            await server.shutdown(grace_period=1.0)
+
+        assert order == ["drain", "export", "cleanup"]
+
+    @pytest.mark.asyncio
+    async def test_app_lifespan_runs_startup_and_shutdown(self):
+        """Test the network app runs the server lifespan inside its own."""
+        app = server.build_app("sse", grace_period=2.0, warm=False)
+
+        with (
+            patch.object(server, "startup", AsyncMock()) as startup,
+            patch.object(server, "shutdown", AsyncMock()) as shutdown,
+        ):
+            async with app.router.lifespan_context(app):
+                startup.assert_awaited_once_with(warm=False)
+                shutdown.assert_not_awaited()
+
+        shutdown.assert_awaited_once_with(2.0)
+
+
+class TestDrainingServer:
+    """Test suite for the draining uvicorn server."""
+
+    def test_signal_stops_accepting_calls(self):
+        """Test the signal handler refuses new calls before uvicorn exits."""
+        import uvicorn
+
+        from src.mcp_server.http_server import DrainingServer
+
+        lifecycle = ServerLifecycle()
+        config = uvicorn.Config(app=AsyncMock())
+        draining = DrainingServer(config, lifecycle, grace_period=5.0)
+
+        draining.handle_exit(15, None)
+
+        assert lifecycle.accepting is False
+        assert draining.should_exit is True
+        assert 4.0 < lifecycle.drain_remaining() <= 5.0
@@ -79,6 +79,37 @@ class TestMCPTransport:
             assert transport.available_tools == ["roll_dice", "get_weather", "get_date"]
             assert transport.session == mock_session
 
+    @pytest.mark.asyncio
+    async def test_connect_http_success(self):
+        """Test connection to a server URL uses streamable HTTP transport."""
+        transport = MCPTransport("http://localhost:8000/mcp")
+        assert transport.is_http is True
+
+        with (
+            patch("src.mcp_client.transport.streamablehttp_client") as mock_http,
+            patch("src.mcp_client.transport.stdio_client") as mock_stdio,
+            patch("src.mcp_client.transport.ClientSession") as mock_session_class,
+        ):
+            mock_read, mock_write = AsyncMock(), AsyncMock()
+            mock_http.return_value.__aenter__.return_value = (
+                mock_read,
+                mock_write,
+                MagicMock(),
+            )
+
+            mock_session = AsyncMock()
+            mock_session_class.return_value.__aenter__.return_value = mock_session
+            mock_tool = MagicMock()
+            mock_tool.name = "roll_dice"
+            mock_session.list_tools.return_value = MagicMock(tools=[mock_tool])
+
+            await transport.connect()
+
+            mock_http.assert_called_once_with("http://localhost:8000/mcp")
+            mock_stdio.assert_not_called()
+            assert transport.connected is True
+            assert transport.available_tools == ["roll_dice"]
+
     @pytest.mark.asyncio
     async def test_disconnect(self):
         """Test disconnect functionality."""
@@ -135,6 +166,46 @@ class TestMCPTransport:
         mock_session.call_tool.assert_called_once_with("test_tool", {"arg": "value"})
         assert result == mock_result
 
+    @pytest.mark.asyncio
+    async def test_call_tool_sends_deadline(self):
+        """Test a call with a timeout sends its budget in the request metadata."""
+        transport = MCPTransport("test_server.py")
+        transport.connected = True
+        transport.available_tools = ["test_tool"]
+        transport.session = AsyncMock()
+
+        await transport.call_tool("test_tool", {"arg": "value"}, timeout=2.5)
+
+        request, _ = transport.session.send_request.call_args.args
+        params = request.root.params
+        assert params.name == "test_tool"
+        assert params.meta.model_extra == {"timeoutMs": 2500}
+        assert (
+            transport.session.send_request.call_args.kwargs[
+                "request_read_timeout_seconds"
+            ].total_seconds()
+            == 2.5
+        )
+
+    @pytest.mark.asyncio
+    async def test_call_tool_with_progress(self):
+        """Test a progress callback is handed to the session with the request."""
+        transport = MCPTransport("test_server.py")
+        transport.connected = True
+        transport.available_tools = ["test_tool"]
+        transport.session = AsyncMock()
+
+        async def on_progress(progress, total, message):
+            pass
+
+        await transport.call_tool("test_tool", {}, progress_callback=on_progress)
+
+        request, _ = transport.session.send_request.call_args.args
+        kwargs = transport.session.send_request.call_args.kwargs
+        assert request.root.params.meta is None
+        assert kwargs["progress_callback"] is on_progress
+        assert kwargs["request_read_timeout_seconds"] is None
+
     @pytest.mark.asyncio
     async def test_health_check_not_connected(self):
         """Test health check when not connected."""
@@ -188,3 +188,35 @@ class TestMCPServerIntegration:
             assert "isError" in result
             assert result["isError"] is False
             assert "37.7749,-122.4194" in result["content"][0]["text"]
+
+    @pytest.mark.parametrize("transport", ["stdio", "http", "sse"])
+    def test_run_server_transports(self, transport):
+        """Test run_server serves each transport and binds host/port."""
+        from src.mcp_server.server import (
+            mcp,
+            run_server,
+            serve_network,
+            serve_stdio,
+        )
+
+        with (
+            patch("src.mcp_server.server.anyio.run") as mock_run,
+            patch.object(mcp, "settings") as mock_settings,
+        ):
+            run_server(transport=transport, host="0.0.0.0", port=9000, grace_period=5.0)
+
+            if transport == "stdio":
+                mock_run.assert_called_once_with(serve_stdio, 5.0)
+            else:
+                mock_run.assert_called_once_with(
+                    serve_network, transport, "0.0.0.0", 9000, 5.0
+                )
+                assert mock_settings.host == "0.0.0.0"
+                assert mock_settings.port == 9000
+
+    def test_run_server_unknown_transport(self):
+        """Test run_server rejects unknown transports."""
+        from src.mcp_server.server import run_server
+
+        with pytest.raises(ValueError, match="Unknown transport"):
+            run_server(transport="carrier-pigeon")
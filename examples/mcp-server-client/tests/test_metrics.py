@@ -0,0 +1,113 @@
+"""Tests for tool instrumentation and the metrics resources."""
+
+import json
+
+import pytest
+
+from src.mcp_server.cache import CachePolicy, ResultCache
+from src.mcp_server.metrics import LatencyHistogram, MetricsRegistry
+from src.mcp_server.tools.dice import DiceRollTool
+
+
+class TestLatencyHistogram:
+    """Test suite for LatencyHistogram."""
+
+    def test_observe_assigns_buckets(self):
+        """Test observations land in the first bucket whose bound covers them."""
+        histogram = LatencyHistogram(buckets=(0.1, 1.0))
+
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        assert histogram.counts == [1, 1, 1]
+        assert histogram.count == 3
+        assert histogram.sum == pytest.approx(5.55)
+
+    def test_quantile_interpolates(self):
+        """Test quantile estimation interpolates inside a bucket."""
+        histogram = LatencyHistogram(buckets=(1.0, 2.0))
+        for _ in range(10):
+            histogram.observe(1.5)
+
+        assert histogram.quantile(0.5) == pytest.approx(1.5)
+        assert LatencyHistogram().quantile(0.5) is None
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry."""
+
+    def test_tool_metrics_are_shared(self):
+        """Test the same metrics object is returned for a tool name."""
+        registry = MetricsRegistry()
+        assert registry.tool("roll_dice") is registry.tool("roll_dice")
+
+    def test_render_prometheus(self):
+        """Test Prometheus rendering contains counters and cumulative buckets."""
+        registry = MetricsRegistry()
+        metrics = registry.tool("roll_dice")
+        metrics.finish(metrics.start(), success=True)
+        metrics.finish(metrics.start(), success=False)
+
+        text = registry.render_prometheus()
+
+        assert 'mcp_tool_calls_total{tool="roll_dice",outcome="success"} 1' in text
+        assert 'mcp_tool_calls_total{tool="roll_dice",outcome="error"} 1' in text
+        assert 'mcp_tool_in_flight{tool="roll_dice"} 0' in text
+        assert 'mcp_tool_latency_seconds_bucket{tool="roll_dice",le="+Inf"} 2' in text
+        assert 'mcp_tool_latency_seconds_count{tool="roll_dice"} 2' in text
+
+    def test_render_json(self):
+        """Test JSON rendering contains derived statistics."""
+        registry = MetricsRegistry()
+        metrics = registry.tool("get_date")
+        metrics.finish(metrics.start(), success=True)
+
+        data = json.loads(registry.render_json())
+
+        tool = data["tools"]["get_date"]
+        assert tool["calls"] == 1
+        assert tool["error_rate"] == 0.0
+        assert tool["latency_seconds"]["p99"] is not None
+
+    def test_render_cache_stats(self):
+        """Test registered caches are rendered in both formats."""
+        registry = MetricsRegistry()
+        cache = ResultCache(CachePolicy())
+        registry.register_cache("get_weather", cache)
+        cache.set("london", "sunny")
+        cache.get("london")
+
+        assert 'mcp_cache_hits_total{cache="get_weather"} 1' in (
+            registry.render_prometheus()
+        )
+        data = json.loads(registry.render_json())
+        assert data["caches"]["get_weather"]["hit_rate"] == 1.0
+
+
+class TestToolInstrumentation:
+    """Test suite for metrics collected by BaseTool.safe_execute."""
+
+    @pytest.mark.asyncio
+    async def test_safe_execute_records_success_and_error(self):
+        """Test safe_execute counts successes and errors."""
+        tool = DiceRollTool()
+        before_success = tool.metrics.success
+        before_errors = tool.metrics.errors
+
+        await tool.safe_execute(notation="1d6")
+        await tool.safe_execute(notation="invalid")
+
+        assert tool.metrics.success == before_success + 1
+        assert tool.metrics.errors == before_errors + 1
+        assert tool.metrics.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_resources(self):
+        """Test metrics resources are exposed by the server."""
+        from src.mcp_server.server import get_metrics, get_metrics_json, roll_dice
+
+        await roll_dice(notation="2d6")
+
+        assert 'tool="roll_dice"' in await get_metrics()
+        assert "roll_dice" in json.loads(await get_metrics_json())["tools"]
@@ -0,0 +1,375 @@
+"""Tests for outbound HTTP retries, circuit breaking and pool metrics."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.mcp_server import deadline
+from src.mcp_server.metrics import MetricsRegistry, merge_snapshots
+from src.mcp_server.outbound import (
+    BreakerPolicy,
+    CircuitBreaker,
+    RetryPolicy,
+    UpstreamPool,
+    retry_after,
+)
+from src.mcp_server.tools.base import (
+    AsyncHttpMixin,
+    BaseTool,
+    DeadlineExceededError,
+    ExternalServiceError,
+)
+
+URL = "https://upstream.example/data"
+ORIGIN = ("https", "upstream.example", 443)
+
+
+class UpstreamTool(AsyncHttpMixin, BaseTool):
+    """HTTP tool with fast retries for testing."""
+
+    retry_policy = RetryPolicy(attempts=3, base_delay=0.001, max_delay=0.01)
+    breaker_policy = BreakerPolicy(failure_threshold=3, reset_timeout=0.05)
+
+    def __init__(self, handler):
+        super().__init__(name="upstream_test", description="Calls an upstream")
+        self._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def execute(self, **kwargs):
+        return await self.make_request("GET", URL)
+
+
+def responses(*statuses, headers=None):
+    """Build a handler answering with ``statuses`` in turn, recording calls."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        if isinstance(status, Exception):
+            raise status
+        return httpx.Response(status, json={"ok": True}, headers=headers)
+
+    return handler, calls
+
+
+class TestRetries:
+    """Test suite for bounded retries in make_request."""
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_retried(self):
+        """Test 503s are retried until the upstream answers."""
+        handler, calls = responses(503, 503, 200)
+        tool = UpstreamTool(handler)
+
+        assert await tool.make_request("GET", URL) == {"ok": True}
+        assert len(calls) == 3
+        assert tool.upstreams.hosts[ORIGIN].retries == 2
+
+    @pytest.mark.asyncio
+    async def test_caller_extensions_sent_on_every_attempt(self):
+        """Test retries keep the caller's request extensions and the trace hook."""
+        handler, calls = responses(503, 503, 200)
+        tool = UpstreamTool(handler)
+
+        await tool.make_request("GET", URL, extensions={"sni_hostname": "edge"})
+
+        assert [call.extensions.get("sni_hostname") for call in calls] == ["edge"] * 3
+        assert all("trace" in call.extensions for call in calls)
+
+    @pytest.mark.asyncio
+    async def test_attempts_bounded(self):
+        """Test the last error is raised once every attempt failed."""
+        handler, calls = responses(503)
+        tool = UpstreamTool(handler)
+
+        with pytest.raises(ExternalServiceError) as exc_info:
+            await tool.make_request("GET", URL)
+
+        assert exc_info.value.status_code == 503
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_not_retried(self):
+        """Test 4xx responses other than 429 fail immediately."""
+        handler, calls = responses(404)
+        tool = UpstreamTool(handler)
+
+        with pytest.raises(ExternalServiceError) as exc_info:
+            await tool.make_request("GET", URL)
+
+        assert exc_info.value.status_code == 404
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried_after_reaching_server(self):
+        """Test non-idempotent requests are not repeated after a response."""
+        handler, calls = responses(503, 200)
+        tool = UpstreamTool(handler)
+
+        with pytest.raises(ExternalServiceError):
+            await tool.make_request("POST", URL, json={})
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_post_marked_idempotent_retried(self):
+        """Test callers can opt non-idempotent methods into retries."""
+        handler, calls = responses(503, 200)
+        tool = UpstreamTool(handler)
+
+        await tool.make_request("POST", URL, idempotent=True, json={})
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_connect_errors_retried_for_any_method(self):
+        """Test requests that never reached the server are always retried."""
+        handler, calls = responses(httpx.ConnectError("refused"), 200)
+        tool = UpstreamTool(handler)
+
+        await tool.make_request("POST", URL, json={})
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_not_waited_for(self):
+        """Test a Retry-After beyond the longest backoff fails immediately."""
+        handler, calls = responses(429, 200, headers={"Retry-After": "120"})
+        tool = UpstreamTool(handler)
+
+        with pytest.raises(ExternalServiceError) as exc_info:
+            await tool.make_request("GET", URL)
+
+        assert exc_info.value.status_code == 429
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_retry_past_deadline(self):
+        """Test backoff never sleeps beyond the call's deadline."""
+        handler, calls = responses(503, 200)
+        tool = UpstreamTool(handler)
+        tool.retry_policy = RetryPolicy(attempts=3, base_delay=1.0, max_delay=1.0)
+
+        with deadline.scope(0.001), pytest.raises(ExternalServiceError):
+            await tool.make_request("GET", URL)
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_timeout_not_retried(self):
+        """Test a timeout cut short by the deadline ends the call."""
+        handler, calls = responses(httpx.ReadTimeout("timed out"))
+        tool = UpstreamTool(handler)
+
+        with deadline.scope(0.5), pytest.raises(DeadlineExceededError):
+            await tool.make_request("GET", URL)
+
+        assert len(calls) == 1
+        assert tool.upstreams.hosts[ORIGIN].breaker.failures == 0
+
+    def test_retry_after_parsing(self):
+        """Test Retry-After seconds are parsed and dates ignored."""
+        assert retry_after("3") == 3.0
+        assert retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+        assert retry_after(None) is None
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test delays stay within the exponential, capped bound."""
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+
+        assert all(0 <= policy.backoff(1) <= 0.2 for _ in range(100))
+        assert all(0 <= policy.backoff(5) <= 0.3 for _ in range(100))
+        assert len({policy.backoff(1) for _ in range(10)}) > 1
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker and its use in make_request."""
+
+    def test_opens_at_threshold(self):
+        """Test consecutive failures open the breaker."""
+        breaker = CircuitBreaker(BreakerPolicy(failure_threshold=2))
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.rejected == 1
+
+    def test_success_resets_failures(self):
+        """Test only consecutive failures count."""
+        breaker = CircuitBreaker(BreakerPolicy(failure_threshold=2))
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_single_probe_after_reset_timeout(self):
+        """Test one probe is let through once the reset timeout passed."""
+        breaker = CircuitBreaker(BreakerPolicy(failure_threshold=1, reset_timeout=0.01))
+        breaker.record_failure()
+        await asyncio.sleep(0.02)
+
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.opens == 2
+
+    @pytest.mark.asyncio
+    async def test_abandoned_probe_frees_slot(self):
+        """Test a cancelled probe does not block further probes."""
+        breaker = CircuitBreaker(BreakerPolicy(failure_threshold=1, reset_timeout=0.01))
+        breaker.record_failure()
+        await asyncio.sleep(0.02)
+        assert breaker.allow()
+
+        breaker.abandon()
+
+        assert breaker.allow()
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self):
+        """Test requests to a failing host stop reaching it."""
+        handler, calls = responses(503)
+        tool = UpstreamTool(handler)
+        tool.retry_policy = RetryPolicy(attempts=1)
+
+        for _ in range(3):
+            with pytest.raises(ExternalServiceError):
+                await tool.make_request("GET", URL)
+        with pytest.raises(ExternalServiceError) as exc_info:
+            await tool.make_request("GET", URL)
+
+        assert "Circuit open for upstream.example" in exc_info.value.message
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_recovers_after_probe(self):
+        """Test a successful probe closes the breaker again."""
+        handler, calls = responses(503, 503, 503, 200)
+        tool = UpstreamTool(handler)
+        tool.retry_policy = RetryPolicy(attempts=1)
+        for _ in range(3):
+            with pytest.raises(ExternalServiceError):
+                await tool.make_request("GET", URL)
+
+        await asyncio.sleep(0.06)
+
+        assert await tool.make_request("GET", URL) == {"ok": True}
+        assert tool.upstreams.hosts[ORIGIN].breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_breaker(self):
+        """Test 4xx answers count as a healthy upstream."""
+        handler, _ = responses(400)
+        tool = UpstreamTool(handler)
+
+        for _ in range(5):
+            with pytest.raises(ExternalServiceError):
+                await tool.make_request("GET", URL)
+
+        assert tool.upstreams.hosts[ORIGIN].breaker.state == "closed"
+
+
+class TestHttpMetrics:
+    """Test suite for per-host pool and breaker metrics."""
+
+    @pytest.mark.asyncio
+    async def test_host_stats(self):
+        """Test requests, retries and failures are counted per host."""
+        handler, _ = responses(503, 200)
+        tool = UpstreamTool(handler)
+
+        await tool.make_request("GET", URL)
+
+        stats = tool.upstreams.stats()["https://upstream.example"]
+        assert stats["requests"] == 2
+        assert stats["retries"] == 1
+        assert stats["failures"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["breaker_open"] == 0
+
+    def test_pool_built_from_policy(self):
+        """Test the default client is pooled per the tool's HttpPolicy."""
+
+        class PlainTool(AsyncHttpMixin, BaseTool):
+            async def execute(self, **kwargs):
+                return None
+
+        tool = PlainTool(name="plain_http_test", description="Plain")
+        with patch("httpx.Limits", wraps=httpx.Limits) as limits:
+            assert tool.http_client is not None
+
+        limits.assert_called_once_with(
+            max_connections=tool.http_policy.max_connections,
+            max_keepalive_connections=tool.http_policy.max_keepalive_connections,
+            keepalive_expiry=tool.http_policy.keepalive_expiry,
+        )
+
+    @pytest.mark.asyncio
+    async def test_trace_counts_opened_connections(self):
+        """Test the trace hook counts connections but not other events."""
+        upstream = UpstreamPool(BreakerPolicy()).host("https", "api.example", None)
+
+        await upstream.trace("connection.connect_tcp.complete", {})
+        await upstream.trace("http11.send_request_headers.complete", {})
+
+        assert upstream.stats()["connections_opened"] == 1
+
+    def test_hosts_keyed_by_origin(self):
+        """Test each scheme and port of a host gets its own breaker and stats."""
+        upstreams = UpstreamPool(BreakerPolicy())
+
+        plain = upstreams.host("http", "api.example", 8080)
+        secure = upstreams.host("https", "api.example", None)
+
+        assert plain is not secure
+        assert secure.origin == ("https", "api.example", 443)
+        assert upstreams.host("https", "api.example", 443) is secure
+        assert set(upstreams.stats()) == {
+            "http://api.example:8080",
+            "https://api.example",
+        }
+
+    def test_prometheus_labels_tool_and_host(self):
+        """Test HTTP series carry tool and host labels."""
+        registry = MetricsRegistry()
+        upstreams = UpstreamPool(BreakerPolicy())
+        upstreams.host("https", "api.example", None).requests = 4
+        registry.register_http("get_data", upstreams)
+
+        text = registry.render_prometheus()
+        data = json.loads(registry.render_json())
+
+        assert (
+            'mcp_http_requests_total{tool="get_data",host="https://api.example"} 4'
+            in text
+        )
+        assert (
+            "mcp_http_connections_opened_total"
+            '{tool="get_data",host="https://api.example"} 0' in text
+        )
+        assert data["http"]["get_data"]["https://api.example"]["requests"] == 4
+
+    def test_merge_sums_per_host(self):
+        """Test worker snapshots are merged host by host."""
+        snapshot = {
+            "started_at": 0.0,
+            "tools": {},
+            "http": {"get_data": {"api.example": {"requests": 2, "in_flight": 1}}},
+        }
+
+        merged = merge_snapshots([snapshot, snapshot])
+
+        assert merged["http"]["get_data"]["api.example"] == {
+            "requests": 4,
+            "in_flight": 2,
+        }
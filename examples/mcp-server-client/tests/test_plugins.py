@@ -0,0 +1,112 @@
+"""Tests for tool plugin discovery and schema-driven generation."""
+
+import argparse
+import inspect
+
+import pytest
+
+from src.mcp_client.cli import add_tool_subcommands, build_tool_arguments
+from src.mcp_server import plugins
+from src.mcp_server.plugins import (
+    build_docstring,
+    build_signature,
+    build_spec,
+    discover_tools,
+)
+
+DICE_TARGET = "src.mcp_server.tools.dice:DiceRollTool"
+DATE_TARGET = "src.mcp_server.tools.date_time:DateTimeTool"
+
+
+class TestDiscovery:
+    """Test suite for tool discovery and the manifest cache."""
+
+    def test_build_spec(self):
+        """Test a tool class is described by its name and request schema."""
+        spec = build_spec(DICE_TARGET)
+
+        assert spec.name == "roll_dice"
+        assert spec.target == DICE_TARGET
+        assert "notation" in spec.input_schema["properties"]
+
+    def test_build_spec_does_not_construct_tool(self, monkeypatch):
+        """Test discovery reads the class without running its constructor."""
+        from src.mcp_server.tools.dice import DiceRollTool
+
+        def fail(self):
+            raise AssertionError("tool constructed during discovery")
+
+        monkeypatch.setattr(DiceRollTool, "__init__", fail)
+        spec = build_spec(DICE_TARGET)
+
+        assert spec.name == "roll_dice"
+        assert spec.description.startswith("Roll dice")
+
+    def test_build_spec_requires_request_model(self):
+        """Test tools without a request model are rejected."""
+        with pytest.raises(ValueError, match="request_model"):
+            build_spec("src.mcp_server.tools.base:BaseTool")
+
+    def test_discover_builtin_tools(self, tmp_path):
+        """Test the built-in tools are discovered."""
+        specs = discover_tools(tmp_path / "manifest.json")
+
+        assert {"roll_dice", "get_weather", "get_date"} <= {s.name for s in specs}
+
+    def test_manifest_is_reused(self, tmp_path, monkeypatch):
+        """Test a valid manifest avoids re-scanning the tools."""
+        manifest = tmp_path / "manifest.json"
+        discover_tools(manifest)
+        monkeypatch.setattr(plugins, "scan_tools", pytest.fail)
+
+        assert [s.name for s in discover_tools(manifest)]
+
+    def test_manifest_invalidated_by_fingerprint(self, tmp_path, monkeypatch):
+        """Test a changed fingerprint triggers a re-scan."""
+        manifest = tmp_path / "manifest.json"
+        discover_tools(manifest)
+        monkeypatch.setattr(plugins, "fingerprint", lambda: "changed")
+        monkeypatch.setattr(plugins, "scan_tools", lambda: [build_spec(DICE_TARGET)])
+
+        assert [s.name for s in discover_tools(manifest)] == ["roll_dice"]
+
+    def test_broken_plugin_is_skipped(self, monkeypatch):
+        """Test a plugin that fails to import does not break discovery."""
+        monkeypatch.setattr(
+            plugins, "BUILTIN_TOOLS", {"roll_dice": DICE_TARGET, "bad": "no.such:Tool"}
+        )
+
+        assert [s.name for s in plugins.scan_tools()] == ["roll_dice"]
+
+
+class TestGeneration:
+    """Test suite for signatures, docstrings and CLI options built from specs."""
+
+    def test_build_signature(self):
+        """Test required and optional fields become keyword-only parameters."""
+        signature = build_signature(build_spec(DATE_TARGET))
+        parameter = signature.parameters["timezone"]
+
+        assert parameter.kind is inspect.Parameter.KEYWORD_ONLY
+        assert parameter.default == "UTC"
+
+        notation = build_signature(build_spec(DICE_TARGET)).parameters["notation"]
+        assert notation.default is inspect.Parameter.empty
+
+    def test_build_docstring(self):
+        """Test the docstring lists the tool's arguments."""
+        docstring = build_docstring(build_spec(DICE_TARGET))
+
+        assert "Args:" in docstring
+        assert "notation:" in docstring
+
+    def test_cli_subcommands(self):
+        """Test CLI subcommands and arguments are generated from specs."""
+        spec = build_spec(DICE_TARGET)
+        parser = argparse.ArgumentParser()
+        subparsers = parser.add_subparsers(dest="tool")
+        add_tool_subcommands(subparsers, [spec])
+
+        args = parser.parse_args(["roll_dice", "--notation", "2d6"])
+
+        assert build_tool_arguments(args, spec) == {"notation": "2d6"}
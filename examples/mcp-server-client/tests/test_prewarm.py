@@ -0,0 +1,226 @@
+"""Tests for prewarming popular cache entries before they expire."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.mcp_server.metrics import MetricsRegistry, merge_snapshots, render_prometheus
+from src.mcp_server.prewarm import Prewarmer, PrewarmPolicy, PrewarmScheduler
+from src.mcp_server.tools.weather import WeatherTool
+from tests.fixtures.mcp_messages import WeatherAPIFixtures
+
+CLOCK = "src.mcp_server.prewarm.time.monotonic"
+
+
+def record(prewarmer: Prewarmer, key, times: int) -> None:
+    """Count ``times`` requests for ``key``."""
+    for _ in range(times):
+        prewarmer.record(key)
+
+
+class FakeTool:
+    """Prewarmable tool with scripted expiries."""
+
+    def __init__(self, policy: PrewarmPolicy, expiries: dict):
+        self.name = "fake"
+        self.prewarmer = Prewarmer(policy)
+        self.expiries = expiries
+        self.prewarmed: list = []
+        self.fail: set = set()
+
+    def expires_in(self, key):
+        return self.expiries.get(key)
+
+    async def prewarm(self, key):
+        if key in self.fail:
+            raise RuntimeError("upstream down")
+        self.prewarmed.append(key)
+
+
+class TestPrewarmer:
+    """Test suite for request popularity tracking."""
+
+    def test_hottest_first(self):
+        """Test keys are ranked by request count."""
+        prewarmer = Prewarmer(PrewarmPolicy(top_k=2, min_requests=0.5))
+        record(prewarmer, "paris", 3)
+        record(prewarmer, "london", 5)
+        record(prewarmer, "oslo", 1)
+
+        assert prewarmer.hottest() == ["london", "paris"]
+
+    def test_one_off_lookups_not_kept_warm(self):
+        """Test keys below min_requests are not returned."""
+        prewarmer = Prewarmer(PrewarmPolicy(min_requests=1.5))
+        record(prewarmer, "paris", 3)
+        record(prewarmer, "oslo", 1)
+
+        assert prewarmer.hottest() == ["paris"]
+
+    def test_popularity_decays(self):
+        """Test old requests count less than recent ones."""
+        prewarmer = Prewarmer(PrewarmPolicy(half_life=60.0, min_requests=0.5))
+        with patch(CLOCK, return_value=0.0):
+            record(prewarmer, "paris", 8)
+        with patch(CLOCK, return_value=180.0):
+            record(prewarmer, "london", 2)
+            # Paris decayed to 8 / 2**3 = 1
+            assert prewarmer.hottest() == ["london", "paris"]
+
+    def test_least_popular_forgotten(self):
+        """Test tracking is bounded by max_tracked."""
+        prewarmer = Prewarmer(PrewarmPolicy(max_tracked=8, min_requests=0.5))
+        record(prewarmer, "hot", 5)
+        for n in range(20):
+            prewarmer.record(n)
+
+        assert prewarmer.stats()["tracked"] <= 8
+        assert prewarmer.hottest()[0] == "hot"
+
+    def test_due_keys(self):
+        """Test only entries expiring within lead_time or uncached are due."""
+        prewarmer = Prewarmer(PrewarmPolicy(lead_time=60.0, min_requests=0.5))
+        for key in ("soon", "later", "gone"):
+            prewarmer.record(key)
+        expiries = {"soon": 30.0, "later": 600.0}
+
+        due = prewarmer.due(expiries.get)
+
+        assert sorted(due, key=str) == [("gone", None), ("soon", 30.0)]
+
+    def test_hits_gained(self):
+        """Test only hits after the old expiry count as gained."""
+        prewarmer = Prewarmer(PrewarmPolicy())
+        with patch(CLOCK, return_value=100.0):
+            prewarmer.refreshed("paris", 30.0)
+        with patch(CLOCK, return_value=120.0):
+            prewarmer.record_hit("paris")
+        with patch(CLOCK, return_value=140.0):
+            prewarmer.record_hit("paris")
+            prewarmer.record_hit("london")
+
+        assert prewarmer.stats()["hits"] == 1
+        assert prewarmer.stats()["refreshes"] == 1
+
+
+class TestPrewarmScheduler:
+    """Test suite for the background refresh scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_cycle_refreshes_due_keys(self):
+        """Test due keys are refreshed hottest first."""
+        tool = FakeTool(PrewarmPolicy(min_requests=0.5), {"paris": 5.0})
+        record(tool.prewarmer, "paris", 2)
+        record(tool.prewarmer, "london", 3)
+
+        await PrewarmScheduler(list).cycle(tool)
+
+        assert tool.prewarmed == ["london", "paris"]
+        assert tool.prewarmer.stats()["refreshes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cycle_within_budget(self):
+        """Test refreshes beyond max_qps * interval are deferred."""
+        policy = PrewarmPolicy(max_qps=100.0, interval=0.02, min_requests=0.5)
+        tool = FakeTool(policy, {})
+        for key in range(5):
+            record(tool.prewarmer, key, 5 - key)
+
+        await PrewarmScheduler(list).cycle(tool)
+
+        assert tool.prewarmed == [0, 1]
+        assert tool.prewarmer.stats()["deferred"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_counted(self):
+        """Test a failed refresh does not stop the cycle."""
+        tool = FakeTool(PrewarmPolicy(max_qps=100.0, min_requests=0.5), {})
+        record(tool.prewarmer, "paris", 2)
+        tool.prewarmer.record("oslo")
+        tool.fail.add("paris")
+
+        await PrewarmScheduler(list).cycle(tool)
+
+        assert tool.prewarmed == ["oslo"]
+        assert tool.prewarmer.stats()["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_runs_in_background(self):
+        """Test started schedulers pick up tools and refresh periodically."""
+        tool = FakeTool(PrewarmPolicy(interval=0.01, min_requests=0.5), {})
+        tool.prewarmer.record("paris")
+        scheduler = PrewarmScheduler(lambda: [tool])
+
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert tool.prewarmed[:2] == ["paris", "paris"]
+
+
+class TestWeatherPrewarm:
+    """Test suite for prewarming get_weather's grid cells."""
+
+    @pytest.mark.asyncio
+    async def test_popular_cell_refreshed_before_expiry(self):
+        """Test a hot cell is refreshed and then served fresh."""
+        tool = WeatherTool()
+        data = WeatherAPIFixtures.current_weather_response(temperature=15.0)
+        cell = tool.snap(51.5074, -0.1278)
+
+        with patch.object(tool, "make_request", return_value=data) as request:
+            for _ in range(3):
+                await tool.execute(location="London")
+            # Pretend the cached conditions are about to expire
+            tool.coordinate_cache.set(cell, data, ttl=-1.0)
+            await PrewarmScheduler(list).cycle(tool)
+            await tool.execute(location="London")
+
+        assert request.call_count == 2
+        assert tool.prewarmer.stats()["refreshes"] == 1
+        assert tool.prewarmer.stats()["hits"] == 1
+        assert tool.expires_in(cell) > 0
+
+    @pytest.mark.asyncio
+    async def test_repeated_calls_counted_through_safe_execute(self):
+        """Test every served call counts towards its cell's popularity."""
+        tool = WeatherTool()
+        data = WeatherAPIFixtures.current_weather_response()
+        london = tool.snap(51.5074, -0.1278)
+
+        with patch.object(tool, "make_request", return_value=data):
+            for _ in range(5):
+                await tool.safe_execute(location="London")
+            await tool.safe_execute(location="Paris")
+
+        assert tool.prewarmer.hottest() == [london]
+        assert tool.coordinate_cache.stats()["hits"] == 4
+
+    def test_only_get_weather_prewarms(self):
+        """Test tools that do not read the cell cache have no prewarmer."""
+        from src.mcp_server.tools.forecast import ForecastTool
+        from src.mcp_server.tools.weather_batch import WeatherBatchTool
+
+        for tool in (ForecastTool(), WeatherBatchTool()):
+            assert getattr(tool, "prewarmer", None) is None
+            assert not hasattr(tool, "coordinate_cache")
+            assert tool.disk_cache_policy is None
+
+
+class TestPrewarmMetrics:
+    """Test suite for prewarming metrics."""
+
+    def test_exported(self):
+        """Test statistics are merged across workers and rendered."""
+        registry = MetricsRegistry()
+        prewarmer = Prewarmer(PrewarmPolicy())
+        prewarmer.refreshed("paris", 10.0)
+        registry.register_prewarm("get_weather", prewarmer)
+
+        merged = merge_snapshots([registry.snapshot(), registry.snapshot()])
+        text = render_prometheus(merged)
+
+        assert merged["prewarm"]["get_weather"]["refreshes"] == 2
+        assert 'mcp_prewarm_refreshes_total{tool="get_weather"} 2' in text
+        assert "# TYPE mcp_prewarm_hits_total counter" in text
@@ -0,0 +1,248 @@
+"""Tests for single-flight coalescing of concurrent upstream calls."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.mcp_server import deadline
+from src.mcp_server.admission import AdmissionController, AdmissionPolicy
+from src.mcp_server.metrics import MetricsRegistry
+from src.mcp_server.singleflight import SingleFlight
+from src.mcp_server.tools.base import ExternalServiceError
+from src.mcp_server.tools.weather import WeatherTool
+
+WEATHER_DATA = {
+    "current": {
+        "time": "2025-07-07T14:30:00Z",
+        "temperature_2m": 22.5,
+        "relative_humidity_2m": 65,
+        "weather_code": 1,
+        "wind_speed_10m": 12.3,
+    }
+}
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_run(self):
+        """Test concurrent callers with the same key share a single call."""
+        group = SingleFlight()
+        runs = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal runs
+            runs += 1
+            await release.wait()
+            return {"value": 1}
+
+        calls = [asyncio.create_task(group.do("key", fetch)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        assert runs == 1
+        assert all(result == {"value": 1} for result in results)
+        assert group.stats() == {"in_flight": 0, "flights": 1, "coalesced": 9}
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_run_again(self):
+        """Test results are not reused once the shared call has finished."""
+        group = SingleFlight()
+        runs = 0
+
+        async def fetch():
+            nonlocal runs
+            runs += 1
+            return runs
+
+        assert await group.do("key", fetch) == 1
+        assert await group.do("key", fetch) == 2
+        assert group.coalesced == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test only calls with the same key are coalesced."""
+        group = SingleFlight()
+
+        async def fetch(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            group.do("a", lambda: fetch("a")), group.do("b", lambda: fetch("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert group.flights == 2
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_caller(self):
+        """Test a failed shared call fails all coalesced callers."""
+        group = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *(group.do("key", fetch) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert group.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test one caller giving up leaves the shared call running."""
+        group = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(group.do("key", fetch))
+        follower = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == "done"
+        assert leader.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_shared_call_cancelled_without_waiters(self):
+        """Test the shared call stops once every caller has given up."""
+        group = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fetch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        call = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0)
+        call.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+        await asyncio.sleep(0)
+        assert group.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_call_ignores_starting_callers_deadline(self):
+        """Test the shared call is not bound by the first caller's deadline."""
+        group = SingleFlight()
+        seen = []
+
+        async def fetch():
+            seen.append(deadline.current())
+
+        with deadline.scope(0.5):
+            await group.do("key", fetch)
+
+        assert seen == [None]
+
+
+class TestWeatherCoalescing:
+    """Test suite for coalesced weather lookups."""
+
+    @pytest.mark.asyncio
+    async def test_burst_for_one_city_makes_one_request(self):
+        """Test 500 concurrent lookups of one city hit the API once."""
+        tool = WeatherTool()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def make_request(**kwargs):
+            started.set()
+            await release.wait()
+            return WEATHER_DATA
+
+        with patch.object(tool, "make_request", side_effect=make_request) as request:
+            calls = [
+                asyncio.create_task(tool.execute(location="tokyo")) for _ in range(500)
+            ]
+            await started.wait()
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*calls)
+
+        assert request.call_count == 1
+        assert {result.temperature for result in results} == {22.5}
+        assert tool.coalescer.coalesced == 499
+
+    @pytest.mark.asyncio
+    async def test_callers_keep_their_own_location(self):
+        """Test coalesced callers each get a response for their own query."""
+        tool = WeatherTool()
+
+        async def make_request(**kwargs):
+            await asyncio.sleep(0.01)
+            return WEATHER_DATA
+
+        with patch.object(tool, "make_request", side_effect=make_request) as request:
+            by_name, by_coords = await asyncio.gather(
+                tool.execute(location="Tokyo"),
+                tool.execute(location="35.6762,139.6503"),
+            )
+
+        assert request.call_count == 1
+        assert by_name.location == "Tokyo"
+        assert by_coords.location == "35.6762,139.6503"
+
+    @pytest.mark.asyncio
+    async def test_upstream_error_reaches_coalesced_callers(self):
+        """Test an upstream failure is reported to every coalesced call."""
+        tool = WeatherTool()
+
+        async def make_request(**kwargs):
+            await asyncio.sleep(0.01)
+            raise ExternalServiceError("HTTP error 503", service_name="HTTP")
+
+        with patch.object(tool, "make_request", side_effect=make_request):
+            results = await asyncio.gather(
+                *(tool.safe_execute(location="paris") for _ in range(3))
+            )
+
+        assert all(result["isError"] for result in results)
+        assert all("503" in result["content"][0]["text"] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_only_upstream_calls_take_admission_slots(self):
+        """Test coalesced calls are not shed by a saturated admission queue."""
+        tool = WeatherTool()
+        tool.admission = AdmissionController(
+            AdmissionPolicy(max_concurrency=1, max_queue=0, queue_timeout=1.0)
+        )
+
+        async def make_request(**kwargs):
+            await asyncio.sleep(0.01)
+            return WEATHER_DATA
+
+        with patch.object(tool, "make_request", side_effect=make_request):
+            results = await asyncio.gather(
+                *(tool.safe_execute(location="london") for _ in range(20))
+            )
+
+        assert not any(result["isError"] for result in results)
+        assert tool.admission.rejected == 0
+
+    def test_coalescing_metrics_exported(self):
+        """Test coalescing statistics appear in the Prometheus output."""
+        registry = MetricsRegistry()
+        group = SingleFlight()
+        group.coalesced = 7
+        registry.register_coalescing("get_weather", group)
+
+        text = registry.render_prometheus()
+
+        assert 'mcp_tool_coalesced_total{tool="get_weather"} 7' in text
+        assert 'mcp_tool_upstream_in_flight{tool="get_weather"} 0' in text
@@ -0,0 +1,79 @@
+"""Tests for lazy tool loading and the server cold start budget."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_startup import measure_startup
+from src.mcp_server.registry import ToolRegistry, ToolSpec
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Generous default so slow CI machines don't flake; tighten locally via env
+STARTUP_BUDGET_SECONDS = float(os.environ.get("MCP_STARTUP_BUDGET_SECONDS", "10"))
+
+
+class TestToolRegistry:
+    """Test suite for ToolRegistry."""
+
+    def test_get_constructs_once(self):
+        """Test tools are constructed on first access and then reused."""
+        registry = ToolRegistry()
+        registry.register(
+            ToolSpec(name="roll_dice", target="src.mcp_server.tools.dice:DiceRollTool")
+        )
+
+        assert registry.is_loaded("roll_dice") is False
+        tool = registry.get("roll_dice")
+
+        assert tool.name == "roll_dice"
+        assert registry.get("roll_dice") is tool
+        assert registry.loaded() == [tool]
+
+    def test_unknown_tool(self):
+        """Test unknown tools raise KeyError."""
+        with pytest.raises(KeyError):
+            ToolRegistry().get("missing")
+
+
+class TestColdStart:
+    """Test suite for server cold start cost."""
+
+    def test_server_import_does_not_load_tools(self, tmp_path):
+        """Test importing the server with a warm manifest leaves tools unimported."""
+        code = (
+            "import json, sys; import src.mcp_server.server; "
+            "print(json.dumps(sorted(m for m in sys.modules "
+            "if m.startswith('src.mcp_server.tools'))))"
+        )
+        env = {**os.environ, "MCP_TOOL_MANIFEST": str(tmp_path / "manifest.json")}
+
+        def imported_tool_modules() -> list[str]:
+            output = subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=PROJECT_ROOT,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            return json.loads(output)
+
+        # The first start scans the tools to build the manifest
+        assert imported_tool_modules() != []
+        assert imported_tool_modules() == []
+
+    @pytest.mark.asyncio
+    async def test_time_to_initialize_within_budget(self, tmp_path):
+        """Test a spawned stdio server answers initialize within budget."""
+        env = {**os.environ, "MCP_TOOL_MANIFEST": str(tmp_path / "manifest.json")}
+
+        # The first start builds the manifest that later starts reuse
+        await measure_startup(env)
+        elapsed = await measure_startup(env)
+
+        assert elapsed < STARTUP_BUDGET_SECONDS
@@ -0,0 +1,130 @@
+"""Tests for the queue-backed structured logging pipeline."""
+
+import io
+import json
+import logging
+import sys
+
+import pytest
+
+from src.mcp_server.structured_logging import (
+    JsonFormatter,
+    SamplingFilter,
+    StackRateLimitFilter,
+    configure_logging,
+    parse_sample_rates,
+    stop_logging,
+)
+
+
+def make_record(level=logging.INFO, tool=None, exc_info=None):
+    """Create a log record as a tool logger would."""
+    record = logging.LogRecord(
+        "src.mcp_server.tools", level, "tool.py", 10, "Rolling %s", ("2d6",), exc_info
+    )
+    if tool is not None:
+        record.tool = tool
+    return record
+
+
+def error_info():
+    """Return exc_info for a raised error."""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        return sys.exc_info()
+
+
+class TestJsonFormatter:
+    """Test suite for JsonFormatter."""
+
+    def test_format_includes_extra_fields(self):
+        """Test records become JSON with their lazily formatted message."""
+        data = json.loads(JsonFormatter().format(make_record(tool="roll_dice")))
+
+        assert data["message"] == "Rolling 2d6"
+        assert data["level"] == "INFO"
+        assert data["tool"] == "roll_dice"
+
+    def test_format_exception(self):
+        """Test tracebacks are included as a field."""
+        record = make_record(level=logging.ERROR, exc_info=error_info())
+
+        assert (
+            "ValueError: boom" in json.loads(JsonFormatter().format(record))["exc_info"]
+        )
+
+
+class TestFilters:
+    """Test suite for sampling and stack rate limiting."""
+
+    def test_sampling_per_tool(self):
+        """Test sampling drops low-severity records for sampled tools only."""
+        sampler = SamplingFilter({"roll_dice": 0.0})
+
+        assert sampler.filter(make_record(tool="roll_dice")) is False
+        assert sampler.filter(make_record(tool="get_date")) is True
+        assert sampler.filter(make_record(logging.ERROR, tool="roll_dice")) is True
+
+    def test_sampling_default_rate(self):
+        """Test "*" sets the rate for tools without their own rate."""
+        sampler = SamplingFilter({"*": 0.0, "get_date": 1.0})
+
+        assert sampler.filter(make_record(tool="roll_dice")) is False
+        assert sampler.filter(make_record(tool="get_date")) is True
+
+    def test_repeated_stacks_are_stripped(self):
+        """Test only the first traceback per interval is kept."""
+        limiter = StackRateLimitFilter(interval=60.0)
+        first = make_record(logging.ERROR, exc_info=error_info())
+        second = make_record(logging.ERROR, exc_info=error_info())
+
+        assert limiter.filter(first) and limiter.filter(second)
+        assert first.exc_info is not None
+        assert second.exc_info is None
+
+    def test_suppressed_count_reported(self):
+        """Test the next emitted stack reports how many were suppressed."""
+        limiter = StackRateLimitFilter(interval=0.0)
+        limiter.filter(make_record(logging.ERROR, exc_info=error_info()))
+        limiter.interval = 60.0
+        limiter.filter(make_record(logging.ERROR, exc_info=error_info()))
+        limiter.interval = 0.0
+        record = make_record(logging.ERROR, exc_info=error_info())
+        limiter.filter(record)
+
+        assert record.suppressed_stacks == 1
+
+    def test_parse_sample_rates(self):
+        """Test sample rates are parsed and validated."""
+        assert parse_sample_rates("roll_dice=0.1, *=0.5") == {
+            "roll_dice": 0.1,
+            "*": 0.5,
+        }
+        assert parse_sample_rates("") == {}
+        with pytest.raises(ValueError):
+            parse_sample_rates("roll_dice=2")
+
+
+class TestConfigureLogging:
+    """Test suite for the background writer."""
+
+    def test_records_written_by_listener(self):
+        """Test records reach the stream once the queue is flushed."""
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        stream = io.StringIO()
+        try:
+            configure_logging("INFO", fmt="json", sample_rates={}, stream=stream)
+            logging.getLogger("test").info("hello %s", "world", extra={"tool": "x"})
+            stop_logging()
+        finally:
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+            for handler in handlers:
+                root.addHandler(handler)
+            root.setLevel(level)
+
+        data = json.loads(stream.getvalue())
+        assert data["message"] == "hello world"
+        assert data["tool"] == "x"
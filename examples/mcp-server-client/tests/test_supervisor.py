@@ -0,0 +1,92 @@
+"""Tests for the pre-forking worker supervisor and metrics aggregation."""
+
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from src.mcp_server.metrics import MetricsRegistry, merge_snapshots
+from src.mcp_server.supervisor import WorkerSupervisor
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestMetricsAggregation:
+    """Test suite for merging metrics across worker processes."""
+
+    def test_merge_snapshots(self):
+        """Test counters and histogram buckets are summed across workers."""
+        first, second = MetricsRegistry(), MetricsRegistry()
+        for registry, success in ((first, True), (second, False)):
+            metrics = registry.tool("roll_dice")
+            metrics.finish(metrics.start(), success=success)
+
+        merged = merge_snapshots([first.snapshot(), second.snapshot()])
+
+        tool = merged["tools"]["roll_dice"]
+        assert tool["success"] == 1
+        assert tool["errors"] == 1
+        assert tool["latency"]["count"] == 2
+        assert sum(tool["latency"]["counts"]) == 2
+
+    def test_aggregate_reads_shared_dir(self, tmp_path):
+        """Test a registry merges snapshots exported by sibling workers."""
+        sibling = MetricsRegistry()
+        metrics = sibling.tool("get_date")
+        metrics.finish(metrics.start(), success=True)
+        (tmp_path / "worker-1.json").write_text(json.dumps(sibling.snapshot()))
+
+        registry = MetricsRegistry()
+        registry.shared_dir = tmp_path
+        metrics = registry.tool("get_date")
+        metrics.finish(metrics.start(), success=True)
+
+        aggregated = registry.aggregate()
+
+        assert aggregated["tools"]["get_date"]["success"] == 2
+        assert (tmp_path / f"worker-{os.getpid()}.json").exists()
+
+
+class TestWorkerSupervisor:
+    """Test suite for WorkerSupervisor."""
+
+    def test_invalid_worker_count(self):
+        """Test at least one worker is required."""
+        with pytest.raises(ValueError):
+            WorkerSupervisor(0)
+
+    def test_restarts_exited_workers(self):
+        """Test workers that exit are restarted until the supervisor stops."""
+
+        def short_lived_worker(sock, metrics_dir):
+            time.sleep(0.05)
+
+        supervisor = WorkerSupervisor(
+            2, port=_free_port(), target=short_lived_worker, restart_delay=0.01
+        )
+        thread = threading.Thread(target=supervisor.run)
+        thread.start()
+
+        deadline = time.monotonic() + 10
+        while supervisor.restarts < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        supervisor.stop()
+        thread.join(timeout=10)
+
+        assert supervisor.restarts >= 2
+        assert not thread.is_alive()
+        assert supervisor.pids == {}
+
+    def test_run_server_rejects_workers_without_http(self):
+        """Test multiple workers are only supported for the http transport."""
+        from src.mcp_server.server import run_server
+
+        with pytest.raises(ValueError, match="http transport"):
+            run_server(transport="stdio", workers=2)
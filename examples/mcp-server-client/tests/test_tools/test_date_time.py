@@ -1,11 +1,13 @@
 """Tests for the date/time tool."""
 
+import json
 import zoneinfo
 from datetime import UTC, datetime
 from unittest.mock import patch
 
 import pytest
 
+from src.mcp_server.metrics import registry as metrics_registry
 from src.mcp_server.tools.base import ToolError, ValidationToolError
 from src.mcp_server.tools.date_time import DateTimeTool
 
@@ -49,6 +51,14 @@ class TestDateTimeTool:
         assert isinstance(tz, zoneinfo.ZoneInfo)
         assert str(tz) == "America/Los_Angeles"
 
+    def test_timezone_cache_published_under_tool_name(self, datetime_tool):
+        """Test timezone cache metrics are named after the tool."""
+        datetime_tool.parse_timezone("est")
+
+        caches = json.loads(metrics_registry.render_json())["caches"]
+        assert caches["get_date_timezones"]["misses"] >= 1
+        assert "timezones" not in caches
+
     def test_parse_timezone_invalid(self, datetime_tool):
         """Test parsing invalid timezone raises ToolError."""
         with pytest.raises(ToolError) as exc_info:
@@ -1,9 +1,14 @@
 """Tests for the dice rolling tool."""
 
+from unittest.mock import patch
+
 import pytest
 
+from src.mcp_server import session
+from src.mcp_server.dice_notation import compile_notation
+from src.mcp_server.models import DiceGroupRoll, DiceRollResponse, DiceRollSummary
 from src.mcp_server.tools.base import ValidationToolError
-from src.mcp_server.tools.dice import DiceRollTool
+from src.mcp_server.tools.dice import COMMON_NOTATIONS, DiceRollTool
 
 
 class TestDiceRollTool:
@@ -78,8 +83,9 @@ class TestDiceRollTool:
         assert "Number of sides must be greater than 0" in str(exc_info.value)
 
     @pytest.mark.asyncio
-    async def test_roll_dice_too_many_dice(self, dice_tool):
+    async def test_roll_dice_too_many_dice(self, dice_tool, monkeypatch):
         """Test too many dice raises ValidationError."""
+        monkeypatch.setenv("MCP_DICE_LIMITS", "dice=100")
         with pytest.raises(ValidationToolError) as exc_info:
             await dice_tool.execute(notation="101d6")
 
@@ -159,3 +165,205 @@ class TestDiceRollTool:
         assert len(result2.values) == 2
         assert all(1 <= v <= 6 for v in result1.values)
         assert all(1 <= v <= 6 for v in result2.values)
+
+    @pytest.mark.asyncio
+    async def test_roll_dice_past_default_cap(self, dice_tool):
+        """Test more than 100 dice can be rolled by default."""
+        result = await dice_tool.execute(notation="1000d6")
+
+        assert result.summary is not None
+        assert result.summary.count == 1000
+        assert result.values == []
+        assert sum(result.summary.histogram) == 1000
+        assert 1000 <= result.total <= 6000
+
+    @pytest.mark.asyncio
+    async def test_roll_dice_millions(self, dice_tool):
+        """Test millions of dice are summarized instead of listed."""
+        result = await dice_tool.execute(notation="2000000d6")
+
+        summary = result.summary
+        assert summary.minimum == 1
+        assert summary.maximum == 6
+        assert abs(summary.mean - 3.5) < 0.01
+        assert result.total == sum(
+            face * seen for face, seen in enumerate(summary.histogram, 1)
+        )
+
+    @pytest.mark.asyncio
+    async def test_values_limit_configurable(self, dice_tool, monkeypatch):
+        """Test MCP_DICE_LIMITS sets when values give way to a summary."""
+        monkeypatch.setenv("MCP_DICE_LIMITS", "values=5")
+
+        listed = await dice_tool.execute(notation="5d6")
+        summarized = await dice_tool.execute(notation="6d6")
+
+        assert len(listed.values) == 5
+        assert summarized.summary.count == 6
+
+    def test_format_result_summary(self, dice_tool):
+        """Test summarized rolls show statistics and a small histogram."""
+        response = DiceRollResponse(
+            total=35,
+            notation="10d6",
+            summary=DiceRollSummary(
+                count=10, minimum=1, maximum=6, mean=3.5, histogram=[2, 1, 2, 2, 1, 2]
+            ),
+        )
+
+        formatted = dice_tool.format_result(response)
+
+        assert "**35** (mean 3.500, min 1, max 6)" in formatted
+        assert "\n6: 2" in formatted
+
+    @pytest.mark.asyncio
+    async def test_roll_dice_expression(self, dice_tool):
+        """Test keeps and constants are applied to the total."""
+        result = await dice_tool.execute(notation="4d6kh3+2")
+
+        assert len(result.values) == 3
+        assert len(result.dropped) == 1
+        assert result.modifier == 2
+        assert result.total == sum(result.values) + 2
+        assert result.groups == []
+
+    @pytest.mark.asyncio
+    async def test_roll_dice_several_groups(self, dice_tool):
+        """Test each dice group is reported with its sign."""
+        result = await dice_tool.execute(notation="2d6-1d4")
+
+        plus, minus = result.groups
+        assert (plus.notation, plus.sign, len(plus.values)) == ("2d6", 1, 2)
+        assert (minus.notation, minus.sign, len(minus.values)) == ("1d4", -1, 1)
+        assert result.total == plus.total - minus.total
+        assert result.values == plus.values + minus.values
+
+    @pytest.mark.asyncio
+    async def test_repeated_notation_skips_validation(self, dice_tool):
+        """Test a cached plan is rolled without parsing or validating."""
+        await dice_tool.execute(notation="3d8+1")
+
+        with patch.object(dice_tool, "validate_input") as validate:
+            result = await dice_tool.execute(notation="3d8+1")
+
+        validate.assert_not_called()
+        assert len(result.values) == 3
+        assert dice_tool.plans.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_new_notation_compiled_once(self, dice_tool):
+        """Test an uncached notation is parsed once, not again by the model."""
+        with (
+            patch(
+                "src.mcp_server.tools.dice.compile_notation",
+                wraps=compile_notation,
+            ) as compile_plan,
+            patch("src.mcp_server.models.requests.compile_notation") as validate,
+        ):
+            await dice_tool.execute(notation="3d10+2")
+
+        compile_plan.assert_called_once_with("3d10+2")
+        validate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalid_notation_not_cached(self, dice_tool):
+        """Test rejected notations are not stored as plans."""
+        for _ in range(2):
+            with pytest.raises(ValidationToolError):
+                await dice_tool.execute(notation="4d6kh9")
+
+        assert len(dice_tool.plans) == 0
+
+    @pytest.mark.asyncio
+    async def test_warm_compiles_common_notations(self, dice_tool):
+        """Test warming fills the plan cache."""
+        await dice_tool.warm()
+
+        assert len(dice_tool.plans) == len(COMMON_NOTATIONS)
+
+    @pytest.mark.asyncio
+    async def test_seeded_rolls_replay(self, dice_tool):
+        """Test a seed replays the roll and the rolls after it."""
+
+        async def play():
+            first = await dice_tool.execute(notation="4d6kh3", seed=1234)
+            second = await dice_tool.execute(notation="1d20+1d8")
+            return first.values + first.dropped, second.values
+
+        assert await play() == await play()
+
+    @pytest.mark.asyncio
+    async def test_sessions_roll_independently(self, dice_tool):
+        """Test seeding one session does not touch another's stream."""
+
+        class Session:
+            pass
+
+        player, other = Session(), Session()
+        with session.scope(player):
+            await dice_tool.execute(notation="1d20", seed=5)
+            expected = await dice_tool.execute(notation="10d20")
+            await dice_tool.execute(notation="1d20", seed=5)
+        with session.scope(other):
+            await dice_tool.execute(notation="10d20")
+        with session.scope(player):
+            replayed = await dice_tool.execute(notation="10d20")
+
+        assert replayed.values == expected.values
+
+    @pytest.mark.asyncio
+    async def test_secure_roll(self, dice_tool):
+        """Test secure rolls draw from the cryptographic stream."""
+        result = await dice_tool.execute(notation="3d6", secure=True)
+
+        assert len(result.values) == 3
+        assert all(1 <= v <= 6 for v in result.values)
+
+    @pytest.mark.asyncio
+    async def test_secure_roll_cannot_be_seeded(self, dice_tool):
+        """Test asking for a seeded secure roll is rejected."""
+        with pytest.raises(ValidationToolError, match="cannot be seeded"):
+            await dice_tool.execute(notation="1d20", seed=1, secure=True)
+
+    @pytest.mark.asyncio
+    async def test_seed_rejected_in_secure_mode(self, dice_tool, monkeypatch):
+        """Test seeds are refused when the server only rolls securely."""
+        monkeypatch.setenv("MCP_DICE_RNG", "secure")
+
+        with pytest.raises(ValidationToolError, match="cannot be seeded"):
+            await dice_tool.execute(notation="1d20", seed=1)
+
+    @pytest.mark.asyncio
+    async def test_negative_single_die(self, dice_tool):
+        """Test a subtracted single die is shown with its sign."""
+        result = await dice_tool.execute(notation="-1d6")
+
+        assert result.total == -result.values[0]
+        formatted = dice_tool.format_result(result)
+        assert formatted == f"🎲 Rolled -1d6: **{result.total}**"
+
+    def test_format_result_expression(self, dice_tool):
+        """Test dropped dice and constants are shown."""
+        response = DiceRollResponse(
+            values=[6, 4, 3], dropped=[1], modifier=-2, total=11, notation="4d6kh3-2"
+        )
+
+        formatted = dice_tool.format_result(response)
+
+        assert "[6, 4, 3] (dropped 1) - 2 = **11**" in formatted
+
+    def test_format_result_groups(self, dice_tool):
+        """Test expressions with several groups show each group."""
+        response = DiceRollResponse(
+            values=[5, 2],
+            total=3,
+            notation="1d6-1d4",
+            groups=[
+                DiceGroupRoll(notation="1d6", sign=1, values=[5], total=5),
+                DiceGroupRoll(notation="1d4", sign=-1, values=[2], total=2),
+            ],
+        )
+
+        formatted = dice_tool.format_result(response)
+
+        assert "1d6 [5] - 1d4 [2] = **3**" in formatted
@@ -0,0 +1,102 @@
+"""Tests for the batch dice tool."""
+
+import json
+
+import pytest
+
+from src.mcp_server.tools.base import ValidationToolError
+from src.mcp_server.tools.dice_batch import DiceBatchTool
+
+
+class TestDiceBatchTool:
+    """Test suite for DiceBatchTool."""
+
+    @pytest.fixture
+    def batch_tool(self):
+        """Create a DiceBatchTool instance for testing."""
+        return DiceBatchTool()
+
+    @pytest.mark.asyncio
+    async def test_totals_per_notation(self, batch_tool):
+        """Test one row of totals is returned per notation, in order."""
+        result = await batch_tool.execute(
+            notations=["1d20+5", "4d6kh3", "1d20+5"], repeat=50
+        )
+
+        assert result.notations == ["1d20+5", "4d6kh3", "1d20+5"]
+        assert result.repeat == 50
+        assert [len(row) for row in result.totals] == [50, 50, 50]
+        assert all(6 <= total <= 25 for total in result.totals[0])
+        assert all(3 <= total <= 18 for total in result.totals[1])
+
+    @pytest.mark.asyncio
+    async def test_distinct_notations_compiled_once(self, batch_tool):
+        """Test repeated notations are compiled once and then cached."""
+        await batch_tool.execute(notations=["2d6", "2d6", "1d8"], repeat=1)
+
+        stats = batch_tool.plans.stats()
+        assert stats["misses"] == 2
+        assert stats["entries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_seeded_batch_replays(self, batch_tool):
+        """Test a seeded batch rolls the same totals again."""
+        arguments = {"notations": ["1d20+5", "4d6kh3"], "repeat": 20, "seed": 99}
+
+        first = await batch_tool.execute(**arguments)
+        second = await batch_tool.execute(**arguments)
+
+        assert first.totals == second.totals
+
+    @pytest.mark.asyncio
+    async def test_secure_batch(self, batch_tool):
+        """Test secure batches draw from the cryptographic stream."""
+        result = await batch_tool.execute(notations=["2d6"], repeat=100, secure=True)
+
+        assert all(2 <= total <= 12 for total in result.totals[0])
+
+    @pytest.mark.asyncio
+    async def test_invalid_notation(self, batch_tool):
+        """Test any invalid notation rejects the batch."""
+        with pytest.raises(ValidationToolError, match="Invalid dice notation"):
+            await batch_tool.execute(notations=["1d20", "2x6"], repeat=1)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "arguments",
+        [
+            {"notations": [], "repeat": 1},
+            {"notations": ["1d6"], "repeat": 0},
+            {"notations": ["1d6"] * 20, "repeat": 10_000},
+        ],
+    )
+    async def test_batch_size_limits(self, batch_tool, arguments):
+        """Test empty batches, no repeats and too many rolls are rejected."""
+        with pytest.raises(ValidationToolError):
+            await batch_tool.execute(**arguments)
+
+    @pytest.mark.asyncio
+    async def test_huge_constant_rejected(self, batch_tool):
+        """Test constants beyond int64 are invalid input, not an overflow."""
+        with pytest.raises(ValidationToolError, match="constants must not exceed"):
+            await batch_tool.execute(notations=["1d6+99999999999999999999"], repeat=2)
+
+    @pytest.mark.asyncio
+    async def test_dice_limit(self, batch_tool, monkeypatch):
+        """Test the dice limit applies to the whole batch."""
+        monkeypatch.setenv("MCP_DICE_LIMITS", "dice=100")
+
+        with pytest.raises(ValidationToolError, match="more than the limit of 100"):
+            await batch_tool.execute(notations=["10d6", "1d6"], repeat=10)
+
+    @pytest.mark.asyncio
+    async def test_safe_execute_returns_json(self, batch_tool):
+        """Test results reach clients as compact JSON."""
+        result = await batch_tool.safe_execute(notations=["1d6", "2d6"], repeat=3)
+
+        assert not result["isError"]
+        text = result["content"][0]["text"]
+        data = json.loads(text)
+        assert data["notations"] == ["1d6", "2d6"]
+        assert len(data["totals"]) == 2
+        assert " " not in text
@@ -0,0 +1,98 @@
+"""Tests for the dice distribution tool."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.mcp_server.tools.base import ToolError, ValidationToolError
+from src.mcp_server.tools.dice_distribution import MAX_POINTS, DiceDistributionTool
+
+
+class TestDiceDistributionTool:
+    """Test suite for DiceDistributionTool."""
+
+    @pytest.fixture
+    def distribution_tool(self):
+        """Create a DiceDistributionTool instance for testing."""
+        return DiceDistributionTool()
+
+    @pytest.mark.asyncio
+    async def test_exact_distribution(self, distribution_tool):
+        """Test small expressions return every total."""
+        result = await distribution_tool.execute(notation="2d6")
+
+        assert (result.minimum, result.maximum) == (2, 12)
+        assert (result.start, result.end, result.step) == (2, 12, 1)
+        assert result.pmf[5] == pytest.approx(6 / 36)
+        assert result.cdf[-1] == pytest.approx(1.0)
+        assert result.mean == pytest.approx(7.0)
+        assert result.variance == pytest.approx(35 / 6)
+        assert result.percentiles["p50"] == 7
+        assert result.notation == "2d6"
+
+    @pytest.mark.asyncio
+    async def test_large_distribution_binned(self, distribution_tool):
+        """Test hundreds of large dice are summarized in bins."""
+        result = await distribution_tool.execute(notation="200d1000+5")
+
+        assert result.maximum == 200_005
+        assert result.step > 1
+        assert len(result.pmf) <= MAX_POINTS
+        assert result.mean == pytest.approx(200 * 500.5 + 5)
+        assert result.percentiles["p50"] == pytest.approx(result.mean, rel=1e-3)
+
+    @pytest.mark.asyncio
+    async def test_invalid_notation(self, distribution_tool):
+        """Test notation is validated like roll_dice."""
+        with pytest.raises(ValidationToolError) as exc_info:
+            await distribution_tool.execute(notation="2x6")
+
+        assert "Invalid dice notation" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_too_large(self, distribution_tool):
+        """Test expressions too large to compute are rejected as invalid."""
+        with pytest.raises(ValidationToolError) as exc_info:
+            await distribution_tool.execute(notation="10000000d6")
+
+        assert "outcomes" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_missing_notation(self, distribution_tool):
+        """Test missing notation raises ToolError."""
+        with pytest.raises(ToolError):
+            await distribution_tool.execute()
+
+    @pytest.mark.asyncio
+    async def test_results_cached(self, distribution_tool):
+        """Test repeated notations are answered from the result cache."""
+        first = await distribution_tool.safe_execute(notation="4d6kh3")
+
+        with patch.object(distribution_tool, "compute") as compute:
+            second = await distribution_tool.safe_execute(notation="4d6kh3")
+
+        compute.assert_not_called()
+        assert second == first
+        assert "12.2446" in first["content"][0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_format_result(self, distribution_tool):
+        """Test the table lists totals with their probabilities."""
+        result = await distribution_tool.execute(notation="1d4")
+
+        formatted = distribution_tool.format_result(result)
+
+        assert "📊 **Distribution of 1d4**" in formatted
+        assert "mean **2.5000**" in formatted
+        assert "p50 2" in formatted
+        assert "\n3: 0.25 0.75" in formatted
+
+    @pytest.mark.asyncio
+    async def test_format_result_bins(self, distribution_tool):
+        """Test binned totals are shown as ranges."""
+        result = await distribution_tool.execute(notation="100d100")
+
+        formatted = distribution_tool.format_result(result)
+
+        first = result.start
+        assert f"\n{first}–{first + result.step - 1}: " in formatted
@@ -0,0 +1,214 @@
+"""Tests for the streaming forecast tool."""
+
+import math
+from array import array
+from unittest.mock import patch
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.mcp_server import progress
+from src.mcp_server.tools.base import ExternalServiceError, ToolError
+from src.mcp_server.tools.forecast import ForecastSeries, ForecastTool
+
+# Monday 7 July 2025, 00:00 UTC
+START = 1751846400
+
+
+def hourly_response(hours: int = 48) -> dict:
+    """Build an Open-Meteo hourly forecast requested as unix time."""
+    return {
+        "utc_offset_seconds": 3600,
+        "hourly": {
+            "time": [START + 3600 * i for i in range(hours)],
+            "temperature_2m": [10.0 + i % 24 for i in range(hours)],
+            "precipitation_probability": [i % 100 for i in range(hours)],
+            "weather_code": [3] * (hours - 1) + [None],
+            "wind_speed_10m": [12.5] * hours,
+        },
+    }
+
+
+def daily_response(days: int = 3) -> dict:
+    """Build an Open-Meteo daily forecast requested as unix time."""
+    return {
+        "utc_offset_seconds": 0,
+        "daily": {
+            "time": [START + 86400 * i for i in range(days)],
+            "temperature_2m_min": [8.0 + i for i in range(days)],
+            "temperature_2m_max": [18.0 + i for i in range(days)],
+            "precipitation_sum": [0.0, 1.2, None][:days],
+            "weather_code": [61] * days,
+            "wind_speed_10m_max": [20.0] * days,
+        },
+    }
+
+
+class TestForecastSeries:
+    """Test suite for decoding forecasts into columns."""
+
+    def test_decode_into_typed_arrays(self):
+        """Test each variable becomes one typed array."""
+        series = ForecastSeries.decode(hourly_response(), "hourly")
+
+        assert len(series) == 48
+        assert series.times.typecode == "q"
+        assert series.columns["temperature_2m"].typecode == "d"
+        assert series.columns["weather_code"].typecode == "h"
+        assert all(isinstance(c, array) for c in series.columns.values())
+
+    def test_missing_values(self):
+        """Test nulls decode to None through value()."""
+        data = daily_response()
+        series = ForecastSeries.decode(data, "daily")
+
+        assert math.isnan(series.columns["precipitation_sum"][2])
+        assert series.value("precipitation_sum", 2) is None
+        assert series.value("precipitation_sum", 1) == 1.2
+        assert series.value("weather_code", 0) == 61
+
+    def test_local_time_uses_utc_offset(self):
+        """Test steps are shown in the location's local time."""
+        series = ForecastSeries.decode(hourly_response(), "hourly")
+
+        assert series.local_time(0).hour == 1
+
+    def test_missing_series(self):
+        """Test a response without the requested series is an error."""
+        with pytest.raises(ExternalServiceError):
+            ForecastSeries.decode({"hourly": {}}, "hourly")
+
+    def test_misaligned_series(self):
+        """Test a variable with the wrong number of values is an error."""
+        data = hourly_response()
+        data["hourly"]["temperature_2m"].pop()
+
+        with pytest.raises(ExternalServiceError) as exc_info:
+            ForecastSeries.decode(data, "hourly")
+
+        assert "47 values for 48 times" in str(exc_info.value)
+
+
+class TestForecastTool:
+    """Test suite for ForecastTool."""
+
+    @pytest.fixture
+    def forecast_tool(self):
+        """Create a ForecastTool instance for testing."""
+        return ForecastTool()
+
+    @pytest.mark.asyncio
+    async def test_hourly_request(self, forecast_tool):
+        """Test hours request an hourly series as unix time."""
+        with patch.object(
+            forecast_tool, "make_request", return_value=hourly_response()
+        ) as request:
+            forecast = await forecast_tool.execute(location="London", hours=48)
+
+        params = request.call_args.kwargs["params"]
+        assert params["forecast_hours"] == 48
+        assert params["timeformat"] == "unixtime"
+        assert "hourly" in params
+        assert len(forecast.series) == 48
+        assert forecast.streamed_chunks == 0
+
+    @pytest.mark.asyncio
+    async def test_daily_request(self, forecast_tool):
+        """Test days request a daily series."""
+        with patch.object(
+            forecast_tool, "make_request", return_value=daily_response()
+        ) as request:
+            forecast = await forecast_tool.execute(location="Paris", days=3)
+
+        assert request.call_args.kwargs["params"]["forecast_days"] == 3
+        assert forecast.series.resolution == "daily"
+
+    @pytest.mark.asyncio
+    async def test_hours_and_days_rejected(self, forecast_tool):
+        """Test only one horizon may be given."""
+        with pytest.raises(ToolError) as exc_info:
+            await forecast_tool.execute(location="London", hours=5, days=2)
+
+        assert "either hours or days" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_chunks_streamed_to_listening_client(self, forecast_tool):
+        """Test each day of hours is sent as one progress notification."""
+        updates = []
+
+        async def reporter(done, total, message):
+            updates.append((done, total, message))
+
+        with (
+            patch.object(forecast_tool, "make_request", return_value=hourly_response()),
+            progress.scope(reporter),
+        ):
+            forecast = await forecast_tool.execute(location="London", hours=48)
+
+        assert [(done, total) for done, total, _ in updates] == [(24, 48), (48, 48)]
+        assert updates[0][2].count("\n") == 23
+        assert updates[0][2].startswith("Mon 07 Jul 01:00  10.0°C  0%  Overcast")
+        assert forecast.streamed_chunks == 2
+
+    @pytest.mark.asyncio
+    async def test_streamed_result_is_summary(self, forecast_tool):
+        """Test streamed forecasts are not repeated in the final result."""
+
+        async def reporter(done, total, message):
+            pass
+
+        with (
+            patch.object(forecast_tool, "make_request", return_value=hourly_response()),
+            progress.scope(reporter),
+        ):
+            result = await forecast_tool.safe_execute(location="London", hours=48)
+
+        text = result["content"][0]["text"]
+        assert "Streamed in 2 chunks." in text
+        assert "10.0–33.0°C" in text
+        assert "Overcast" not in text
+
+    @pytest.mark.asyncio
+    async def test_full_result_without_progress(self, forecast_tool):
+        """Test clients without progress get every row in the result."""
+        with patch.object(forecast_tool, "make_request", return_value=daily_response()):
+            result = await forecast_tool.safe_execute(location="Paris", days=3)
+
+        text = result["content"][0]["text"]
+        assert "**Daily forecast for Paris** (3 days)" in text
+        assert "Tue 08 Jul  9.0–19.0°C  1.2 mm  Slight rain  20.0 km/h" in text
+        assert "Wed 09 Jul  10.0–20.0°C  –  Slight rain" in text
+
+    @pytest.mark.asyncio
+    async def test_missing_weather_code_formatted(self, forecast_tool):
+        """Test steps without a weather code are still shown."""
+        with patch.object(
+            forecast_tool, "make_request", return_value=hourly_response()
+        ):
+            forecast = await forecast_tool.execute(location="London", hours=48)
+
+        assert forecast_tool.format_rows(forecast.series, 47, 48).count("–") == 1
+
+    @pytest.mark.asyncio
+    async def test_progress_over_mcp(self):
+        """Test chunks reach an MCP client as progress notifications."""
+        from src.mcp_server.server import mcp, tool_registry
+
+        tool = tool_registry.get("get_forecast")
+        messages = []
+
+        async def on_progress(done, total, message):
+            messages.append(message)
+
+        with patch.object(tool, "make_request", return_value=hourly_response()):
+            async with create_connected_server_and_client_session(
+                mcp._mcp_server
+            ) as session:
+                result = await session.call_tool(
+                    "get_forecast",
+                    {"location": "London", "hours": 48},
+                    progress_callback=on_progress,
+                )
+
+        assert len(messages) == 2
+        assert "Streamed in 2 chunks." in result.content[0].text
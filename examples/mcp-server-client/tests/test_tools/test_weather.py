@@ -62,6 +62,35 @@ class TestWeatherTool:
         with pytest.raises(ToolError):
             weather_tool.parse_location("200,300")  # Out of range
 
+    def test_parse_location_gazetteer(self, weather_tool):
+        """Test cities beyond the original list resolve, with any spelling."""
+        assert weather_tool.parse_location("München") == (48.1351, 11.5820)
+        assert weather_tool.parse_location("  SAO PAULO ") == (-23.5505, -46.6333)
+
+    def test_parse_location_suggestions(self, weather_tool):
+        """Test unknown names suggest similar places instead of every city."""
+        with pytest.raises(ToolError) as exc_info:
+            weather_tool.parse_location("Lodnon")
+
+        message = str(exc_info.value)
+        assert "Did you mean: London, GB" in message
+        assert "Tokyo" not in message
+
+    @pytest.mark.asyncio
+    async def test_coordinates_named_by_nearest_place(self, weather_tool):
+        """Test coordinate lookups report the closest known place."""
+        mock_response = WeatherAPIFixtures.current_weather_response()
+
+        with patch.object(weather_tool, "make_request", return_value=mock_response):
+            near = await weather_tool.execute(location="51.51,-0.13")
+            remote = await weather_tool.execute(location="0,-140")
+            named = await weather_tool.execute(location="London")
+
+        assert near.place == "London, GB"
+        assert "📍 Near: **London, GB**" in weather_tool.format_result(near)
+        assert remote.place is None
+        assert named.place is None
+
     def test_weather_code_to_text(self, weather_tool):
         """Test weather code conversion."""
         assert weather_tool.weather_code_to_text(0) == "Clear sky"
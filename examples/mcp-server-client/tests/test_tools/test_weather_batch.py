@@ -0,0 +1,211 @@
+"""Tests for the batch weather tool."""
+
+from urllib.parse import urlencode
+
+import pytest
+
+from src.mcp_server.tools.base import ExternalServiceError, ToolError
+from src.mcp_server.tools.weather import CURRENT_FIELDS
+from src.mcp_server.tools.weather_batch import WeatherBatchTool, chunk_coordinates
+from tests.fixtures.mcp_messages import WeatherAPIFixtures
+
+URL = "https://api.open-meteo.com/v1/forecast"
+PARAMS = {"current": CURRENT_FIELDS, "timezone": "auto"}
+
+
+def request_url(coordinates):
+    """Build the URL a chunk of coordinates is requested with."""
+    params = {
+        "latitude": ",".join(str(lat) for lat, _ in coordinates),
+        "longitude": ",".join(str(lon) for _, lon in coordinates),
+        **PARAMS,
+    }
+    return f"{URL}?{urlencode(params)}"
+
+
+class TestChunkCoordinates:
+    """Test suite for splitting coordinates by URL length."""
+
+    def test_small_batch_fits_one_request(self):
+        """Test a few coordinates are requested together."""
+        coordinates = [(51.5074, -0.1278), (48.8566, 2.3522)]
+
+        assert chunk_coordinates(coordinates, URL, PARAMS) == [coordinates]
+
+    def test_chunks_respect_url_limit(self):
+        """Test every chunk's URL stays within the limit, in order."""
+        coordinates = [(i / 7, -i / 3) for i in range(1, 200)]
+
+        chunks = chunk_coordinates(coordinates, URL, PARAMS, max_length=500)
+
+        assert len(chunks) > 1
+        assert [pair for chunk in chunks for pair in chunk] == coordinates
+        assert all(len(request_url(chunk)) <= 500 for chunk in chunks)
+
+    def test_chunks_are_filled(self):
+        """Test a chunk is only closed when the next pair would not fit."""
+        coordinates = [(i / 7, -i / 3) for i in range(1, 200)]
+
+        chunks = chunk_coordinates(coordinates, URL, PARAMS, max_length=500)
+
+        for chunk, following in zip(chunks, chunks[1:], strict=False):
+            assert len(request_url([*chunk, following[0]])) > 500
+
+    def test_oversized_pair_gets_own_chunk(self):
+        """Test a pair is still requested when the limit is too small."""
+        coordinates = [(1.0, 2.0), (3.0, 4.0)]
+
+        assert chunk_coordinates(coordinates, URL, PARAMS, max_length=10) == [
+            [(1.0, 2.0)],
+            [(3.0, 4.0)],
+        ]
+
+
+class TestWeatherBatchTool:
+    """Test suite for WeatherBatchTool."""
+
+    @pytest.fixture
+    def batch_tool(self):
+        """Create a WeatherBatchTool instance for testing."""
+        return WeatherBatchTool()
+
+    @pytest.mark.asyncio
+    async def test_results_per_location_in_order(self, batch_tool, monkeypatch):
+        """Test one request serves every location, keeping request order."""
+        calls = []
+
+        async def make_request(**kwargs):
+            calls.append(kwargs["params"])
+            return [
+                WeatherAPIFixtures.current_weather_response(temperature=10.0),
+                WeatherAPIFixtures.current_weather_response(temperature=20.0),
+            ]
+
+        monkeypatch.setattr(batch_tool, "make_request", make_request)
+        response = await batch_tool.execute(locations=["London", "Paris"])
+
+        assert len(calls) == 1
+        assert calls[0]["latitude"] == "51.5074,48.8566"
+        assert calls[0]["longitude"] == "-0.1278,2.3522"
+        assert [item.location for item in response.results] == ["London", "Paris"]
+        assert [item.weather.temperature for item in response.results] == [10.0, 20.0]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_coordinates_requested_once(self, batch_tool, monkeypatch):
+        """Test locations resolving to the same coordinates share a result."""
+        calls = []
+
+        async def make_request(**kwargs):
+            calls.append(kwargs["params"])
+            # Open-Meteo returns an object for a single location
+            return WeatherAPIFixtures.current_weather_response()
+
+        monkeypatch.setattr(batch_tool, "make_request", make_request)
+        response = await batch_tool.execute(locations=["tokyo", "35.6762,139.6503"])
+
+        assert calls[0]["latitude"] == "35.6762"
+        assert response.failed == 0
+        assert response.results[1].location == "35.6762,139.6503"
+
+    @pytest.mark.asyncio
+    async def test_large_batch_split_into_requests(self, batch_tool, monkeypatch):
+        """Test a batch exceeding the URL limit uses several requests."""
+        batch_tool.max_url_length = 300
+        locations = [f"{i / 7},{i / 3}" for i in range(1, 40)]
+
+        async def make_request(**kwargs):
+            count = kwargs["params"]["latitude"].count(",") + 1
+            return [WeatherAPIFixtures.current_weather_response()] * count
+
+        monkeypatch.setattr(batch_tool, "make_request", make_request)
+        response = await batch_tool.execute(locations=locations)
+
+        assert response.failed == 0
+        assert len(response.results) == len(locations)
+
+    @pytest.mark.asyncio
+    async def test_unknown_location_reported_per_item(self, batch_tool, monkeypatch):
+        """Test an unknown location does not fail the rest of the batch."""
+
+        async def make_request(**kwargs):
+            return WeatherAPIFixtures.current_weather_response()
+
+        monkeypatch.setattr(batch_tool, "make_request", make_request)
+        response = await batch_tool.execute(locations=["Atlantis", "London"])
+
+        assert response.failed == 1
+        assert "Unknown location" in response.results[0].error
+        assert response.results[1].weather is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_request_reported_for_its_chunk(self, batch_tool, monkeypatch):
+        """Test a failed request only fails the locations it carried."""
+        batch_tool.max_url_length = 1
+
+        async def make_request(**kwargs):
+            if kwargs["params"]["latitude"] == "48.8566":
+                raise ExternalServiceError("HTTP error 503", service_name="HTTP")
+            return WeatherAPIFixtures.current_weather_response()
+
+        monkeypatch.setattr(batch_tool, "make_request", make_request)
+        response = await batch_tool.execute(locations=["London", "Paris"])
+
+        assert response.results[0].weather is not None
+        assert response.results[1].error == "HTTP error 503"
+
+    @pytest.mark.asyncio
+    async def test_incomplete_data_reported_per_item(self, batch_tool, monkeypatch):
+        """Test a location without current conditions is reported as failed."""
+
+        async def make_request(**kwargs):
+            return [WeatherAPIFixtures.current_weather_response(), {"current": {}}]
+
+        monkeypatch.setattr(batch_tool, "make_request", make_request)
+        response = await batch_tool.execute(locations=["London", "Paris"])
+
+        assert "No current weather data" in response.results[1].error
+
+    @pytest.mark.asyncio
+    async def test_result_count_mismatch(self, batch_tool, monkeypatch):
+        """Test a short upstream answer is not matched to the wrong places."""
+
+        async def make_request(**kwargs):
+            return [WeatherAPIFixtures.current_weather_response()]
+
+        monkeypatch.setattr(batch_tool, "make_request", make_request)
+        with pytest.raises(ToolError) as exc_info:
+            await batch_tool.execute(locations=["London", "Paris"])
+
+        assert "Expected 2 results, got 1" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_all_locations_failed(self, batch_tool):
+        """Test a batch without any weather data is an error."""
+        with pytest.raises(ToolError) as exc_info:
+            await batch_tool.execute(locations=["Atlantis", "Lemuria"])
+
+        assert "No weather data for any location" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_empty_locations(self, batch_tool):
+        """Test execution without locations."""
+        with pytest.raises(ToolError) as exc_info:
+            await batch_tool.execute(locations=[])
+
+        assert "Missing required parameter" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_safe_execute_formats_partial_failure(self, batch_tool, monkeypatch):
+        """Test the formatted result lists successes and failures."""
+
+        async def make_request(**kwargs):
+            return WeatherAPIFixtures.current_weather_response(temperature=18.0)
+
+        monkeypatch.setattr(batch_tool, "make_request", make_request)
+        result = await batch_tool.safe_execute(locations=["London", "Atlantis"])
+
+        text = result["content"][0]["text"]
+        assert result["isError"] is False
+        assert "1 of 2 locations" in text
+        assert "London: **18.0°C**" in text
+        assert "Atlantis: ⚠️ Unknown location" in text